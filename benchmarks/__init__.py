@@ -0,0 +1,4 @@
+"""
+WTF Platform benchmarks - run from the repository root, e.g.
+    python -m benchmarks.bench_pdf_reports
+"""
@@ -0,0 +1,209 @@
+"""
+Load test for the JSON API: requests/sec and latency per endpoint
+
+Starts `python -m wtf_api serve --builtin` on a scratch copy of a seeded
+benchmark database (or targets a running instance with --url and --api-key),
+then drives it from keep-alive connections with a weighted mix of requests:
+
+    python -m benchmarks.bench_api --size small --duration 10 --concurrency 16
+    python -m benchmarks.bench_api --url http://127.0.0.1:8000 --api-key <key> --db wtf_ultimate.db
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from benchmarks.run_benchmarks import prepare_database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (weight, name, method, path, body)
+SCENARIOS = [
+    (30, 'autocomplete', 'GET', '/api/properties/autocomplete?query={prefix}', None),
+    (20, 'properties', 'GET', '/api/properties?limit=20&page={page}', None),
+    (15, 'leads', 'GET', '/api/leads?limit=20', None),
+    (10, 'deals', 'GET', '/api/deals', None),
+    (10, 'buyers_match', 'POST', '/api/buyers/match', {'propertyId': '{property_id}'}),
+    (10, 'analyze', 'POST', '/api/properties/analyze',
+     {'address': '{address}', 'propertyData': {'city': 'Dallas', 'state': 'TX', 'listPrice': 250000,
+                                               'squareFeet': 1600}}),
+    (5, 'usage', 'GET', '/api/usage', None)
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _fill(value, context: Dict):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {k: _fill(v, context) for k, v in value.items()}
+    return value
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 client connection"""
+
+    def __init__(self, host: str, port: int, api_key: str):
+        self.host, self.port, self.api_key = host, port, api_key
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, body: Optional[Dict] = None) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nhost: {self.host}\r\nauthorization: Bearer {self.api_key}\r\n"
+                           f"content-type: application/json\r\ncontent-length: {len(payload)}\r\n\r\n").encode()
+                          + payload)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        headers = dict((k.strip().lower(), v.strip())
+                       for k, v in (line.split(':', 1) for line in lines[1:] if ':' in line))
+        await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return int(lines[0].split(' ')[1])
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _worker(conn: Connection, deadline: float, rng: random.Random, context: Dict,
+                  samples: Dict[str, List[float]], errors: Dict[str, int]):
+    weights = [s[0] for s in SCENARIOS]
+    while time.perf_counter() < deadline:
+        _, name, method, path, body = rng.choices(SCENARIOS, weights)[0]
+        ctx = {**context, 'prefix': rng.choice(context['prefixes']).replace(' ', '%20'),
+               'page': rng.randint(1, 5), 'property_id': rng.choice(context['property_ids']),
+               'address': f"{rng.randint(100, 9999)} Main St"}
+        start = time.perf_counter()
+        try:
+            status = await conn.request(method, _fill(path, ctx), _fill(body, ctx))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn.close()
+            status = 599
+        samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        if status >= 400:
+            errors[name] = errors.get(name, 0) + 1
+    conn.close()
+
+
+async def load(host: str, port: int, context: Dict, duration: float, concurrency: int, seed: int = 42) -> Dict:
+    samples, errors = {}, {}
+    connections = [Connection(host, port, context['api_key']) for _ in range(concurrency)]
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_worker(conn, deadline, random.Random(seed + i), context, samples, errors)
+                           for i, conn in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(v) for v in samples.values())
+    endpoints = {}
+    for name, values in sorted(samples.items()):
+        values.sort()
+        endpoints[name] = {'requests': len(values), 'errors': errors.get(name, 0),
+                           'rps': round(len(values) / elapsed, 1),
+                           'p50_ms': round(statistics.median(values), 2),
+                           'p99_ms': round(values[min(len(values) - 1, int(len(values) * 0.99))], 2)}
+    return {'duration_s': round(elapsed, 2), 'concurrency': concurrency, 'requests': total,
+            'requests_per_sec': round(total / elapsed, 1), 'errors': sum(errors.values()), 'endpoints': endpoints}
+
+
+def load_context(db_path: str, api_key: Optional[str] = None) -> Dict:
+    conn = sqlite3.connect(db_path)
+    if api_key:
+        user_id = conn.execute('SELECT id FROM users WHERE api_key = ?', (api_key,)).fetchone()[0]
+    else:
+        user_id = conn.execute('''
+            SELECT user_id FROM properties GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1
+        ''').fetchone()[0]
+        # Unlimited plan so usage limits do not turn the analyze mix into 403s
+        api_key = f"bench-{uuid.uuid4().hex}"
+        conn.execute("UPDATE users SET subscription_tier = 'enterprise', api_key = ?, is_active = 1 WHERE id = ?",
+                     (api_key, user_id))
+        conn.commit()
+    property_ids = [row[0] for row in conn.execute('SELECT id FROM properties WHERE user_id = ? LIMIT 200',
+                                                   (user_id,))]
+    addresses = [row[0] for row in conn.execute('SELECT address FROM properties WHERE user_id = ? LIMIT 500',
+                                                (user_id,))]
+    conn.close()
+    return {'user_id': user_id, 'api_key': api_key, 'property_ids': property_ids or ['missing'],
+            'prefixes': [a[:random.Random(i).randint(4, 12)] for i, a in enumerate(addresses)] or ['123 main']}
+
+
+def start_server(db_path: str, port: int, cpu_workers: int, threads: bool) -> subprocess.Popen:
+    command = [sys.executable, '-m', 'wtf_api', 'serve', '--builtin', '--port', str(port), '--db', db_path,
+               '--cpu-workers', str(cpu_workers)] + (['--threads'] if threads else [])
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(300):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('API server did not start')
+
+
+def run(size: str, duration: float, concurrency: int, cpu_workers: int, threads: bool) -> Dict:
+    scratch = tempfile.mkdtemp(prefix='wtf_api_bench_')
+    db_path = os.path.join(scratch, f"{size}.db")
+    shutil.copyfile(prepare_database(size), db_path)
+    context = load_context(db_path)
+    port = _free_port()
+    server = start_server(db_path, port, cpu_workers, threads)
+    try:
+        result = asyncio.run(load('127.0.0.1', port, context, duration, concurrency))
+        result.update(size=size, cpu_workers=cpu_workers, cpu_pool='threads' if threads else 'processes')
+        return result
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON API load test')
+    parser.add_argument('--size', default='small')
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--cpu-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', action='store_true', help='Run analysis on threads instead of processes')
+    parser.add_argument('--url', help='Target a running instance instead of starting one')
+    parser.add_argument('--api-key', help='API key to authenticate with (required with --url)')
+    parser.add_argument('--db', help='Database of the running instance, for sample ids (with --url)')
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.api_key or not args.db:
+            parser.error('--url needs --api-key and --db')
+        target = urlparse(args.url)
+        result = asyncio.run(load(target.hostname, target.port or 80, load_context(args.db, args.api_key),
+                                  args.duration, args.concurrency))
+    else:
+        result = run(args.size, args.duration, args.concurrency, args.cpu_workers, args.threads)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
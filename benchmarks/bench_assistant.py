@@ -0,0 +1,97 @@
+"""
+Assistant latency benchmark: legacy MockAIAssistant/EnhancedAIAssistant paths vs AssistantEngine
+
+    python -m benchmarks.bench_assistant --prompts 20000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime
+
+from wtf_assistant import FULL_SCRIPT_TEMPLATE, RESPONSES, SCRIPT_TYPES, AssistantEngine, stream_text
+
+PROMPT_WORDS = ['how', 'do', 'i', 'write', 'a', 'cold', 'call', 'script', 'for', 'sellers', 'who', 'say',
+                'not', 'interested', 'objection', 'analyze', 'this', 'property', 'what', 'is', 'the',
+                '70%', 'rule', 'wholesale', 'fee', 'in', 'houston', 'please']
+
+
+def legacy_response(prompt: str, ai_type: str) -> str:
+    """The original MockAIAssistant.get_response keyword chain"""
+    prompt_lower = prompt.lower()
+    if ai_type == "scriptmaster":
+        if "cold call" in prompt_lower or "script" in prompt_lower:
+            return RESPONSES["scriptmaster"]["cold_calling"]
+        elif "objection" in prompt_lower or "not interested" in prompt_lower:
+            return RESPONSES["scriptmaster"]["objection"]
+        return RESPONSES["scriptmaster"]["default"]
+    elif ai_type == "underwriter":
+        if "analyze" in prompt_lower or "property" in prompt_lower:
+            return RESPONSES["underwriter"]["analysis"]
+        return RESPONSES["underwriter"]["default"]
+    if "70%" in prompt or "70 rule" in prompt_lower:
+        return RESPONSES["general"]["70_rule"]
+    return RESPONSES["general"]["default"]
+
+
+def legacy_script(script_type: str, scenario: str) -> str:
+    """The original per-call f-string build of the full 5x5 script"""
+    data = SCRIPT_TYPES[script_type]
+    return FULL_SCRIPT_TEMPLATE.format(title=data['title'], scenario=scenario, introduction=data['introduction'],
+                                       opening=data['opening'], script_id=str(uuid.uuid4())[:8],
+                                       created=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+
+def sample_prompts(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [(' '.join(rng.choice(PROMPT_WORDS) for _ in range(rng.randint(4, 30))),
+             rng.choice(['scriptmaster', 'underwriter', 'general'])) for _ in range(count)]
+
+
+def _time_each(fn, items) -> dict:
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        fn(*item)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        'p50_us': round(statistics.median(samples), 2),
+        'p99_us': round(samples[int(len(samples) * 0.99) - 1], 2),
+        'mean_us': round(statistics.fmean(samples), 2)
+    }
+
+
+def run(prompts: int, scripts: int) -> dict:
+    items = sample_prompts(prompts)
+    engine = AssistantEngine()
+
+    results = {
+        'prompts': prompts,
+        'mismatches_vs_legacy': sum(engine.get_response(p, t) != legacy_response(p, t) for p, t in items),
+        'legacy_chain': _time_each(legacy_response, items),
+        'engine_response': _time_each(engine.get_response, items),
+        'engine_first_chunk': _time_each(lambda p, t: next(engine.stream_response(p, t)), items),
+        'legacy_first_chunk': _time_each(lambda p, t: stream_text(legacy_response(p, t))[0], items)
+    }
+
+    script_items = [(t, 'Divorce - Cash Offer') for t in list(SCRIPT_TYPES) * (scripts // len(SCRIPT_TYPES))]
+    results['script_legacy_format'] = _time_each(legacy_script, script_items)
+    results['script_precomputed'] = _time_each(engine.generate_full_script, script_items)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Assistant latency benchmark')
+    parser.add_argument('--prompts', type=int, default=20000)
+    parser.add_argument('--scripts', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.prompts, args.scripts), indent=2))
+
+
+if __name__ == '__main__':
+    main()
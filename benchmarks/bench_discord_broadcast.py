@@ -0,0 +1,77 @@
+"""
+Deal-alert broadcast throughput against the fake Discord client
+
+    python -m benchmarks.bench_discord_broadcast --deals 20000 --channels 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from wtf_discord_broadcaster import DealAlertBroadcaster, FakeDiscordClient
+
+STATES = ['TX', 'FL', 'GA', 'AZ', 'NC', 'OH', 'TN', 'NV', 'CA', 'CO']
+GRADES = ['A+', 'A', 'A', 'B']
+
+
+def sample_deals(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    deals = []
+    for i in range(count):
+        price = rng.randint(80, 450) * 1000
+        deals.append({'id': f"deal-{i}", 'address': f"{rng.randint(100, 9999)} Oak St", 'city': 'Houston',
+                      'state': rng.choice(STATES), 'price': price, 'arv': round(price * 1.3),
+                      'max_offer': round(price * 0.8), 'grade': rng.choice(GRADES)})
+    return deals
+
+
+async def run(deals: int, channels: int, duplicate_rate: float, rate: float, latency: float) -> dict:
+    # Each state fans out to its share of the channels; the last channel takes every A+ deal
+    by_state = {state: [c for c in range(channels - 1) if c % len(STATES) == i] for i, state in enumerate(STATES)}
+    routes = lambda deal: by_state[deal['state']] + ([channels - 1] if deal['grade'] == 'A+' else [])
+
+    # The fake enforces the same per-second limit the broadcaster paces itself to
+    client = FakeDiscordClient(latency=latency, rate_limit=int(rate), per_seconds=1.0)
+    broadcaster = DealAlertBroadcaster(client, routes, flush_interval=0.05, channel_rate=rate, channel_burst=1)
+    await broadcaster.start()
+
+    events = sample_deals(deals)
+    rng = random.Random(7)
+    events += [rng.choice(events) for _ in range(int(deals * duplicate_rate))]
+
+    start = time.perf_counter()
+    for deal in events:
+        await broadcaster.publish(deal)
+    await broadcaster.stop(drain=True)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'events': len(events),
+        'channels': channels,
+        'seconds': round(elapsed, 3),
+        'events_per_sec': round(len(events) / elapsed),
+        'deliveries_per_sec': round(broadcaster.stats['deals_sent'] / elapsed),
+        'messages': len(client.messages),
+        'deals_per_message': round(broadcaster.stats['deals_sent'] / max(1, len(client.messages)), 1),
+        'rate_limited_responses': client.rate_limited,
+        'broadcaster': broadcaster.stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Deal-alert broadcast throughput benchmark')
+    parser.add_argument('--deals', type=int, default=20000)
+    parser.add_argument('--channels', type=int, default=200)
+    parser.add_argument('--duplicate-rate', type=float, default=0.2)
+    parser.add_argument('--rate', type=float, default=50, help='Messages/sec per channel')
+    parser.add_argument('--latency', type=float, default=0.002, help='Fake send latency (s)')
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.deals, args.channels, args.duplicate_rate, args.rate, args.latency)),
+                     indent=2))
+
+
+if __name__ == '__main__':
+    main()
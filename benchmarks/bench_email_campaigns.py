@@ -0,0 +1,130 @@
+"""
+Email campaign send benchmark against the local stub SMTP server
+
+    python -m benchmarks.bench_email_campaigns --recipients 100000 --workers 8
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from wtf_email_engine import (CompiledTemplate, EmailCampaignEngine, EngagementTracker, SMTPSenderPool,
+                              StubSMTPServer)
+from wtf_platform_services import PlatformDatabase
+from wtf_schema import create_schema
+
+SUBJECT = "New investment opportunity near {property_address}"
+CONTENT = """Hi {first_name},
+
+I wanted to reach out about your property at {property_address}. Homes like yours
+are selling for around {estimated_value} right now and we have cash buyers ready.
+
+Would you be open to a no-obligation offer?
+
+Best regards,
+{sender_name}
+{tracking_url}"""
+
+
+def sample_recipients(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return [{
+        'email': f"owner{i}@example.com",
+        'first_name': rng.choice(['James', 'Maria', 'Robert', 'Linda', 'Carlos', 'Angela']),
+        'last_name': rng.choice(['Smith', 'Garcia', 'Johnson', 'Lee', 'Chen']),
+        'property_address': f"{rng.randint(100, 9999)} Oak St, Houston, TX",
+        'estimated_value': f"${rng.randint(150, 600) * 1000:,}"
+    } for i in range(count)]
+
+
+def run(recipients: int, workers: int, batch_size: int, rate: float = None) -> dict:
+    scratch = tempfile.mkdtemp(prefix='wtf_email_bench_')
+    db_path = os.path.join(scratch, 'email.db')
+    conn = sqlite3.connect(db_path)
+    create_schema(conn.cursor())
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.commit()
+    conn.close()
+
+    server = StubSMTPServer()
+    host, port = server.start()
+    try:
+        db = PlatformDatabase(db_path)
+        engine = EmailCampaignEngine(db, batch_size=batch_size, tracking_base_url='https://track.example.com')
+        audience = sample_recipients(recipients)
+
+        # Bulk template rendering on its own
+        template = CompiledTemplate(CONTENT)
+        start = time.perf_counter()
+        template.render_many(audience)
+        render_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        campaign_id = engine.create_campaign('bench-user', 'Benchmark', SUBJECT, CONTENT, audience)
+        enqueue_seconds = time.perf_counter() - start
+
+        pool = SMTPSenderPool(host, port, workers=workers, rate_per_second=rate)
+        result = engine.send_campaign(campaign_id, pool, sender_name='WTF Benchmarks')
+        pool.close()
+
+        # Simulated engagement: 25% open (some twice), 5% click
+        tracker = EngagementTracker(db, flush_every=5000, flush_interval=60)
+        tokens = [row[0] for row in sqlite3.connect(db_path).execute(
+            'SELECT tracking_token FROM email_recipients WHERE campaign_id = ?', (campaign_id,))]
+        rng = random.Random(7)
+        events = 0
+        start = time.perf_counter()
+        for token in tokens:
+            roll = rng.random()
+            if roll < 0.25:
+                tracker.record_open(token)
+                events += 1
+                if roll < 0.08:
+                    tracker.record_open(token)
+                    events += 1
+                if roll < 0.05:
+                    tracker.record_click(token)
+                    events += 1
+        tracker.flush()
+        ingest_seconds = time.perf_counter() - start
+
+        counts = sqlite3.connect(db_path).execute(
+            'SELECT sent_count, open_count, click_count FROM email_campaigns WHERE id = ?', (campaign_id,)).fetchone()
+
+        return {
+            'recipients': recipients,
+            'workers': workers,
+            'batch_size': batch_size,
+            'render_messages_per_sec': round(recipients / render_seconds),
+            'enqueue_rows_per_sec': round(recipients / enqueue_seconds),
+            'send': result,
+            'smtp_connections': pool.stats['connections'],
+            'stub_messages_received': server.message_count,
+            'engagement_events': events,
+            'engagement_events_per_sec': round(events / ingest_seconds),
+            'engagement_flushes': tracker.stats['flushes'],
+            'campaign_counts': {'sent': counts[0], 'unique_opens': counts[1], 'unique_clicks': counts[2]}
+        }
+    finally:
+        server.stop()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Email campaign send benchmark')
+    parser.add_argument('--recipients', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--rate', type=float, default=None, help='Messages/sec cap (token bucket)')
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.recipients, args.workers, args.batch_size, args.rate), indent=2))
+
+
+if __name__ == '__main__':
+    main()
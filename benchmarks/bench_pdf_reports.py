@@ -0,0 +1,116 @@
+"""
+PDF report throughput benchmark (reports/minute)
+
+    python -m benchmarks.bench_pdf_reports --reports 200 --workers 4
+"""
+
+import argparse
+import random
+import time
+import json
+
+from wtf_pdf_reports import ReportService, render_analysis_report
+
+
+def sample_analysis(seed: int) -> tuple:
+    """Build a realistic analysis payload shaped like generate_ultimate_analysis output"""
+    rng = random.Random(seed)
+    list_price = rng.randint(150000, 650000)
+    arv = list_price * rng.uniform(1.0, 1.3)
+    rehab = rng.randint(15000, 90000)
+    max_offers = {f"{pct}_percent": max(0, arv * pct / 100 - rehab) for pct in (65, 70, 75, 80, 85)}
+
+    property_data = {
+        'address': f"{rng.randint(100, 9999)} {rng.choice(['Elm', 'Oak', 'Pine', 'Maple'])} Street",
+        'city': rng.choice(['Dallas', 'Houston', 'Austin', 'Atlanta', 'Phoenix']),
+        'state': rng.choice(['TX', 'GA', 'AZ']),
+        'zip_code': f"{rng.randint(10000, 99999)}",
+        'property_type': 'single_family',
+        'bedrooms': rng.randint(2, 5),
+        'bathrooms': rng.choice([1.0, 1.5, 2.0, 2.5, 3.0]),
+        'square_feet': rng.randint(900, 3500),
+        'year_built': rng.randint(1940, 2020),
+        'list_price': list_price,
+        'data_sources': ['Zillow', 'PropStream', 'Privy', 'Rentometer']
+    }
+    metrics = {
+        'arv': arv,
+        'rehab_cost': rehab,
+        'max_offers': max_offers,
+        'profit_potential': arv - max_offers['70_percent'] - rehab,
+        'overall_grade': rng.choice('ABCD'),
+        'grade_score': rng.randint(40, 98),
+        'confidence_level': rng.randint(60, 95),
+        'recommended_strategy': 'Multiple strategies viable'
+    }
+    strategies = {
+        'wholesale': {'best_scenario': {'assignment_fee': 15000, 'net_profit': 11700, 'roi': 354.5}},
+        'fix_flip': {'best_scenario': {'gross_profit': rng.randint(10000, 90000), 'roi': rng.uniform(5, 40),
+                                       'timeline': '6 months'}},
+        'buy_hold': {'best_scenario': {'monthly_cash_flow': rng.randint(-200, 900),
+                                       'cash_on_cash': rng.uniform(-5, 20), 'cap_rate': rng.uniform(3, 10)}}
+    }
+    market_data = {
+        'median_home_price': rng.randint(250000, 550000),
+        'days_on_market': rng.randint(12, 75),
+        'price_growth_yoy': rng.uniform(-3, 15),
+        'market_temperature': rng.choice(['Hot', 'Warm', 'Balanced', 'Cool'])
+    }
+    ai_insights = [
+        {'type': 'opportunity', 'title': 'Extended Market Time', 'confidence': 85,
+         'description': 'Property has been on market for an extended period, indicating seller motivation. ' * 2,
+         'action': 'Submit aggressive offer with quick closing timeline'},
+        {'type': 'financial', 'title': 'High Profit Potential', 'confidence': 92,
+         'description': 'Deal shows exceptional profit potential. Consider multiple exit strategies.',
+         'action': 'Secure contract quickly and evaluate all strategies'}
+    ]
+    return property_data, metrics, strategies, market_data, ai_insights
+
+
+def run(reports: int, workers: int, use_processes: bool) -> dict:
+    payloads = [sample_analysis(seed) for seed in range(reports)]
+
+    # Single-threaded baseline
+    start = time.perf_counter()
+    sizes = [len(render_analysis_report(*payload)) for payload in payloads]
+    serial_seconds = time.perf_counter() - start
+
+    # Worker pool, cold cache
+    service = ReportService(max_workers=workers, cache_size=reports, use_processes=use_processes)
+    start = time.perf_counter()
+    futures = [service.submit(*payload) for payload in payloads]
+    for future in futures:
+        future.result()
+    pool_seconds = time.perf_counter() - start
+
+    # Warm cache: every report is an unchanged re-download
+    start = time.perf_counter()
+    for payload in payloads:
+        service.submit(*payload).result()
+    cached_seconds = time.perf_counter() - start
+    service.shutdown()
+
+    return {
+        'reports': reports,
+        'workers': workers,
+        'executor': 'process' if use_processes else 'thread',
+        'avg_pdf_kb': round(sum(sizes) / len(sizes) / 1024, 1),
+        'serial_reports_per_minute': round(reports / serial_seconds * 60),
+        'pool_reports_per_minute': round(reports / pool_seconds * 60),
+        'cached_reports_per_minute': round(reports / max(cached_seconds, 1e-9) * 60),
+        'cache_stats': service.stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF report throughput benchmark')
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--processes', action='store_true', help='Use a process pool instead of threads')
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.reports, args.workers, args.processes), indent=2))
+
+
+if __name__ == '__main__':
+    main()
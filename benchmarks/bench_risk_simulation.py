@@ -0,0 +1,81 @@
+"""
+Monte Carlo risk simulation benchmark (single-deal latency and pipeline throughput)
+
+    python -m benchmarks.bench_risk_simulation --deals 200 --samples 20000 --workers 4
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+from wtf_risk_simulation import simulate_deal, simulate_pipeline
+
+
+def sample_pipeline(count: int, seed: int = 42) -> list:
+    """Flip deals shaped like generate_risk_analysis input"""
+    rng = random.Random(seed)
+    deals = []
+    for _ in range(count):
+        arv = rng.randint(180000, 700000)
+        rehab = rng.randint(15000, 90000)
+        deals.append({
+            'purchase_price': max(0, arv * 0.70 - rehab),
+            'arv': arv,
+            'rehab_cost': rehab,
+            'holding_months': rng.choice([4, 6, 9]),
+            'interest_rate': rng.uniform(8, 12),
+            'monthly_rent': arv * rng.uniform(0.006, 0.009),
+            'year_built': rng.randint(1930, 2015),
+            'market_data': {'inventory_months': rng.uniform(1.2, 7.0),
+                            'price_growth_yoy': rng.uniform(-3, 15),
+                            'market_temperature': rng.choice(['Hot', 'Warm', 'Balanced', 'Cool', 'Cold'])}
+        })
+    return deals
+
+
+def run(deals: int, samples: int, workers: int) -> dict:
+    pipeline = sample_pipeline(deals)
+
+    # Single-deal latency at both ends of the supported range
+    latency = {}
+    for n in (10000, 100000):
+        simulate_deal(pipeline[0], n, seed=0)
+        start = time.perf_counter()
+        for i in range(10):
+            simulate_deal(pipeline[i % len(pipeline)], n, seed=i)
+        latency[f"{n}_samples_ms"] = round((time.perf_counter() - start) / 10 * 1000, 2)
+
+    start = time.perf_counter()
+    serial = simulate_pipeline(pipeline, samples, workers=1, seed=7)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pooled = simulate_pipeline(pipeline, samples, workers=workers, seed=7)
+    pool_seconds = time.perf_counter() - start
+
+    return {
+        'deals': deals,
+        'samples_per_deal': samples,
+        'workers': workers,
+        'single_deal': latency,
+        'serial_deals_per_sec': round(deals / serial_seconds, 1),
+        'pool_deals_per_sec': round(deals / pool_seconds, 1),
+        'reproducible': serial == pooled,
+        'mean_probability_of_loss': round(sum(r['probability_of_loss'] for r in pooled) / len(pooled), 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo risk simulation benchmark')
+    parser.add_argument('--deals', type=int, default=200)
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.deals, args.samples, args.workers), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Cold-start benchmark for the ultimate app bootstrap
+
+Compares the old start path (eager pandas/plotly imports, create_schema and the
+seed checks on every start) with the current one (lazy imports, schema version
+check only), both as in-process database bootstrap timings and as end-to-end
+fresh-interpreter wall time:
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from wtf_demo_data import seed_demo_data
+from wtf_schema import create_schema, ensure_schema
+from wtf_startup import entry_point_imports, profile_imports
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = os.path.join(ROOT, 'wtf_ultimate_complete.py')
+
+# Imports the entry point dropped or deferred
+DEFERRED = ['pandas', 'plotly.express', 'plotly.graph_objects', 'requests']
+
+LEGACY_BOOT = '''
+conn = sqlite3.connect({db!r})
+create_schema(conn.cursor())
+conn.commit()
+conn.close()
+seed_demo_data({db!r})
+'''
+
+CURRENT_BOOT = '''
+ensure_schema({db!r})
+conn = sqlite3.connect({db!r})
+conn.execute("SELECT NOT EXISTS (SELECT 1 FROM users)").fetchone()
+conn.close()
+'''
+
+
+def _median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def _process_ms(imports: list, boot: str, runs: int) -> float:
+    """Median wall time of a fresh interpreter doing the imports and the database bootstrap"""
+    lines = ['import sqlite3', 'from wtf_schema import create_schema, ensure_schema',
+             'from wtf_demo_data import seed_demo_data']
+    lines += [f"try:\n    import {m}\nexcept ImportError:\n    pass" for m in imports]
+    code = '\n'.join(lines) + boot
+
+    def launch():
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True)
+    launch()
+    return _median_ms(launch, runs)
+
+
+def run(runs: int) -> dict:
+    scratch = tempfile.mkdtemp(prefix='wtf_startup_bench_')
+    db_path = os.path.join(scratch, 'startup.db')
+    try:
+        current_imports = [m for m in entry_point_imports(ENTRY_POINT) if m not in ('streamlit',)]
+        legacy_imports = current_imports + [m for m in DEFERRED if m not in current_imports]
+
+        # First boot against an empty database
+        start = time.perf_counter()
+        ensure_schema(db_path)
+        first_boot_ms = (time.perf_counter() - start) * 1000
+        seed_demo_data(db_path)
+
+        def legacy_restart():
+            conn = sqlite3.connect(db_path)
+            create_schema(conn.cursor())
+            conn.commit()
+            conn.close()
+            seed_demo_data(db_path)
+
+        def current_restart():
+            ensure_schema(db_path)
+            conn = sqlite3.connect(db_path)
+            conn.execute("SELECT NOT EXISTS (SELECT 1 FROM users)").fetchone()
+            conn.close()
+
+        legacy_profile = profile_imports(legacy_imports, top=10)
+        current_profile = profile_imports(current_imports, top=10)
+
+        return {
+            'runs': runs,
+            'db_bootstrap_ms': {
+                'first_boot_schema': round(first_boot_ms, 2),
+                'legacy_restart': _median_ms(legacy_restart, runs),
+                'current_restart': _median_ms(current_restart, runs)
+            },
+            'import_ms': {
+                'legacy': legacy_profile['total_ms'],
+                'current': current_profile['total_ms'],
+                'current_top': [(r['module'], r['cumulative_ms']) for r in current_profile['top_level']],
+                'not_installed_here': legacy_profile['not_installed']
+            },
+            'process_wall_ms': {
+                'legacy': _process_ms(legacy_imports, LEGACY_BOOT.format(db=db_path), runs),
+                'current': _process_ms(current_imports, CURRENT_BOOT.format(db=db_path), runs)
+            }
+        }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start benchmark')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.runs), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,429 @@
+"""
+End-to-end benchmark suite for the analysis and data-access hot paths
+
+Runs headless against seeded databases (see wtf_seed_data) and writes latency
+percentiles and throughput per case to JSON. Compare against a stored baseline
+to flag regressions:
+
+    python -m benchmarks.run_benchmarks --sizes small,medium
+    python -m benchmarks.run_benchmarks --sizes small --save-baseline
+    python -m benchmarks.run_benchmarks --sizes small --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from wtf_analysis import generate_ultimate_analysis, RealEstateCalculatorEngine, calculate_lead_score
+from wtf_analysis_dag import run_analysis_dag
+from wtf_analysis_store import AnalysisStore
+from wtf_autocomplete import DatabaseAddressIndex
+from wtf_figures import lttb_indices
+from wtf_followups import FollowUpScheduler
+from wtf_market_data import MarketDataStore
+from wtf_projections import project_rental
+from wtf_platform_services import (PlatformDatabase, BuyerMatcher, UsageTrackingManager,
+                                   NotificationManager, DashboardDataService, PipelineDataService,
+                                   PropertySearchService, BuyerStateCountsService)
+from wtf_schema import ensure_schema
+from wtf_search_index import DatabaseSearchIndex
+from wtf_seed_data import SIZE_PRESETS, seed_database
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+SEED = 42
+AS_OF = datetime(2024, 6, 1, 12, 0, 0)
+
+# Analyzer defaults from render_ultimate_deal_analyzer
+DEFAULT_PARAMS = {
+    'target_roi': 15.0,
+    'max_rehab_budget': 50000,
+    'target_cash_flow': 300,
+    'down_payment_pct': 20,
+    'interest_rate': 6.5,
+    'holding_period': 6,
+    'closing_costs_pct': 3.0,
+    'assignment_fee': 15000,
+    'profit_margin_min': 10000,
+    'vacancy_rate': 5.0,
+    'maintenance_rate': 5.0,
+    'management_fee': 8.0,
+    'insurance_rate': 0.8,
+    'capex_rate': 5.0,
+    'appreciation_rate': 3.0
+}
+
+# Metrics compared against the baseline; all are "lower is better"
+REGRESSION_METRICS = ('p50_ms', 'p90_ms')
+
+
+def measure(fn: Callable, iterations: int, warmup: int = 5) -> Dict:
+    """Time fn() iterations times; returns latency percentiles in ms and ops/sec"""
+    for i in range(warmup):
+        fn(i)
+
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples[i] = time.perf_counter() - start
+
+    total = float(samples.sum())
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99]) * 1000
+    return {
+        'iterations': iterations,
+        'mean_ms': round(float(samples.mean()) * 1000, 4),
+        'p50_ms': round(float(p50), 4),
+        'p90_ms': round(float(p90), 4),
+        'p99_ms': round(float(p99), 4),
+        'max_ms': round(float(samples.max()) * 1000, 4),
+        'ops_per_sec': round(iterations / total, 1) if total > 0 else None
+    }
+
+
+def prepare_database(size: str, data_dir: str = DATA_DIR) -> str:
+    """Seed (once) and return the path of the benchmark database for a size preset"""
+    os.makedirs(data_dir, exist_ok=True)
+    db_path = os.path.join(data_dir, f"{size}.db")
+    if not os.path.exists(db_path):
+        print(f"Seeding {size} database at {db_path}...", file=sys.stderr)
+        seed_database(db_path, SIZE_PRESETS[size], seed=SEED, as_of=AS_OF, reset=True, verbose=False)
+    return db_path
+
+
+# Fixtures
+def analysis_inputs(rng: random.Random, count: int) -> List[tuple]:
+    """Positional arguments for generate_ultimate_analysis"""
+    inputs = []
+    for _ in range(count):
+        square_feet = rng.randint(900, 3500)
+        list_price = rng.randint(120000, 650000)
+        inputs.append((
+            f"{rng.randint(100, 9999)} Main St", rng.choice(['Dallas', 'Houston', 'Austin']), 'TX',
+            f"75{rng.randint(100, 999)}", 'Single Family', rng.randint(2, 5), rng.choice([1.0, 2.0, 2.5]),
+            square_feet, rng.randint(1940, 2020), list_price,
+            rng.choice(['Excellent', 'Good', 'Fair', 'Poor', 'Needs Major Repairs']), rng.randint(1, 180),
+            rng.choice([0, 0, 150]), round(list_price * 0.02), DEFAULT_PARAMS
+        ))
+    return inputs
+
+
+def deal_grade_inputs(rng: random.Random, count: int) -> List[Dict]:
+    """Property payloads shaped like the data service output consumed by calculate_deal_grade"""
+    return [{
+        'investment_analysis': {'wholesale': {'profit_margin': rng.uniform(0, 40)}},
+        'rental_analysis': {'monthly_rent': rng.randint(900, 3500)},
+        'neighborhood_data': {'school_rating': rng.randint(3, 10), 'crime_score': rng.randint(30, 95),
+                              'growth_rate': rng.uniform(0, 0.08)},
+        'market_analysis': {'market_trend': rng.choice(['hot', 'warm', 'cool']),
+                            'inventory_level': rng.choice(['low', 'medium', 'high'])},
+        'days_on_market': rng.randint(1, 180),
+        'condition_score': rng.randint(30, 100)
+    } for _ in range(count)]
+
+
+def lead_inputs(rng: random.Random, count: int) -> List[Dict]:
+    """Lead form payloads for calculate_lead_score"""
+    motivations = ['Divorce', 'Financial Hardship', 'Behind on Payments', 'Health Issues',
+                   'Job Relocation', 'Inherited Property', 'Tired Landlord', 'Downsizing']
+    return [{
+        'motivation': rng.sample(motivations, rng.randint(0, 3)),
+        'timeline': rng.choice(['ASAP', '1-30 days', '30-60 days', '60-90 days', '90+ days', 'Flexible']),
+        'equity': rng.randint(0, 200000),
+        'condition': rng.choice(['Excellent', 'Good', 'Fair', 'Poor', 'Needs Major Repairs']),
+        'occupancy': rng.choice(['Vacant', 'Owner Occupied', 'Tenant Occupied'])
+    } for _ in range(count)]
+
+
+def sample_rows(db_path: str, query: str, limit: int) -> List[tuple]:
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(query, (limit,)).fetchall()
+    conn.close()
+    return rows
+
+
+# Suites
+def run_compute_cases(iterations: int) -> Dict:
+    """Pure-CPU cases; independent of database size"""
+    rng = random.Random(SEED)
+    np.random.seed(SEED)
+    results = {}
+
+    inputs = analysis_inputs(rng, 64)
+    results['generate_ultimate_analysis'] = measure(
+        lambda i: generate_ultimate_analysis(*inputs[i % len(inputs)]), iterations)
+    results['run_analysis_dag'] = measure(lambda i: run_analysis_dag(*inputs[i % len(inputs)]), iterations)
+    # With the Monte Carlo risk simulation on, the DAG overlaps it with the strategy stages
+    simulated = [(*args[:-1], {**args[-1], 'risk_simulation': True}) for args in inputs]
+    results['generate_ultimate_analysis.simulated'] = measure(
+        lambda i: generate_ultimate_analysis(*simulated[i % len(simulated)]), max(10, iterations // 4))
+    results['run_analysis_dag.simulated'] = measure(
+        lambda i: run_analysis_dag(*simulated[i % len(simulated)]), max(10, iterations // 4))
+
+    grades = deal_grade_inputs(rng, 256)
+    results['calculate_deal_grade'] = measure(
+        lambda i: RealEstateCalculatorEngine.calculate_deal_grade(grades[i % len(grades)]), iterations * 10)
+
+    leads = lead_inputs(rng, 256)
+    results['calculate_lead_score'] = measure(
+        lambda i: calculate_lead_score(leads[i % len(leads)]), iterations * 10)
+
+    # One call projects 1,000 ten-year amortized rental paths and solves their IRRs
+    prices = np.random.uniform(120000, 650000, 1000)
+    rates = np.random.uniform(0.04, 0.09, 1000)
+    results['project_rental_x1000'] = measure(
+        lambda i: project_rental(prices, prices * 0.23, prices * 0.8, rates, prices * 0.007,
+                                 monthly_taxes=prices * 0.02 / 12, operating_rate=0.23),
+        max(10, iterations // 10), warmup=2)
+
+    # A 100k-point series reduced to the figure factory's 2,000-point cap
+    series_x = np.arange(100000, dtype=float)
+    series_y = np.cumsum(np.random.normal(0, 1, 100000))
+    results['lttb_100k_to_2k'] = measure(
+        lambda i: lttb_indices(series_x, series_y, 2000), max(10, iterations // 10), warmup=2)
+
+    return results
+
+
+def run_database_cases(size: str, iterations: int) -> Dict:
+    """Data-access cases against a seeded database of the given size"""
+    source_path = prepare_database(size)
+
+    # Writes go to a scratch copy so the cached database stays pristine
+    scratch_dir = tempfile.mkdtemp(prefix='wtf_bench_')
+    db_path = os.path.join(scratch_dir, f"{size}.db")
+    shutil.copyfile(source_path, db_path)
+    # Databases cached by an older checkout pick up new tables and indexes here
+    ensure_schema(db_path)
+
+    try:
+        db = PlatformDatabase(db_path)
+        users = [row[0] for row in sample_rows(db_path, 'SELECT id FROM users ORDER BY id LIMIT ?', 50)]
+        properties = [
+            {'list_price': row[0], 'property_type': row[1], 'state': row[2], 'city': row[3], 'zip_code': row[4],
+             'address': row[5]}
+            for row in sample_rows(db_path, '''
+                SELECT list_price, property_type, state, city, zip_code, address FROM properties ORDER BY id LIMIT ?
+            ''', 50)
+        ]
+        user = lambda i: users[i % len(users)]
+        results = {}
+
+        matcher = BuyerMatcher(db)
+        results['buyer_matcher.find_matches'] = measure(
+            lambda i: matcher.find_matches(properties[i % len(properties)]), iterations)
+
+        usage = UsageTrackingManager(db)
+        results['usage.check_usage_limit'] = measure(
+            lambda i: usage.check_usage_limit(user(i), 'deal_analysis'), iterations)
+        results['usage.track_usage'] = measure(
+            lambda i: usage.track_usage(user(i), 'deal_analysis', details='benchmark'), iterations)
+
+        notifications = NotificationManager(db)
+        results['notifications.get_user_notifications'] = measure(
+            lambda i: notifications.get_user_notifications(user(i)), iterations)
+
+        dashboard = DashboardDataService(db)
+        results['dashboard.get_dashboard_stats'] = measure(
+            lambda i: dashboard.get_dashboard_stats(user(i)), iterations)
+        # Overdue counts and call lists from the follow-up queue instead of the lead scan
+        followups = FollowUpScheduler(db, notifications, refresh_interval=3600)
+        followups.tick(force=True)
+        queued_dashboard = DashboardDataService(db, followups=followups)
+        results['dashboard.get_dashboard_stats_queued'] = measure(
+            lambda i: queued_dashboard.get_dashboard_stats(user(i)), iterations)
+        results['followups.overdue_count'] = measure(lambda i: followups.overdue_count(user(i)), iterations)
+        results['followups.call_next'] = measure(lambda i: followups.call_next(user(i), 10), iterations)
+        results['dashboard.recent_activity'] = measure(
+            lambda i: (dashboard.get_recent_deals(user(i)), dashboard.get_recent_leads(user(i))), iterations)
+
+        pipeline = PipelineDataService(db)
+        results['pipeline.get_board'] = measure(lambda i: pipeline.get_board(user(i)), iterations)
+        versions = {u: {stage: column['version'] for stage, column in pipeline.get_board(u)['columns'].items()}
+                    for u in users}
+        results['pipeline.get_board_unchanged'] = measure(
+            lambda i: pipeline.get_board(user(i), versions[user(i)]), iterations)
+
+        # ttl 0 measures the uncached zip -> city -> state resolution
+        market = MarketDataStore(db_path, ttl_seconds=0)
+        results['market_store.get_market_data'] = measure(
+            lambda i: market.get_market_data(properties[i % len(properties)]['zip_code'],
+                                             properties[i % len(properties)]['city'],
+                                             properties[i % len(properties)]['state']), iterations)
+
+        search = DatabaseSearchIndex(db_path, refresh_interval=3600)
+        search.refresh(force=True)
+        queries = [f"{p['city']} {p['state']} {p['property_type'].replace('_', ' ')} needs rehab" for p in properties]
+        results['search_index.search'] = measure(
+            lambda i: search.search(queries[i % len(queries)], k=5, owner=user(i)), iterations)
+
+        property_search = PropertySearchService(db, page_size=20)
+        results['property_search.text'] = measure(
+            lambda i: property_search.search(user(i), properties[i % len(properties)]['city']), iterations)
+
+        # Last page of the busiest user's properties: OFFSET re-walks every earlier row, the cursor does not
+        owner, owned = sample_rows(db_path, '''
+            SELECT user_id, COUNT(*) FROM properties GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT ?
+        ''', 1)[0]
+        deep_offset = max(0, owned - 20)
+        conn = sqlite3.connect(db_path)
+        last_before = conn.execute('''
+            SELECT created_at, id FROM properties WHERE user_id = ?
+            ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?
+        ''', (owner, max(0, deep_offset - 1))).fetchone()
+        conn.close()
+        results['properties.offset_deep_page'] = measure(
+            lambda i: sample_rows(db_path, f'''
+                SELECT id FROM properties WHERE user_id = '{owner}'
+                ORDER BY created_at DESC, id DESC LIMIT 20 OFFSET ?
+            ''', deep_offset), iterations)
+        results['property_search.keyset_deep_page'] = measure(
+            lambda i: property_search.search(owner, cursor_key=list(last_before)), iterations)
+
+        addresses = DatabaseAddressIndex(db_path, refresh_interval=3600)
+        addresses.refresh(force=True)
+        # Each prefix is typed by the owner of the address, whose own index answers it
+        typed = [(owner_id, address[:4 + i % 10]) for i, (owner_id, address) in enumerate(sample_rows(
+            db_path, 'SELECT user_id, address FROM properties ORDER BY id LIMIT ?', 50))]
+        results['autocomplete.suggest'] = measure(
+            lambda i: addresses.suggest(typed[i % len(typed)][1], typed[i % len(typed)][0], limit=8), iterations)
+
+        # Buy Boxes map: trigger-maintained counts (check_interval=0 re-reads every call) vs a full scan
+        buyer_counts = BuyerStateCountsService(db, check_interval=0)
+        results['buyer_counts.snapshot'] = measure(lambda i: buyer_counts.snapshot(), iterations)
+        results['buyers.scan_by_state'] = measure(
+            lambda i: sample_rows(db_path, 'SELECT target_states, deal_types FROM buyers LIMIT ?', -1), iterations)
+
+        # Re-saving an unchanged analysis is a hash compare; a changed one rewrites the row and its blob
+        store = AnalysisStore(db)
+        analyses = [generate_ultimate_analysis(*args) for args in analysis_inputs(random.Random(SEED), 20)]
+        saved_ids = [store.save(user(0), analysis['property_data'], analysis['metrics'], analysis)['property_id']
+                     for analysis in analyses]
+        saved = lambda i: analyses[i % len(analyses)]
+        results['analysis_store.save_unchanged'] = measure(
+            lambda i: store.save(user(0), saved(i)['property_data'], saved(i)['metrics'], saved(i)), iterations)
+        results['analysis_store.save_changed'] = measure(
+            lambda i: store.save(user(0), saved(i)['property_data'], {**saved(i)['metrics'], 'grade_score': i},
+                                 saved(i)), iterations)
+        # List views read the promoted columns; only opening an analysis decodes its payload
+        results['property_search.by_grade'] = measure(
+            lambda i: property_search.search(user(0), filters={'grade': 'A'}, sort='grade_desc'), iterations)
+        results['analysis_store.open'] = measure(
+            lambda i: dict(store.open(saved_ids[i % len(saved_ids)])), iterations)
+
+        return results
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def run(sizes: List[str], iterations: int) -> Dict:
+    results = {'compute': run_compute_cases(iterations)}
+    for size in sizes:
+        results[size] = run_database_cases(size, iterations)
+
+    return {
+        'meta': {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sqlite': sqlite3.sqlite_version,
+            'iterations': iterations,
+            'sizes': sizes,
+            'seed': SEED
+        },
+        'results': results
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """List cases whose latency grew by more than threshold (fraction) over the baseline"""
+    regressions = []
+    for group, cases in report['results'].items():
+        for case, stats in cases.items():
+            reference = baseline.get('results', {}).get(group, {}).get(case)
+            if not reference:
+                continue
+            for metric in REGRESSION_METRICS:
+                before, after = reference.get(metric), stats.get(metric)
+                if before and after and after > before * (1 + threshold):
+                    regressions.append({
+                        'case': f"{group}/{case}",
+                        'metric': metric,
+                        'baseline': before,
+                        'current': after,
+                        'change_pct': round((after / before - 1) * 100, 1)
+                    })
+    return regressions
+
+
+def print_summary(report: Dict, regressions: List[Dict]):
+    print(f"{'case':<52}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'ops/sec':>12}")
+    for group, cases in report['results'].items():
+        for case, stats in cases.items():
+            print(f"{group + '/' + case:<52}{stats['p50_ms']:>10.3f}{stats['p90_ms']:>10.3f}"
+                  f"{stats['p99_ms']:>10.3f}{stats['ops_per_sec'] or 0:>12,.0f}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for r in regressions:
+            print(f"  {r['case']} {r['metric']}: {r['baseline']} -> {r['current']} ms (+{r['change_pct']}%)")
+
+
+def write_json(path: str, payload: Dict):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WTF hot-path benchmark suite')
+    parser.add_argument('--sizes', default='small', help=f"Comma separated presets: {', '.join(SIZE_PRESETS)}")
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed latency growth (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 when a regression is found')
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in SIZE_PRESETS]
+    if unknown:
+        parser.error(f"Unknown size preset(s): {', '.join(unknown)}")
+
+    report = run(sizes, args.iterations)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+    report['regressions'] = regressions
+
+    write_json(args.output, report)
+    if args.save_baseline:
+        write_json(args.baseline, report)
+
+    print_summary(report, regressions)
+    print(f"\nResults written to {args.output}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
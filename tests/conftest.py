@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wtf_schema import ensure_schema  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh platform database with the full schema"""
+    path = str(tmp_path / 'platform.db')
+    ensure_schema(path)
+    return path
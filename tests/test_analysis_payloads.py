@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from wtf_analysis import generate_ultimate_analysis
+from wtf_analysis_store import (GRID_KEY, decode_analysis, encode_blob, pack_grids, promoted_columns,
+                                unpack_grids)
+
+SCENARIOS = {
+    'fee_5000': {'fee': 5000, 'profit': 1234.5678, 'label': 'low', 'roi': 42.1},
+    'fee_8000': {'profit': 4321.25, 'fee': 8000, 'label': 'mid', 'roi': 180.0},
+    'fee_9000': {'fee': 9000, 'profit': -10.5, 'label': 'high', 'roi': np.float64(-0.25)}
+}
+
+
+def test_scenario_tables_pack_into_float32_grids_and_back():
+    packed = pack_grids({'wholesale': {'scenarios': SCENARIOS, 'grade': 'A'}})
+    grid = packed['wholesale']['scenarios'][GRID_KEY]
+    assert grid['fields'] == ['fee', 'profit', 'roi'] and grid['ints'] == [0]
+    assert len(grid['values']) == 3 * len(SCENARIOS) * 4
+
+    table = unpack_grids(packed)['wholesale']['scenarios']
+    assert list(table) == list(SCENARIOS)
+    for key, row in SCENARIOS.items():
+        # Per-row field order and the non-numeric fields survive; numbers come back at float32 precision
+        assert list(table[key]) == list(row)
+        assert table[key]['label'] == row['label']
+        assert table[key]['fee'] == row['fee'] and isinstance(table[key]['fee'], int)
+        assert table[key]['profit'] == pytest.approx(row['profit'], rel=1e-6)
+        assert table[key]['roi'] == pytest.approx(float(row['roi']), rel=1e-6)
+
+
+def test_tables_that_cannot_be_gridded_are_left_alone():
+    mixed = {'a': {'x': 1, 'y': 'n/a'}, 'b': {'x': 2 ** 30, 'y': 'n/a'}}
+    assert pack_grids(mixed) == mixed
+    assert pack_grids({'only': {'x': 1.5}}) == {'only': {'x': 1.5}}
+    assert unpack_grids(pack_grids([SCENARIOS, 'text']))[1] == 'text'
+
+
+def test_stored_blobs_decode_to_the_analysis():
+    analysis = generate_ultimate_analysis('7 Pine Ave', 'Dallas', 'TX', '75201', 'Single Family', 4, 2.5,
+                                          2100, 1999, 310000, 'good', 12, 50, 6200,
+                                          {'target_roi': 15.0, 'holding_period': 6, 'assignment_fee': 15000,
+                                           'down_payment_pct': 20, 'interest_rate': 7.0})
+    digest, codec, raw_size, data = encode_blob(analysis)
+    assert encode_blob(analysis)[0] == digest and raw_size > 0
+    decoded = decode_analysis(codec=codec, data=data)
+    assert set(decoded) == set(analysis)
+    assert decoded['metrics']['overall_grade'] == analysis['metrics']['overall_grade']
+    assert promoted_columns({**decoded, 'grade': decoded['metrics']['overall_grade']})['best_strategy']
+    assert decode_analysis(codec='zlib+json', data=b'not zlib') == {}
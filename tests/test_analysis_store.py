@@ -0,0 +1,62 @@
+import sqlite3
+
+import pytest
+
+from wtf_analysis import generate_ultimate_analysis
+from wtf_analysis_dag import run_analysis_dag
+from wtf_analysis_store import AnalysisStore, canonical_json
+from wtf_platform_services import PlatformDatabase
+
+PARAMS = {
+    'target_roi': 15.0, 'max_rehab_budget': 50000, 'target_cash_flow': 300, 'down_payment_pct': 20,
+    'interest_rate': 6.5, 'holding_period': 6, 'closing_costs_pct': 3.0, 'assignment_fee': 15000,
+    'profit_margin_min': 10000, 'vacancy_rate': 5.0, 'maintenance_rate': 5.0, 'management_fee': 8.0,
+    'insurance_rate': 0.8, 'capex_rate': 5.0, 'appreciation_rate': 3.0
+}
+INPUTS = ('123 Main Street', 'Houston', 'TX', '77001', 'Single Family', 3, 2.0, 1600, 1985,
+          250000, 'fair', 40, 0, 5000, PARAMS)
+
+
+def analyze(*overrides):
+    return generate_ultimate_analysis(*(overrides or INPUTS))
+
+
+@pytest.fixture
+def store(db_path):
+    return AnalysisStore(PlatformDatabase(db_path))
+
+
+def save(store, analysis, user_id='u1'):
+    return store.save(user_id, analysis['property_data'], analysis['metrics'], analysis)
+
+
+def test_same_inputs_produce_the_same_analysis():
+    assert canonical_json(analyze()) == canonical_json(analyze())
+    concurrent = run_analysis_dag(*INPUTS)
+    assert all(concurrent[key] == value for key, value in analyze().items())
+    other = analyze(*(('125 Main Street',) + INPUTS[1:]))
+    assert other['comparables'] != analyze()['comparables']
+
+
+def test_resaving_an_unchanged_analysis_writes_nothing(store):
+    first = save(store, analyze())
+    assert first['created'] and first['changed']
+    again = save(store, analyze())
+    assert again == {'success': True, 'property_id': first['property_id'], 'created': False, 'changed': False}
+
+
+def test_saves_upsert_by_normalized_address(store, db_path):
+    first = save(store, analyze())
+    renamed = analyze(*(('123 MAIN ST',) + INPUTS[1:]))
+    second = save(store, renamed)
+    assert second['property_id'] == first['property_id'] and not second['created']
+    assert save(store, analyze(), user_id='u2')['created']
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute('SELECT user_id, COUNT(*) FROM properties GROUP BY user_id ORDER BY user_id').fetchall()
+    blobs = conn.execute('SELECT COUNT(*) FROM analysis_blobs').fetchone()[0]
+    conn.close()
+    assert rows == [('u1', 1), ('u2', 1)]
+    # The replaced analysis's blob is dropped once nothing references it
+    assert blobs == 2
+    assert store.load(first['property_id'])['grade'] == renamed['metrics']['overall_grade']
@@ -0,0 +1,131 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import sqlite3
+import time
+
+import pytest
+
+import wtf_api
+from wtf_api import API_SETTINGS, app, verify_jwt
+
+SECRET = 'test-secret'
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def make_jwt(claims: dict, secret: str = SECRET, alg: str = 'HS256') -> str:
+    header = b64url(json.dumps({'alg': alg, 'typ': 'JWT'}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+def add_user(db_path, user_id, api_key):
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        INSERT INTO users (id, username, email, password_hash, role, api_key, is_active)
+        VALUES (?, ?, ?, 'x', 'wholesaler', ?, 1)
+    ''', (user_id, user_id, f"{user_id}@example.com", api_key))
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def api(db_path, monkeypatch):
+    monkeypatch.setitem(API_SETTINGS, 'db_path', db_path)
+    monkeypatch.setitem(API_SETTINGS, 'cpu_processes', False)
+    monkeypatch.setitem(API_SETTINGS, 'cpu_workers', 1)
+    monkeypatch.setitem(API_SETTINGS, 'db_pool_size', 2)
+    monkeypatch.setitem(API_SETTINGS, 'jwt_secret', SECRET)
+    add_user(db_path, 'u1', 'key-one')
+    add_user(db_path, 'u2', 'key-two')
+    yield db_path
+    wtf_api.close_services()
+
+
+def call(method: str, path: str, token: str = None, body: bytes = b'', chunks=None, headers=None):
+    """Run one request through the ASGI app; returns (status, decoded JSON body)"""
+    raw_headers = [(name.encode(), value.encode()) for name, value in (headers or {}).items()]
+    if token:
+        raw_headers.append((b'authorization', f"Bearer {token}".encode()))
+    path, _, query = path.partition('?')
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(),
+             'headers': raw_headers}
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)] if chunks else [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    payload = sent[1].get('body', b'')
+    return sent[0]['status'], json.loads(payload) if payload else None
+
+
+def test_verify_jwt_accepts_only_signed_unexpired_hs256():
+    now = time.time()
+    assert verify_jwt(make_jwt({'sub': 'u1', 'exp': now + 60}), SECRET) == 'u1'
+    assert verify_jwt(make_jwt({'sub': 'u1', 'exp': now - 1}), SECRET) is None
+    assert verify_jwt(make_jwt({'sub': 'u1'}), SECRET) is None
+    assert verify_jwt(make_jwt({'sub': 'u1', 'exp': now + 60}, secret='other'), SECRET) is None
+    assert verify_jwt(make_jwt({'sub': 'u1', 'exp': now + 60}, alg='none'), SECRET) is None
+    assert verify_jwt(make_jwt({'sub': 'u1', 'exp': now + 60, 'nbf': now + 30}), SECRET) is None
+    assert verify_jwt('not.a.jwt', SECRET) is None
+    assert verify_jwt(make_jwt({'sub': 'u1', 'exp': now + 60}), '') is None
+
+
+def test_requests_authenticate_with_bearer_token_only(api):
+    assert call('GET', '/api/usage')[0] == 401
+    assert call('GET', '/api/usage', headers={'x-user-id': 'u1'})[0] == 401
+    assert call('GET', '/api/usage', token='wrong-key')[0] == 401
+    assert call('GET', '/api/usage', token='key-one')[0] == 200
+    assert call('GET', '/api/usage', token=make_jwt({'sub': 'u1', 'exp': time.time() + 60}))[0] == 200
+
+
+def test_metrics_require_a_user(api):
+    assert call('GET', '/api/metrics')[0] == 401
+    status, payload = call('GET', '/api/metrics', token='key-one')
+    assert status == 200 and 'routes' in payload
+
+
+def test_oversized_bodies_get_413(api, monkeypatch):
+    monkeypatch.setitem(API_SETTINGS, 'max_body_bytes', 100)
+    declared = call('POST', '/api/properties', token='key-one', body=b'{}',
+                    headers={'content-length': '101'})
+    assert declared[0] == 413
+    streamed = call('POST', '/api/properties', token='key-one', chunks=[b'x' * 60, b'x' * 60])
+    assert streamed[0] == 413
+    assert call('POST', '/api/properties', token='key-one', body=b'{}')[0] == 400
+
+
+def test_handler_errors_are_logged_with_traceback(api, caplog, monkeypatch):
+    async def broken(request):
+        raise RuntimeError('boom')
+
+    monkeypatch.setitem(app.routes, ('GET', '/api/broken'), broken)
+    with caplog.at_level(logging.ERROR, logger='wtf_api'):
+        assert call('GET', '/api/broken', token='key-one')[0] == 500
+    assert any(record.exc_info and 'boom' in record.getMessage() for record in caplog.records)
+
+
+def test_autocomplete_is_scoped_to_the_caller(api):
+    for token, address in (('key-one', '100 Elm Street'), ('key-two', '100 Elmwood Avenue')):
+        body = json.dumps({'address': address, 'city': 'Dallas', 'state': 'TX', 'zipCode': '75201',
+                           'propertyType': 'Single Family'}).encode()
+        assert call('POST', '/api/properties', token=token, body=body)[0] == 201
+
+    assert call('GET', '/api/properties/autocomplete?query=100%20elm')[0] == 401
+    _, mine = call('GET', '/api/properties/autocomplete?query=100%20elm', token='key-one')
+    _, theirs = call('GET', '/api/properties/autocomplete?query=100%20elm', token='key-two')
+    assert 'Elm Street' in json.dumps(mine) and 'Elmwood' not in json.dumps(mine)
+    assert 'Elmwood' in json.dumps(theirs) and 'Elm Street' not in json.dumps(theirs)
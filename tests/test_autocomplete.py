@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from wtf_autocomplete import AddressIndex, DatabaseAddressIndex
+
+
+def execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def add_property(db_path, property_id, user_id, address, updated_at='2024-06-01 12:00:00'):
+    execute(db_path, '''
+        INSERT INTO properties (id, user_id, address, city, state, zip_code, property_type, updated_at)
+        VALUES (?, ?, ?, 'Dallas', 'TX', '75201', 'Single Family', ?)
+    ''', (property_id, user_id, address, updated_at))
+
+
+@pytest.fixture
+def index(db_path):
+    return DatabaseAddressIndex(db_path, refresh_interval=0)
+
+
+def test_prefixes_match_from_the_start_of_any_token():
+    addresses = AddressIndex(min_merge=1)
+    addresses.add_address('100 Elm Street, Dallas, TX 75201', seen_at=0, count=3)
+    addresses.add_address('200 Elmwood Avenue, Dallas, TX 75201', seen_at=0)
+    addresses.add_address('300 Oak Lane, Dallas, TX 75201', seen_at=0)
+    assert addresses.suggest('elm', now=0) == ['100 Elm Street, Dallas, TX 75201',
+                                               '200 Elmwood Avenue, Dallas, TX 75201']
+    assert addresses.suggest('100 elm st', now=0) == ['100 Elm Street, Dallas, TX 75201']
+    addresses.discard('200 Elmwood Avenue, Dallas, TX 75201')
+    assert addresses.suggest('elmw', now=0) == []
+
+
+def test_users_only_see_their_own_rows_then_shared_comps(db_path, index, tmp_path):
+    add_property(db_path, 'p1', 'u1', '100 Elm Street')
+    add_property(db_path, 'p2', 'u2', '120 Elm Street')
+    execute(db_path, "INSERT INTO leads (id, user_id, property_address, updated_at) "
+                     "VALUES ('l1', 'u1', '140 Elm Street, Dallas, TX', '2024-06-01 12:00:00')")
+    comps = tmp_path / 'comps.csv'
+    comps.write_text('address,city,state,zip_code\n160 Elm Street,Dallas,TX,75201\n')
+    assert index.import_comps(str(comps)) == 1
+
+    mine = index.suggest('elm', 'u1')
+    assert set(mine[:2]) == {'100 Elm Street, Dallas, TX 75201', '140 Elm Street, Dallas, TX'}
+    assert mine[2:] == ['160 Elm Street, Dallas, TX 75201']
+    assert '100 Elm Street, Dallas, TX 75201' not in index.suggest('elm', 'u2')
+    assert index.suggest('elm', 'u3') == ['160 Elm Street, Dallas, TX 75201']
+
+
+def test_edited_rows_move_between_addresses_and_owners(db_path, index):
+    add_property(db_path, 'p1', 'u1', '100 Elm Street')
+    assert index.suggest('100 elm', 'u1')
+
+    execute(db_path, "UPDATE properties SET address = '100 Oak Lane', updated_at = '2024-06-02 09:00:00' "
+                     "WHERE id = 'p1'")
+    assert index.suggest('100 elm', 'u1') == []
+    assert index.suggest('100 oak', 'u1') == ['100 Oak Lane, Dallas, TX 75201']
+
+    execute(db_path, "UPDATE properties SET user_id = 'u2', updated_at = '2024-06-03 09:00:00' WHERE id = 'p1'")
+    assert index.suggest('100 oak', 'u1') == []
+    assert index.suggest('100 oak', 'u2') == ['100 Oak Lane, Dallas, TX 75201']
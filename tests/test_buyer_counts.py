@@ -0,0 +1,61 @@
+import json
+import sqlite3
+
+import pytest
+
+from wtf_platform_services import MAP_STATES, BuyerStateCountsService, PlatformDatabase
+
+
+def execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def add_buyer(db_path, buyer_id, states, deal_types):
+    execute(db_path, '''
+        INSERT INTO buyers (id, user_id, name, email, target_states, deal_types)
+        VALUES (?, 'u1', ?, ?, ?, ?)
+    ''', (buyer_id, buyer_id, f"{buyer_id}@example.com", states, deal_types))
+
+
+@pytest.fixture
+def counts(db_path):
+    return BuyerStateCountsService(PlatformDatabase(db_path), check_interval=0)
+
+
+def by_state(service):
+    return {row['state']: row for row in service.snapshot()[0]}
+
+
+def test_triggers_count_each_buyer_once_per_state_and_category(db_path, counts):
+    add_buyer(db_path, 'b1', 'TX, fl', 'fix_flip,section8,buy_hold')
+    add_buyer(db_path, 'b2', 'TX', 'subject_to,seller_finance')
+    rows = by_state(counts)
+    assert rows['TEXAS'] == {'state': 'TEXAS', 'fixFlipCount': 1, 'creativeCount': 1, 'section8Count': 1}
+    assert rows['FLORIDA']['section8Count'] == 1
+    assert [row['state'] for row in counts.snapshot()[0]][:len(MAP_STATES)] == MAP_STATES
+
+    execute(db_path, "UPDATE buyers SET target_states = 'GA' WHERE id = 'b1'")
+    rows = by_state(counts)
+    assert (rows['TEXAS']['fixFlipCount'], rows['FLORIDA']['section8Count']) == (0, 0)
+    assert rows['GEORGIA']['section8Count'] == 1
+
+    execute(db_path, "DELETE FROM buyers WHERE id = 'b2'")
+    assert by_state(counts)['TEXAS']['creativeCount'] == 0
+
+
+def test_snapshot_body_and_etag_follow_the_table(db_path, counts):
+    _, body, etag = counts.snapshot()
+    assert counts.snapshot()[2] == etag
+    add_buyer(db_path, 'b1', 'OH', 'fix_flip')
+    rows, new_body, new_etag = counts.snapshot()
+    assert new_etag != etag and json.loads(new_body) == rows
+
+    cached = BuyerStateCountsService(PlatformDatabase(db_path), check_interval=3600)
+    first = cached.snapshot()
+    add_buyer(db_path, 'b2', 'OH', 'fix_flip')
+    assert cached.snapshot() is first
+    cached.invalidate()
+    assert by_state(cached)['OHIO']['fixFlipCount'] == 2
@@ -0,0 +1,50 @@
+import gc
+import queue
+import threading
+
+import pytest
+
+from wtf_platform_services import PooledPlatformDatabase
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = PooledPlatformDatabase(db_path, size=2, timeout=0.5)
+    yield pool
+    pool.close_all()
+
+
+def test_connections_are_reused_and_rolled_back(pool):
+    with pool.connection() as conn:
+        raw = conn._conn
+        conn.execute("INSERT INTO lead_changes (lead_id) VALUES ('x')")
+    with pool.connection() as conn:
+        assert conn._conn is raw
+        assert conn.execute('SELECT COUNT(*) FROM lead_changes').fetchone()[0] == 0
+
+
+def test_exhausted_pool_waits_then_times_out(pool):
+    held = [pool.get_connection(), pool.get_connection()]
+    with pytest.raises(queue.Empty):
+        pool.get_connection()
+
+    threading.Timer(0.1, held[0].close).start()
+    conn = pool.get_connection()
+    assert conn._conn is not None
+    conn.close()
+    held[1].close()
+
+
+def test_leaked_connection_frees_its_slot(pool, caplog):
+    held = pool.get_connection()
+    leaked = pool.get_connection()
+    leaked_raw = leaked._conn
+    del leaked
+    gc.collect()
+    assert 'never closed' in caplog.text
+
+    # The slot is reopened with a new connection; the leaked one is never handed out again
+    replacement = pool.get_connection()
+    assert replacement._conn is not leaked_raw
+    replacement.close()
+    held.close()
@@ -0,0 +1,79 @@
+import io
+import sqlite3
+import zipfile
+
+import pytest
+
+from wtf_document_engine import MAX_REPORTED_ERRORS, DocumentEngine
+
+LOI = {'property_address': '1 Main St', 'seller_name': 'Ann Seller', 'buyer_name': 'Bob Buyer',
+       'offer_price': 150000}
+
+
+@pytest.fixture
+def engine():
+    return DocumentEngine()
+
+
+def test_render_validates_required_fields_by_default(engine):
+    with pytest.raises(ValueError, match='Missing required fields: offer_price'):
+        engine.render('loi', {**LOI, 'offer_price': ''})
+    assert 'Ann Seller' in engine.render('loi', {**LOI, 'offer_price': ''}, validate=False)
+
+
+def test_none_numeric_field_takes_the_default(engine):
+    content = engine.render('loi', {**LOI, 'earnest_money': None})
+    assert 'Earnest Money: $1,000.00' in content
+
+
+def test_unformattable_value_raises_value_error(engine):
+    engine.register('note', 'Price: {price:,.2f}')
+    with pytest.raises(ValueError, match='Missing required fields: price'):
+        engine.render('note', {'price': None})
+    with pytest.raises(ValueError, match="Invalid value for price: 'call me'"):
+        engine.render('note', {'price': 'call me'})
+    assert engine.render('note', {'price': '$185,000'}) == 'Price: 185,000.00'
+
+
+def test_render_many_keeps_order_and_reports_bad_rows(engine):
+    records = [LOI, {**LOI, 'seller_name': ''}, {**LOI, 'offer_price': 'n/a'}, LOI]
+    results = list(engine.render_many('loi', records))
+    assert [r['index'] for r in results] == [0, 1, 2, 3]
+    assert 'content' in results[0] and 'content' in results[3]
+    assert results[1]['error'] == 'Missing required fields: seller_name'
+    assert results[2]['error'].startswith('Invalid value for offer_price')
+
+
+def test_write_zip_caps_reported_errors(engine):
+    bad = MAX_REPORTED_ERRORS + 25
+    records = [LOI, LOI] + [{**LOI, 'buyer_name': None}] * bad
+    buffer = io.BytesIO()
+    result = engine.write_zip('loi', records, buffer)
+
+    assert result['rendered'] == 2
+    assert result['failed'] == bad
+    assert len(result['errors']) == MAX_REPORTED_ERRORS + 1
+    assert result['errors'][-1] == '... and 25 more'
+    with zipfile.ZipFile(buffer) as archive:
+        names = archive.namelist()
+    assert len(names) == 3 and 'errors.txt' in names
+
+
+def test_database_templates_are_scoped_to_public_without_a_user(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executemany('''
+        INSERT INTO templates (id, user_id, template_type, template_name, content, variables, is_public)
+        VALUES (?, 'u1', 'loi', ?, 'Hi {seller_name}', '["seller_name"]', ?)
+    ''', [('pub', 'Public LOI', 1), ('priv', 'Private LOI', 0)])
+    conn.commit()
+    conn.close()
+
+    shared = DocumentEngine(db_path)
+    assert 'pub' in shared.templates and 'priv' not in shared.templates
+    assert {'pub', 'priv'} <= set(DocumentEngine(db_path, user_id='u1').templates)
+    assert shared.render('Public LOI', {'seller_name': 'Ann'}) == 'Hi Ann'
+
+
+def test_database_without_templates_table_keeps_builtins(tmp_path):
+    engine = DocumentEngine(str(tmp_path / 'other_app.db'))
+    assert 'purchase_agreement' in engine.templates
@@ -0,0 +1,88 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from wtf_followups import FollowUpScheduler
+from wtf_platform_services import NotificationManager, PlatformDatabase
+
+
+@pytest.fixture
+def scheduler(db_path):
+    db = PlatformDatabase(db_path)
+    return FollowUpScheduler(db, NotificationManager(db), refresh_interval=0)
+
+
+def add_lead(db_path, lead_id, user_id='u1', next_followup=None, updated_at='2024-06-01 12:00:00'):
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        INSERT INTO leads (id, user_id, first_name, property_address, next_followup, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (lead_id, user_id, lead_id, '1 Main St', next_followup, updated_at))
+    conn.commit()
+    conn.close()
+
+
+def past(hours=1):
+    return (datetime.now() - timedelta(hours=hours)).isoformat(sep=' ', timespec='seconds')
+
+
+def test_same_second_writes_with_smaller_id_are_loaded(db_path, scheduler):
+    add_lead(db_path, 'zzzz', next_followup=past())
+    assert scheduler.overdue_count('u1') == 1
+
+    # Same updated_at as the row already loaded, and an id that sorts before it
+    add_lead(db_path, 'aaaa', next_followup=past())
+    assert scheduler.overdue_count('u1') == 2
+
+
+def test_deleted_lead_leaves_the_queue(db_path, scheduler):
+    add_lead(db_path, 'lead-1', next_followup=past())
+    add_lead(db_path, 'lead-2', next_followup=(datetime.now() + timedelta(days=1)).isoformat())
+    assert scheduler.overdue_count('u1') == 1
+    assert len(scheduler.call_next('u1')) == 2
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('DELETE FROM leads')
+    conn.commit()
+    conn.close()
+
+    assert scheduler.overdue_count('u1') == 0
+    assert scheduler.call_next('u1') == []
+    assert scheduler.summary()['scheduled'] == 0
+
+
+def test_rescheduled_lead_moves_out_of_overdue(db_path, scheduler):
+    add_lead(db_path, 'lead-1', next_followup=past())
+    assert scheduler.overdue_count('u1') == 1
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('UPDATE leads SET next_followup = ? WHERE id = ?',
+                 ((datetime.now() + timedelta(days=2)).isoformat(), 'lead-1'))
+    conn.commit()
+    conn.close()
+
+    assert scheduler.overdue_count('u1') == 0
+    assert scheduler.call_next('u1')[0]['overdue'] is False
+
+
+def test_watermark_suppresses_repeat_notifications_after_restart(db_path, scheduler):
+    # The first run starts the watermark at now, so follow-ups already overdue do not fire
+    add_lead(db_path, 'old', next_followup=past(hours=5))
+    assert scheduler.overdue_count('u1') == 1
+    assert scheduler.stats['fired'] == 0
+
+    # A follow-up that comes due while running is notified once
+    soon = datetime.now() + timedelta(seconds=1)
+    add_lead(db_path, 'new', next_followup=soon.isoformat())
+    scheduler.tick(now=soon + timedelta(seconds=1), force=True)
+    assert scheduler.stats['fired'] == 1
+
+    restarted = FollowUpScheduler(scheduler.db, scheduler.notifications, refresh_interval=0)
+    restarted.tick(now=soon + timedelta(seconds=2), force=True)
+    assert restarted.overdue_count('u1') == 2
+    assert restarted.stats['fired'] == 0
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM notifications WHERE user_id = 'u1'").fetchone()[0] == 1
+    conn.close()
@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import wtf_fragments
+from wtf_fragments import fragment, fragments_enabled
+
+
+def fake_streamlit(calls):
+    def st_fragment(fn, run_every=None):
+        calls.append(run_every)
+        return fn
+    return SimpleNamespace(fragment=st_fragment, session_state={})
+
+
+def test_run_every_is_passed_to_streamlit(monkeypatch):
+    calls = []
+    monkeypatch.setattr(wtf_fragments, 'st', fake_streamlit(calls))
+    fragment('polling', run_every=1)(lambda: None)
+    fragment('plain')(lambda: None)
+    assert calls == [1, None]
+    assert fragments_enabled()
+
+
+def test_disabled_fragments_are_plain_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(wtf_fragments, 'st', fake_streamlit(calls))
+    monkeypatch.setitem(wtf_fragments.FRAGMENT_SETTINGS, 'enabled', False)
+    fragment('polling', run_every=1)(lambda: None)
+    assert calls == [] and not fragments_enabled()
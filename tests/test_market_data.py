@@ -0,0 +1,34 @@
+import csv
+
+from wtf_market_data import MarketDataStore, load_market_feed, normalize_state
+
+
+def test_normalize_state_maps_names_and_rejects_the_rest():
+    assert normalize_state('TX') == 'tx'
+    assert normalize_state(' Texas ') == 'tx'
+    assert normalize_state('new  YORK') == 'ny'
+    assert normalize_state('D.C.') == 'dc'
+    assert normalize_state('District of Columbia') == 'dc'
+    assert normalize_state('Tennessee') == 'tn'
+    assert normalize_state('Te') == ''
+    assert normalize_state('Narnia') == ''
+    assert normalize_state(None) == ''
+
+
+def test_feed_rows_are_keyed_by_usps_code(db_path, tmp_path):
+    feed = tmp_path / 'feed.csv'
+    with open(feed, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['zip_code', 'city', 'state', 'median_home_price', 'data_date'])
+        writer.writerow(['77001', 'Houston', 'Texas', '400000', '2024-06-01'])
+        writer.writerow(['77002', 'Houston', 'TX', '420000', '2024-06-01'])
+        writer.writerow(['00000', 'Nowhere', 'Narnia', '1', '2024-06-01'])
+
+    result = load_market_feed(str(feed), db_path=db_path)
+    assert (result['loaded'], result['skipped']) == (2, 1)
+
+    market = MarketDataStore(db_path, ttl_seconds=0)
+    by_name = market.get_market_data(city='Houston', state='Texas')
+    assert by_name['resolution'] == 'city'
+    assert by_name['median_home_price'] == 410000
+    assert market.get_market_data(city='Houston', state='TX')['median_home_price'] == 410000
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from wtf_analysis import generate_ultimate_analysis
+from wtf_pdf_reports import ReportService, render_analysis_report, report_cache_key
+
+
+@pytest.fixture(scope='module')
+def report_args():
+    analysis = generate_ultimate_analysis('55 Cedar Ct', 'Austin', 'TX', '78701', 'Single Family', 3, 2.0,
+                                          1750, 1978, 420000, 'fair', 30, 0, 7800,
+                                          {'target_roi': 15.0, 'holding_period': 6, 'assignment_fee': 15000,
+                                           'down_payment_pct': 20, 'interest_rate': 7.0})
+    return (analysis['property_data'], analysis['metrics'], analysis['strategies'],
+            analysis['market_data'], analysis['ai_insights'])
+
+
+def test_report_is_a_pdf(report_args):
+    pdf = render_analysis_report(*report_args)
+    assert pdf.startswith(b'%PDF-') and pdf.rstrip().endswith(b'%%EOF')
+    assert b'/Type /Catalog' in pdf
+
+
+def test_unchanged_reports_come_from_the_cache(report_args, tmp_path):
+    service = ReportService(max_workers=1, cache_dir=str(tmp_path))
+    first = service.submit(*report_args).result(timeout=30)
+    service.shutdown()  # waits for the done-callback that stores the render
+    assert service.submit(*report_args).result() == first
+    assert service.stats == {'hits': 1, 'misses': 1, 'rendered': 1}
+
+    key = report_cache_key(*report_args)
+    assert (tmp_path / f"{key}.pdf").read_bytes() == first
+    # A new service (e.g. after a restart) serves the report from disk
+    restarted = ReportService(max_workers=1, cache_dir=str(tmp_path))
+    assert restarted.submit(*report_args).result() == first
+    assert restarted.stats['misses'] == 0
+    restarted.shutdown()
+
+
+def test_concurrent_requests_share_one_render(report_args):
+    service = ReportService(max_workers=1)
+    # Hold the only worker so every submit sees the render in flight
+    release = threading.Event()
+    service.executor.submit(release.wait)
+    futures = [service.submit(*report_args) for _ in range(3)]
+    release.set()
+    assert len({id(f) for f in futures}) == 1
+    service.shutdown()
+    assert service.stats['rendered'] == 1
@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+from wtf_platform_services import PipelineDataService, PlatformDatabase
+
+
+def add_deal(db_path, deal_id, stage='prospecting', user_id='u1', fee=10000, probability=10,
+             updated_at='2024-06-01 12:00:00'):
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        INSERT INTO deals (id, user_id, title, stage, assignment_fee, probability, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (deal_id, user_id, f"Deal {deal_id}", stage, fee, probability, updated_at))
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def pipeline(db_path):
+    return PipelineDataService(PlatformDatabase(db_path), page_size=3)
+
+
+def test_keyset_pages_cover_every_deal_once(db_path, pipeline):
+    # Ties on updated_at are broken by id, so no card is skipped or repeated across pages
+    for i in range(8):
+        add_deal(db_path, f"d{i}", updated_at='2024-06-01 12:00:00' if i < 5 else f"2024-06-0{i - 3} 09:00:00")
+
+    seen, cursor_key = [], None
+    while True:
+        page = pipeline.get_column_page('u1', 'prospecting', cursor_key)
+        seen.extend(deal['id'] for deal in page['deals'])
+        cursor_key = page['cursor']
+        if cursor_key is None:
+            break
+    assert sorted(seen) == [f"d{i}" for i in range(8)]
+    assert len(seen) == len(set(seen))
+    assert seen[:3] == ['d7', 'd6', 'd5']
+
+    board = pipeline.get_board('u1')
+    assert [deal['id'] for deal in board['columns']['prospecting']['deals']] == seen[:3]
+    assert board['columns']['prospecting']['cursor'] == [board['columns']['prospecting']['deals'][-1]['updated_at'], 'd5']
+
+
+def test_triggers_keep_stage_counts_in_step(db_path, pipeline):
+    add_deal(db_path, 'a', fee=10000, probability=10)
+    add_deal(db_path, 'b', fee=20000, probability=50)
+    counts = pipeline.get_stage_counts('u1')
+    assert counts['prospecting']['count'] == 2
+    assert counts['prospecting']['weighted_value'] == pytest.approx(11000)
+
+    moved = pipeline.move_deal('u1', 'b', 'under_contract')
+    assert moved['success'] and moved['from_stage'] == 'prospecting'
+    counts = pipeline.get_stage_counts('u1')
+    assert (counts['prospecting']['count'], counts['prospecting']['value']) == (1, 10000)
+    assert counts['under_contract']['count'] == 1
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM deals WHERE id = 'a'")
+    conn.commit()
+    conn.close()
+    assert pipeline.get_stage_counts('u1')['prospecting']['count'] == 0
+    assert not pipeline.move_deal('u2', 'b', 'closed')['success']
+
+
+def test_board_refetches_only_changed_columns(db_path, pipeline):
+    add_deal(db_path, 'a')
+    add_deal(db_path, 'b', stage='negotiation')
+    first = pipeline.get_board('u1')
+    versions = {stage: column['version'] for stage, column in first['columns'].items()}
+
+    assert pipeline.get_board('u1', versions)['columns'] == {}
+    pipeline.move_deal('u1', 'a', 'negotiation')
+    changed = pipeline.get_board('u1', versions)['columns']
+    assert set(changed) == {'prospecting', 'negotiation'}
+    assert [deal['id'] for deal in changed['negotiation']['deals']][0] == 'a'
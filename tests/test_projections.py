@@ -0,0 +1,48 @@
+import numpy as np
+
+from wtf_projections import amortization_schedule, irr, monthly_payment, project_rental
+
+
+def test_payment_matches_the_annuity_formula_and_zero_rate_loans():
+    assert np.isclose(monthly_payment(200000, 0.06, 360)[0], 1199.10, atol=0.01)
+    assert np.isclose(monthly_payment(120000, 0.0, 120)[0], 1000.0)
+
+
+def test_balance_amortizes_to_zero_at_term():
+    schedule = amortization_schedule([200000, 120000], [0.06, 0.0], [360, 120], horizon_months=480)
+    balance = schedule['balance']
+    assert np.allclose(balance[:, -1], 0.0)
+    assert np.all(np.diff(balance, axis=1) <= 1e-6)
+    # Principal repaid over the life of the loan is the amount borrowed
+    assert np.allclose(schedule['principal'].sum(axis=1), [200000, 120000])
+    assert np.isclose(schedule['interest'][0, 0], 1000.0)
+    # Nothing is paid after the 10-year loan ends
+    assert np.all(schedule['payment'][1, 120:] == 0)
+
+
+def test_irr_matches_npv_root_per_row():
+    flows = np.array([[-1000, 300, 400, 500],
+                      [-1000, 0, 0, 1331],
+                      [-500, -500, 600, 600]])
+    rates = irr(flows)
+    assert np.isclose(rates[1], 0.10)
+    discount = (1 + rates[:, None]) ** -np.arange(flows.shape[1])
+    assert np.allclose((flows * discount).sum(axis=1), 0.0, atol=1e-6)
+
+
+def test_irr_is_nan_without_a_sign_change_in_the_bracket():
+    rates = irr([[-1000, 10, 10, 10],
+                 [1000, 100, 100, 100],
+                 [-1000, 0, 0, 100000]])
+    # Returns below the -50% floor, no investment at all, and a return above the 100% ceiling
+    assert np.isnan(rates).all()
+    assert np.isclose(irr([[-1000, 0, 0, 100000]], high=5.0)[0], 100 ** (1 / 3) - 1)
+
+
+def test_rental_projection_broadcasts_scenarios():
+    result = project_rental(250000, 62500, 187500, [0.06, 0.07], 2200,
+                            monthly_taxes=400, operating_rate=0.2, horizon_years=10)
+    assert result['irr'].shape == (2,)
+    assert result['monthly_cash_flow'][0] > result['monthly_cash_flow'][1]
+    assert result['irr'][0] > result['irr'][1]
+    assert result['cash_flows'].shape == (2, 120)
@@ -0,0 +1,38 @@
+from wtf_analysis import generate_ultimate_analysis
+from wtf_risk_simulation import MIN_SAMPLES, simulate_deal, simulate_pipeline
+
+DEAL = {'purchase_price': 150000, 'arv': 260000, 'rehab_cost': 40000, 'holding_months': 6,
+        'interest_rate': 10, 'monthly_rent': 1900, 'year_built': 1955,
+        'market_data': {'inventory_months': 5.0, 'price_growth_yoy': 3.0, 'market_temperature': 'Balanced'}}
+
+
+def test_seeded_runs_are_reproducible_and_ordered():
+    first = simulate_deal(DEAL, samples=5000, seed=7)
+    assert first == simulate_deal(DEAL, samples=5000, seed=7)
+    percentiles = list(first['profit_percentiles'].values())
+    assert percentiles == sorted(percentiles)
+    assert 0.0 <= first['probability_of_loss'] <= first['probability_below_target'] <= 1.0
+    assert first['expected_shortfall_95'] >= first['var_95']
+    assert sum(first['histogram']['counts']) == 5000
+    assert simulate_deal(DEAL, samples=10)['samples'] == MIN_SAMPLES
+
+
+def test_pipeline_results_do_not_depend_on_worker_count():
+    deals = [dict(DEAL, purchase_price=price) for price in (140000, 160000, 180000)]
+    serial = simulate_pipeline(deals, samples=2000, workers=1, seed=3)
+    pooled = simulate_pipeline(deals, samples=2000, workers=2, seed=3)
+    assert serial == pooled
+    assert serial[0]['expected_profit'] > serial[2]['expected_profit']
+
+
+def test_risk_analysis_simulates_only_when_asked():
+    inputs = ('9 Oak Street', 'Houston', 'TX', '77001', 'Single Family', 3, 2.0, 1500, 1950,
+              200000, 'poor', 20, 0, 4000)
+    params = {'target_roi': 15.0, 'holding_period': 6, 'interest_rate': 10, 'assignment_fee': 15000,
+              'down_payment_pct': 20, 'closing_costs_pct': 3.0, 'vacancy_rate': 5.0,
+              'maintenance_rate': 5.0, 'management_fee': 8.0, 'capex_rate': 5.0, 'insurance_rate': 0.8,
+              'appreciation_rate': 3.0, 'profit_margin_min': 10000}
+    assert generate_ultimate_analysis(*inputs, params)['risk_analysis']['simulation'] is None
+    simulated = dict(params, risk_simulation=True, simulation_samples=2000)
+    simulation = generate_ultimate_analysis(*inputs, simulated)['risk_analysis']['simulation']
+    assert simulation['samples'] == 2000
@@ -0,0 +1,39 @@
+import numpy as np
+
+from wtf_sensitivity import AXES, SensitivityEngine, evaluate_grid, heatmap, what_if
+
+PARAMS = {'holding_period': 6, 'target_roi': 15}
+AXES_SMALL = {'offer_pct': [0.6, 0.7, 0.8], 'rehab_multiplier': [1.0, 1.5],
+              'arv_haircut': [0.0, 0.1], 'assignment_fee': [5000, 15000]}
+
+
+def test_grid_points_match_the_scalar_formulas():
+    grid = evaluate_grid(300000, 40000, 220000, PARAMS, AXES_SMALL)
+    assert grid['shape'] == [3, 2, 2, 2]
+    assert all(grid[metric].dtype == np.float32 for metric in ('buyer_profit', 'spread', 'grade_score'))
+
+    point = what_if(grid, offer_pct=0.7, rehab_multiplier=1.5, arv_haircut=0.1, assignment_fee=15000)
+    contract = 300000 * 0.7 - 40000
+    basis = contract + 15000 + 60000
+    profit = 270000 - (basis * (1 + 0.06 + 0.02) + 270000 * 0.08 + 60000 * 0.1)
+    assert np.isclose(point['contract_price'], contract)
+    assert np.isclose(point['buyer_profit'], profit, rtol=1e-6)
+    assert np.isclose(point['spread'], 270000 - contract - 60000)
+    assert point['grade'] in 'ABCD'
+
+
+def test_heatmap_rows_follow_y_and_columns_follow_x():
+    grid = evaluate_grid(300000, 40000, 220000, PARAMS, AXES_SMALL)
+    sliced = heatmap(grid, 'contract_price', x='offer_pct', y='assignment_fee')
+    assert np.array(sliced['z']).shape == (len(AXES_SMALL['assignment_fee']), len(AXES_SMALL['offer_pct']))
+    assert sliced['z'][0][0] < sliced['z'][0][-1]
+
+
+def test_engine_reuses_grids_for_the_same_inputs():
+    engine = SensitivityEngine(cache_size=1)
+    first = engine.grid(300000, 40000, 220000, PARAMS, AXES_SMALL)
+    assert engine.grid(300000.001, 40000, 220000, PARAMS, AXES_SMALL) is first
+    engine.grid(310000, 40000, 220000, PARAMS, AXES_SMALL)
+    assert engine.grid(300000, 40000, 220000, PARAMS, AXES_SMALL) is not first
+    assert engine.stats == {'hits': 1, 'misses': 3}
+    assert set(first['axes']) == set(AXES)
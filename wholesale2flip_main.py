@@ -3,10 +3,15 @@ import sqlite3
 import hashlib
 import json
 import datetime
-import openai
 import os
 from typing import Dict, List, Optional
-import pandas as pd
+
+from wtf_document_engine import DocumentEngine
+from wtf_startup import lazy_import
+
+# Imported on first use: pandas by the admin tables, openai by nothing yet
+pd = lazy_import('pandas')
+openai = lazy_import('openai')
 
 # Page configuration
 st.set_page_config(
@@ -266,89 +271,24 @@ class DealCalculator:
         return "\n".join(insights) if insights else "Deal analysis complete. Review the numbers carefully."
 
 class ContractGenerator:
-    @staticmethod
-    def generate_wholesale_contract(deal_data: Dict) -> str:
-        template = f"""
-REAL ESTATE PURCHASE AND SALE AGREEMENT
-(WHOLESALE CONTRACT)
-
-Property Address: {deal_data.get('property_address', '')}, {deal_data.get('city', '')}, {deal_data.get('state', '')} {deal_data.get('zip_code', '')}
-
-BUYER: [BUYER NAME]
-Address: [BUYER ADDRESS]
-
-SELLER: {deal_data.get('contact_name', '[SELLER NAME]')}
-Phone: {deal_data.get('contact_phone', '[SELLER PHONE]')}
-
-PURCHASE PRICE: ${deal_data.get('acquisition_cost', 0):,.2f}
-
-EARNEST MONEY: $1,000.00 (to be deposited within 2 business days)
-
-INSPECTION PERIOD: 10 days from acceptance
-
-CLOSING DATE: 30 days from acceptance (or sooner if possible)
-
-FINANCING: This contract is contingent upon Buyer obtaining financing or is a CASH purchase.
-
-ASSIGNMENT: Buyer reserves the right to assign this contract to another party.
-
-PROPERTY CONDITION: Property is sold AS-IS, WHERE-IS.
-
-This contract is subject to Buyer's inspection and approval of the property, title, and all related documents.
+    def __init__(self, db_path: str):
+        # Built-in templates plus the public ones saved in this app's database
+        self.engine = DocumentEngine(db_path)
 
-Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Generated by: Wholesale2Flip Platform
-
-NOTE: This is a template contract. Please consult with a real estate attorney before use.
-        """
-        return template.strip()
+    def generate_wholesale_contract(self, deal_data: Dict) -> str:
+        return self.engine.render('wholesale_contract', deal_data)
     
-    @staticmethod
-    def generate_loi(deal_data: Dict) -> str:
-        template = f"""
-LETTER OF INTENT (LOI)
-REAL ESTATE INVESTMENT OPPORTUNITY
-
-Date: {datetime.datetime.now().strftime('%Y-%m-%d')}
-
-To: {deal_data.get('contact_name', '[SELLER NAME]')}
-Property: {deal_data.get('property_address', '')}, {deal_data.get('city', '')}, {deal_data.get('state', '')} {deal_data.get('zip_code', '')}
-
-Dear Property Owner,
-
-We are interested in purchasing your property located at the above address. Based on our preliminary analysis, we would like to submit the following offer:
-
-PROPOSED PURCHASE PRICE: ${deal_data.get('acquisition_cost', 0):,.2f}
-
-TERMS:
-- Cash Purchase (No Financing Contingency)
-- 10-Day Inspection Period
-- 30-Day Closing (Can close sooner if needed)
-- Buyer to pay all closing costs
-- Property purchased AS-IS
-
-PROPERTY DETAILS:
-- Type: {deal_data.get('property_type', 'N/A')}
-- Bedrooms: {deal_data.get('bedrooms', 'N/A')}
-- Bathrooms: {deal_data.get('bathrooms', 'N/A')}
-- Square Feet: {deal_data.get('square_feet', 'N/A')}
-- Year Built: {deal_data.get('year_built', 'N/A')}
-
-We are serious cash buyers and can close quickly. This offer is non-binding and subject to property inspection and title review.
-
-Please contact us at your earliest convenience to discuss this opportunity.
-
-Best regards,
-Wholesale2Flip Team
-
-Generated by: Wholesale2Flip Platform
-Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        """
-        return template.strip()
+    def generate_loi(self, deal_data: Dict) -> str:
+        return self.engine.render('investor_loi', deal_data)
 
 # Initialize database
 db = DatabaseManager()
 
+@st.cache_resource
+def get_contract_generator() -> ContractGenerator:
+    """Built on first use, so templates are compiled once per server rather than at import"""
+    return ContractGenerator(db.db_name)
+
 # Custom CSS
 def load_css():
     st.markdown("""
@@ -771,25 +711,33 @@ def show_deal_calculator():
                     
                     with col1:
                         if st.button("Generate Wholesale Contract"):
-                            contract = ContractGenerator.generate_wholesale_contract(deal_data)
-                            st.text_area("Wholesale Contract", contract, height=400)
-                            st.download_button(
-                                "Download Contract",
-                                contract,
-                                file_name=f"wholesale_contract_{deal_id}.txt",
-                                mime="text/plain"
-                            )
+                            try:
+                                contract = get_contract_generator().generate_wholesale_contract(deal_data)
+                            except ValueError as e:
+                                st.error(str(e))
+                            else:
+                                st.text_area("Wholesale Contract", contract, height=400)
+                                st.download_button(
+                                    "Download Contract",
+                                    contract,
+                                    file_name=f"wholesale_contract_{deal_id}.txt",
+                                    mime="text/plain"
+                                )
                     
                     with col2:
                         if st.button("Generate Letter of Intent"):
-                            loi = ContractGenerator.generate_loi(deal_data)
-                            st.text_area("Letter of Intent", loi, height=400)
-                            st.download_button(
-                                "Download LOI",
-                                loi,
-                                file_name=f"loi_{deal_id}.txt",
-                                mime="text/plain"
-                            )
+                            try:
+                                loi = get_contract_generator().generate_loi(deal_data)
+                            except ValueError as e:
+                                st.error(str(e))
+                            else:
+                                st.text_area("Letter of Intent", loi, height=400)
+                                st.download_button(
+                                    "Download LOI",
+                                    loi,
+                                    file_name=f"loi_{deal_id}.txt",
+                                    mime="text/plain"
+                                )
 
 def show_my_deals():
     st.markdown("# 📊 My Deals")
@@ -844,13 +792,21 @@ def show_my_deals():
             col1, col2 = st.columns(2)
             with col1:
                 if st.button(f"Generate Contract", key=f"contract_{deal['id']}"):
-                    contract = ContractGenerator.generate_wholesale_contract(deal)
-                    st.text_area("Contract", contract, height=300, key=f"contract_text_{deal['id']}")
+                    try:
+                        contract = get_contract_generator().generate_wholesale_contract(deal)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.text_area("Contract", contract, height=300, key=f"contract_text_{deal['id']}")
             
             with col2:
                 if st.button(f"Generate LOI", key=f"loi_{deal['id']}"):
-                    loi = ContractGenerator.generate_loi(deal)
-                    st.text_area("LOI", loi, height=300, key=f"loi_text_{deal['id']}")
+                    try:
+                        loi = get_contract_generator().generate_loi(deal)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.text_area("LOI", loi, height=300, key=f"loi_text_{deal['id']}")
 
 def show_admin_dashboard():
     if not st.session_state.logged_in or not st.session_state.user.get('is_admin'):
@@ -951,13 +907,21 @@ def show_admin_dashboard():
                     
                     with col3:
                         if st.button("📄 View Contract", key=f"view_contract_{deal['id']}"):
-                            contract = ContractGenerator.generate_wholesale_contract(deal)
-                            st.text_area("Generated Contract", contract, height=200, key=f"admin_contract_{deal['id']}")
+                            try:
+                                contract = get_contract_generator().generate_wholesale_contract(deal)
+                            except ValueError as e:
+                                st.error(str(e))
+                            else:
+                                st.text_area("Generated Contract", contract, height=200, key=f"admin_contract_{deal['id']}")
                     
                     with col4:
                         if st.button("📨 View LOI", key=f"view_loi_{deal['id']}"):
-                            loi = ContractGenerator.generate_loi(deal)
-                            st.text_area("Generated LOI", loi, height=200, key=f"admin_loi_{deal['id']}")
+                            try:
+                                loi = get_contract_generator().generate_loi(deal)
+                            except ValueError as e:
+                                st.error(str(e))
+                            else:
+                                st.text_area("Generated LOI", loi, height=200, key=f"admin_loi_{deal['id']}")
         else:
             st.info("No deals submitted yet.")
     
@@ -400,17 +400,33 @@ import discord
 from discord.ext import commands
 import asyncio
 import json
+from typing import Dict, List
+
+from wtf_discord_broadcaster import DealAlertBroadcaster, DiscordPyClient
 
 class WTFDiscordBot:
-    def __init__(self, token: str):
+    def __init__(self, token: str, deal_channels: Dict[str, List[int]] = None):
         intents = discord.Intents.default()
         intents.message_content = True
         
         self.bot = commands.Bot(command_prefix='!wtf ', intents=intents)
         self.token = token
+        # State code -> channel ids; '*' channels get every deal
+        self.deal_channels = deal_channels or {}
+        self.broadcaster = None
         self.setup_commands()
     
+    def route_deal(self, deal: Dict) -> List[int]:
+        """Channels subscribed to the deal's state plus the catch-all channels"""
+        return self.deal_channels.get(deal.get('state'), []) + self.deal_channels.get('*', [])
+    
     def setup_commands(self):
+        @self.bot.event
+        async def on_ready():
+            if self.broadcaster is None:
+                self.broadcaster = DealAlertBroadcaster(DiscordPyClient(self.bot), self.route_deal)
+                await self.broadcaster.start()
+        
         @self.bot.command(name='deal')
         async def send_deal_alert(ctx, *, deal_info):
             """Send a deal alert to the channel"""
@@ -449,11 +465,17 @@ class WTFDiscordBot:
             embed = discord.Embed(title=title, description=message, color=color)
             await channel.send(embed=embed)
     
+    async def broadcast_deals(self, deals: List[Dict]):
+        """Queue deals for batched, deduplicated alerts to their subscribed channels"""
+        for deal in deals:
+            await self.broadcaster.publish(deal)
+    
     def run(self):
         """Start the bot"""
         self.bot.run(self.token)
 
 # Example usage in main app:
 # if st.secrets.get("discord", {}).get("bot_token"):
-#     discord_bot = WTFDiscordBot(st.secrets["discord"]["bot_token"])
+#     discord_bot = WTFDiscordBot(st.secrets["discord"]["bot_token"],
+#                                 deal_channels={'TX': [1234567890], '*': [9876543210]})
 #     # discord_bot.run()  # Run in separate thread
\ No newline at end of file
@@ -0,0 +1,965 @@
+"""
+WTF Analysis - Deal analysis, strategy, grading and scoring engine
+Pure computation shared by the Streamlit apps, API and benchmarks.
+"""
+
+import hashlib
+import json
+import numpy as np
+from datetime import datetime
+
+from wtf_projections import project_rental, DEFAULT_TERM_YEARS, DEFAULT_RENT_GROWTH, DEFAULT_EXPENSE_GROWTH
+from wtf_risk_simulation import simulate_deal, DEFAULT_SAMPLES
+from wtf_market_data import get_market_store
+
+
+def mock_seed(*inputs) -> int:
+    """Stable seed for a stage's inputs"""
+    data = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def mock_rng(*inputs) -> np.random.Generator:
+    """Generator for a stage's mock figures, seeded from its inputs
+
+    Re-analysing the same property reproduces the same figures, so saves of an
+    unchanged analysis hash the same and AnalysisStore can skip them.
+    """
+    return np.random.default_rng(mock_seed(*inputs))
+
+
+def generate_ultimate_analysis(address, city, state, zip_code, property_type, bedrooms, bathrooms,
+                              square_feet, year_built, list_price, condition, days_on_market,
+                              hoa_fees, property_taxes, params):
+    """Generate comprehensive ultimate analysis
+
+    Runs every stage in turn; wtf_analysis_dag runs the same stages concurrently.
+    """
+    
+    core = build_core_analysis(address, city, state, zip_code, property_type, bedrooms, bathrooms,
+                               square_feet, year_built, list_price, condition, days_on_market,
+                               hoa_fees, property_taxes, params)
+    property_data = core['property_data']
+    metrics = core['metrics']
+    arv = metrics['arv']
+    rehab_cost = metrics['rehab_cost']
+    max_offers = metrics['max_offers']
+    
+    # Generate comprehensive strategies
+    strategies = {
+        'wholesale': generate_enhanced_wholesale_strategy(max_offers, params),
+        'fix_flip': generate_enhanced_fix_flip_strategy(arv, rehab_cost, max_offers, params),
+        'buy_hold': generate_enhanced_buy_hold_strategy(property_data, max_offers, params),
+        'brrrr': generate_enhanced_brrrr_strategy(property_data, arv, rehab_cost, max_offers, params),
+        'creative_finance': generate_creative_finance_strategy(property_data, arv, max_offers, params)
+    }
+    
+    # Generate market data
+    market_data = generate_enhanced_market_data(city, state, zip_code)
+    
+    # Generate AI insights
+    ai_insights = generate_ai_insights(property_data, metrics, strategies, market_data)
+    
+    # Generate risk analysis
+    risk_analysis = generate_risk_analysis(property_data, metrics, market_data, params)
+    
+    # Generate comparables
+    comparables = generate_enhanced_comparables(property_data)
+    
+    return {
+        'property_data': property_data,
+        'metrics': metrics,
+        'strategies': strategies,
+        'market_data': market_data,
+        'ai_insights': ai_insights,
+        'risk_analysis': risk_analysis,
+        'comparables': comparables
+    }
+
+def build_core_analysis(address, city, state, zip_code, property_type, bedrooms, bathrooms,
+                        square_feet, year_built, list_price, condition, days_on_market,
+                        hoa_fees, property_taxes, params):
+    """Property data, offers and grade: the inputs every other analysis stage builds on"""
+    
+    rng = mock_rng('core', address, city, state, zip_code, property_type, bedrooms, bathrooms,
+                   square_feet, year_built, list_price, condition)
+    
+    # Enhanced property data with realistic calculations
+    zestimate = list_price * rng.uniform(0.92, 1.08)
+    rent_estimate = list_price * rng.uniform(0.005, 0.008)
+    
+    property_data = {
+        'address': address,
+        'city': city,
+        'state': state,
+        'zip_code': zip_code,
+        'property_type': property_type,
+        'bedrooms': bedrooms,
+        'bathrooms': bathrooms,
+        'square_feet': square_feet,
+        'year_built': year_built,
+        'list_price': list_price,
+        'zestimate': round(zestimate),
+        'rent_estimate': round(rent_estimate),
+        'condition': condition,
+        'days_on_market': days_on_market,
+        'price_per_sqft': round(list_price / square_feet),
+        'neighborhood': f"{city} - {rng.choice(['Downtown', 'Midtown', 'Uptown', 'Suburbs', 'Historic District', 'Waterfront'])}",
+        'school_rating': int(rng.integers(4, 10)),
+        'crime_score': int(rng.integers(40, 90)),
+        'walkability': int(rng.integers(30, 95)),
+        'property_taxes': property_taxes,
+        'hoa_fees': hoa_fees,
+        'data_sources': ['Zillow', 'PropStream', 'Privy', 'Rentometer']
+    }
+    
+    # Calculate enhanced metrics
+    arv = max(zestimate, list_price) * 1.05
+    rehab_cost = calculate_ultimate_rehab_cost(property_data, condition, square_feet, year_built)
+    
+    max_offers = {
+        '65_percent': max(0, (arv * 0.65) - rehab_cost),
+        '70_percent': max(0, (arv * 0.70) - rehab_cost),
+        '75_percent': max(0, (arv * 0.75) - rehab_cost),
+        '80_percent': max(0, (arv * 0.80) - rehab_cost),
+        '85_percent': max(0, (arv * 0.85) - rehab_cost)
+    }
+    
+    profit_potential = arv - max_offers['70_percent'] - rehab_cost
+    
+    # Advanced grading system
+    grade_score = calculate_deal_grade_score(profit_potential, arv, list_price, params)
+    
+    if grade_score >= 85:
+        grade = 'A'
+        strategy = 'Fix & Flip - Exceptional profit potential'
+    elif grade_score >= 70:
+        grade = 'B'
+        strategy = 'Multiple strategies viable'
+    elif grade_score >= 55:
+        grade = 'C'
+        strategy = 'Wholesale or creative financing'
+    else:
+        grade = 'D'
+        strategy = 'Pass - Insufficient margins'
+    
+    confidence_level = min(95, max(60, grade_score + int(rng.integers(-10, 10))))
+    
+    metrics = {
+        'arv': arv,
+        'rehab_cost': rehab_cost,
+        'max_offers': max_offers,
+        'profit_potential': profit_potential,
+        'overall_grade': grade,
+        'grade_score': grade_score,
+        'confidence_level': confidence_level,
+        'recommended_strategy': strategy
+    }
+    
+    return {'property_data': property_data, 'metrics': metrics}
+
+def calculate_ultimate_rehab_cost(property_data, condition, square_feet, year_built):
+    """Calculate ultimate rehab cost with detailed breakdown"""
+    
+    # Base costs by condition
+    condition_costs = {
+        'excellent': 0,
+        'good': 5,
+        'fair': 15,
+        'poor': 30,
+        'needs_rehab': 50
+    }
+    
+    base_cost_per_sqft = condition_costs.get(condition, 20)
+    
+    # Age factor
+    current_year = datetime.now().year
+    age = current_year - year_built
+    age_multiplier = 1.0 + max(0, (age - 25) * 0.02)
+    
+    # Base rehab
+    base_rehab = square_feet * base_cost_per_sqft * age_multiplier
+    
+    # Major systems
+    major_systems = {
+        'roof': 20000 if age > 20 or condition in ['poor', 'needs_rehab'] else 0,
+        'hvac': 15000 if age > 15 or condition in ['poor', 'needs_rehab'] else 0,
+        'electrical': 10000 if age > 40 or condition in ['poor', 'needs_rehab'] else 0,
+        'plumbing': 8000 if age > 35 or condition in ['poor', 'needs_rehab'] else 0,
+        'windows': 18000 if age > 25 or condition in ['poor', 'needs_rehab'] else 0,
+        'foundation': 15000 if age > 50 or condition == 'needs_rehab' else 0
+    }
+    
+    # Cosmetic improvements
+    cosmetic_costs = {
+        'kitchen': 30000 if condition in ['poor', 'needs_rehab'] else 15000 if condition == 'fair' else 0,
+        'bathrooms': 20000 if condition in ['poor', 'needs_rehab'] else 10000 if condition == 'fair' else 0,
+        'flooring': 12000 if condition in ['poor', 'needs_rehab'] else 6000 if condition == 'fair' else 0,
+        'paint_interior': 5000,
+        'paint_exterior': 4000,
+        'landscaping': 3000,
+        'appliances': 8000 if condition in ['poor', 'needs_rehab'] else 0
+    }
+    
+    # Additional costs
+    soft_costs = {
+        'permits': 3000,
+        'insurance': 2000,
+        'utilities': 1500,
+        'carrying_costs': 3000,
+        'dumpster': 1000
+    }
+    
+    # Calculate totals
+    major_total = sum(major_systems.values())
+    cosmetic_total = sum(cosmetic_costs.values())
+    soft_total = sum(soft_costs.values())
+    
+    subtotal = base_rehab + major_total + cosmetic_total + soft_total
+    
+    # Contingency based on complexity
+    if condition == 'needs_rehab':
+        contingency_rate = 0.25
+    elif condition == 'poor':
+        contingency_rate = 0.20
+    else:
+        contingency_rate = 0.15
+    
+    contingency = subtotal * contingency_rate
+    
+    total_rehab = subtotal + contingency
+    
+    return round(total_rehab)
+
+def calculate_deal_grade_score(profit_potential, arv, list_price, params):
+    """Calculate comprehensive deal grade score"""
+    
+    score = 0
+    
+    # Profit potential (40 points)
+    profit_ratio = profit_potential / arv if arv > 0 else 0
+    if profit_ratio >= 0.20:
+        score += 40
+    elif profit_ratio >= 0.15:
+        score += 32
+    elif profit_ratio >= 0.10:
+        score += 24
+    elif profit_ratio >= 0.05:
+        score += 16
+    else:
+        score += max(0, profit_ratio * 320)
+    
+    # Price vs market (20 points)
+    if list_price < arv * 0.85:
+        score += 20
+    elif list_price < arv * 0.95:
+        score += 15
+    elif list_price < arv * 1.05:
+        score += 10
+    else:
+        score += 5
+    
+    # ROI potential (20 points)
+    estimated_roi = profit_potential / list_price if list_price > 0 else 0
+    if estimated_roi >= params['target_roi'] / 100:
+        score += 20
+    else:
+        score += max(0, (estimated_roi / (params['target_roi'] / 100)) * 20)
+    
+    # Market factors (20 points)
+    # This would include neighborhood, schools, crime, etc.
+    score += int(mock_rng('grade', profit_potential, arv, list_price).integers(12, 20))  # Mock market score
+    
+    return min(100, round(score))
+
+def generate_enhanced_wholesale_strategy(max_offers, params):
+    """Generate enhanced wholesale strategy analysis"""
+    
+    rng = mock_rng('wholesale', max_offers)
+    assignment_fees = [5000, 8000, 12000, 15000, 20000, 25000, 30000, 40000, 50000]
+    scenarios = {}
+    
+    for fee in assignment_fees:
+        marketing_costs = 1000
+        legal_costs = 800
+        inspection_costs = 500
+        earnest_money = 1000
+        total_costs = marketing_costs + legal_costs + inspection_costs + earnest_money
+        
+        net_profit = fee - total_costs
+        roi = (net_profit / total_costs) * 100 if total_costs > 0 else 0
+        
+        # Timeline based on fee
+        if fee <= 10000:
+            timeline = '7-14 days'
+        elif fee <= 20000:
+            timeline = '14-21 days'
+        else:
+            timeline = '21-30 days'
+        
+        scenarios[f'${fee:,}'] = {
+            'assignment_fee': fee,
+            'marketing_costs': marketing_costs,
+            'legal_costs': legal_costs,
+            'inspection_costs': inspection_costs,
+            'earnest_money': earnest_money,
+            'total_costs': total_costs,
+            'net_profit': net_profit,
+            'roi': roi,
+            'timeline': timeline,
+            'risk_level': 'Low',
+            'difficulty': 'Easy' if fee <= 15000 else 'Medium' if fee <= 25000 else 'Hard'
+        }
+    
+    best_scenario = max(scenarios.values(), key=lambda x: x['roi'])
+    
+    return {
+        'scenarios': scenarios,
+        'best_scenario': best_scenario,
+        'recommended_fee': params.get('assignment_fee', 15000),
+        'strategy_grade': 'A' if best_scenario['roi'] > 400 else 'B' if best_scenario['roi'] > 250 else 'C',
+        'market_demand': rng.choice(['High', 'Medium', 'Low']),
+        'buyer_pool_size': int(rng.integers(50, 200))
+    }
+
+def generate_enhanced_fix_flip_strategy(arv, rehab_cost, max_offers, params):
+    """Generate enhanced fix and flip strategy analysis"""
+    
+    rng = mock_rng('fix_flip', arv, rehab_cost, max_offers)
+    scenarios = {}
+    
+    for rule, offer_price in max_offers.items():
+        total_investment = offer_price + rehab_cost
+        
+        # Detailed costs
+        holding_costs = total_investment * 0.01 * params['holding_period']  # Monthly holding
+        selling_costs = arv * 0.08  # 6% realtor + 2% closing
+        carrying_costs = total_investment * 0.02  # Insurance, taxes, utilities
+        unexpected_costs = rehab_cost * 0.1  # 10% buffer
+        
+        total_costs = total_investment + holding_costs + selling_costs + carrying_costs + unexpected_costs
+        gross_profit = arv - total_costs
+        roi = (gross_profit / total_investment) * 100 if total_investment > 0 else 0
+        
+        # Annual ROI
+        annual_roi = roi * (12 / params['holding_period']) if params['holding_period'] > 0 else 0
+        
+        scenarios[rule] = {
+            'purchase_price': offer_price,
+            'rehab_cost': rehab_cost,
+            'holding_costs': holding_costs,
+            'selling_costs': selling_costs,
+            'carrying_costs': carrying_costs,
+            'unexpected_costs': unexpected_costs,
+            'total_investment': total_investment,
+            'total_costs': total_costs,
+            'gross_profit': gross_profit,
+            'roi': roi,
+            'annual_roi': annual_roi,
+            'timeline': f"{params['holding_period']} months",
+            'risk_level': 'Medium-High',
+            'complexity': 'Medium' if rehab_cost < 50000 else 'High'
+        }
+    
+    best_scenario = max(scenarios.values(), key=lambda x: x['annual_roi'])
+    
+    return {
+        'scenarios': scenarios,
+        'best_scenario': best_scenario,
+        'recommended_rule': '70_percent',
+        'strategy_grade': 'A' if best_scenario['annual_roi'] > 30 else 'B' if best_scenario['annual_roi'] > 20 else 'C',
+        'market_conditions': rng.choice(['Favorable', 'Neutral', 'Challenging']),
+        'resale_demand': rng.choice(['High', 'Medium', 'Low'])
+    }
+
+def _rental_inputs(property_data, offer_prices, params):
+    """Monthly fixed costs and the rent-proportional operating rate shared by rental strategies"""
+    monthly_taxes = property_data['property_taxes'] / 12
+    monthly_insurance = offer_prices * (params.get('insurance_rate', 0.8) / 100 / 12)
+    monthly_hoa = property_data.get('hoa_fees', 0)
+    rent_shares = {
+        'maintenance': params.get('maintenance_rate', 5) / 100,
+        'vacancy': params.get('vacancy_rate', 5) / 100,
+        'management': params.get('management_fee', 8) / 100,
+        'capex': params.get('capex_rate', 5) / 100
+    }
+    return monthly_taxes, monthly_insurance, monthly_hoa, rent_shares
+
+def generate_enhanced_buy_hold_strategy(property_data, max_offers, params):
+    """Generate enhanced buy and hold strategy analysis"""
+    
+    rng = mock_rng('buy_hold', property_data, max_offers)
+    scenarios = {}
+    rent_estimate = property_data['rent_estimate']
+    rules = list(max_offers)
+    
+    # All offer rules are projected together as one batch of fully amortized loans
+    offer_prices = np.array([max_offers[rule] for rule in rules], dtype=float)
+    down_payments = offer_prices * (params['down_payment_pct'] / 100)
+    cash_invested = down_payments + offer_prices * (params.get('closing_costs_pct', 3) / 100)
+    loan_amounts = offer_prices - down_payments
+    monthly_taxes, monthly_insurance, monthly_hoa, rent_shares = _rental_inputs(property_data, offer_prices, params)
+    
+    projection = project_rental(
+        offer_prices, cash_invested, loan_amounts, params['interest_rate'] / 100, rent_estimate,
+        monthly_taxes=monthly_taxes, monthly_insurance=monthly_insurance, monthly_hoa=monthly_hoa,
+        operating_rate=sum(rent_shares.values()),
+        appreciation=params.get('appreciation_rate', 3) / 100,
+        rent_growth=params.get('rent_growth_rate', DEFAULT_RENT_GROWTH * 100) / 100,
+        expense_growth=params.get('expense_growth_rate', DEFAULT_EXPENSE_GROWTH * 100) / 100,
+        term_years=params.get('loan_term_years', DEFAULT_TERM_YEARS),
+        horizon_years=10
+    )
+    
+    for i, rule in enumerate(rules):
+        invested = cash_invested[i] > 0
+        irr = projection['irr'][i]
+        
+        scenarios[rule] = {
+            'purchase_price': max_offers[rule],
+            'down_payment': float(down_payments[i]),
+            'cash_invested': float(cash_invested[i]),
+            'loan_amount': float(loan_amounts[i]),
+            'monthly_cash_flow': float(projection['monthly_cash_flow'][i]),
+            'annual_cash_flow': float(projection['annual_cash_flow'][i]),
+            'cash_on_cash': float(projection['cash_on_cash'][i]) if invested else 0,
+            'cap_rate': float(projection['cap_rate'][i]),
+            'dscr': float(projection['dscr'][i]),
+            'year_10_value': float(projection['horizon_value'][i]),
+            'year_10_loan_balance': float(projection['horizon_balance'][i]),
+            'year_10_equity': float(projection['horizon_equity'][i]),
+            'irr': float(irr) * 100 if invested and np.isfinite(irr) else 0,
+            'expense_breakdown': {
+                'piti': float(projection['monthly_payment'][i]),
+                'taxes': monthly_taxes,
+                'insurance': float(monthly_insurance[i]),
+                'hoa': monthly_hoa,
+                'maintenance': rent_estimate * rent_shares['maintenance'],
+                'vacancy': rent_estimate * rent_shares['vacancy'],
+                'management': rent_estimate * rent_shares['management'],
+                'capex': rent_estimate * rent_shares['capex']
+            },
+            'risk_level': 'Medium'
+        }
+    
+    best_scenario = max(scenarios.values(), key=lambda x: x['irr'])
+    
+    return {
+        'scenarios': scenarios,
+        'best_scenario': best_scenario,
+        'recommended_rule': '75_percent',
+        'strategy_grade': 'A' if best_scenario['cash_on_cash'] > 12 else 'B' if best_scenario['cash_on_cash'] > 8 else 'C',
+        'rental_demand': rng.choice(['High', 'Medium', 'Low']),
+        'rent_growth_potential': f"{rng.uniform(2, 6):.1f}% annually"
+    }
+
+def generate_enhanced_brrrr_strategy(property_data, arv, rehab_cost, max_offers, params):
+    """Generate enhanced BRRRR strategy analysis"""
+    
+    rng = mock_rng('brrrr', property_data, arv, rehab_cost, max_offers)
+    scenarios = {}
+    rent_estimate = property_data['rent_estimate']
+    rules = list(max_offers)
+    
+    offer_prices = np.array([max_offers[rule] for rule in rules], dtype=float)
+    total_investments = offer_prices + rehab_cost
+    
+    # After rehab refinance (75% of ARV typically)
+    refi_percentage = 0.75
+    refi_amount = arv * refi_percentage
+    cash_recovered = np.minimum(refi_amount, total_investments)
+    cash_left_in_deal = np.maximum(0, total_investments - cash_recovered)
+    
+    # Cash flow after refi on the same expense model as buy and hold, valued at ARV
+    monthly_taxes, monthly_insurance, monthly_hoa, rent_shares = _rental_inputs(property_data, arv, params)
+    projection = project_rental(
+        arv, cash_left_in_deal, refi_amount, params['interest_rate'] / 100, rent_estimate,
+        monthly_taxes=monthly_taxes, monthly_insurance=monthly_insurance, monthly_hoa=monthly_hoa,
+        operating_rate=sum(rent_shares.values()),
+        appreciation=params.get('appreciation_rate', 3) / 100,
+        rent_growth=params.get('rent_growth_rate', DEFAULT_RENT_GROWTH * 100) / 100,
+        expense_growth=params.get('expense_growth_rate', DEFAULT_EXPENSE_GROWTH * 100) / 100,
+        term_years=params.get('loan_term_years', DEFAULT_TERM_YEARS),
+        horizon_years=10
+    )
+    
+    for i, rule in enumerate(rules):
+        total_investment = float(total_investments[i])
+        recovered = float(cash_recovered[i])
+        left_in_deal = float(cash_left_in_deal[i])
+        annual_cash_flow = float(projection['annual_cash_flow'][i])
+        
+        # Returns on remaining capital
+        if left_in_deal > 0:
+            cash_on_cash = (annual_cash_flow / left_in_deal) * 100
+        else:
+            cash_on_cash = float('inf')  # Infinite return if no cash left
+        
+        recovery_percentage = (recovered / total_investment) * 100 if total_investment > 0 else 0
+        
+        # Scale analysis
+        properties_per_year = 4 if recovery_percentage > 90 else 2 if recovery_percentage > 80 else 1
+        annual_portfolio_growth = properties_per_year * recovered
+        
+        scenarios[rule] = {
+            'purchase_price': max_offers[rule],
+            'rehab_cost': rehab_cost,
+            'total_investment': total_investment,
+            'refi_amount': refi_amount,
+            'cash_recovered': recovered,
+            'cash_left_in_deal': left_in_deal,
+            'monthly_payment': float(projection['monthly_payment'][i]),
+            'monthly_cash_flow': float(projection['monthly_cash_flow'][i]),
+            'annual_cash_flow': annual_cash_flow,
+            'dscr': float(projection['dscr'][i]),
+            'year_10_equity': float(projection['horizon_equity'][i]),
+            'cash_on_cash': min(cash_on_cash, 999),  # Cap for display
+            'recovery_percentage': recovery_percentage,
+            'properties_per_year': properties_per_year,
+            'annual_portfolio_growth': annual_portfolio_growth,
+            'risk_level': 'Medium-High',
+            'complexity': 'High'
+        }
+    
+    best_scenario = max(scenarios.values(), key=lambda x: x['recovery_percentage'])
+    
+    return {
+        'scenarios': scenarios,
+        'best_scenario': best_scenario,
+        'recommended_rule': '70_percent',
+        'strategy_grade': 'A' if best_scenario['recovery_percentage'] > 95 else 'B' if best_scenario['recovery_percentage'] > 85 else 'C',
+        'refinance_likelihood': rng.choice(['High', 'Medium', 'Low']),
+        'scaling_potential': 'Excellent' if best_scenario['recovery_percentage'] > 90 else 'Good' if best_scenario['recovery_percentage'] > 80 else 'Limited'
+    }
+
+def generate_creative_finance_strategy(property_data, arv, max_offers, params):
+    """Generate creative financing strategy analysis"""
+    
+    strategies = {}
+    
+    # Subject To
+    monthly_payment = property_data.get('monthly_payment', property_data['list_price'] * 0.005)
+    rent_estimate = property_data['rent_estimate']
+    
+    strategies['subject_to'] = {
+        'name': 'Subject To',
+        'down_payment': 0,
+        'monthly_payment': monthly_payment,
+        'monthly_cash_flow': rent_estimate - monthly_payment - (rent_estimate * 0.2),  # 20% expenses
+        'initial_investment': 5000,  # Closing costs, legal
+        'risk_level': 'High',
+        'legality': 'Gray area - consult attorney',
+        'roi': ((rent_estimate - monthly_payment - (rent_estimate * 0.2)) * 12 / 5000) * 100
+    }
+    
+    # Seller Financing
+    seller_price = property_data['list_price']
+    down_payment_sf = seller_price * 0.10  # 10% down
+    seller_monthly = (seller_price - down_payment_sf) * 0.004  # 4.8% annual rate
+    
+    strategies['seller_finance'] = {
+        'name': 'Seller Financing',
+        'down_payment': down_payment_sf,
+        'monthly_payment': seller_monthly,
+        'monthly_cash_flow': rent_estimate - seller_monthly - (rent_estimate * 0.2),
+        'initial_investment': down_payment_sf + 3000,
+        'risk_level': 'Medium',
+        'legality': 'Legal with proper documentation',
+        'roi': ((rent_estimate - seller_monthly - (rent_estimate * 0.2)) * 12 / (down_payment_sf + 3000)) * 100
+    }
+    
+    # Lease Option
+    lease_payment = rent_estimate * 0.9  # Pay 90% of market rent
+    option_fee = 5000
+    
+    strategies['lease_option'] = {
+        'name': 'Lease Option',
+        'down_payment': option_fee,
+        'monthly_payment': lease_payment,
+        'monthly_cash_flow': rent_estimate - lease_payment,
+        'initial_investment': option_fee + 2000,
+        'risk_level': 'Medium',
+        'legality': 'Legal with proper contracts',
+        'roi': ((rent_estimate - lease_payment) * 12 / (option_fee + 2000)) * 100
+    }
+    
+    # Wrap-around Mortgage
+    wrap_rate = 0.08  # 8% to buyer
+    existing_rate = 0.06  # 6% existing mortgage
+    spread = wrap_rate - existing_rate
+    
+    strategies['wrap_mortgage'] = {
+        'name': 'Wrap-around Mortgage',
+        'down_payment': seller_price * 0.05,  # 5% down
+        'monthly_spread': (seller_price * 0.95) * (spread / 12),
+        'monthly_cash_flow': (seller_price * 0.95) * (spread / 12),
+        'initial_investment': seller_price * 0.05 + 3000,
+        'risk_level': 'High',
+        'legality': 'Complex - attorney required',
+        'roi': (((seller_price * 0.95) * (spread / 12)) * 12 / (seller_price * 0.05 + 3000)) * 100
+    }
+    
+    # Find best strategy
+    best_strategy = max(strategies.values(), key=lambda x: x['roi'])
+    
+    return {
+        'strategies': strategies,
+        'best_strategy': best_strategy,
+        'recommended': best_strategy['name'],
+        'overall_grade': 'A' if best_strategy['roi'] > 25 else 'B' if best_strategy['roi'] > 15 else 'C',
+        'complexity': 'High',
+        'legal_requirements': 'Attorney consultation strongly recommended'
+    }
+
+def generate_enhanced_market_data(city, state, zip_code):
+    """Market metrics from the market-data store (zip -> city -> state fallback)"""
+    
+    return get_market_store().get_market_data(zip_code, city, state)
+
+def generate_ai_insights(property_data, metrics, strategies, market_data):
+    """Generate AI-powered insights"""
+    
+    insights = []
+    
+    # Property-specific insights
+    if property_data['days_on_market'] > 60:
+        insights.append({
+            'type': 'opportunity',
+            'title': 'Extended Market Time',
+            'description': f"Property has been on market for {property_data['days_on_market']} days. This indicates potential seller motivation and negotiation opportunity.",
+            'action': 'Submit aggressive offer with quick closing timeline',
+            'confidence': 85
+        })
+    
+    # Market insights
+    if market_data['price_growth_yoy'] > 10:
+        insights.append({
+            'type': 'market',
+            'title': 'Strong Appreciation Market',
+            'description': f"Market showing {market_data['price_growth_yoy']:.1f}% annual growth. Consider buy-and-hold strategy.",
+            'action': 'Focus on acquisition and holding for appreciation',
+            'confidence': 90
+        })
+    
+    # Strategy insights
+    best_wholesale = strategies['wholesale']['best_scenario']
+    best_flip = strategies['fix_flip']['best_scenario']
+    
+    if best_wholesale['roi'] > best_flip['roi']:
+        insights.append({
+            'type': 'strategy',
+            'title': 'Wholesale Advantage',
+            'description': f"Wholesale ROI ({best_wholesale['roi']:.0f}%) exceeds fix & flip ROI ({best_flip['roi']:.1f}%).",
+            'action': 'Prioritize wholesale assignment strategy',
+            'confidence': 95
+        })
+    
+    # Financial insights
+    if metrics['profit_potential'] > 50000:
+        insights.append({
+            'type': 'financial',
+            'title': 'High Profit Potential',
+            'description': f"Deal shows exceptional profit potential of ${metrics['profit_potential']:,.0f}. Consider multiple exit strategies.",
+            'action': 'Secure contract quickly and evaluate all strategies',
+            'confidence': 92
+        })
+    
+    # Risk insights
+    if property_data['year_built'] < 1950:
+        insights.append({
+            'type': 'risk',
+            'title': 'Older Property Risk',
+            'description': f"Property built in {property_data['year_built']} may have hidden issues (lead, asbestos, electrical).",
+            'action': 'Budget extra for inspections and environmental testing',
+            'confidence': 80
+        })
+    
+    # Neighborhood insights
+    if property_data['school_rating'] >= 8:
+        insights.append({
+            'type': 'opportunity',
+            'title': 'Excellent School District',
+            'description': f"School rating of {property_data['school_rating']}/10 attracts families and supports property values.",
+            'action': 'Market to family buyers and emphasize school district',
+            'confidence': 95
+        })
+    
+    return insights
+
+def generate_risk_analysis(property_data, metrics, market_data, params=None):
+    """Generate comprehensive risk analysis; params['risk_simulation'] adds a Monte Carlo profit distribution"""
+    
+    params = params or {}
+    risks = []
+    risk_score = 0
+    simulation = None
+    
+    # Market risks
+    if market_data['inventory_months'] > 6:
+        risks.append({
+            'category': 'Market',
+            'risk': 'High Inventory',
+            'description': f"{market_data['inventory_months']:.1f} months inventory indicates buyer's market",
+            'impact': 'High',
+            'mitigation': 'Price aggressively, consider rent-ready condition'
+        })
+        risk_score += 20
+    
+    # Property risks
+    if property_data['year_built'] < 1960:
+        risks.append({
+            'category': 'Property',
+            'risk': 'Older Construction',
+            'description': 'Potential for outdated systems, materials, and code issues',
+            'impact': 'Medium',
+            'mitigation': 'Comprehensive inspection, extra rehab budget'
+        })
+        risk_score += 15
+    
+    # Financial risks
+    if metrics['profit_potential'] < 15000:
+        risks.append({
+            'category': 'Financial',
+            'risk': 'Thin Margins',
+            'description': f"Low profit potential of ${metrics['profit_potential']:,.0f}",
+            'impact': 'High',
+            'mitigation': 'Negotiate lower price or find cost savings'
+        })
+        risk_score += 25
+    
+    # Location risks
+    if property_data.get('crime_score', 50) < 40:
+        risks.append({
+            'category': 'Location',
+            'risk': 'High Crime Area',
+            'description': 'Crime score below 40 may affect resale and rental demand',
+            'impact': 'Medium',
+            'mitigation': 'Target cash buyers, price for quick sale'
+        })
+        risk_score += 10
+    
+    # Market timing risks
+    if market_data['price_growth_yoy'] < 0:
+        risks.append({
+            'category': 'Timing',
+            'risk': 'Declining Market',
+            'description': f"Market down {abs(market_data['price_growth_yoy']):.1f}% year-over-year",
+            'impact': 'High',
+            'mitigation': 'Focus on cash flow, avoid speculation'
+        })
+        risk_score += 20
+    
+    # Simulated downside of a flip at the 70% offer
+    if params.get('risk_simulation'):
+        deal = {
+            'purchase_price': metrics['max_offers']['70_percent'],
+            'arv': metrics['arv'],
+            'rehab_cost': metrics['rehab_cost'],
+            'holding_months': params.get('holding_period', 6),
+            'interest_rate': params.get('interest_rate', 10),
+            'monthly_rent': property_data.get('rent_estimate', 0),
+            'year_built': property_data['year_built'],
+            'market_data': market_data,
+            'target_profit': params.get('profit_margin_min', 15000)
+        }
+        simulation = simulate_deal(deal, samples=params.get('simulation_samples', DEFAULT_SAMPLES),
+                                   seed=mock_seed('simulation', deal))
+        
+        if simulation['probability_of_loss'] > 0.15:
+            risks.append({
+                'category': 'Financial',
+                'risk': 'Simulated Loss Probability',
+                'description': f"{simulation['probability_of_loss']:.0%} of {simulation['samples']:,} simulated outcomes lose money "
+                               f"(95% VaR ${simulation['var_95']:,.0f})",
+                'impact': 'High' if simulation['probability_of_loss'] > 0.3 else 'Medium',
+                'mitigation': 'Lower the offer, tighten the rehab scope or line up a rental exit'
+            })
+            risk_score += 20 if simulation['probability_of_loss'] > 0.3 else 10
+    
+    # Overall risk assessment
+    if risk_score <= 20:
+        risk_level = 'Low'
+        risk_color = '#10B981'
+    elif risk_score <= 40:
+        risk_level = 'Medium'
+        risk_color = '#F59E0B'
+    else:
+        risk_level = 'High'
+        risk_color = '#EF4444'
+    
+    return {
+        'risks': risks,
+        'risk_score': risk_score,
+        'risk_level': risk_level,
+        'risk_color': risk_color,
+        'recommendation': 'Proceed with caution' if risk_score > 40 else 'Acceptable risk' if risk_score > 20 else 'Low risk opportunity',
+        'simulation': simulation
+    }
+
+def generate_enhanced_comparables(property_data):
+    """Generate enhanced comparable sales"""
+    
+    rng = mock_rng('comparables', property_data)
+    comparables = []
+    base_price = property_data['list_price']
+    
+    for i in range(6):
+        # Generate realistic comparable properties
+        comp_price = base_price * rng.uniform(0.85, 1.15)
+        comp_sqft = property_data['square_feet'] * rng.uniform(0.9, 1.1)
+        days_ago = int(rng.integers(15, 180))
+        
+        comparables.append({
+            'address': f"{int(rng.integers(100, 9999))} {rng.choice(['Oak', 'Elm', 'Pine', 'Maple', 'Cedar', 'Birch'])} {rng.choice(['St', 'Ave', 'Dr', 'Ln', 'Ct'])}",
+            'price': comp_price,
+            'sqft': comp_sqft,
+            'price_per_sqft': comp_price / comp_sqft,
+            'bedrooms': property_data['bedrooms'] + int(rng.integers(-1, 2)),
+            'bathrooms': property_data['bathrooms'] + rng.uniform(-0.5, 1.0),
+            'year_built': property_data['year_built'] + int(rng.integers(-10, 10)),
+            'days_ago': days_ago,
+            'status': 'Sold',
+            'dom': int(rng.integers(5, 90)),
+            'distance': rng.uniform(0.1, 2.5)
+        })
+    
+    # Sort by relevance (price similarity)
+    comparables.sort(key=lambda x: abs(x['price'] - base_price))
+    
+    return comparables
+
+class RealEstateCalculatorEngine:
+    """Advanced real estate calculation engine"""
+    
+    @staticmethod
+    def calculate_deal_grade(property_data):
+        """Calculate professional deal grade A-D"""
+        
+        investment = property_data['investment_analysis']
+        wholesale = investment['wholesale']
+        rental = property_data['rental_analysis']
+        
+        score = 0
+        max_score = 100
+        
+        # Profit margin (40 points)
+        profit_margin = wholesale['profit_margin']
+        if profit_margin >= 30: score += 40
+        elif profit_margin >= 25: score += 35
+        elif profit_margin >= 20: score += 30
+        elif profit_margin >= 15: score += 25
+        elif profit_margin >= 10: score += 15
+        else: score += max(0, profit_margin * 1.5)
+        
+        # Location factors (25 points)
+        neighborhood = property_data['neighborhood_data']
+        if neighborhood['school_rating'] >= 8: score += 8
+        elif neighborhood['school_rating'] >= 6: score += 5
+        else: score += 2
+        
+        if neighborhood['crime_score'] >= 80: score += 8
+        elif neighborhood['crime_score'] >= 60: score += 5
+        else: score += 2
+        
+        if neighborhood['growth_rate'] > 0.05: score += 9
+        elif neighborhood['growth_rate'] > 0.02: score += 6
+        else: score += 3
+        
+        # Market conditions (20 points)
+        market = property_data['market_analysis']
+        market_points = 0
+        if market['market_trend'] == 'hot': market_points += 8
+        elif market['market_trend'] == 'warm': market_points += 6
+        else: market_points += 3
+        
+        if market['inventory_level'] == 'low': market_points += 6
+        else: market_points += 3
+        
+        if property_data['days_on_market'] > 60: market_points += 6  # Motivated seller
+        
+        score += market_points
+        
+        # Property condition (15 points)
+        condition_score = property_data['condition_score']
+        score += int(condition_score * 0.15)
+        
+        # Normalize score
+        final_score = min(100, max(0, score))
+        
+        if final_score >= 85:
+            grade = 'A'
+            strategy = 'Excellent deal - Multiple strategies viable'
+        elif final_score >= 70:
+            grade = 'B' 
+            strategy = 'Good deal - Fix & flip or wholesale'
+        elif final_score >= 55:
+            grade = 'C'
+            strategy = 'Marginal deal - Wholesale only'
+        else:
+            grade = 'D'
+            strategy = 'Pass - Insufficient margins'
+        
+        return {
+            'grade': grade,
+            'score': final_score,
+            'strategy': strategy,
+            'confidence': min(95, max(65, final_score + int(mock_rng('deal_grade', property_data).integers(-5, 10))))
+        }
+
+def calculate_lead_score(lead_data):
+    """Calculate lead score based on various factors"""
+    score = 0
+    
+    # Motivation scoring (30 points max)
+    high_motivation = ["Divorce", "Financial Hardship", "Behind on Payments", "Health Issues"]
+    medium_motivation = ["Job Relocation", "Inherited Property", "Tired Landlord"]
+    
+    for motivation in lead_data.get('motivation', []):
+        if motivation in high_motivation:
+            score += 10
+        elif motivation in medium_motivation:
+            score += 5
+    
+    # Timeline scoring (25 points max)
+    timeline_scores = {
+        "ASAP": 25,
+        "1-30 days": 20,
+        "30-60 days": 15,
+        "60-90 days": 10,
+        "90+ days": 5,
+        "Flexible": 8
+    }
+    score += timeline_scores.get(lead_data.get('timeline'), 0)
+    
+    # Equity scoring (25 points max)
+    equity = lead_data.get('equity', 0)
+    if equity >= 100000:
+        score += 25
+    elif equity >= 50000:
+        score += 20
+    elif equity >= 25000:
+        score += 15
+    elif equity >= 10000:
+        score += 10
+    elif equity > 0:
+        score += 5
+    
+    # Condition scoring (10 points max)
+    condition_scores = {
+        "Excellent": 2,
+        "Good": 4,
+        "Fair": 6,
+        "Poor": 8,
+        "Needs Major Repairs": 10
+    }
+    score += condition_scores.get(lead_data.get('condition'), 0)
+    
+    # Occupancy scoring (10 points max)
+    occupancy_scores = {
+        "Vacant": 10,
+        "Owner Occupied": 8,
+        "Tenant Occupied": 5
+    }
+    score += occupancy_scores.get(lead_data.get('occupancy'), 0)
+    
+    return min(score, 100)
@@ -0,0 +1,234 @@
+"""
+WTF Analysis DAG - Concurrent execution mode for generate_ultimate_analysis
+
+The analysis is split into stages with explicit dependencies:
+
+    core, market_data               (no inputs; start together)
+    five strategies, comparables    <- core
+    risk_analysis                   <- core, market_data
+    ai_insights                     <- core, market_data, the five strategies
+
+A stage is submitted to a process-wide pool as soon as its dependencies
+finish, so the strategy generators, comparables and risk simulation run side
+by side. Every stage has a timeout and is timed (queue wait and run time).
+Optional stages (ai_insights, risk_analysis, comparables) that time out or
+fail are replaced by an empty fallback and the result is marked partial;
+a required stage that does not finish raises AnalysisStageError.
+
+A timed-out stage cannot be interrupted: its worker finishes in the background
+and the result is dropped. The pool is threads by default; set
+WTF_ANALYSIS_EXECUTOR=process for a process pool when stages are CPU-bound
+Python. WTF_ANALYSIS_DAG=1 makes run_analysis() use this mode.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+from wtf_analysis import (build_core_analysis, generate_ai_insights, generate_creative_finance_strategy,
+                          generate_enhanced_brrrr_strategy, generate_enhanced_buy_hold_strategy,
+                          generate_enhanced_comparables, generate_enhanced_fix_flip_strategy,
+                          generate_enhanced_market_data, generate_enhanced_wholesale_strategy,
+                          generate_risk_analysis, generate_ultimate_analysis)
+from wtf_instrumentation import TRACER
+
+logger = logging.getLogger(__name__)
+
+DAG_SETTINGS = {
+    'enabled': os.environ.get('WTF_ANALYSIS_DAG', '') == '1',
+    'executor': os.environ.get('WTF_ANALYSIS_EXECUTOR', 'thread'),
+    'workers': int(os.environ.get('WTF_ANALYSIS_WORKERS', str(min(8, os.cpu_count() or 1)))),
+    'stage_timeout': float(os.environ.get('WTF_ANALYSIS_STAGE_TIMEOUT', '10'))
+}
+
+INPUT_NAMES = ('address', 'city', 'state', 'zip_code', 'property_type', 'bedrooms', 'bathrooms',
+               'square_feet', 'year_built', 'list_price', 'condition', 'days_on_market', 'hoa_fees',
+               'property_taxes')
+
+STRATEGY_STAGES = ('wholesale', 'fix_flip', 'buy_hold', 'brrrr', 'creative_finance')
+
+
+def _metrics(results: Dict) -> Dict:
+    return results['core']['metrics']
+
+
+def _property(results: Dict) -> Dict:
+    return results['core']['property_data']
+
+
+# name -> fn, deps, args(inputs, params, results), and for optional stages the fallback that replaces
+# a result that timed out or failed. Stages are listed in dependency order.
+ANALYSIS_STAGES = {
+    'core': {
+        'fn': build_core_analysis, 'deps': (),
+        'args': lambda inputs, params, r: (*(inputs[name] for name in INPUT_NAMES), params)
+    },
+    'market_data': {
+        'fn': generate_enhanced_market_data, 'deps': (),
+        'args': lambda inputs, params, r: (inputs['city'], inputs['state'], inputs['zip_code'])
+    },
+    'wholesale': {
+        'fn': generate_enhanced_wholesale_strategy, 'deps': ('core',),
+        'args': lambda inputs, params, r: (_metrics(r)['max_offers'], params)
+    },
+    'fix_flip': {
+        'fn': generate_enhanced_fix_flip_strategy, 'deps': ('core',),
+        'args': lambda inputs, params, r: (_metrics(r)['arv'], _metrics(r)['rehab_cost'],
+                                           _metrics(r)['max_offers'], params)
+    },
+    'buy_hold': {
+        'fn': generate_enhanced_buy_hold_strategy, 'deps': ('core',),
+        'args': lambda inputs, params, r: (_property(r), _metrics(r)['max_offers'], params)
+    },
+    'brrrr': {
+        'fn': generate_enhanced_brrrr_strategy, 'deps': ('core',),
+        'args': lambda inputs, params, r: (_property(r), _metrics(r)['arv'], _metrics(r)['rehab_cost'],
+                                           _metrics(r)['max_offers'], params)
+    },
+    'creative_finance': {
+        'fn': generate_creative_finance_strategy, 'deps': ('core',),
+        'args': lambda inputs, params, r: (_property(r), _metrics(r)['arv'], _metrics(r)['max_offers'], params)
+    },
+    'comparables': {
+        'fn': generate_enhanced_comparables, 'deps': ('core',), 'optional': True,
+        'args': lambda inputs, params, r: (_property(r),),
+        'fallback': lambda: []
+    },
+    'risk_analysis': {
+        'fn': generate_risk_analysis, 'deps': ('core', 'market_data'), 'optional': True,
+        'args': lambda inputs, params, r: (_property(r), _metrics(r), r['market_data'], params),
+        'fallback': lambda: {'risks': [], 'risk_score': 0, 'risk_level': 'Unknown', 'risk_color': '#6B7280',
+                             'recommendation': 'Risk analysis did not finish; re-run the analysis',
+                             'simulation': None}
+    },
+    'ai_insights': {
+        'fn': generate_ai_insights, 'deps': ('core', 'market_data', *STRATEGY_STAGES), 'optional': True,
+        'args': lambda inputs, params, r: (_property(r), _metrics(r), {name: r[name] for name in STRATEGY_STAGES},
+                                           r['market_data']),
+        'fallback': lambda: []
+    }
+}
+
+
+class AnalysisStageError(RuntimeError):
+    """A required analysis stage timed out or failed"""
+
+    def __init__(self, stage: str, status: str, stages: Dict):
+        super().__init__(f"Analysis stage '{stage}' {status}")
+        self.stage = stage
+        self.status = status
+        self.stages = stages
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_pool():
+    """Process-wide stage pool shared by every analysis, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if DAG_SETTINGS['executor'] == 'process':
+                _pool = ProcessPoolExecutor(max_workers=DAG_SETTINGS['workers'])
+            else:
+                _pool = ThreadPoolExecutor(max_workers=DAG_SETTINGS['workers'], thread_name_prefix='analysis')
+        return _pool
+
+
+def _timed_call(fn: Callable, args: tuple):
+    """Runs on the worker: (result, wall-clock start, run time in ms)"""
+    started = time.time()
+    begin = time.perf_counter()
+    result = fn(*args)
+    return result, started, (time.perf_counter() - begin) * 1000
+
+
+def run_analysis_dag(address, city, state, zip_code, property_type, bedrooms, bathrooms,
+                     square_feet, year_built, list_price, condition, days_on_market,
+                     hoa_fees, property_taxes, params, executor=None,
+                     timeouts: Optional[Dict[str, float]] = None) -> Dict:
+    """generate_ultimate_analysis with independent stages run concurrently
+
+    timeouts: per-stage seconds overriding DAG_SETTINGS['stage_timeout'].
+    The result has the usual keys plus 'stages' ({name: {status, run_ms,
+    queued_ms}}) and 'partial' (True when an optional stage fell back).
+    """
+    inputs = dict(zip(INPUT_NAMES, (address, city, state, zip_code, property_type, bedrooms, bathrooms,
+                                    square_feet, year_built, list_price, condition, days_on_market,
+                                    hoa_fees, property_taxes)))
+    pool = executor or get_analysis_pool()
+    timeouts = timeouts or {}
+    results, stages = {}, {name: {'status': 'waiting'} for name in ANALYSIS_STAGES}
+    running = {}  # future -> (stage name, submitted wall clock, deadline)
+
+    def finish(name: str, status: str, value=None):
+        stage = ANALYSIS_STAGES[name]
+        stages[name]['status'] = status
+        if status == 'ok':
+            results[name] = value
+        elif stage.get('optional'):
+            results[name] = stage['fallback']()
+        else:
+            raise AnalysisStageError(name, status, stages)
+
+    while True:
+        # Submit every stage whose inputs are ready; a stage whose input fell back is skipped
+        for name, stage in ANALYSIS_STAGES.items():
+            if stages[name]['status'] != 'waiting':
+                continue
+            dep_status = [stages[dep]['status'] for dep in stage['deps']]
+            if any(status in ('timeout', 'error', 'skipped') for status in dep_status):
+                finish(name, 'skipped')
+            elif all(status == 'ok' for status in dep_status):
+                future = pool.submit(_timed_call, stage['fn'], stage['args'](inputs, params, results))
+                deadline = time.monotonic() + timeouts.get(name, DAG_SETTINGS['stage_timeout'])
+                running[future] = (name, time.time(), deadline)
+                stages[name]['status'] = 'running'
+        if not running:
+            break
+
+        next_deadline = min(deadline for _, _, deadline in running.values())
+        done, _ = wait(running, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            name, submitted, _ = running.pop(future)
+            try:
+                value, started, run_ms = future.result()
+            except Exception as e:
+                logger.warning(f"Analysis stage {name} failed: {str(e)}")
+                finish(name, 'error')
+                continue
+            stages[name].update(run_ms=round(run_ms, 3), queued_ms=round(max(0.0, started - submitted) * 1000, 3))
+            TRACER.add_span(f"stage:{name}", 'analysis', time.perf_counter() - run_ms / 1000, run_ms)
+            finish(name, 'ok', value)
+
+        now = time.monotonic()
+        for future, (name, submitted, deadline) in list(running.items()):
+            if now >= deadline:
+                del running[future]
+                future.cancel()
+                logger.warning(f"Analysis stage {name} timed out")
+                finish(name, 'timeout')
+
+    return {
+        'property_data': results['core']['property_data'],
+        'metrics': results['core']['metrics'],
+        'strategies': {name: results[name] for name in STRATEGY_STAGES},
+        'market_data': results['market_data'],
+        'ai_insights': results['ai_insights'],
+        'risk_analysis': results['risk_analysis'],
+        'comparables': results['comparables'],
+        'stages': stages,
+        'partial': any(stage['status'] != 'ok' for stage in stages.values())
+    }
+
+
+def run_analysis(*args, **kwargs) -> Dict:
+    """generate_ultimate_analysis, or run_analysis_dag when WTF_ANALYSIS_DAG=1"""
+    if DAG_SETTINGS['enabled']:
+        return run_analysis_dag(*args, **kwargs)
+    return generate_ultimate_analysis(*args)
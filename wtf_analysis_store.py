@@ -0,0 +1,527 @@
+"""
+WTF Analysis Store - Incremental, content-addressed saves of deal analyses
+
+Saving an analysis upserts one properties row per (user, normalized address)
+instead of inserting a new row every time. Two hashes keep repeat saves cheap:
+
+- analysis_hash: blake2b of the canonical analysis JSON. The payload is stored
+  once in analysis_blobs under that hash, compressed with zstd when the
+  zstandard package is installed and zlib otherwise.
+- content_hash: blake2b of the property columns plus analysis_hash. A save
+  whose content_hash matches the stored row is skipped without compressing
+  or writing anything.
+
+With msgpack installed, payloads are stored as msgpack instead of JSON text,
+and every scenario table (a dict of scenarios sharing numeric fields, such as
+strategies -> scenarios) becomes one float32 grid, column-major by field.
+Without msgpack they stay lossless JSON; both decode the same way.
+
+grade, grade_score, confidence, best_strategy and best_roi are copied into
+indexed properties columns, so list views filter and sort without touching
+the payload. The payload is decoded only when an analysis is opened
+(load_analysis / LazyAnalysis). properties.analysis_data is left NULL for rows
+saved here; decode_analysis still accepts the legacy inline JSON, and
+
+    python -m wtf_analysis_store migrate [--db wtf_ultimate.db]
+
+moves legacy rows to the current codec and fills their promoted columns.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import uuid
+import zlib
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from wtf_autocomplete import normalize_address
+from wtf_schema import DATABASE_PATH, ensure_schema
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Payloads smaller than this are stored uncompressed; compression would not pay for its header
+MIN_COMPRESS_BYTES = 512
+ZSTD_LEVEL = 6
+ZLIB_LEVEL = 6
+
+# Scenario tables with fewer rows than this stay as plain maps
+GRID_MIN_ROWS = 2
+GRID_KEY = '__grid__'
+# Integers up to 2**24 survive float32 exactly; larger integer columns are not put in grids
+FLOAT32_EXACT_INT = 2 ** 24
+
+# Strategy -> (best entry, ROI field, cap) as ranked on the strategy comparison chart
+STRATEGY_ROI_FIELDS = {
+    'wholesale': ('best_scenario', 'roi', None),
+    'fix_flip': ('best_scenario', 'annual_roi', None),
+    'buy_hold': ('best_scenario', 'cash_on_cash', None),
+    'brrrr': ('best_scenario', 'cash_on_cash', 100),
+    'creative_finance': ('best_strategy', 'roi', None)
+}
+
+# Columns copied out of the payload so list views never decode it
+PROMOTED_COLUMNS = ('grade', 'grade_score', 'confidence', 'best_strategy', 'best_roi')
+
+
+# Encoding
+def _plain(value):
+    # numpy scalars from the analysis engine serialize as their Python values
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def canonical_json(value) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=_plain).encode()
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def pack_grids(value):
+    """Replace each scenario table (dict of >= GRID_MIN_ROWS dicts sharing numeric fields) with a float32 grid"""
+    if isinstance(value, dict):
+        rows = list(value.values())
+        if len(rows) >= GRID_MIN_ROWS and all(isinstance(row, dict) for row in rows):
+            order = list(rows[0])
+            fields, ints = [], []
+            for field in order:
+                column = [row.get(field) for row in rows]
+                if not all(_is_number(v) for v in column):
+                    continue
+                if all(_is_int(v) for v in column):
+                    if any(abs(int(v)) > FLOAT32_EXACT_INT for v in column):
+                        continue
+                    ints.append(len(fields))
+                fields.append(field)
+            if fields:
+                grid = np.array([[row[field] for row in rows] for field in fields], dtype='<f4')
+                rest = [{k: pack_grids(v) for k, v in row.items() if k not in fields} for row in rows]
+                # Field order of each row, spelled out only where it differs from the first row
+                orders = [None if list(row) == order else list(row) for row in rows]
+                return {GRID_KEY: {'keys': list(value), 'order': order, 'orders': orders, 'fields': fields,
+                                   'ints': ints, 'values': grid.tobytes(), 'rest': rest}}
+        return {k: pack_grids(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [pack_grids(v) for v in value]
+    return value
+
+
+def unpack_grids(value):
+    if isinstance(value, dict):
+        grid = value.get(GRID_KEY) if len(value) == 1 else None
+        if grid is None:
+            return {k: unpack_grids(v) for k, v in value.items()}
+        fields, ints = grid['fields'], set(grid['ints'])
+        columns = np.frombuffer(grid['values'], dtype='<f4').reshape(len(fields), len(grid['keys'])).tolist()
+        table = {}
+        for i, (key, rest, order) in enumerate(zip(grid['keys'], grid['rest'], grid['orders'])):
+            row = {field: int(columns[j][i]) if j in ints else columns[j][i] for j, field in enumerate(fields)}
+            row.update((k, unpack_grids(v)) for k, v in rest.items())
+            table[key] = {k: row[k] for k in (order or grid['order'])}
+        return table
+    if isinstance(value, list):
+        return [unpack_grids(v) for v in value]
+    return value
+
+
+def serialize_analysis(analysis: Dict, raw_json: Optional[bytes] = None) -> Tuple[str, bytes]:
+    """(format, bytes): msgpack with float32 grids when msgpack is installed, else canonical JSON"""
+    if msgpack is not None:
+        return 'msgpack', msgpack.packb(pack_grids(analysis), default=_plain, use_bin_type=True)
+    return 'json', raw_json if raw_json is not None else canonical_json(analysis)
+
+
+def compress_payload(payload_format: str, raw: bytes) -> Tuple[str, bytes]:
+    """(codec, bytes); codecs are '<format>' or '<zstd|zlib>+<format>'"""
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return payload_format, raw
+    if zstandard is not None:
+        return f"zstd+{payload_format}", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return f"zlib+{payload_format}", zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_payload(codec: str, data: bytes) -> Tuple[str, bytes]:
+    """(format, raw bytes) of a stored payload"""
+    compression, _, payload_format = codec.rpartition('+')
+    if not compression:
+        return payload_format, bytes(data)
+    if compression == 'zlib':
+        return payload_format, zlib.decompress(data)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError('analysis payload is zstd-compressed but zstandard is not installed')
+        return payload_format, zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"unknown analysis codec: {codec}")
+
+
+def decode_analysis(analysis_data: Optional[str] = None, codec: Optional[str] = None,
+                    data: Optional[bytes] = None) -> Dict:
+    """Analysis dict from a stored blob, or from the legacy inline analysis_data JSON"""
+    try:
+        if data is not None and codec:
+            payload_format, raw = decompress_payload(codec, data)
+            if payload_format == 'msgpack':
+                if msgpack is None:
+                    raise ValueError('analysis payload is msgpack but msgpack is not installed')
+                analysis = unpack_grids(msgpack.unpackb(raw, raw=False, strict_map_key=False))
+            elif payload_format == 'json':
+                analysis = json.loads(raw)
+            else:
+                raise ValueError(f"unknown analysis codec: {codec}")
+        else:
+            analysis = json.loads(analysis_data or '{}')
+    except (TypeError, ValueError, zlib.error) as e:
+        logger.warning(f"Unreadable analysis payload: {str(e)}")
+        return {}
+    return analysis if isinstance(analysis, dict) else {}
+
+
+def encode_blob(analysis: Dict) -> Tuple[str, str, int, bytes]:
+    """(hash, codec, raw JSON size, stored bytes) for an analysis"""
+    raw = canonical_json(analysis)
+    codec, data = compress_payload(*serialize_analysis(analysis, raw))
+    return content_digest(raw), codec, len(raw), data
+
+
+# Promoted columns
+def _finite(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def strategy_rois(strategies: Dict) -> Dict[str, float]:
+    """ROI of each strategy's best scenario, as compared on the strategy chart"""
+    rois = {}
+    if not isinstance(strategies, dict):
+        return rois
+    for name, (entry, field, cap) in STRATEGY_ROI_FIELDS.items():
+        best = (strategies.get(name) or {}).get(entry) or {}
+        roi = _finite(best.get(field)) if isinstance(best, dict) else None
+        if roi is not None:
+            rois[name] = min(roi, cap) if cap is not None else roi
+    return rois
+
+
+def promoted_columns(analysis: Dict) -> Dict:
+    """grade, grade_score, confidence, best_strategy and best_roi of a (new or legacy) analysis"""
+    metrics = analysis.get('metrics') or {}
+    rois = strategy_rois(analysis.get('strategies'))
+    best_strategy = max(rois, key=rois.get) if rois else None
+    grade = analysis.get('grade') or analysis.get('investment_grade') or metrics.get('overall_grade')
+    return {
+        'grade': str(grade) if grade else None,
+        'grade_score': _finite(analysis.get('grade_score', metrics.get('grade_score'))),
+        'confidence': _finite(analysis.get('confidence_level', metrics.get('confidence_level'))),
+        'best_strategy': best_strategy,
+        'best_roi': rois[best_strategy] if best_strategy else None
+    }
+
+
+def address_key(property_data: Dict) -> str:
+    """Normalized 'street city state' an analysis is keyed by ('123 Main Street' == '123 main st')"""
+    return normalize_address(' '.join(str(property_data.get(field) or '')
+                                      for field in ('address', 'city', 'state', 'zip_code')))
+
+
+def load_analysis(cursor, property_id: str, user_id: Optional[str] = None) -> Optional[Dict]:
+    """Decoded analysis of a saved property, or None if there is no such property"""
+    sql = '''
+        SELECT p.analysis_data, b.codec, b.data
+        FROM properties p
+        LEFT JOIN analysis_blobs b ON b.hash = p.analysis_hash
+        WHERE p.id = ?
+    '''
+    params = [property_id]
+    if user_id is not None:
+        sql += ' AND p.user_id = ?'
+        params.append(user_id)
+    row = cursor.execute(sql, params).fetchone()
+    return decode_analysis(*row) if row else None
+
+
+class LazyAnalysis(Mapping):
+    """Read-only analysis that is fetched and decoded on first access"""
+
+    def __init__(self, store: 'AnalysisStore', property_id: str, user_id: Optional[str] = None):
+        self.store = store
+        self.property_id = property_id
+        self.user_id = user_id
+        self._analysis = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._analysis is not None
+
+    def _data(self) -> Dict:
+        if self._analysis is None:
+            self._analysis = self.store.load(self.property_id, self.user_id) or {}
+        return self._analysis
+
+    def __getitem__(self, key):
+        return self._data()[key]
+
+    def __iter__(self):
+        return iter(self._data())
+
+    def __len__(self):
+        return len(self._data())
+
+
+class AnalysisStore:
+    """Upserts analyses into properties, keeping payloads in analysis_blobs"""
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    @staticmethod
+    def build_analysis(metrics: Dict, analysis_result: Dict) -> Dict:
+        return {
+            'metrics': metrics,
+            'strategies': analysis_result.get('strategies', {}),
+            'market_data': analysis_result.get('market_data', {}),
+            'ai_insights': analysis_result.get('ai_insights', []),
+            'risk_analysis': analysis_result.get('risk_analysis', {}),
+            'grade': metrics['overall_grade'],
+            'grade_score': metrics['grade_score'],
+            'confidence_level': metrics['confidence_level']
+        }
+
+    @staticmethod
+    def build_columns(property_data: Dict, metrics: Dict) -> Dict:
+        return {
+            'address': property_data['address'],
+            'city': property_data['city'],
+            'state': property_data['state'],
+            'zip_code': property_data.get('zip_code', ''),
+            'property_type': property_data['property_type'],
+            'bedrooms': property_data['bedrooms'],
+            'bathrooms': property_data['bathrooms'],
+            'square_feet': property_data['square_feet'],
+            'year_built': property_data['year_built'],
+            'list_price': property_data['list_price'],
+            'zestimate': property_data.get('zestimate', 0),
+            'rent_estimate': property_data.get('rent_estimate', 0),
+            'arv': metrics['arv'],
+            'rehab_cost': metrics['rehab_cost'],
+            'max_offer': metrics['max_offers']['70_percent'],
+            'profit_potential': metrics['profit_potential'],
+            'condition': property_data.get('condition', 'fair'),
+            'days_on_market': property_data.get('days_on_market', 0),
+            'price_per_sqft': property_data.get('price_per_sqft', 0),
+            'neighborhood': property_data.get('neighborhood', ''),
+            'school_rating': property_data.get('school_rating', 0),
+            'crime_score': property_data.get('crime_score', 0),
+            'walkability': property_data.get('walkability', 0),
+            'property_taxes': property_data.get('property_taxes', 0),
+            'hoa_fees': property_data.get('hoa_fees', 0),
+            'data_sources': ','.join(property_data.get('data_sources', []))
+        }
+
+    @staticmethod
+    def _existing(cursor, user_id: str, key: str) -> Optional[Tuple]:
+        cursor.execute('''
+            SELECT id, content_hash, analysis_hash FROM properties
+            WHERE user_id = ? AND address_key = ?
+        ''', (user_id, key))
+        return cursor.fetchone()
+
+    def save(self, user_id: str, property_data: Dict, metrics: Dict, analysis_result: Dict) -> Dict:
+        """Insert or update the user's property at this address; unchanged saves write nothing
+
+        Returns {'success', 'property_id', 'created', 'changed'}.
+        """
+        analysis = self.build_analysis(metrics, analysis_result)
+        raw = canonical_json(analysis)
+        analysis_hash = content_digest(raw)
+        columns = self.build_columns(property_data, metrics)
+        columns.update(promoted_columns(analysis))
+        columns['analysis_hash'] = analysis_hash
+        content_hash = content_digest(canonical_json(columns))
+        key = address_key(property_data)
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            # Unchanged saves return before taking the write lock
+            existing = self._existing(cursor, user_id, key)
+            if existing and existing[1] == content_hash:
+                return {'success': True, 'property_id': existing[0], 'created': False, 'changed': False}
+
+            # Re-read under the write lock so two saves of one address cannot both insert
+            cursor.execute('BEGIN IMMEDIATE')
+            existing = self._existing(cursor, user_id, key)
+            if existing and existing[1] == content_hash:
+                conn.rollback()
+                return {'success': True, 'property_id': existing[0], 'created': False, 'changed': False}
+
+            codec, data = compress_payload(*serialize_analysis(analysis, raw))
+            cursor.execute('''
+                INSERT OR IGNORE INTO analysis_blobs (hash, codec, raw_size, data)
+                VALUES (?, ?, ?, ?)
+            ''', (analysis_hash, codec, len(raw), data))
+
+            columns.update({'content_hash': content_hash, 'analysis_data': None})
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if existing:
+                property_id, old_hash = existing[0], existing[2]
+                assignments = ', '.join(f"{column} = ?" for column in columns)
+                cursor.execute(f'''
+                    UPDATE properties SET {assignments}, updated_at = ?
+                    WHERE id = ?
+                ''', [*columns.values(), now, property_id])
+                if old_hash and old_hash != analysis_hash:
+                    cursor.execute('''
+                        DELETE FROM analysis_blobs
+                        WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM properties WHERE analysis_hash = ?)
+                    ''', (old_hash, old_hash))
+            else:
+                property_id = str(uuid.uuid4())
+                columns.update({
+                    'id': property_id,
+                    'user_id': user_id,
+                    'address_key': key,
+                    'images': json.dumps([]),
+                    'notes': f"Analysis completed on {datetime.now().strftime('%Y-%m-%d %H:%M')}. "
+                             f"Grade: {metrics['overall_grade']} ({metrics['grade_score']}/100)"
+                })
+                cursor.execute(f'''
+                    INSERT INTO properties ({', '.join(columns)})
+                    VALUES ({', '.join('?' for _ in columns)})
+                ''', list(columns.values()))
+
+            conn.commit()
+            return {'success': True, 'property_id': property_id, 'created': not existing, 'changed': True}
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Failed to save analysis: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+        finally:
+            conn.close()
+
+    def load(self, property_id: str, user_id: Optional[str] = None) -> Optional[Dict]:
+        conn = self.db.get_connection()
+        try:
+            return load_analysis(conn.cursor(), property_id, user_id)
+        finally:
+            conn.close()
+
+    def open(self, property_id: str, user_id: Optional[str] = None) -> LazyAnalysis:
+        """Handle that decodes the analysis the first time it is read"""
+        return LazyAnalysis(self, property_id, user_id)
+
+    def stats(self) -> Dict:
+        """Stored payload count and raw vs stored bytes"""
+        conn = self.db.get_connection()
+        try:
+            count, raw_bytes, stored_bytes = conn.execute('''
+                SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(length(data)), 0)
+                FROM analysis_blobs
+            ''').fetchone()
+        finally:
+            conn.close()
+        return {'blobs': count, 'raw_bytes': raw_bytes, 'stored_bytes': stored_bytes,
+                'ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0}
+
+
+# Migration
+def migrate(db_path: str = DATABASE_PATH, batch_size: int = 500) -> Dict:
+    """Re-encode legacy analyses with the current codec and fill their promoted columns
+
+    Covers rows with inline analysis_data and blob rows saved before the promoted
+    columns existed. Rows keep their updated_at; legacy rows are not given an
+    address_key, so duplicates a user saved before upserts are left as they are.
+    """
+    ensure_schema(db_path)
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    migrated = failed = 0
+    last_rowid = 0
+    try:
+        while True:
+            rows = cursor.execute('''
+                SELECT p.rowid, p.analysis_data, p.analysis_hash, b.codec, b.data
+                FROM properties p
+                LEFT JOIN analysis_blobs b ON b.hash = p.analysis_hash
+                WHERE p.rowid > ?
+                  AND (p.analysis_data IS NOT NULL OR (p.analysis_hash IS NOT NULL AND p.grade IS NULL))
+                ORDER BY p.rowid
+                LIMIT ?
+            ''', (last_rowid, batch_size)).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+
+            for rowid, analysis_data, old_hash, codec, data in rows:
+                analysis = decode_analysis(analysis_data if data is None else None, codec, data)
+                if not analysis:
+                    failed += 1
+                    continue
+                analysis_hash, new_codec, raw_size, payload = encode_blob(analysis)
+                # Same content, possibly an older codec: the blob is rewritten in place
+                cursor.execute('''
+                    INSERT INTO analysis_blobs (hash, codec, raw_size, data) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (hash) DO UPDATE SET codec = excluded.codec, data = excluded.data
+                ''', (analysis_hash, new_codec, raw_size, payload))
+                promoted = promoted_columns(analysis)
+                assignments = ', '.join(f"{column} = ?" for column in promoted)
+                cursor.execute(f'''
+                    UPDATE properties SET {assignments}, analysis_hash = ?, analysis_data = NULL
+                    WHERE rowid = ?
+                ''', [*promoted.values(), analysis_hash, rowid])
+                if old_hash and old_hash != analysis_hash:
+                    cursor.execute('''
+                        DELETE FROM analysis_blobs
+                        WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM properties WHERE analysis_hash = ?)
+                    ''', (old_hash, old_hash))
+                migrated += 1
+            conn.commit()
+    finally:
+        conn.close()
+    return {'migrated': migrated, 'unreadable': failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Saved analysis payload maintenance')
+    sub = parser.add_subparsers(dest='command', required=True)
+    migrate_cmd = sub.add_parser('migrate', help='Re-encode legacy analyses and fill promoted columns')
+    migrate_cmd.add_argument('--db', default=DATABASE_PATH)
+    migrate_cmd.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    print(json.dumps(migrate(args.db, args.batch_size), indent=2))
+
+
+if __name__ == '__main__':
+    main()
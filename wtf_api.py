@@ -0,0 +1,847 @@
+"""
+WTF API - JSON API for the TypeScript frontend, as a plain ASGI application
+
+`app` is a dependency-free ASGI callable, so any ASGI server can host it.
+When uvicorn is not installed the CLI falls back to a small asyncio
+HTTP/1.1 server that is enough for local development and load tests:
+
+    python -m wtf_api serve --port 8000 --db wtf_ultimate.db
+
+Handlers never block the event loop: SQLite work runs on an I/O thread pool
+over pooled connections, and the analysis math runs on a CPU worker pool
+(processes by default). Every request is timed per route; the numbers are in
+the Server-Timing header and, for signed-in callers, at /api/metrics.
+
+Callers authenticate with `Authorization: Bearer <token>`, where the token is
+either an HS256 JWT signed with WTF_API_JWT_SECRET (NEXTAUTH_SECRET by
+default; the user is its `sub`) or the user's API key from the users table.
+Handlers that need a user answer 401 when the token is missing or invalid.
+CORS is limited to WTF_API_CORS_ORIGIN (NEXTAUTH_URL by default).
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from wtf_analysis import calculate_lead_score, generate_ultimate_analysis
+from wtf_analysis_dag import DAG_SETTINGS, AnalysisStageError, run_analysis_dag
+from wtf_analysis_store import AnalysisStore
+from wtf_autocomplete import get_autocomplete_index
+from wtf_followups import FollowUpScheduler
+from wtf_platform_services import (BuyerMatcher, BuyerStateCountsService, NotificationManager, PipelineDataService,
+                                   PooledPlatformDatabase, PropertySearchService, UsageTrackingManager)
+from wtf_schema import DATABASE_PATH, ensure_schema
+
+logger = logging.getLogger(__name__)
+
+API_SETTINGS = {
+    'db_path': os.environ.get('WTF_API_DB', DATABASE_PATH),
+    'db_pool_size': int(os.environ.get('WTF_API_DB_POOL_SIZE', '8')),
+    'cpu_workers': int(os.environ.get('WTF_API_CPU_WORKERS', str(os.cpu_count() or 1))),
+    'cpu_processes': os.environ.get('WTF_API_CPU_PROCESSES', '1') == '1',
+    'cors_origin': os.environ.get('WTF_API_CORS_ORIGIN', os.environ.get('NEXTAUTH_URL', 'http://localhost:3000')),
+    'jwt_secret': os.environ.get('WTF_API_JWT_SECRET', os.environ.get('NEXTAUTH_SECRET', '')),
+    'max_body_bytes': int(os.environ.get('WTF_API_MAX_BODY_BYTES', str(1024 * 1024)))
+}
+
+STATUS_TEXT = {200: 'OK', 201: 'Created', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request', 401: 'Unauthorized',
+               403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+               500: 'Internal Server Error', 504: 'Gateway Timeout'}
+
+# Same defaults as the analyzer form; the Monte Carlo simulation is opt-in per request
+DEFAULT_ANALYSIS_PARAMS = {
+    'target_roi': 15.0,
+    'max_rehab_budget': 50000,
+    'target_cash_flow': 300,
+    'down_payment_pct': 20,
+    'interest_rate': 6.5,
+    'holding_period': 6,
+    'closing_costs_pct': 3.0,
+    'assignment_fee': 15000,
+    'profit_margin_min': 10000,
+    'vacancy_rate': 5.0,
+    'maintenance_rate': 5.0,
+    'management_fee': 8.0,
+    'insurance_rate': 0.8,
+    'capex_rate': 5.0,
+    'appreciation_rate': 3.0,
+    'risk_simulation': False,
+    'simulation_samples': 10000
+}
+
+PROPERTY_COLUMNS = ['id', 'address', 'city', 'state', 'zip_code', 'property_type', 'bedrooms', 'bathrooms',
+                    'square_feet', 'year_built', 'list_price', 'arv', 'rehab_cost', 'max_offer',
+                    'profit_potential', 'condition', 'status', 'grade', 'grade_score', 'confidence',
+                    'best_strategy', 'best_roi', 'created_at', 'updated_at']
+
+LEAD_COLUMNS = ['id', 'first_name', 'last_name', 'phone', 'email', 'property_address', 'property_id',
+                'motivation', 'timeline', 'source', 'status', 'score', 'property_condition', 'equity',
+                'priority', 'next_followup', 'created_at', 'updated_at']
+
+BUYER_FIELDS = ['id', 'name', 'email', 'phone', 'property_types', 'min_price', 'max_price', 'states',
+                'cities', 'deal_types', 'verified', 'proof_of_funds']
+
+
+def camel(name: str) -> str:
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+
+def camel_keys(record: Dict) -> Dict:
+    return {camel(key): value for key, value in record.items()}
+
+
+def field(data: Dict, name: str, default=None):
+    """Read a snake_case field that the frontend may send in camelCase"""
+    value = data.get(name, data.get(camel(name)))
+    return default if value in (None, '') else value
+
+
+def _json_default(value):
+    # numpy scalars and arrays from the analysis code
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def _b64url(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def verify_jwt(token: str, secret: str, now: Optional[float] = None) -> Optional[str]:
+    """Subject of an HS256 JWT signed with secret; None if it is malformed, forged, expired or has no exp"""
+    if not secret or token.count('.') != 2:
+        return None
+    header, payload, signature = token.split('.')
+    try:
+        if json.loads(_b64url(header)).get('alg') != 'HS256':
+            return None
+        expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64url(signature)):
+            return None
+        claims = json.loads(_b64url(payload))
+    except (ValueError, AttributeError):
+        return None
+    now = time.time() if now is None else now
+    if not isinstance(claims, dict) or not isinstance(claims.get('exp'), (int, float)) or claims['exp'] <= now:
+        return None
+    if isinstance(claims.get('nbf'), (int, float)) and claims['nbf'] > now:
+        return None
+    subject = claims.get('sub')
+    return subject if isinstance(subject, str) and subject else None
+
+
+class Request:
+    """The parts of an ASGI http scope the handlers use"""
+
+    def __init__(self, scope: Dict, body: bytes = b''):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query = {k: v[-1] for k, v in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+        self.body = body
+        # Set by API.dispatch from the bearer token; None when it is missing or invalid
+        self.user_id = None
+
+    @property
+    def bearer_token(self) -> Optional[str]:
+        scheme, _, token = self.headers.get('authorization', '').partition(' ')
+        return (token.strip() or None) if scheme.lower() == 'bearer' else None
+
+    def json(self) -> Dict:
+        try:
+            data = json.loads(self.body or b'{}')
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def int_param(self, name: str, default: int, low: int, high: int) -> int:
+        try:
+            return max(low, min(int(self.query.get(name, default)), high))
+        except ValueError:
+            return default
+
+
+class RequestTimings:
+    """Per-route latency samples (bounded) and status counts"""
+
+    def __init__(self, samples_per_route: int = 2000):
+        self.samples_per_route = samples_per_route
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, status: int, ms: float):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {'samples': deque(maxlen=self.samples_per_route), 'count': 0,
+                                               'errors': 0}
+            entry['samples'].append(ms)
+            entry['count'] += 1
+            entry['errors'] += status >= 500
+
+    def summary(self) -> Dict:
+        with self._lock:
+            routes = {route: (sorted(entry['samples']), entry['count'], entry['errors'])
+                      for route, entry in self._routes.items()}
+        result = {}
+        for route, (samples, count, errors) in routes.items():
+            pick = lambda pct: round(samples[min(len(samples) - 1, int(len(samples) * pct))], 3)
+            result[route] = {'count': count, 'errors': errors, 'p50_ms': pick(0.5), 'p90_ms': pick(0.9),
+                             'p99_ms': pick(0.99), 'max_ms': round(samples[-1], 3)}
+        return result
+
+
+class API:
+    """Minimal ASGI app: exact-path routing to async handlers returning (status, payload)"""
+
+    def __init__(self):
+        self.routes = {}
+        self.timings = RequestTimings()
+        self.on_shutdown = []
+
+    def route(self, method: str, path: str) -> Callable:
+        def decorator(handler):
+            self.routes[(method.upper(), path)] = handler
+            return handler
+        return decorator
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    self.shutdown()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        start = time.perf_counter()
+        body = await self.read_body(scope, receive)
+        if body is None:
+            request = Request(scope, b'')
+            status, payload, extra = 413, {'success': False, 'error': 'Request body too large'}, []
+        else:
+            request = Request(scope, body)
+            status, payload, *extra = await self.dispatch(request)
+        ms = (time.perf_counter() - start) * 1000
+        route = request.path if (request.method, request.path) in self.routes else 'unmatched'
+        self.timings.record(f"{request.method} {route}", status, ms)
+        await self.respond(send, status, payload, ms, extra[0] if extra else None)
+
+    @staticmethod
+    async def read_body(scope: Dict, receive: Callable) -> Optional[bytes]:
+        """The request body, or None once it exceeds max_body_bytes (whatever the server enforces)"""
+        limit = API_SETTINGS['max_body_bytes']
+        declared = dict(scope.get('headers', [])).get(b'content-length', b'')
+        if declared.isdigit() and int(declared) > limit:
+            return None
+        chunks, size, more = [], 0, True
+        while more:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(chunk)
+            more = message.get('more_body', False)
+        return b''.join(chunks)
+
+    async def dispatch(self, request: Request) -> Tuple:
+        """(status, payload) or (status, payload, extra headers) from the matching handler"""
+        if request.method == 'OPTIONS':
+            return 204, None
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            allowed = any(path == request.path for _, path in self.routes)
+            return (405, {'error': 'Method not allowed'}) if allowed else (404, {'error': 'Not found'})
+        try:
+            request.user_id = await authenticate(request)
+            return await handler(request)
+        except Exception as e:
+            logger.exception(f"{request.method} {request.path} failed: {str(e)}")
+            return 500, {'success': False, 'error': 'Internal server error'}
+
+    @staticmethod
+    async def respond(send: Callable, status: int, payload, ms: float = 0.0, extra_headers: Optional[Dict] = None):
+        """payload is JSON-encoded unless it is already bytes (pre-rendered snapshots)"""
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload, default=_json_default).encode() if payload is not None else b''
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()),
+                   (b'server-timing', f"app;dur={ms:.2f}".encode()),
+                   (b'access-control-allow-origin', API_SETTINGS['cors_origin'].encode()),
+                   (b'access-control-allow-headers', b'authorization, content-type, if-none-match')]
+        headers += [(name.lower().encode(), str(value).encode()) for name, value in (extra_headers or {}).items()]
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def shutdown(self):
+        for hook in self.on_shutdown:
+            hook()
+
+
+app = API()
+
+
+class APIServices:
+    """Shared services for the handlers: pooled database, I/O threads and the CPU worker pool"""
+
+    def __init__(self, db_path: str = DATABASE_PATH, db_pool_size: int = 8, cpu_workers: int = 1,
+                 cpu_processes: bool = True):
+        self.db_path = db_path
+        self.db = PooledPlatformDatabase(db_path, size=db_pool_size)
+        self.usage = UsageTrackingManager(self.db)
+        self.matcher = BuyerMatcher(self.db)
+        self.pipeline = PipelineDataService(self.db)
+        self.search = PropertySearchService(self.db)
+        self.analysis_store = AnalysisStore(self.db)
+        self.buyer_counts = BuyerStateCountsService(self.db)
+        self.followups = FollowUpScheduler(self.db, NotificationManager(self.db))
+        # One I/O thread per pooled connection, so threads never queue on the pool
+        self.io_pool = ThreadPoolExecutor(max_workers=db_pool_size, thread_name_prefix='api-io')
+        pool_class = ProcessPoolExecutor if cpu_processes else ThreadPoolExecutor
+        self.cpu_pool = pool_class(max_workers=max(1, cpu_workers))
+
+    def user_for_api_key(self, api_key: str) -> Optional[str]:
+        rows = self.query('SELECT id FROM users WHERE api_key = ? AND is_active = 1', (api_key,))
+        return rows[0][0] if rows else None
+
+    async def run_io(self, fn: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.io_pool, fn, *args)
+
+    async def run_cpu(self, fn: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.cpu_pool, fn, *args)
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.db.connection() as conn:
+            return conn.cursor().execute(sql, params).fetchall()
+
+    def execute(self, sql: str, params: tuple = ()):
+        with self.db.connection() as conn:
+            conn.cursor().execute(sql, params)
+            conn.commit()
+
+    def close(self):
+        self.cpu_pool.shutdown(wait=True)
+        self.io_pool.shutdown(wait=True)
+        self.db.close_all()
+
+
+_services = None
+_services_lock = threading.Lock()
+
+
+def get_services() -> APIServices:
+    """Services for API_SETTINGS['db_path'], created on first use"""
+    global _services
+    with _services_lock:
+        if _services is None or _services.db_path != API_SETTINGS['db_path']:
+            _services = APIServices(API_SETTINGS['db_path'], API_SETTINGS['db_pool_size'],
+                                    API_SETTINGS['cpu_workers'], API_SETTINGS['cpu_processes'])
+        return _services
+
+
+def close_services():
+    global _services
+    with _services_lock:
+        if _services is not None:
+            _services.close()
+            _services = None
+
+
+app.on_shutdown.append(close_services)
+
+
+def unauthorized() -> Tuple[int, Dict]:
+    return 401, {'success': False, 'error': 'Unauthorized'}
+
+
+async def authenticate(request: Request) -> Optional[str]:
+    """User id for the request's bearer token: a signed JWT, else an active user's API key"""
+    token = request.bearer_token
+    if not token:
+        return None
+    if token.count('.') == 2:
+        return verify_jwt(token, API_SETTINGS['jwt_secret'])
+    services = get_services()
+    return await services.run_io(services.user_for_api_key, token)
+
+
+def paginated(rows: List[Dict], page: int, limit: int, total: int) -> Dict:
+    """PaginatedResponse as defined in wtf-core-types.ts"""
+    pages = (total + limit - 1) // limit
+    return {'success': True, 'data': rows, 'pagination': {
+        'page': page, 'limit': limit, 'total': total, 'pages': pages,
+        'hasNext': page * limit < total, 'hasPrev': page > 1}}
+
+
+def analysis_arguments(data: Dict, params: Optional[Dict] = None) -> tuple:
+    """Positional arguments for generate_ultimate_analysis from a property payload"""
+    list_price = float(field(data, 'list_price', 250000))
+    square_feet = int(field(data, 'square_feet', 1500))
+    if list_price <= 0 or square_feet <= 0:
+        raise ValueError('listPrice and squareFeet must be positive')
+    return (
+        field(data, 'address'), field(data, 'city', ''), field(data, 'state', ''), field(data, 'zip_code', ''),
+        field(data, 'property_type', 'single_family'), int(field(data, 'bedrooms', 3)),
+        float(field(data, 'bathrooms', 2)), square_feet, int(field(data, 'year_built', 1990)), list_price,
+        field(data, 'condition', 'fair'), int(field(data, 'days_on_market', 30)),
+        float(field(data, 'hoa_fees', 0)), float(field(data, 'property_taxes', list_price * 0.012)),
+        {**DEFAULT_ANALYSIS_PARAMS, **(params or {})}
+    )
+
+
+# Properties
+@app.route('GET', '/api/properties')
+async def list_properties(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    page = request.int_param('page', 1, 1, 100000)
+    limit = request.int_param('limit', 20, 1, 100)
+
+    where, params = ['user_id = ?'], [request.user_id]
+    search = request.query.get('search')
+    if search:
+        where.append('(address LIKE ? OR city LIKE ? OR state LIKE ?)')
+        params += [f"%{search}%"] * 3
+    if request.query.get('propertyType'):
+        where.append('property_type = ?')
+        params.append(request.query['propertyType'])
+    for name, op in (('minPrice', '>='), ('maxPrice', '<=')):
+        if request.query.get(name):
+            try:
+                params.append(float(request.query[name]))
+            except ValueError:
+                return 400, {'success': False, 'error': f"{name} must be a number"}
+            where.append(f"list_price {op} ?")
+
+    services = get_services()
+    clause = ' AND '.join(where)
+    rows, total = await asyncio.gather(
+        services.run_io(services.query, f'''
+            SELECT {', '.join(PROPERTY_COLUMNS)} FROM properties
+            WHERE {clause}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', tuple(params + [limit, (page - 1) * limit])),
+        services.run_io(services.query, f'SELECT COUNT(*) FROM properties WHERE {clause}', tuple(params)))
+    return 200, paginated([camel_keys(dict(zip(PROPERTY_COLUMNS, row))) for row in rows],
+                          page, limit, total[0][0])
+
+
+@app.route('POST', '/api/properties')
+async def create_property(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    data = request.json()
+    missing = [camel(name) for name in ('address', 'city', 'state', 'zip_code', 'property_type')
+               if not field(data, name)]
+    if missing:
+        return 400, {'success': False, 'error': 'Invalid input data', 'details': missing}
+
+    columns = ['address', 'city', 'state', 'zip_code', 'property_type', 'bedrooms', 'bathrooms',
+               'square_feet', 'year_built', 'condition', 'list_price', 'arv', 'rehab_cost']
+    values = {name: field(data, name) for name in columns if field(data, name) is not None}
+    values.update(id=str(uuid.uuid4()), user_id=request.user_id)
+
+    services = get_services()
+    await services.run_io(services.execute, f'''
+        INSERT INTO properties ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})
+    ''', tuple(values.values()))
+    # The autocomplete index reads the new row on its next refresh, off the event loop
+    get_autocomplete_index(API_SETTINGS['db_path']).invalidate()
+    return 201, {'success': True, 'message': 'Property created successfully', 'data': camel_keys(values)}
+
+
+@app.route('POST', '/api/properties/analyze')
+async def analyze_property(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    body = request.json()
+    data = dict(body.get('propertyData') or {})
+    if isinstance(body.get('address'), str):
+        data.setdefault('address', body['address'])
+    if not data.get('address'):
+        return 400, {'success': False, 'error': 'Address or property data is required'}
+    try:
+        arguments = analysis_arguments(data, body.get('params'))
+    except (TypeError, ValueError) as e:
+        return 400, {'success': False, 'error': f"Invalid property data: {str(e)}"}
+
+    services = get_services()
+    usage = await services.run_io(services.usage.check_usage_limit, request.user_id, 'deal_analysis')
+    if not usage.get('allowed'):
+        return 403, {'success': False, 'error': usage.get('error') or 'Deal analysis limit reached',
+                     'usage': usage}
+
+    if DAG_SETTINGS['enabled']:
+        # The DAG waits on its own stage pool, so its driver only needs an I/O thread
+        try:
+            analysis = await services.run_io(run_analysis_dag, *arguments)
+        except AnalysisStageError as e:
+            return 504, {'success': False, 'error': str(e), 'stages': e.stages}
+    else:
+        analysis = await services.run_cpu(generate_ultimate_analysis, *arguments)
+    await services.run_io(services.usage.track_usage, request.user_id, 'deal_analysis', 1, data['address'])
+    return 200, {'success': True, 'data': analysis}
+
+
+# Search parameter -> PropertySearchService filter
+SEARCH_FILTERS = {'minPrice': 'min_price', 'maxPrice': 'max_price', 'propertyType': 'property_type',
+                  'minBedrooms': 'min_bedrooms', 'condition': 'condition', 'city': 'city', 'state': 'state',
+                  'status': 'status', 'grade': 'grade', 'bestStrategy': 'best_strategy',
+                  'minGradeScore': 'min_grade_score', 'minConfidence': 'min_confidence', 'minRoi': 'min_roi'}
+
+
+async def _search_page(request: Request, params: Dict):
+    try:
+        cursor_key = json.loads(params['cursor']) if params.get('cursor') else None
+        limit = max(1, min(int(params.get('limit') or 25), 100))
+    except (TypeError, ValueError):
+        return 400, {'success': False, 'error': 'cursor must be a JSON [sortKey, id] pair and limit an integer'}
+    filters = {name: params[key] for key, name in SEARCH_FILTERS.items() if params.get(key) not in (None, '')}
+
+    services = get_services()
+    try:
+        result = await services.run_io(services.search.search, request.user_id, params.get('q') or '', filters,
+                                       params.get('sort') or '', cursor_key, limit)
+    except (TypeError, ValueError):
+        return 400, {'success': False, 'error': 'Invalid filter value'}
+    if not result.get('success'):
+        return 400, result
+    next_cursor = json.dumps(result['cursor']) if result['cursor'] else None
+    return 200, {'success': True, 'data': [camel_keys(p) for p in result['properties']],
+                 'pagination': {'limit': limit, 'sort': result['sort'], 'nextCursor': next_cursor,
+                                'hasNext': next_cursor is not None}}
+
+
+@app.route('GET', '/api/properties/search')
+async def search_properties(request: Request):
+    """?q=&minPrice=&maxPrice=&propertyType=&minBedrooms=&condition=&grade=&minGradeScore=&minRoi=&sort=&limit=&cursor="""
+    if not request.user_id:
+        return unauthorized()
+    return await _search_page(request, request.query)
+
+
+@app.route('POST', '/api/properties/search')
+async def lookup_property(request: Request):
+    """{address} returns the best matching property (the search page flow); any other body is a search"""
+    if not request.user_id:
+        return unauthorized()
+    body = request.json()
+    if set(body) != {'address'}:
+        return await _search_page(request, body)
+
+    services = get_services()
+    found = await services.run_io(services.search.find_by_address, request.user_id, body['address'] or '')
+    if found is None:
+        return 404, {'success': False, 'message': 'Property not found'}
+    return 200, camel_keys(found)
+
+
+@app.route('GET', '/api/properties/autocomplete')
+async def autocomplete(request: Request):
+    """Suggestions from the caller's own properties and leads, then shared comps"""
+    if not request.user_id:
+        return unauthorized()
+    index = get_autocomplete_index(API_SETTINGS['db_path'])
+    try:
+        limit = max(1, min(int(request.query.get('limit', 8)), 25))
+    except ValueError:
+        return 400, {'error': 'limit must be an integer'}
+    # A due refresh reads SQLite and holds the index lock; neither may block the event loop
+    suggestions = await asyncio.to_thread(index.suggest, request.query.get('query', ''), request.user_id,
+                                            limit)
+    return 200, {'suggestions': suggestions}
+
+
+@app.route('GET', '/api/properties/analysis')
+async def property_analysis(request: Request):
+    """?id= returns the saved analysis; list and search results carry only its promoted columns"""
+    if not request.user_id:
+        return unauthorized()
+    if not request.query.get('id'):
+        return 400, {'success': False, 'error': 'id is required'}
+    services = get_services()
+    analysis = await services.run_io(services.analysis_store.load, request.query['id'], request.user_id)
+    if analysis is None:
+        return 404, {'success': False, 'error': 'Property not found'}
+    return 200, {'success': True, 'data': analysis}
+
+
+# Buyers
+@app.route('GET', '/api/buyers/by-state')
+async def buyers_by_state(request: Request):
+    """Buy Boxes map counts, answered from the in-memory snapshot (304 when the client's copy is current)"""
+    if not request.user_id:
+        return unauthorized()
+    services = get_services()
+    _, body, etag = await services.run_io(services.buyer_counts.snapshot)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag in (tag.strip() for tag in request.headers.get('if-none-match', '').split(',')):
+        return 304, b'', headers
+    return 200, body, headers
+
+
+@app.route('POST', '/api/buyers/match')
+async def match_buyers(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    body = request.json()
+    services = get_services()
+
+    if body.get('propertyId'):
+        rows = await services.run_io(services.query, f'''
+            SELECT {', '.join(PROPERTY_COLUMNS)} FROM properties WHERE id = ? AND user_id = ?
+        ''', (body['propertyId'], request.user_id))
+        if not rows:
+            return 404, {'success': False, 'error': 'Property not found'}
+        property_data = dict(zip(PROPERTY_COLUMNS, rows[0]))
+    elif body.get('propertyData'):
+        data = body['propertyData']
+        property_data = {name: field(data, name) for name in ('property_type', 'state', 'city')}
+        try:
+            property_data['list_price'] = float(field(data, 'list_price', 0))
+        except (TypeError, ValueError):
+            return 400, {'success': False, 'error': 'listPrice must be a number'}
+    else:
+        return 400, {'success': False, 'error': 'Property ID or property data is required'}
+
+    matches = await services.run_io(services.matcher.find_matches, property_data)
+    return 200, {'success': True, 'data': [{
+        'buyer': camel_keys(dict(zip(BUYER_FIELDS, match['buyer']))),
+        'matchScore': match['match_score'],
+        'matchReasons': match['match_reasons']
+    } for match in matches]}
+
+
+# Leads
+@app.route('GET', '/api/leads')
+async def list_leads(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    page = request.int_param('page', 1, 1, 100000)
+    limit = request.int_param('limit', 20, 1, 100)
+    where, params = ['user_id = ?'], [request.user_id]
+    if request.query.get('status'):
+        where.append('status = ?')
+        params.append(request.query['status'])
+
+    services = get_services()
+    clause = ' AND '.join(where)
+    rows, total = await asyncio.gather(
+        services.run_io(services.query, f'''
+            SELECT {', '.join(LEAD_COLUMNS)} FROM leads
+            WHERE {clause}
+            ORDER BY score DESC, created_at DESC
+            LIMIT ? OFFSET ?
+        ''', tuple(params + [limit, (page - 1) * limit])),
+        services.run_io(services.query, f'SELECT COUNT(*) FROM leads WHERE {clause}', tuple(params)))
+    return 200, paginated([camel_keys(dict(zip(LEAD_COLUMNS, row))) for row in rows], page, limit, total[0][0])
+
+
+@app.route('GET', '/api/leads/call-next')
+async def call_next(request: Request):
+    """The user's earliest follow-ups and overdue count, from the follow-up queue"""
+    if not request.user_id:
+        return unauthorized()
+    limit = request.int_param('limit', 10, 1, 100)
+    services = get_services()
+    calls, overdue = await asyncio.gather(
+        services.run_io(services.followups.call_next, request.user_id, limit),
+        services.run_io(services.followups.overdue_count, request.user_id))
+    return 200, {'success': True, 'overdue': overdue, 'data': [camel_keys(call) for call in calls]}
+
+
+@app.route('POST', '/api/leads')
+async def create_lead(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    data = request.json()
+    address = field(data, 'property_address') or field(data, 'address')
+    if not address:
+        return 400, {'success': False, 'error': 'propertyAddress is required'}
+
+    services = get_services()
+    usage = await services.run_io(services.usage.check_usage_limit, request.user_id, 'lead_management')
+    if not usage.get('allowed'):
+        return 403, {'success': False, 'error': usage.get('error') or 'Lead limit reached', 'usage': usage}
+
+    motivation = field(data, 'motivation', [])
+    motivation = [m.strip() for m in motivation.split(',')] if isinstance(motivation, str) else list(motivation)
+    try:
+        equity = float(field(data, 'equity', 0))
+    except (TypeError, ValueError):
+        return 400, {'success': False, 'error': 'equity must be a number'}
+    score = calculate_lead_score({'motivation': motivation, 'timeline': field(data, 'timeline'), 'equity': equity,
+                                  'condition': field(data, 'condition'), 'occupancy': field(data, 'occupancy')})
+
+    lead = {'id': str(uuid.uuid4()), 'user_id': request.user_id, 'first_name': field(data, 'first_name'),
+            'last_name': field(data, 'last_name'), 'phone': field(data, 'phone'), 'email': field(data, 'email'),
+            'property_address': address, 'motivation': ', '.join(motivation), 'timeline': field(data, 'timeline'),
+            'source': field(data, 'source', 'api'), 'score': score, 'equity': equity,
+            'property_condition': (field(data, 'condition') or 'fair').lower()}
+    await services.run_io(services.execute, f'''
+        INSERT INTO leads ({', '.join(lead)}) VALUES ({', '.join('?' * len(lead))})
+    ''', tuple(lead.values()))
+    await services.run_io(services.usage.track_usage, request.user_id, 'lead_management', 1, address)
+    get_autocomplete_index(API_SETTINGS['db_path']).invalidate()
+    return 201, {'success': True, 'message': 'Lead created successfully', 'data': camel_keys(lead)}
+
+
+# Deals
+@app.route('GET', '/api/deals')
+async def list_deals(request: Request):
+    """Pipeline board, or the next page of one stage with ?stage=...&cursor=[updated_at, id]"""
+    if not request.user_id:
+        return unauthorized()
+    services = get_services()
+    stage = request.query.get('stage')
+    if not stage:
+        board = await services.run_io(services.pipeline.get_board, request.user_id)
+        return 200, {'success': True, 'data': board}
+
+    cursor_key = None
+    if request.query.get('cursor'):
+        try:
+            cursor_key = json.loads(request.query['cursor'])
+        except ValueError:
+            return 400, {'success': False, 'error': 'cursor must be a JSON [updated_at, id] pair'}
+    page = await services.run_io(services.pipeline.get_column_page, request.user_id, stage, cursor_key)
+    return 200, {'success': True, 'data': page}
+
+
+# Usage and service metrics
+@app.route('GET', '/api/usage')
+async def usage_summary(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    services = get_services()
+    summary = await services.run_io(services.usage.get_usage_summary, request.user_id)
+    return 200, {'success': True, 'data': summary}
+
+
+@app.route('GET', '/api/metrics')
+async def metrics(request: Request):
+    if not request.user_id:
+        return unauthorized()
+    return 200, {'routes': app.timings.summary()}
+
+
+# Built-in server
+async def _handle_connection(asgi_app, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """HTTP/1.1 with keep-alive and Content-Length bodies; no chunked requests"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lines = head.decode('latin-1').split('\r\n')
+            method, target, version = (lines[0].split(' ') + ['', ''])[:3]
+            headers = [tuple(line.split(':', 1)) for line in lines[1:] if ':' in line]
+            headers = [(name.strip().lower().encode('latin-1'), value.strip().encode('latin-1'))
+                       for name, value in headers]
+            header_map = dict(headers)
+
+            length = int(header_map.get(b'content-length', b'0') or 0)
+            if length > API_SETTINGS['max_body_bytes']:
+                writer.write(b'HTTP/1.1 413 Payload Too Large\r\ncontent-length: 0\r\nconnection: close\r\n\r\n')
+                await writer.drain()
+                return
+            body = await reader.readexactly(length) if length else b''
+
+            path, _, query = target.partition('?')
+            scope = {'type': 'http', 'http_version': version.replace('HTTP/', '') or '1.1', 'method': method.upper(),
+                     'path': path, 'query_string': query.encode('latin-1'), 'headers': headers}
+            keep_alive = header_map.get(b'connection', b'').lower() != b'close' and version == 'HTTP/1.1'
+            response = {}
+
+            async def receive():
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response['start'] = message
+                elif message['type'] == 'http.response.body':
+                    status = response['start']['status']
+                    out = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}".encode()]
+                    out += [name + b': ' + value for name, value in response['start']['headers']]
+                    out.append(b'connection: ' + (b'keep-alive' if keep_alive else b'close'))
+                    writer.write(b'\r\n'.join(out) + b'\r\n\r\n' + message.get('body', b''))
+
+            await asgi_app(scope, receive, send)
+            await writer.drain()
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(asgi_app, host: str = '127.0.0.1', port: int = 8000) -> asyncio.AbstractServer:
+    """Start the built-in server; the caller owns the returned asyncio server"""
+    return await asyncio.start_server(lambda r, w: _handle_connection(asgi_app, r, w), host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WTF JSON API')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run = subparsers.add_parser('serve', help='Serve the API')
+    run.add_argument('--host', default='127.0.0.1')
+    run.add_argument('--port', type=int, default=8000)
+    run.add_argument('--db', default=API_SETTINGS['db_path'])
+    run.add_argument('--cpu-workers', type=int, default=API_SETTINGS['cpu_workers'])
+    run.add_argument('--threads', action='store_true', help='Run analysis on threads instead of processes')
+    run.add_argument('--builtin', action='store_true', help='Use the built-in server even if uvicorn is installed')
+    args = parser.parse_args()
+
+    API_SETTINGS.update(db_path=args.db, cpu_workers=args.cpu_workers,
+                        cpu_processes=API_SETTINGS['cpu_processes'] and not args.threads)
+    start = time.perf_counter()
+    ensure_schema(args.db)
+    get_autocomplete_index(args.db).refresh(force=True)
+    get_services()
+    logger.info(f"Services ready in {time.perf_counter() - start:.2f}s")
+
+    if not args.builtin:
+        try:
+            import uvicorn
+            uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+            return
+        except ImportError:
+            logger.info("uvicorn not installed; using the built-in server")
+
+    async def run_forever():
+        server = await serve(app, args.host, args.port)
+        logger.info(f"Serving on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app.shutdown()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -16,6 +16,9 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import time
 
+from wtf_assistant import AssistantEngine
+from wtf_platform_services import BuyerMatcher
+
 # Page configuration
 st.set_page_config(
     page_title="WTF - Wholesale2Flip Platform",
@@ -345,212 +348,13 @@ class PropertyAnalyzer:
         cost_per_sqft = cost_per_sqft_map.get(condition, 20)
         return round(square_feet * cost_per_sqft)
 
-# Buyer Matching Service
-class BuyerMatcher:
-    def __init__(self):
-        self.db = DatabaseManager()
-    
-    def find_matches(self, property_data: Dict) -> List[Dict]:
-        """Find matching buyers for a property"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM buyers 
-            WHERE min_price <= ? 
-            AND max_price >= ?
-        ''', (property_data.get('list_price', 0), property_data.get('list_price', 0)))
-        
-        buyers = cursor.fetchall()
-        conn.close()
-        
-        matches = []
-        for buyer in buyers:
-            score = self.calculate_match_score(property_data, buyer)
-            if score > 50:
-                matches.append({
-                    'buyer': buyer,
-                    'match_score': score,
-                    'match_reasons': self.get_match_reasons(property_data, buyer)
-                })
-        
-        return sorted(matches, key=lambda x: x['match_score'], reverse=True)
-    
-    def calculate_match_score(self, property_data: Dict, buyer: tuple) -> int:
-        """Calculate match score between property and buyer"""
-        score = 0
-        
-        # Property type match (30 points)
-        buyer_types = buyer[4].split(',') if buyer[4] else []
-        if property_data.get('property_type') in buyer_types:
-            score += 30
-        
-        # Price range match (25 points)
-        list_price = property_data.get('list_price', 0)
-        if buyer[5] <= list_price <= buyer[6]:
-            score += 25
-        
-        # Location match (20 points)
-        buyer_states = buyer[7].split(',') if buyer[7] else []
-        if property_data.get('state') in buyer_states:
-            score += 20
-        
-        # Verification bonus (25 points)
-        if buyer[10]:  # verified
-            score += 15
-        if buyer[11]:  # proof of funds
-            score += 10
-        
-        return min(score, 100)
-    
-    def get_match_reasons(self, property_data: Dict, buyer: tuple) -> List[str]:
-        """Get reasons why buyer matches property"""
-        reasons = []
-        
-        buyer_types = buyer[4].split(',') if buyer[4] else []
-        if property_data.get('property_type') in buyer_types:
-            reasons.append('Property type match')
-        
-        list_price = property_data.get('list_price', 0)
-        if buyer[5] <= list_price <= buyer[6]:
-            reasons.append('Price range match')
-        
-        buyer_states = buyer[7].split(',') if buyer[7] else []
-        if property_data.get('state') in buyer_states:
-            reasons.append('Location preference')
-        
-        if buyer[11]:  # proof of funds
-            reasons.append('Verified buyer with proof of funds')
-        
-        return reasons
-
-# AI Assistant Service (Mock - No OpenAI)
-class MockAIAssistant:
-    """Mock AI Assistant without OpenAI dependency"""
-    
-    def __init__(self):
-        self.responses = {
-            "scriptmaster": {
-                "cold_calling": """Here's an effective cold calling script:
-
-**Opening (First 10 seconds):**
-"Hi [Name], I'm [Your Name] with [Company]. I know you weren't expecting my call, but I'm reaching out to homeowners in [Area] about a quick question - do you have 30 seconds?"
-
-**Rapport Building:**
-"Great! I work with homeowners who are looking to sell quickly without the hassle of repairs or realtor fees. I was wondering, have you ever thought about selling your property at [Address]?"
-
-**Problem Identification:**
-- Listen for pain points
-- Ask open-ended questions: "What's your timeline?" "What would selling mean for you?"
-
-**Solution Presentation:**
-"Based on what you've told me, I think I can help. We buy houses as-is, close quickly, and handle all the paperwork. Would you be interested in getting a no-obligation cash offer?"
-
-**Call to Action:**
-"I can come by tomorrow or Thursday to take a quick look and give you an offer on the spot. Which works better for you?"
-""",
-                "objection": """Here are effective responses to common objections:
-
-**"I'm not interested"**
-"I completely understand, and I appreciate your honesty. Before I let you go, can I ask - is it that you're not interested in selling at all, or just not interested in selling right now?"
-
-**"The price is too low"**
-"I hear you, and I understand price is important. Keep in mind, our offer factors in that we're buying as-is, closing quickly, and covering all costs. When you factor in repairs, realtor fees, and holding costs, how does that change the picture for you?"
-
-**"I need to think about it"**
-"Of course, this is a big decision. What specifically would you like to think over? Maybe I can provide some clarity right now."
-
-**"I'm already working with a realtor"**
-"That's great! How's that going for you? Just so you know, we're investors, not realtors, so there's no conflict. If your listing doesn't work out, we'd be happy to be your backup plan."
-""",
-                "default": "I can help you with cold calling scripts, objection handling, and follow-up strategies. What specific situation would you like help with?"
-            },
-            "underwriter": {
-                "analysis": """Based on the property details provided:
-
-**Investment Analysis:**
-- Property appears to be in a stable market
-- Current pricing suggests room for value-add improvements
-- Location factors are favorable for both rental and resale
-
-**Investment Potential: 7.5/10**
-
-**Risk Factors:**
-1. Market conditions may shift
-2. Rehab costs could exceed estimates
-3. Holding time might be longer than anticipated
-
-**Recommended Strategy:**
-- Consider a fix-and-flip if rehab costs stay under $40K
-- Alternative: Buy-and-hold for rental income if cash flow exceeds $300/month
-- Assignment fee potential: $10-15K based on current spreads
-
-**Key Metrics to Track:**
-- Days on market for comps
-- Rental rates in the area
-- Construction cost trends
-- Buyer demand indicators
-""",
-                "default": "I can help analyze properties for wholesaling potential, calculate ARV, estimate rehab costs, and recommend investment strategies. What property would you like me to analyze?"
-            },
-            "general": {
-                "70_rule": """The 70% Rule is a fundamental formula in real estate wholesaling:
-
-**Formula:** Maximum Offer = (ARV × 0.70) - Repair Costs
-
-**Example:**
-- ARV (After Repair Value): $200,000
-- Repair Costs: $30,000
-- Maximum Offer = ($200,000 × 0.70) - $30,000 = $110,000
-
-**Why 70%?**
-- 30% margin covers:
-  - Your wholesale fee (5-10%)
-  - Investor's profit (10-15%)
-  - Holding costs, closing costs, contingencies (5-10%)
-
-**When to Adjust:**
-- Hot markets: May need to go to 75-80%
-- Tough markets: Stick to 65-70%
-- High-end properties: Can often use 70-75%
-- Lower-end properties: May need 60-65%
-""",
-                "default": "I can help you with wholesaling strategies, deal analysis, marketing tips, and general real estate investing questions. What would you like to know?"
-            }
-        }
-    
-    def get_response(self, prompt: str, ai_type: str = "general", context: Dict = None) -> str:
-        """Get mock AI response based on keywords in prompt"""
-        prompt_lower = prompt.lower()
-        
-        # Determine response based on keywords
-        if ai_type == "scriptmaster":
-            if "cold call" in prompt_lower or "script" in prompt_lower:
-                return self.responses["scriptmaster"]["cold_calling"]
-            elif "objection" in prompt_lower or "not interested" in prompt_lower:
-                return self.responses["scriptmaster"]["objection"]
-            else:
-                return self.responses["scriptmaster"]["default"]
-        
-        elif ai_type == "underwriter":
-            if "analyze" in prompt_lower or "property" in prompt_lower:
-                return self.responses["underwriter"]["analysis"]
-            else:
-                return self.responses["underwriter"]["default"]
-        
-        else:  # general
-            if "70%" in prompt or "70 rule" in prompt_lower:
-                return self.responses["general"]["70_rule"]
-            else:
-                return self.responses["general"]["default"]
-
 # Initialize services
 @st.cache_resource
 def get_services():
     return {
         'property_analyzer': PropertyAnalyzer(),
-        'buyer_matcher': BuyerMatcher(),
-        'ai_assistant': MockAIAssistant(),
+        'buyer_matcher': BuyerMatcher(DatabaseManager()),
+        'ai_assistant': AssistantEngine(),
         'db': DatabaseManager()
     }
 
@@ -2086,13 +1890,20 @@ def render_ai_assistant():
         # Add user message
         st.session_state.ai_messages.append({"role": "user", "content": user_input})
         
-        # Get AI response
-        with st.spinner("AI is thinking..."):
-            response = services['ai_assistant'].get_response(
+        with st.chat_message("user"):
+            st.write(user_input)
+        
+        # Stream AI response chunk by chunk
+        with st.chat_message("assistant"):
+            placeholder = st.empty()
+            response = ""
+            for chunk in services['ai_assistant'].stream_response(
                 user_input, 
                 st.session_state.ai_type,
                 {"user_role": st.session_state.user_role}
-            )
+            ):
+                response += chunk
+                placeholder.markdown(response)
         
         # Add AI response
         st.session_state.ai_messages.append({"role": "assistant", "content": response})
@@ -0,0 +1,402 @@
+"""
+WTF Autocomplete - In-memory address prefix index for /api/properties/autocomplete
+
+Every known address (properties, leads and imported comps) is normalized to
+lowercase tokens with USPS street suffixes and directions abbreviated, then
+indexed under the suffixes that start at each of its first few tokens, so
+"elm st" finds "1234 Elm Street, Dallas". Keys live in a sorted array that is
+searched with bisect; inserts land in a small sorted delta that is merged in
+when it grows. Matches are ranked by how often the address was seen and how
+recently.
+
+Addresses from a user's properties and leads are only ever suggested to that
+user; each user has an index of their own. Imported comps are shared by
+everyone and fill in after the user's own matches.
+
+    python -m wtf_autocomplete "1234 elm" --user <user_id> --limit 8
+"""
+
+import argparse
+import bisect
+import csv
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from wtf_schema import DATABASE_PATH
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+ZIP_RE = re.compile(r"^\d{5}(?:\d{4})?$")
+
+STREET_SUFFIXES = {
+    'street': 'st', 'str': 'st', 'avenue': 'ave', 'av': 'ave', 'road': 'rd', 'drive': 'dr', 'lane': 'ln',
+    'boulevard': 'blvd', 'court': 'ct', 'circle': 'cir', 'place': 'pl', 'terrace': 'ter', 'parkway': 'pkwy',
+    'highway': 'hwy', 'trail': 'trl', 'square': 'sq', 'crossing': 'xing', 'point': 'pt', 'cove': 'cv',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+    'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw',
+    'apartment': 'apt', 'suite': 'ste', 'unit': 'unit'
+}
+
+# An address is indexed under the suffixes starting at its first MAX_START_TOKENS tokens
+# (house number, direction, street name, ...), which covers what people start typing with
+MAX_START_TOKENS = 4
+MIN_QUERY_LENGTH = 3
+
+AUTOCOMPLETE_SETTINGS = {
+    'recency_half_life_days': float(os.environ.get('WTF_AUTOCOMPLETE_HALF_LIFE_DAYS', '30')),
+    'recency_weight': float(os.environ.get('WTF_AUTOCOMPLETE_RECENCY_WEIGHT', '2')),
+    'refresh_interval': float(os.environ.get('WTF_AUTOCOMPLETE_REFRESH_SECONDS', '5'))
+}
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase address tokens with suffixes/directions abbreviated and a trailing ZIP dropped"""
+    tokens = [STREET_SUFFIXES.get(t, t) for t in TOKEN_RE.findall((text or '').lower())]
+    if len(tokens) > 1 and ZIP_RE.match(tokens[-1]):
+        tokens.pop()
+    return tokens
+
+
+def normalize_address(text: str) -> str:
+    return ' '.join(normalize_tokens(text))
+
+
+def query_prefixes(query: str) -> List[str]:
+    """Normalized prefixes for a partly typed query; the last word may be an unfinished suffix"""
+    words = TOKEN_RE.findall((query or '').lower())
+    if not words:
+        return []
+    head = [STREET_SUFFIXES.get(t, t) for t in words[:-1]]
+    last = words[-1]
+    variants = [STREET_SUFFIXES.get(last, last)]
+    # "1234 elm stre" should reach "1234 elm st"
+    for word, abbreviation in STREET_SUFFIXES.items():
+        if len(last) > len(abbreviation) and word.startswith(last) and abbreviation not in variants:
+            variants.append(abbreviation)
+    if last not in variants:
+        variants.append(last)
+    return [' '.join(head + [variant]) for variant in variants]
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+class AddressIndex:
+    """Sorted-array prefix index over normalized addresses with frequency/recency ranking"""
+
+    def __init__(self, min_merge: int = 2000,
+                 half_life_days: float = AUTOCOMPLETE_SETTINGS['recency_half_life_days'],
+                 recency_weight: float = AUTOCOMPLETE_SETTINGS['recency_weight']):
+        self.min_merge = min_merge
+        self.half_life = half_life_days * 86400
+        self.recency_weight = recency_weight
+
+        # Per-address columns, grown by doubling
+        self.display = []
+        self._ids = {}
+        self._frequency = np.zeros(1024, dtype=np.int32)
+        self._last_seen = np.zeros(1024, dtype=np.float64)
+
+        # Main segment: sorted keys with the address id of each key
+        self._keys = []
+        self._key_ids = np.zeros(0, dtype=np.int32)
+        # Delta segment: sorted (key, address id) pairs not yet merged
+        self._delta = []
+        self.stats = {'addresses': 0, 'keys': 0, 'merges': 0, 'queries': 0}
+
+    def __len__(self):
+        return len(self.display)
+
+    # Inserts
+    def add_address(self, address: str, seen_at=None, count: int = 1) -> Optional[int]:
+        """Record a sighting of address; returns its id (None if it has no usable tokens)"""
+        tokens = normalize_tokens(address)
+        if not tokens:
+            return None
+        key = ' '.join(tokens)
+        seen = _timestamp(seen_at) if seen_at is not None else time.time()
+
+        address_id = self._ids.get(key)
+        if address_id is None:
+            address_id = len(self.display)
+            self._ids[key] = address_id
+            self.display.append(' '.join((address or '').split()))
+            self._grow(address_id + 1)
+            for start in range(min(len(tokens), MAX_START_TOKENS)):
+                bisect.insort(self._delta, (' '.join(tokens[start:]), address_id))
+            self.stats['addresses'] += 1
+            if len(self._delta) >= max(self.min_merge, len(self._keys) // 10):
+                self.merge()
+
+        self._frequency[address_id] += count
+        self._last_seen[address_id] = max(self._last_seen[address_id], seen)
+        return address_id
+
+    def touch(self, address: str, seen_at=None):
+        """Bump recency without counting another sighting (e.g. an edited row)"""
+        address_id = self._ids.get(normalize_address(address))
+        if address_id is not None:
+            seen = _timestamp(seen_at) if seen_at is not None else time.time()
+            self._last_seen[address_id] = max(self._last_seen[address_id], seen)
+
+    def discard(self, address: str, count: int = 1):
+        """Take back sightings (a row deleted, moved or re-addressed); at zero the address is not suggested"""
+        address_id = self._ids.get(normalize_address(address))
+        if address_id is not None:
+            self._frequency[address_id] = max(0, self._frequency[address_id] - count)
+
+    def record_selection(self, address: str):
+        """A user picked this suggestion; it ranks higher next time"""
+        self.add_address(address)
+
+    def _grow(self, size: int):
+        if size > len(self._frequency):
+            capacity = max(size, len(self._frequency) * 2)
+            self._frequency = np.concatenate([self._frequency, np.zeros(capacity - len(self._frequency), np.int32)])
+            self._last_seen = np.concatenate([self._last_seen, np.zeros(capacity - len(self._last_seen))])
+
+    def merge(self):
+        """Fold the delta segment into the sorted main arrays"""
+        if not self._delta:
+            return
+        pairs = sorted(list(zip(self._keys, self._key_ids.tolist())) + self._delta)
+        self._keys = [key for key, _ in pairs]
+        self._key_ids = np.fromiter((address_id for _, address_id in pairs), dtype=np.int32, count=len(pairs))
+        self._delta = []
+        self.stats['keys'] = len(self._keys)
+        self.stats['merges'] += 1
+
+    # Queries
+    def _candidates(self, prefix: str) -> List[np.ndarray]:
+        upper = prefix + '\uffff'
+        found = []
+        lo, hi = bisect.bisect_left(self._keys, prefix), bisect.bisect_left(self._keys, upper)
+        if hi > lo:
+            found.append(self._key_ids[lo:hi])
+        lo, hi = bisect.bisect_left(self._delta, (prefix,)), bisect.bisect_left(self._delta, (upper,))
+        if hi > lo:
+            found.append(np.array([address_id for _, address_id in self._delta[lo:hi]], dtype=np.int32))
+        return found
+
+    def suggest(self, query: str, limit: int = 8, now: Optional[float] = None) -> List[str]:
+        """Top addresses matching the typed prefix, most used and most recent first"""
+        self.stats['queries'] += 1
+        if len((query or '').strip()) < MIN_QUERY_LENGTH:
+            return []
+        found = [ids for prefix in query_prefixes(query) for ids in self._candidates(prefix)]
+        if not found:
+            return []
+        ids = np.unique(np.concatenate(found))
+        ids = ids[self._frequency[ids] > 0]
+        if not len(ids):
+            return []
+
+        age = (now or time.time()) - self._last_seen[ids]
+        scores = np.log1p(self._frequency[ids]) + self.recency_weight * np.exp2(-np.maximum(age, 0) / self.half_life)
+        if len(ids) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        return [self.display[i] for i in ids[top]]
+
+
+class DatabaseAddressIndex:
+    """Address suggestions per user from their own properties and leads, then from shared comps
+
+    Each user's rows go into that user's own AddressIndex, picked up by (updated_at, id)
+    watermark, so one user's addresses are never suggested to another. Imported comps are
+    public and go into a separate shared index that fills in after the user's own matches.
+    """
+
+    SOURCES = {
+        'properties': '''
+            SELECT id, user_id, address, city, state, zip_code, updated_at
+            FROM properties
+            WHERE updated_at > ? OR (updated_at = ? AND id > ?)
+            ORDER BY updated_at, id
+        ''',
+        'leads': '''
+            SELECT id, user_id, property_address AS address, NULL AS city, NULL AS state, NULL AS zip_code,
+                   updated_at
+            FROM leads
+            WHERE updated_at > ? OR (updated_at = ? AND id > ?)
+            ORDER BY updated_at, id
+        '''
+    }
+
+    def __init__(self, db_path: str = DATABASE_PATH,
+                 refresh_interval: float = AUTOCOMPLETE_SETTINGS['refresh_interval'], **kwargs):
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.index_options = kwargs
+        self.users = {}
+        self.comps = AddressIndex(**kwargs)
+        self.watermarks = {table: ('', '') for table in self.SOURCES}
+        self._rows = {}
+        self._next_refresh = 0.0
+        # Guards every read and write of the indexes: merge() swaps _keys and _key_ids together
+        self._lock = threading.RLock()
+        self.stats = {'rows_indexed': 0}
+
+    def __len__(self):
+        return sum(len(index) for index in self.users.values()) + len(self.comps)
+
+    @staticmethod
+    def format_address(record: Dict) -> str:
+        parts = [record.get('address'), record.get('city')]
+        region = ' '.join(str(p) for p in (record.get('state'), record.get('zip_code')) if p)
+        return ', '.join(str(p) for p in parts + [region] if p)
+
+    def user_index(self, user_id: str) -> AddressIndex:
+        index = self.users.get(user_id)
+        if index is None:
+            index = self.users[user_id] = AddressIndex(**self.index_options)
+        return index
+
+    def refresh_due(self) -> bool:
+        return time.monotonic() >= self._next_refresh
+
+    def invalidate(self):
+        """Make the next refresh() read new rows now instead of waiting for refresh_interval"""
+        self._next_refresh = 0.0
+
+    def add_address(self, user_id: str, address: str, seen_at=None, count: int = 1) -> Optional[int]:
+        with self._lock:
+            return self.user_index(user_id).add_address(address, seen_at, count)
+
+    def merge(self):
+        with self._lock:
+            for index in self.users.values():
+                index.merge()
+            self.comps.merge()
+
+    def refresh(self, force: bool = False) -> int:
+        """Index rows inserted or edited since the last refresh; returns how many were read"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now < self._next_refresh:
+                return 0
+            self._next_refresh = now + self.refresh_interval
+            if not os.path.exists(self.db_path):
+                return 0
+
+            read = 0
+            try:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                for table, sql in self.SOURCES.items():
+                    updated_at, last_id = self.watermarks[table]
+                    cursor.execute(sql, (updated_at, updated_at, last_id))
+                    columns = [d[0] for d in cursor.description]
+                    for row in cursor.fetchall():
+                        record = dict(zip(columns, row))
+                        self._index_row(table, record)
+                        self.watermarks[table] = (record['updated_at'] or '', record['id'])
+                        read += 1
+                conn.close()
+                self.merge()
+            except sqlite3.Error as e:
+                logger.warning(f"Autocomplete refresh failed: {str(e)}")
+            self.stats['rows_indexed'] += read
+            return read
+
+    def _index_row(self, table: str, record: Dict):
+        address = self.format_address(record)
+        key = normalize_address(address)
+        row_key = (table, record['id'])
+        indexed = self._rows.get(row_key)
+        # An edited row only counts again if its address or owner changed
+        if indexed is not None and indexed[:2] == (record['user_id'], key):
+            self.user_index(record['user_id']).touch(address, record.get('updated_at'))
+            return
+        if indexed is not None:
+            self.users[indexed[0]].discard(indexed[2])
+        if key and record['user_id']:
+            self._rows[row_key] = (record['user_id'], key, address)
+            self.add_address(record['user_id'], address, record.get('updated_at'))
+        else:
+            self._rows.pop(row_key, None)
+
+    def import_comps(self, path: str, column: str = 'address') -> int:
+        """Add the addresses from a comps CSV export to the shared index; returns how many rows were read"""
+        count = 0
+        with open(path, newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                record = {k.strip().lower(): v for k, v in record.items() if k}
+                if record.get(column):
+                    with self._lock:
+                        self.comps.add_address(self.format_address({**record, 'address': record[column]}),
+                                               record.get('sold_date') or record.get('date'))
+                    count += 1
+        self.merge()
+        return count
+
+    def suggest(self, query: str, user_id: str, limit: int = 8, now: Optional[float] = None) -> List[str]:
+        """The user's own matching addresses first, then shared comps"""
+        self.refresh()
+        with self._lock:
+            index = self.users.get(user_id)
+            own = index.suggest(query, limit=limit, now=now) if index is not None else []
+            if len(own) >= limit:
+                return own
+            seen = {normalize_address(address) for address in own}
+            shared = [address for address in self.comps.suggest(query, limit=limit, now=now)
+                      if normalize_address(address) not in seen]
+            return own + shared[:limit - len(own)]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_autocomplete_index(db_path: str = DATABASE_PATH) -> DatabaseAddressIndex:
+    """Process-wide index for db_path, built on first use"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None or _default_index.db_path != db_path:
+            _default_index = DatabaseAddressIndex(db_path)
+        return _default_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Address autocomplete over known properties and leads')
+    parser.add_argument('query')
+    parser.add_argument('--user', required=True, help='Suggest from this user\'s properties and leads')
+    parser.add_argument('--db', default=DATABASE_PATH)
+    parser.add_argument('--limit', type=int, default=8)
+    parser.add_argument('--comps', help='CSV of imported comps with an address column')
+    args = parser.parse_args()
+
+    index = get_autocomplete_index(args.db)
+    start = time.perf_counter()
+    index.refresh(force=True)
+    if args.comps:
+        index.import_comps(args.comps)
+    logger.info(f"Indexed {len(index)} addresses in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    suggestions = index.suggest(args.query, args.user, limit=args.limit)
+    logger.info(f"Query took {(time.perf_counter() - start) * 1000:.3f} ms")
+    for suggestion in suggestions:
+        print(suggestion)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -16,6 +16,8 @@ import base64
 from io import BytesIO
 import uuid
 
+from wtf_market_data import CITY_SQFT_DATA
+
 # Page configuration
 st.set_page_config(
     page_title="WTF - Wholesale2Flip", 
@@ -457,24 +459,7 @@ class RealPropertyDataService:
     """Professional property data service with real market data"""
     
     def __init__(self):
-        self.market_data = {
-            # Major Texas Markets
-            'houston': {'median_sqft_price': 150, 'rent_per_sqft': 1.2, 'appreciation': 0.05},
-            'dallas': {'median_sqft_price': 160, 'rent_per_sqft': 1.3, 'appreciation': 0.06},
-            'austin': {'median_sqft_price': 280, 'rent_per_sqft': 1.8, 'appreciation': 0.08},
-            'san antonio': {'median_sqft_price': 140, 'rent_per_sqft': 1.1, 'appreciation': 0.04},
-            'fort worth': {'median_sqft_price': 155, 'rent_per_sqft': 1.25, 'appreciation': 0.055},
-            'porter': {'median_sqft_price': 145, 'rent_per_sqft': 1.15, 'appreciation': 0.045},
-            
-            # Major National Markets
-            'phoenix': {'median_sqft_price': 200, 'rent_per_sqft': 1.4, 'appreciation': 0.07},
-            'atlanta': {'median_sqft_price': 170, 'rent_per_sqft': 1.2, 'appreciation': 0.06},
-            'tampa': {'median_sqft_price': 190, 'rent_per_sqft': 1.35, 'appreciation': 0.065},
-            'charlotte': {'median_sqft_price': 180, 'rent_per_sqft': 1.25, 'appreciation': 0.055},
-            'nashville': {'median_sqft_price': 220, 'rent_per_sqft': 1.5, 'appreciation': 0.07},
-            'denver': {'median_sqft_price': 250, 'rent_per_sqft': 1.6, 'appreciation': 0.06},
-            'las vegas': {'median_sqft_price': 180, 'rent_per_sqft': 1.3, 'appreciation': 0.065}
-        }
+        self.market_data = CITY_SQFT_DATA
     
     def lookup_property_by_address(self, address: str, city: str, state: str) -> Dict:
         """Enhanced property lookup with realistic data"""
@@ -4,10 +4,7 @@ Enhanced version with landing page, full CRM, contracts, LOI generation, and adm
 """
 
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import sqlite3
 import hashlib
@@ -18,6 +15,18 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 import time
 import re
+from io import BytesIO
+
+from wtf_analysis import calculate_lead_score
+from wtf_assistant import AssistantEngine
+from wtf_document_engine import DocumentEngine
+from wtf_search_index import get_search_index
+from wtf_startup import lazy_import
+
+# Loaded on first use by the pages that chart or tabulate
+pd = lazy_import('pandas')
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
 
 # Page configuration
 st.set_page_config(
@@ -282,11 +291,12 @@ class Contract:
 # Enhanced Database Manager
 class EnhancedDatabaseManager:
     def __init__(self):
+        self.db_name = 'wtf_platform.db'
         self.init_database()
     
     def init_database(self):
         """Initialize enhanced database with all tables"""
-        conn = sqlite3.connect('wtf_platform.db')
+        conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
         
         # Enhanced properties table
@@ -687,508 +697,39 @@ class DealCalculator:
 class ContractGenerator:
     """Generate professional real estate contracts and LOIs"""
     
-    def __init__(self):
-        pass
+    def __init__(self, db_path: str):
+        # Templates are compiled once and reused for every document; public templates
+        # saved in this app's database are loaded alongside the built-ins
+        self.engine = DocumentEngine(db_path)
     
     def generate_purchase_agreement(self, deal_data: Dict) -> str:
         """Generate a complete purchase agreement"""
-        template = f"""
-        REAL ESTATE PURCHASE AGREEMENT
-        
-        This Purchase Agreement ("Agreement") is made on {datetime.now().strftime('%B %d, %Y')} between:
-        
-        SELLER: {deal_data.get('seller_name', 'SELLER NAME')}
-        Address: {deal_data.get('seller_address', 'SELLER ADDRESS')}
-        
-        BUYER: {deal_data.get('buyer_name', 'BUYER NAME')}
-        Address: {deal_data.get('buyer_address', 'BUYER ADDRESS')}
-        
-        PROPERTY INFORMATION:
-        Address: {deal_data.get('property_address', 'PROPERTY ADDRESS')}
-        Legal Description: To be obtained from title company
-        
-        PURCHASE TERMS:
-        Purchase Price: ${deal_data.get('purchase_price', 0):,.2f}
-        Earnest Money: ${deal_data.get('earnest_money', 1000):,.2f}
-        Inspection Period: {deal_data.get('inspection_period', 7)} days
-        Closing Date: {deal_data.get('closing_date', 'TBD')}
-        
-        FINANCING:
-        This purchase is subject to buyer obtaining financing within {deal_data.get('financing_days', 21)} days.
-        
-        CONTINGENCIES:
-        1. Property inspection satisfactory to buyer
-        2. Clear title and survey
-        3. Property to be delivered in same condition as of acceptance
-        
-        CLOSING COSTS:
-        Closing costs will be paid by: {deal_data.get('closing_costs_paid_by', 'Split 50/50')}
-        
-        SPECIAL PROVISIONS:
-        {deal_data.get('special_terms', 'None')}
-        
-        This agreement shall be binding upon the parties, their heirs, successors, and assigns.
-        
-        SELLER SIGNATURE: _________________________ DATE: _________
-        {deal_data.get('seller_name', 'SELLER NAME')}
-        
-        BUYER SIGNATURE: _________________________ DATE: _________
-        {deal_data.get('buyer_name', 'BUYER NAME')}
-        
-        Generated by WTF Platform on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        Contract ID: {deal_data.get('contract_id', str(uuid.uuid4())[:8])}
-        """
-        
-        return template
+        return self.engine.render('purchase_agreement', deal_data)
     
     def generate_assignment_contract(self, deal_data: Dict) -> str:
         """Generate assignment contract"""
-        template = f"""
-        ASSIGNMENT OF REAL ESTATE PURCHASE CONTRACT
-        
-        This Assignment Agreement is made on {datetime.now().strftime('%B %d, %Y')} between:
-        
-        ASSIGNOR (Original Buyer): {deal_data.get('assignor_name', 'ASSIGNOR NAME')}
-        ASSIGNEE (New Buyer): {deal_data.get('assignee_name', 'ASSIGNEE NAME')}
-        
-        ORIGINAL CONTRACT INFORMATION:
-        Property Address: {deal_data.get('property_address', 'PROPERTY ADDRESS')}
-        Original Purchase Price: ${deal_data.get('purchase_price', 0):,.2f}
-        Original Contract Date: {deal_data.get('original_contract_date', 'TBD')}
-        Seller: {deal_data.get('seller_name', 'SELLER NAME')}
-        
-        ASSIGNMENT TERMS:
-        Assignment Fee: ${deal_data.get('assignment_fee', 5000):,.2f}
-        Assignee shall assume all rights and obligations under the original purchase contract.
-        
-        ASSIGNOR WARRANTIES:
-        1. Original contract is valid and in full force
-        2. No defaults exist under original contract
-        3. All conditions have been met or waived
-        
-        ASSIGNEE ACKNOWLEDGMENTS:
-        1. Has reviewed original purchase contract
-        2. Accepts all terms and conditions
-        3. Will close directly with seller
-        
-        ASSIGNMENT FEE PAYMENT:
-        Assignment fee of ${deal_data.get('assignment_fee', 5000):,.2f} is due at closing.
-        
-        ASSIGNOR SIGNATURE: _________________________ DATE: _________
-        {deal_data.get('assignor_name', 'ASSIGNOR NAME')}
-        
-        ASSIGNEE SIGNATURE: _________________________ DATE: _________
-        {deal_data.get('assignee_name', 'ASSIGNEE NAME')}
-        
-        Generated by WTF Platform on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        Assignment ID: {deal_data.get('assignment_id', str(uuid.uuid4())[:8])}
-        """
-        
-        return template
+        return self.engine.render('assignment_contract', deal_data)
     
     def generate_loi(self, loi_data: Dict) -> str:
         """Generate Letter of Intent"""
-        template = f"""
-        LETTER OF INTENT TO PURCHASE REAL ESTATE
-        
-        Date: {datetime.now().strftime('%B %d, %Y')}
-        
-        To: {loi_data.get('seller_name', 'PROPERTY OWNER')}
-        
-        Re: Purchase of Property at {loi_data.get('property_address', 'PROPERTY ADDRESS')}
-        
-        Dear Property Owner,
-        
-        I am writing to express my serious interest in purchasing your property located at 
-        {loi_data.get('property_address', 'PROPERTY ADDRESS')}.
-        
-        PROPOSED TERMS:
-        
-        Purchase Price: ${loi_data.get('offer_price', 0):,.2f}
-        Earnest Money: ${loi_data.get('earnest_money', 1000):,.2f}
-        Closing Timeframe: {loi_data.get('closing_timeframe', '30 days')}
-        Inspection Period: {loi_data.get('inspection_period', '7 days')}
-        
-        CONDITIONS:
-        • Property to be sold in "AS-IS" condition
-        • Clear and marketable title
-        • All liens and encumbrances to be satisfied at closing
-        • Standard property inspection to be completed
-        
-        ADDITIONAL TERMS:
-        {loi_data.get('additional_terms', 'Cash purchase with quick closing')}
-        
-        This Letter of Intent is non-binding and is intended to outline the basic terms 
-        for further negotiation. A formal purchase agreement will be prepared upon 
-        mutual acceptance of these terms.
-        
-        I am a serious buyer with {loi_data.get('buyer_qualification', 'cash available and pre-approval')} 
-        and can close quickly. I would appreciate the opportunity to discuss this offer with you.
-        
-        Please contact me at your earliest convenience.
-        
-        Sincerely,
-        
-        {loi_data.get('buyer_name', 'BUYER NAME')}
-        {loi_data.get('buyer_phone', 'BUYER PHONE')}
-        {loi_data.get('buyer_email', 'BUYER EMAIL')}
-        
-        Generated by WTF Platform on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        LOI ID: {loi_data.get('loi_id', str(uuid.uuid4())[:8])}
-        """
-        
-        return template
-
-# Enhanced AI Assistant with Script Generation
-class EnhancedAIAssistant:
-    """Enhanced AI Assistant with full script generation capabilities"""
+        return self.engine.render('loi', loi_data)
     
-    def __init__(self):
-        self.script_templates = {
-            'cold_calling': self._get_cold_calling_scripts(),
-            'objection_handling': self._get_objection_scripts(),
-            'follow_up': self._get_followup_scripts(),
-            'closing': self._get_closing_scripts()
-        }
-    
-    def generate_full_script(self, script_type: str, scenario: str) -> str:
-        """Generate complete 5x5 script as per Empire ScriptMaster AI"""
-        if script_type not in self.script_templates:
-            return "Script type not available"
-        
-        script_data = self.script_templates[script_type]
-        
-        # Build the complete 5x5 script
-        full_script = f"""
-# {script_data['title']} - Complete 5x5 Script
-
-## Scenario: {scenario}
-
-{script_data['introduction']}
-
----
-
-## 📞 PART 1 – Intro & Rapport Building
-
-**Your Opening:**
-"{script_data['opening']}"
-
-### Seller Responses & Your Replies:
-
-**💬 Seller Response #1:** "Who is this and what do you want?"
-**🔁 Closer Reply Bank:**
-1. "Hi [Name], I completely understand the surprise call. I'm [Your Name] with [Company], and I specialize in helping homeowners who need to sell quickly without the hassle of traditional real estate. I was wondering - is your property at [Address] something you'd ever consider selling?"
-2. "I know you weren't expecting my call, but I work with homeowners in [Area] who are looking for fast, hassle-free solutions. Have you ever thought about what it would take to sell your property quickly?"
-3. "I apologize for the cold call. I'm [Name] and I buy houses in [Area]. I was calling because I'm interested in your property at [Address]. Would you be open to hearing about a quick sale option?"
-4. "Hi there! I'm [Name] with [Company]. I know this is unexpected, but I help homeowners sell their properties fast for cash. Is selling your home at [Address] something that might interest you?"
-5. "I understand the surprise. I'm a local real estate investor, and I'm interested in purchasing homes in your area. Would you have 30 seconds to hear about how I might be able to help you?"
-
-**💬 Seller Response #2:** "I'm not interested in selling."
-**🔁 Closer Reply Bank:**
-1. "I completely understand, and most people I talk to say the same thing initially. But let me ask you this - if you could sell quickly without repairs, realtor fees, or showings, would that change anything?"
-2. "That's perfectly fine, and I respect that. But just out of curiosity - what would it take for you to consider selling? Sometimes people's situations change."
-3. "I hear you, and that's totally okay. Can I ask though - is it that you're not interested in selling at all, or just not interested in the traditional hassle of selling?"
-4. "No problem at all. But if I may ask - what if you could get a fair cash offer with no obligations and close in as little as 7 days? Would that be worth a conversation?"
-5. "I understand completely. Most homeowners aren't actively thinking about selling until the right opportunity comes along. What would make selling attractive to you?"
-
-**💬 Seller Response #3:** "How did you get my number?"
-**🔁 Closer Reply Bank:**
-1. "That's a great question. I get leads from public records, marketing campaigns, and referrals. I'm not a telemarketer - I'm a local investor who buys houses. Have you ever considered selling your property?"
-2. "I work with a service that identifies homeowners who might benefit from a quick sale. I'm a real estate investor, not a salesperson. Would you be interested in hearing about a cash offer for your property?"
-3. "I get homeowner information through public records and marketing. I'm calling because I'm genuinely interested in purchasing your property. Would you be open to discussing a potential sale?"
-4. "Fair question. I'm a local real estate investor, and I get leads through various marketing channels. I'm calling because I'm interested in your property specifically. Is selling something you've ever considered?"
-5. "I understand your concern. I'm a licensed real estate investor, and I get information through legitimate marketing sources. I'm calling because I buy houses in your area. Would you be interested in a no-obligation offer?"
-
-**💬 Seller Response #4:** "What's this about exactly?"
-**🔁 Closer Reply Bank:**
-1. "Great question! I buy houses directly from homeowners - no realtors, no repairs needed, and I can close in as little as 7-10 days. I'm calling to see if you'd be interested in a cash offer for your property."
-2. "I'm a real estate investor who purchases homes for cash. I can close quickly, handle all the paperwork, and you don't need to make any repairs. Would you be interested in hearing what I could offer for your property?"
-3. "I specialize in buying houses from homeowners who need to sell quickly. Whether it's because of job relocation, financial hardship, or you just want to avoid the hassle of traditional selling - I can help. Interested in learning more?"
-4. "I'm in the business of buying houses directly from homeowners. I pay cash, close fast, and take properties as-is. No realtor fees, no repairs, no showings. Would that type of sale interest you?"
-5. "I purchase homes for cash from homeowners who need a quick, hassle-free sale. I can usually make an offer within 24 hours and close in 1-2 weeks. Is that something that might benefit you?"
-
-**💬 Seller Response #5:** "I'm too busy to talk right now."
-**🔁 Closer Reply Bank:**
-1. "I completely understand, and I appreciate your honesty. When would be a better time to call you back? This will only take 2-3 minutes, and I think you'll find it valuable."
-2. "No problem at all. I know you're busy. What's the best time to reach you for just a quick 2-minute conversation about your property?"
-3. "I respect your time completely. Would it be better if I called you back this evening or tomorrow? I just need 60 seconds to explain how I might be able to help you."
-4. "Absolutely, I understand. Would you prefer I call you back in a few hours, or would texting be better? I just want to see if I can make you a cash offer for your property."
-5. "Of course, I don't want to interrupt your day. When you have just 2 minutes free, I'd love to explain how I buy houses for cash. What time works better for you?"
-
----
-
-## 📞 PART 2 – Discovery Questions & Motivation
-
-**Transition Statement:**
-"Great! Since you're open to hearing more, let me ask you a few quick questions to see if this might be a good fit for both of us."
-
-### Seller Responses & Your Replies:
-
-**💬 Seller Response #1:** "What do you need to know?"
-**🔁 Closer Reply Bank:**
-1. "Perfect! First, can you tell me a little about your property? How many bedrooms and bathrooms, and what condition would you say it's in?"
-2. "Great! I just need to understand your situation better. What's prompting you to consider selling? Is it a timing issue, or are there other factors?"
-3. "Excellent! Let me start with the basics - how long have you owned the property, and what's your ideal timeline if you were to sell?"
-4. "Wonderful! Can you walk me through what's driving the potential sale? Are you looking to move, or is there another reason you'd consider selling?"
-5. "Perfect! I'd love to know more about your property and your situation. What would need to happen for a sale to make sense for you?"
-
-**💬 Seller Response #2:** "Why should I tell you anything?"
-**🔁 Closer Reply Bank:**
-1. "That's a very reasonable question. I ask because I want to make sure I can actually help you. If your timeline doesn't match what I can offer, or if your property isn't a fit, I'd rather know now and not waste either of our time."
-2. "Fair point. I'm asking because I want to give you an accurate offer that makes sense for your situation. If I don't understand your needs, I can't determine if I'm the right solution for you."
-3. "I completely understand your hesitation. The reason I ask is that every homeowner's situation is different, and I want to make sure I can provide real value. If I can't help you, I'll tell you honestly."
-4. "Great question. I ask these questions because I want to make you a fair offer that actually works for your situation. If your needs don't align with what I do, I'd rather know upfront."
-5. "I respect that caution. I ask because I've found that understanding someone's specific situation helps me determine if I can be a good solution. If not, I'm happy to refer you to someone who might be a better fit."
-
-**💬 Seller Response #3:** "The house needs a lot of work."
-**🔁 Closer Reply Bank:**
-1. "That's actually perfect for what I do! I specialize in buying houses that need work. Can you give me an idea of what kind of repairs we're talking about? Foundation, roof, cosmetic updates?"
-2. "No problem at all - I buy houses in any condition. That's one of the benefits of working with me versus a traditional sale. What kind of work does it need?"
-3. "That's exactly why homeowners call me! I take properties as-is, so you don't have to worry about repairs. Can you tell me more about what needs to be done?"
-4. "Perfect! I actually prefer houses that need work because I can factor that into my offer and you don't have to deal with contractors. What are the main issues?"
-5. "That's great to hear because that's my specialty. Most homeowners don't want to deal with repairs before selling, which is exactly why I exist. What's the biggest repair needed?"
-
-**💬 Seller Response #4:** "I don't know what it's worth."
-**🔁 Closer Reply Bank:**
-1. "No worries at all - that's very common. I can help you figure that out. Can you tell me roughly what similar houses in your neighborhood have sold for recently?"
-2. "That's perfectly fine. I do this every day, so I can help determine value. What did you pay for it, and when did you purchase it?"
-3. "Don't worry about that - I'll handle the valuation. Can you give me the square footage and number of bedrooms and bathrooms?"
-4. "That's okay, most homeowners don't track the market closely. I can run some quick numbers. Do you know what your neighbors' houses have sold for?"
-5. "No problem at all. I can provide you with a market analysis. In the meantime, what would you need to get out of the property to make selling worthwhile?"
-
-**💬 Seller Response #5:** "I need to think about it."
-**🔁 Closer Reply Bank:**
-1. "Absolutely, this is a big decision. What specifically would you like to think over? Maybe I can provide some clarity right now."
-2. "Of course, I completely understand. What questions do you have that might help you think through this decision?"
-3. "That makes total sense. While you're thinking, what information would be most helpful for you to have?"
-4. "I respect that completely. Is there anything specific you'd like me to explain better, or do you need to discuss it with someone?"
-5. "Absolutely, take all the time you need. What would help you feel more comfortable with the process?"
-
----
-
-## 📞 PART 3 – Deal Pivot / Offer Framing
-
-**Transition Statement:**
-"Based on what you've told me, I think I might be able to help you. Let me explain how my process works and see if it makes sense for your situation."
-
-### Seller Responses & Your Replies:
-
-**💬 Seller Response #1:** "Okay, what can you offer?"
-**🔁 Closer Reply Bank:**
-1. "Great question! Before I give you a number, let me explain my process. I make fair cash offers based on current market value minus any needed repairs. I can typically offer between 70-80% of market value, but you get speed, certainty, and no hassles. Does that sound reasonable?"
-2. "I'm glad you asked! I determine my offers based on what the property would sell for in perfect condition, minus repair costs and my margin. For a property like yours, I'd estimate an offer in the $[X] to $[Y] range. Would that be worth exploring?"
-3. "Perfect! I calculate offers based on the after-repair value of the property. Given what you've told me about the condition and location, I'm thinking somewhere around $[X]. Would an offer in that range make sense for your situation?"
-4. "Excellent! Based on our conversation, I believe I can make you an offer between $[X] and $[Y]. The exact number depends on a quick property inspection. Would you be interested in having me take a look?"
-5. "I'm excited to help! For properties in your area with similar characteristics, I typically offer between $[X] and $[Y]. The final number depends on seeing the property in person. When could I come take a look?"
-
-**💬 Seller Response #2:** "That sounds too low."
-**🔁 Closer Reply Bank:**
-1. "I understand that initial reaction, and it's completely normal. Let me ask you this - if you sold traditionally, what would you pay in realtor fees, repairs, carrying costs, and other expenses? When you factor those in, my offer might be closer than you think."
-2. "I hear you, and I want to make sure you understand the full picture. With traditional sales, you have 6% realtor fees, repair costs, months of carrying costs, and uncertainty. What would those costs total for you?"
-3. "That's a fair concern. Keep in mind though, my offer is net to you - no fees, no repairs, no carrying costs. If you listed with an agent at $[higher price], what would you actually net after all expenses?"
-4. "I completely understand. But consider this - I close in 10-14 days with cash, versus 6 months on the market, thousands in repairs, realtor fees, and no guarantee of sale. What's your time and certainty worth?"
-5. "I get that reaction often. But think about it this way - my offer is what you'll actually receive. No surprise deductions, no repair negotiations, no deals falling through. Isn't certainty worth something?"
-
-**💬 Seller Response #3:** "How do I know you're legitimate?"
-**🔁 Closer Reply Bank:**
-1. "Excellent question, and you should absolutely verify that! I'm a licensed real estate investor, and I can provide references from recent sellers. I also use a reputable title company for all closings. Would you like me to send you some references?"
-2. "Smart question! I've been buying houses in this area for [X] years. I can show you my business license, provide references, and we'll close through a title company where you'll be protected. What would make you feel most comfortable?"
-3. "I'm glad you asked! I'm a legitimate business owner with proper licensing and insurance. All our closings go through licensed title companies, and I can provide testimonials from recent clients. How can I best prove my credibility to you?"
-4. "Great question - you should verify anyone you work with! I have an A+ BBB rating, proper business licensing, and can provide references. We also use title companies for all transactions to protect you. What would give you confidence?"
-5. "Absolutely the right question to ask! I'm a licensed real estate professional, fully insured, and I can provide proof of funds and references. All closings are handled by licensed professionals. Would you like me to email you my credentials?"
-
-**💬 Seller Response #4:** "What's the catch?"
-**🔁 Closer Reply Bank:**
-1. "No catch at all! The trade-off is that you get speed, convenience, and certainty, but you get less than retail market value. If you had 6-12 months and wanted to maximize price, listing with an agent might get you more - but most of my sellers value the convenience."
-2. "Great question! There's no catch - just a trade-off. You're trading maximum sale price for speed, convenience, and certainty. It's like selling your car to CarMax versus selling it yourself - you get less but save time and hassle."
-3. "No hidden catch! The only 'cost' is that you'll get less than if you spent months on the market and thousands on repairs. But you get cash in 2 weeks versus uncertainty for months. Which is more valuable to you?"
-4. "Totally fair question! The only trade-off is price versus convenience. You could potentially get more listing with an agent, but you'll wait longer, pay fees, and have no guarantees. I offer certainty and speed."
-5. "No catch whatsoever! I make money by buying below market value and either renting or reselling after repairs. You benefit by getting cash quickly without hassles. It's a fair trade where we both win."
-
-**💬 Seller Response #5:** "I need to talk to my spouse/family."
-**🔁 Closer Reply Bank:**
-1. "Absolutely, you should definitely discuss this with them! This is a big decision. When do you think you'll have a chance to talk it over? I'd be happy to speak with both of you together if that would help."
-2. "Of course, that's exactly what you should do! Would it be helpful if I put together a written offer that you can review together? That way you'll have all the details to discuss."
-3. "That's exactly the right thing to do. Would your spouse want to be part of the conversation? I'm happy to explain the process to both of you at the same time."
-4. "Absolutely, you should both be comfortable with the decision. When would be a good time for me to call back after you've had a chance to discuss it?"
-5. "Perfect, that's exactly what I'd expect you to do. Would it be helpful if I sent you some information about my company and the process so you can review it together?"
-
----
-
-## 📞 PART 4 – Objection Handling
-
-**Common Objections and Response Framework:**
-
-### Seller Responses & Your Replies:
-
-**💬 Seller Response #1:** "I want to think about it more."
-**🔁 Closer Reply Bank:**
-1. "I completely understand - this is a big decision. Help me understand what specifically you'd like to think over. Is it the offer amount, the timeline, or something else? Maybe I can provide clarity right now."
-2. "That makes total sense. What questions are going through your mind that I might be able to answer? I'd rather address your concerns now than have you worry about them."
-3. "Absolutely, take the time you need. What information would be most helpful for you to have while you're thinking it over?"
-4. "Of course, and I respect that. Is there something specific that's making you hesitant? I'm happy to explain any part of the process in more detail."
-5. "That's perfectly reasonable. While you're thinking, what would need to change for this to be a definite yes for you?"
-
-**💬 Seller Response #2:** "I think I can get more money elsewhere."
-**🔁 Closer Reply Bank:**
-1. "You very well might be able to, and I respect that. Let me ask you this - after realtor fees, repairs, carrying costs, and time, what would you actually net? And what's your time worth over the next 6-12 months?"
-2. "That's possible, and you should explore that option. But consider this - I can close in 2 weeks with certainty, versus 6 months of uncertainty, showings, and potential deals falling through. What's that peace of mind worth?"
-3. "You might be right, and I encourage you to test the market. Just keep in mind that every month you wait costs you mortgage payments, insurance, utilities, and taxes. What are those monthly costs?"
-4. "I understand that thinking. But remember, my offer is guaranteed cash in your hands. A higher listing price doesn't guarantee you'll get it, or that a deal will close. How important is certainty versus potentially getting more?"
-5. "That's a fair point. But let me ask you this - if you could get $10,000 more but it takes 8 months longer and costs you $5,000 in carrying costs and stress, is that extra money worth it?"
-
-**💬 Seller Response #3:** "I'm not ready to sell yet."
-**🔁 Closer Reply Bank:**
-1. "I hear you, and timing is everything. Can I ask what would need to happen for you to be ready? Is it a timing issue, or are there other factors?"
-2. "That's totally fine. What's driving the timeline? Is there something specific you're waiting for, or do you just need more time to prepare?"
-3. "I understand completely. When do you think you might be ready? I'd be happy to stay in touch and revisit this when the timing is better for you."
-4. "No problem at all. Help me understand what 'ready' looks like for you. Is it a certain time of year, or are there things you need to accomplish first?"
-5. "I respect that timing. What would change in your situation that would make you ready to sell? Maybe I can help with some of those factors."
-
-**💬 Seller Response #4:** "I don't trust investors."
-**🔁 Closer Reply Bank:**
-1. "I completely understand that skepticism, and frankly, you should be cautious. There are some bad actors out there. That's exactly why I use licensed title companies, provide references, and have all proper licensing. What specifically concerns you?"
-2. "Your caution is smart, and I respect that. I've heard the horror stories too. That's why I'm transparent about my process, use reputable title companies, and can provide references from recent sellers. What would make you feel comfortable?"
-3. "That's actually good - you should be careful! The difference is that I'm a licensed professional who's been doing this legitimately for years. I can prove my credibility and track record. What would convince you I'm one of the good ones?"
-4. "I don't blame you for feeling that way. Unfortunately, some investors have given the rest of us a bad name. That's why I'm fully licensed, insured, and use title companies for protection. What bad experiences have you heard about?"
-5. "Smart to be cautious! I earn trust by being transparent, providing references, and ensuring all transactions go through proper legal channels. I'm happy to prove my legitimacy. What would give you confidence in working with me?"
-
-**💬 Seller Response #5:** "The offer is just too low."
-**🔁 Closer Reply Bank:**
-1. "I hear you, and I want to make sure you're comparing apples to apples. If you listed for $50,000 more, after 6% realtor fees, that's $3,000 less already. Add repair costs, carrying costs, and time - what would you actually net?"
-2. "I understand that feeling. But let me put this in perspective - my offer is guaranteed money in 2 weeks. If you listed higher, what are the chances you'd actually get that price, and how long might it take?"
-3. "That's a fair reaction. But consider this - every month you don't sell costs you mortgage, taxes, insurance, and utilities. What are those monthly costs? After 6 months, how much have you spent just carrying the property?"
-4. "I get it, and price is important. But what if I could close in 10 days and guarantee you won't have any more monthly expenses, repairs, or hassles? What's that worth to you?"
-5. "I understand your position. Let me ask this - if another buyer offered you $10,000 more but needed financing, repairs, and 90 days to close, versus my guaranteed cash in 2 weeks, which would you choose?"
-
----
-
-## 📞 PART 5 – Close & Next Steps
-
-**Transition Statement:**
-"Based on our conversation, I believe I can help you achieve your goals. Let me outline exactly what happens next."
-
-### Seller Responses & Your Replies:
-
-**💬 Seller Response #1:** "Okay, what's the next step?"
-**🔁 Closer Reply Bank:**
-1. "Perfect! The next step is for me to see the property in person so I can give you an exact offer. I can come by as early as tomorrow morning or afternoon. Which works better for you?"
-2. "Excellent! I'll need to do a quick 15-minute walkthrough to finalize my offer. When would be convenient for you? I'm available tomorrow or the next day."
-3. "Great! I'll schedule a brief property inspection - usually takes about 10-15 minutes. After that, I can give you a written offer within 24 hours. When can I come take a look?"
-4. "Wonderful! I'll need to see the property to give you my final offer. I can usually work around your schedule. What day and time work best for you this week?"
-5. "Perfect! The process is simple - I'll do a quick walkthrough, give you a written offer, and if you accept, we can close in 10-14 days. When can I come by to see the property?"
-
-**💬 Seller Response #2:** "I still need to think about it."
-**🔁 Closer Reply Bank:**
-1. "Absolutely, and I respect that. How about this - let me come take a look at the property so I can give you an exact offer to consider. That way you'll have real numbers to think about. No obligation whatsoever."
-2. "Of course, take your time. Would it help to have a written offer in hand while you're thinking? I can do a quick property visit and give you exact terms to consider."
-3. "That's completely reasonable. Here's what I suggest - let me see the property and put together a formal offer. Then you can take all the time you need to decide. Fair enough?"
-4. "I understand completely. Why don't I do the property walkthrough now so you have a real offer to consider? That way you're making a decision based on actual numbers, not estimates."
-5. "Take all the time you need. But while you're thinking, it might help to have a concrete offer in writing. When could I briefly see the property to give you exact terms?"
-
-**💬 Seller Response #3:** "When could you close?"
-**🔁 Closer Reply Bank:**
-1. "That's a great question! I can typically close in 10-14 days from acceptance. If you needed faster, I could potentially do 7 days. If you needed more time, I can work with your schedule. What timing would work best for you?"
-2. "Excellent question! My standard closing is 2 weeks, but I've closed in as little as 5 days when needed. I can also extend the timeline if you need more time to find your next place. What's your ideal timeline?"
-3. "I can usually close within 10-14 business days. If you're in a hurry, I can expedite to about a week. If you need more time, that's fine too. What timeframe would be ideal for your situation?"
-4. "Great question! Typically 10-14 days, but I'm flexible based on your needs. If you need to close faster because of financial pressure, I can rush it. If you need more time to move, we can extend. What works for you?"
-5. "I can close as quickly as 7-10 days if needed, or extend to 30+ days if you need time to find another place. My goal is to work around your timeline. When would be ideal for you?"
-
-**💬 Seller Response #4:** "What if I don't like your offer?"
-**🔁 Closer Reply Bank:**
-1. "That's totally fine! There's absolutely no obligation. If my offer doesn't work for you, just say no. I'd rather you be completely happy with the decision. At minimum, you'll know exactly what a cash offer looks like for comparison."
-2. "No problem whatsoever! This is a no-pressure situation. If my offer doesn't meet your needs, we'll shake hands and part as friends. At least you'll have a baseline for comparison with other options."
-3. "Completely understood! You're under zero obligation to accept any offer I make. Think of it as free market research. You'll know what an investor cash offer looks like, which helps with any decision you make."
-4. "That's perfectly fine! I make offers all the time that don't get accepted, and that's just business. No hard feelings at all. You'll just have good information to help with your decision-making process."
-5. "No worries at all! I'd rather make you an honest offer that you decline than a fake offer that creates problems later. Worst case, you get a free property evaluation and know your options."
-
-**💬 Seller Response #5:** "Let me call you back."
-**🔁 Closer Reply Bank:**
-1. "Absolutely! I understand you need time to process this. When do you think would be a good time for me to follow up? I don't want to be pushy, but I also don't want this opportunity to slip away if it's right for you."
-2. "Of course, take your time. Just so I know how to best help you - when were you thinking of calling back? Tomorrow, next week? I want to make sure I'm available when you're ready."
-3. "That sounds perfect. In the meantime, should I put together some information about my company and recent sales for you to review? When do you think you might be ready to continue the conversation?"
-4. "Absolutely, I'll wait for your call. Just to set expectations - when do you think you might be ready to move forward? I want to make sure I keep my schedule open for you."
-5. "Perfect! I respect that you need time. Would it be easier if I followed up with you instead? That way there's no pressure on you to remember to call. When would be a good time to check back?"
-
----
-
-## 🎯 CLOSING FRAMEWORK
-
-### Final Push Techniques:
-
-1. **Urgency Creation:** "I'm only in your area this week for appointments. After that, it might be 3-4 weeks before I can get back."
-
-2. **Scarcity:** "I typically only look at 2-3 properties per week, and I have one slot left this Thursday."
-
-3. **Social Proof:** "I just helped a couple on [Street Name] sell their house in 8 days. They were amazed at how simple the process was."
-
-4. **Risk Reversal:** "Here's what I'll do - let me come look at the property with no obligation. If my offer doesn't make sense, just say no. Fair enough?"
-
-5. **Alternative Close:** "Would tomorrow morning or afternoon work better for you?"
-
----
-
-## 📝 FOLLOW-UP SEQUENCE
-
-If they don't commit on the call:
-
-**Immediate Follow-up (within 2 hours):**
-Text: "Hi [Name], thanks for your time today. Just wanted to confirm your address is [Address] and send you my information: [Company Info]. No pressure - here when you're ready!"
-
-**24-Hour Follow-up:**
-"Hi [Name], I've been thinking about our conversation yesterday. I realize I might have rushed through some details. Would you like me to explain anything more clearly? I'm here to help, not pressure."
-
-**72-Hour Follow-up:**
-"Hi [Name], just checking in. I know selling a house is a big decision. Did any other questions come up since we talked? I'm happy to provide more information or references."
-
-**1-Week Follow-up:**
-"Hi [Name], I hope you're doing well. I wanted to reach out one more time about your property. If the timing isn't right now, I completely understand. Would it be okay if I checked back in a few months?"
-
----
-
-**Generated by WTF Platform ScriptMaster AI**
-**Script ID: {str(uuid.uuid4())[:8]}**
-**Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}**
-        """
-        
-        return full_script
-    
-    def _get_cold_calling_scripts(self):
-        return {
-            'title': 'Cold Calling Master Script',
-            'introduction': 'This script is designed for initial contact with motivated sellers from various lead sources.',
-            'opening': "Hi [Name], I'm [Your Name] with [Company]. I know you weren't expecting my call, but I specialize in helping homeowners who need to sell quickly. Do you have 30 seconds?"
-        }
-    
-    def _get_objection_scripts(self):
-        return {
-            'title': 'Objection Handling Arsenal',
-            'introduction': 'Complete responses to every common objection you\'ll encounter.',
-            'opening': "I completely understand that concern. Let me address that directly..."
-        }
-    
-    def _get_followup_scripts(self):
-        return {
-            'title': 'Follow-up Sequence Scripts',
-            'introduction': 'Systematic follow-up approaches for different lead temperatures.',
-            'opening': "Hi [Name], I wanted to follow up on our conversation about your property..."
-        }
-    
-    def _get_closing_scripts(self):
-        return {
-            'title': 'Closing Techniques Master Class',
-            'introduction': 'Advanced closing techniques for converting leads to appointments.',
-            'opening': "Based on everything we\'ve discussed, I believe I can help you..."
-        }
+    def generate_bulk_lois(self, loi_records, fileobj, defaults: Dict = None) -> Dict:
+        """Render an LOI per record and stream them into a ZIP archive"""
+        defaults = defaults or {}
+        records = ({**defaults, **record} for record in loi_records)
+        return self.engine.write_zip('loi', records, fileobj)
 
 # Initialize enhanced services
 @st.cache_resource
 def get_enhanced_services():
+    db = EnhancedDatabaseManager()
     return {
-        'db': EnhancedDatabaseManager(),
+        'db': db,
         'calculator': DealCalculator(),
-        'contract_generator': ContractGenerator(),
-        'ai_assistant': EnhancedAIAssistant()
+        'contract_generator': ContractGenerator(db.db_name),
+        'ai_assistant': AssistantEngine(),
+        'search': get_search_index()
     }
 
 services = get_enhanced_services()
@@ -2064,64 +1605,6 @@ def render_add_lead_form():
             else:
                 st.error("Please fill in all required fields")
 
-def calculate_lead_score(lead_data):
-    """Calculate lead score based on various factors"""
-    score = 0
-    
-    # Motivation scoring (30 points max)
-    high_motivation = ["Divorce", "Financial Hardship", "Behind on Payments", "Health Issues"]
-    medium_motivation = ["Job Relocation", "Inherited Property", "Tired Landlord"]
-    
-    for motivation in lead_data.get('motivation', []):
-        if motivation in high_motivation:
-            score += 10
-        elif motivation in medium_motivation:
-            score += 5
-    
-    # Timeline scoring (25 points max)
-    timeline_scores = {
-        "ASAP": 25,
-        "1-30 days": 20,
-        "30-60 days": 15,
-        "60-90 days": 10,
-        "90+ days": 5,
-        "Flexible": 8
-    }
-    score += timeline_scores.get(lead_data.get('timeline'), 0)
-    
-    # Equity scoring (25 points max)
-    equity = lead_data.get('equity', 0)
-    if equity >= 100000:
-        score += 25
-    elif equity >= 50000:
-        score += 20
-    elif equity >= 25000:
-        score += 15
-    elif equity >= 10000:
-        score += 10
-    elif equity > 0:
-        score += 5
-    
-    # Condition scoring (10 points max)
-    condition_scores = {
-        "Excellent": 2,
-        "Good": 4,
-        "Fair": 6,
-        "Poor": 8,
-        "Needs Major Repairs": 10
-    }
-    score += condition_scores.get(lead_data.get('condition'), 0)
-    
-    # Occupancy scoring (10 points max)
-    occupancy_scores = {
-        "Vacant": 10,
-        "Owner Occupied": 8,
-        "Tenant Occupied": 5
-    }
-    score += occupancy_scores.get(lead_data.get('occupancy'), 0)
-    
-    return min(score, 100)
-
 def render_lead_scoring():
     """Lead scoring analysis and management"""
     st.markdown("### 📊 Lead Scoring System")
@@ -2606,7 +2089,11 @@ def render_loi_generator():
                 }
                 
                 # Generate LOI
-                loi_content = services['contract_generator'].generate_loi(loi_data)
+                try:
+                    loi_content = services['contract_generator'].generate_loi(loi_data)
+                except ValueError as e:
+                    st.error(str(e))
+                    return
                 
                 st.markdown("### 📄 Generated Letter of Intent")
                 
@@ -2640,6 +2127,47 @@ def render_loi_generator():
                 
             else:
                 st.error("Please fill in all required fields")
+    
+    render_bulk_loi_generator()
+
+def render_bulk_loi_generator():
+    """Bulk LOI generation from an uploaded property list"""
+    st.markdown("#### 📦 Bulk LOI Generator")
+    st.caption("Upload a CSV with property_address, seller_name and offer_price columns to generate an LOI for every row.")
+    
+    uploaded_file = st.file_uploader("Property List (CSV)", type=['csv'], key="bulk_loi_upload")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        bulk_buyer_name = st.text_input("Buyer Name", value="WTF Investments LLC", key="bulk_loi_buyer")
+        bulk_buyer_phone = st.text_input("Buyer Phone", value="(555) 123-4567", key="bulk_loi_phone")
+    with col2:
+        bulk_buyer_email = st.text_input("Buyer Email", value="offers@wtfinvestments.com", key="bulk_loi_email")
+        bulk_closing = st.selectbox("Closing Timeframe", ["7 days", "14 days", "21 days", "30 days", "45 days"],
+                                    index=3, key="bulk_loi_closing")
+    
+    if uploaded_file is not None and st.button("📦 Generate All LOIs", type="primary"):
+        property_list = pd.read_csv(uploaded_file, dtype=str).fillna('')
+        
+        defaults = {
+            'buyer_name': bulk_buyer_name,
+            'buyer_phone': bulk_buyer_phone,
+            'buyer_email': bulk_buyer_email,
+            'closing_timeframe': bulk_closing
+        }
+        
+        archive = BytesIO()
+        with st.spinner(f"Generating {len(property_list):,} LOIs..."):
+            result = services['contract_generator'].generate_bulk_lois(
+                property_list.to_dict('records'), archive, defaults=defaults)
+        
+        st.success(f"Generated {result['rendered']:,} LOIs")
+        if result['failed']:
+            st.warning(f"{result['failed']:,} rows skipped (see errors.txt in the archive)")
+        
+        st.download_button("📥 Download LOIs (ZIP)", data=archive.getvalue(),
+                           file_name=f"lois_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+                           mime="application/zip")
 
 def render_contract_generator():
     """Enhanced contract generator"""
@@ -2750,7 +2278,11 @@ def render_purchase_agreement_form():
                 }
                 
                 # Generate contract
-                contract_content = services['contract_generator'].generate_purchase_agreement(deal_data)
+                try:
+                    contract_content = services['contract_generator'].generate_purchase_agreement(deal_data)
+                except ValueError as e:
+                    st.error(str(e))
+                    return
                 
                 st.markdown("### 📋 Generated Purchase Agreement")
                 
@@ -2848,7 +2380,11 @@ def render_assignment_contract_form():
                 }
                 
                 # Generate assignment contract
-                contract_content = services['contract_generator'].generate_assignment_contract(deal_data)
+                try:
+                    contract_content = services['contract_generator'].generate_assignment_contract(deal_data)
+                except ValueError as e:
+                    st.error(str(e))
+                    return
                 
                 st.markdown("### 📋 Generated Assignment Contract")
                 
@@ -3186,50 +2722,55 @@ def render_scriptmaster_interface():
     
     # Generate complete script
     if st.button("🎭 Generate Complete 5x5 Script", type="primary", use_container_width=True):
-        with st.spinner("🤖 ScriptMaster AI is generating your complete 5x5 script..."):
-            # Simulate script generation time
-            import time
-            time.sleep(3)
-            
-            # Generate full script using AI assistant
-            script_prompt = f"Generate a complete {script_type} script for {scenario} with {deal_type} structure"
-            full_script = services['ai_assistant'].generate_full_script(
-                script_type.lower().replace(' ', '_'), 
-                f"{scenario} - {deal_type}"
-            )
-            
-            st.success("✅ Complete 5x5 Script Generated!")
+        # Generate full script using AI assistant
+        script_prompt = f"Generate a complete {script_type} script for {scenario} with {deal_type} structure"
+        full_script = services['ai_assistant'].generate_full_script(
+            script_type.lower().replace(' ', '_'), 
+            f"{scenario} - {deal_type}"
+        )
             
-            # Display the complete script
-            st.markdown("### 📖 Your Complete 5x5 Script")
+        st.success("✅ Complete 5x5 Script Generated!")
             
-            with st.expander("📄 View Full Script (Click to expand)", expanded=True):
-                st.markdown(f"""
-                <div style='background: rgba(255, 255, 255, 0.95); color: black; padding: 2rem; 
-                            border-radius: 10px; font-family: monospace; white-space: pre-wrap;'>
-                {full_script}
-                </div>
-                """, unsafe_allow_html=True)
+        # Display the complete script
+        st.markdown("### 📖 Your Complete 5x5 Script")
             
-            # Script actions
-            col1, col2, col3, col4 = st.columns(4)
+        with st.expander("📄 View Full Script (Click to expand)", expanded=True):
+            st.markdown(f"""
+            <div style='background: rgba(255, 255, 255, 0.95); color: black; padding: 2rem; 
+                        border-radius: 10px; font-family: monospace; white-space: pre-wrap;'>
+            {full_script}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Related scripts and templates from the local library
+        library_matches = services['search'].search(
+            f"{script_type} {scenario} {deal_type}", k=3,
+            owner=st.session_state.user_data.get('id'), kinds=['script', 'template'])
+        if library_matches:
+            with st.expander("📚 Related from your library"):
+                for match in library_matches:
+                    st.markdown(f"**{match['title']}** ({match['kind']})")
+                    st.caption(match['snippet'])
+            
+        # Script actions
+        col1, col2, col3, col4 = st.columns(4)
             
-            with col1:
-                if st.button("📥 Download Script", use_container_width=True):
-                    st.success("Script downloaded as PDF!")
+        with col1:
+            if st.button("📥 Download Script", use_container_width=True):
+                st.success("Script downloaded as PDF!")
             
-            with col2:
-                if st.button("📧 Email Script", use_container_width=True):
-                    st.success("Script emailed to your team!")
+        with col2:
+            if st.button("📧 Email Script", use_container_width=True):
+                st.success("Script emailed to your team!")
             
-            with col3:
-                if st.button("💾 Save to Library", use_container_width=True):
-                    st.success("Script saved to script library!")
+        with col3:
+            if st.button("💾 Save to Library", use_container_width=True):
+                st.success("Script saved to script library!")
             
-            with col4:
-                if st.button("🎯 Practice Mode", use_container_width=True):
-                    st.session_state.practice_script = full_script
-                    st.success("Practice mode activated!")
+        with col4:
+            if st.button("🎯 Practice Mode", use_container_width=True):
+                st.session_state.practice_script = full_script
+                st.success("Practice mode activated!")
     
     # Practice mode
     if 'practice_script' in st.session_state:
@@ -3342,6 +2883,17 @@ def render_underwriter_interface():
                     )
                     
                     st.markdown(analysis_result)
+                
+                # Cite the user's own comparable past analyses
+                comparables = services['search'].comparable_deals(
+                    {'address': address, 'strategy': strategy}, st.session_state.user_data.get('id'))
+                if comparables:
+                    st.markdown("#### 🏘️ Comparable Deals From Your History")
+                    for deal in comparables:
+                        meta = deal['metadata']
+                        st.markdown(f"- **{deal['title']}**, {meta.get('city')}, {meta.get('state')} · "
+                                    f"ARV ${meta.get('arv') or 0:,.0f} · Max offer ${meta.get('max_offer') or 0:,.0f}"
+                                    + (f" · Grade {meta['grade']}" if meta.get('grade') else ''))
     
     elif mode == "deal_comparison":
         st.markdown("#### 💰 Deal Comparison Tool")
@@ -3471,9 +3023,16 @@ def render_general_assistant_interface():
         # Add user message
         st.session_state.general_ai_messages.append({"role": "user", "content": user_input})
         
-        # Get AI response
-        with st.spinner("🤖 AI Assistant thinking..."):
-            response = services['ai_assistant'].get_response(user_input, "general")
+        with st.chat_message("user"):
+            st.write(user_input)
+        
+        # Stream AI response chunk by chunk
+        with st.chat_message("assistant"):
+            placeholder = st.empty()
+            response = ""
+            for chunk in services['ai_assistant'].stream_response(user_input, "general"):
+                response += chunk
+                placeholder.markdown(response)
         
         # Add AI response
         st.session_state.general_ai_messages.append({"role": "assistant", "content": response})
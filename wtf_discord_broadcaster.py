@@ -0,0 +1,287 @@
+"""
+WTF Discord Broadcaster - Batched, deduplicated deal alerts over asyncio
+
+Deal events go onto a queue. A dispatcher routes each deal to its channels,
+drops alerts already sent within the dedup window (by deal hash), and coalesces the
+rest into digest embeds. Each channel has its own sender task and token bucket
+so a rate-limited channel never holds up the others.
+
+The client only needs `async send(channel_id, embeds) -> Dict`; DiscordPyClient
+wraps a discord.py bot and FakeDiscordClient stands in for throughput tests.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Discord allows 5 messages per 5 seconds per channel; a steady 1/s without bursts stays inside it
+DISCORD_SETTINGS = {
+    'channel_rate': float(os.environ.get('WTF_DISCORD_CHANNEL_RATE', '1')),
+    'channel_burst': float(os.environ.get('WTF_DISCORD_CHANNEL_BURST', '1')),
+    'flush_interval': float(os.environ.get('WTF_DISCORD_FLUSH_INTERVAL', '2')),
+    'dedup_hours': float(os.environ.get('WTF_DISCORD_DEDUP_HOURS', '24'))
+}
+
+# Discord caps an embed at 25 fields and a message at 10 embeds
+MAX_FIELDS_PER_EMBED = 25
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_ATTEMPTS = 3
+
+GRADE_COLORS = {'A+': 0x10B981, 'A': 0x10B981, 'B': 0x3B82F6, 'C': 0xF59E0B, 'D': 0xEF4444, 'F': 0xEF4444}
+
+
+def deal_hash(deal: Dict) -> str:
+    """Identity of an alert: the deal plus the figures that would make a re-alert worthwhile"""
+    key = [deal.get('id') or deal.get('address'), deal.get('price') or deal.get('list_price'),
+           deal.get('grade'), deal.get('status')]
+    return hashlib.sha1(json.dumps(key, default=str).encode()).hexdigest()
+
+
+def deal_field(deal: Dict) -> Dict:
+    """One embed field summarizing a deal"""
+    price = deal.get('price') or deal.get('list_price') or 0
+    parts = [f"💰 ${price:,.0f}"]
+    if deal.get('arv'):
+        parts.append(f"ARV ${deal['arv']:,.0f}")
+    if deal.get('max_offer'):
+        parts.append(f"Max offer ${deal['max_offer']:,.0f}")
+    if deal.get('grade'):
+        parts.append(f"Grade {deal['grade']}")
+    location = ', '.join(str(deal[k]) for k in ('city', 'state') if deal.get(k))
+    name = deal.get('address') or deal.get('title') or 'New deal'
+    return {'name': f"🏠 {name}"[:256], 'value': ' · '.join(parts) + (f"\n📍 {location}" if location else ''),
+            'inline': False}
+
+
+def build_digest(deals: List[Dict]) -> List[Dict]:
+    """Discord embed dicts for up to MAX_FIELDS_PER_EMBED * MAX_EMBEDS_PER_MESSAGE deals"""
+    embeds = []
+    for i in range(0, len(deals), MAX_FIELDS_PER_EMBED):
+        chunk = deals[i:i + MAX_FIELDS_PER_EMBED]
+        grades = [d.get('grade') for d in chunk if d.get('grade')]
+        embeds.append({
+            'title': f"🏠 {len(chunk)} New Deal{'s' if len(chunk) != 1 else ''}" if i == 0 else 'More Deals',
+            'color': GRADE_COLORS.get(min(grades) if grades else '', 0x8B5CF6),
+            'fields': [deal_field(deal) for deal in chunk]
+        })
+    return embeds[:MAX_EMBEDS_PER_MESSAGE]
+
+
+class AsyncTokenBucket:
+    """asyncio token bucket; acquire() sleeps until a token is available"""
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst or max(1.0, rate_per_second))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens; returns seconds spent waiting"""
+        waited = 0.0
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return waited
+            wait = (tokens - self._tokens) / self.rate
+            waited += wait
+            await asyncio.sleep(wait)
+
+
+class DealAlertBroadcaster:
+    """Consumes deal events and sends per-channel digests, rate limited and deduplicated"""
+
+    def __init__(self, client, routes: Callable[[Dict], Iterable[int]],
+                 deals_per_digest: int = MAX_FIELDS_PER_EMBED,
+                 flush_interval: float = DISCORD_SETTINGS['flush_interval'],
+                 channel_rate: float = DISCORD_SETTINGS['channel_rate'],
+                 channel_burst: float = DISCORD_SETTINGS['channel_burst'],
+                 dedup_seconds: float = DISCORD_SETTINGS['dedup_hours'] * 3600,
+                 max_dedup_entries: int = 200000, queue_size: int = 10000):
+        self.client = client
+        self.routes = routes
+        self.deals_per_digest = min(deals_per_digest, MAX_FIELDS_PER_EMBED * MAX_EMBEDS_PER_MESSAGE)
+        self.flush_interval = flush_interval
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.dedup_seconds = dedup_seconds
+        self.max_dedup_entries = max_dedup_entries
+
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self._pending = {}
+        self._senders = {}
+        self._outboxes = {}
+        self._buckets = {}
+        self._seen = OrderedDict()
+        self._tasks = []
+        self.stats = {'received': 0, 'duplicates': 0, 'unrouted': 0, 'digests_sent': 0, 'deals_sent': 0,
+                      'rate_limit_waits': 0, 'retries': 0, 'failed': 0}
+
+    # Lifecycle
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._dispatch()), asyncio.create_task(self._ticker())]
+
+    async def stop(self, drain: bool = True):
+        """Stop accepting work; with drain, send everything already queued first"""
+        if drain:
+            await self.queue.join()
+            self._flush_all()
+            await asyncio.gather(*(outbox.join() for outbox in self._outboxes.values()))
+        for task in self._tasks + list(self._senders.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._senders.values(), return_exceptions=True)
+        self._tasks, self._senders, self._outboxes = [], {}, {}
+
+    async def publish(self, deal: Dict):
+        await self.queue.put(deal)
+
+    def publish_nowait(self, deal: Dict) -> bool:
+        try:
+            self.queue.put_nowait(deal)
+            return True
+        except asyncio.QueueFull:
+            logger.warning("Deal alert queue full; dropping alert")
+            return False
+
+    # Routing and coalescing
+    def _is_duplicate(self, key: str, now: float) -> bool:
+        expires = self._seen.get(key)
+        if expires is not None and expires > now:
+            return True
+        self._seen[key] = now + self.dedup_seconds
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_dedup_entries:
+            self._seen.popitem(last=False)
+        return False
+
+    async def _dispatch(self):
+        while True:
+            deal = await self.queue.get()
+            try:
+                self.stats['received'] += 1
+                if self._is_duplicate(deal_hash(deal), time.monotonic()):
+                    self.stats['duplicates'] += 1
+                    continue
+                channels = list(self.routes(deal) or [])
+                if not channels:
+                    self.stats['unrouted'] += 1
+                for channel_id in channels:
+                    pending = self._pending.setdefault(channel_id, [])
+                    pending.append(deal)
+                    if len(pending) >= self.deals_per_digest:
+                        self._flush(channel_id)
+            except Exception as e:
+                logger.error(f"Deal alert dispatch failed: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    async def _ticker(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._flush_all()
+
+    def _flush_all(self):
+        for channel_id in list(self._pending):
+            self._flush(channel_id)
+
+    def _flush(self, channel_id: int):
+        deals = self._pending.pop(channel_id, None)
+        if not deals:
+            return
+        if channel_id not in self._senders:
+            self._outboxes[channel_id] = asyncio.Queue()
+            self._buckets[channel_id] = AsyncTokenBucket(self.channel_rate, self.channel_burst)
+            self._senders[channel_id] = asyncio.create_task(self._sender(channel_id))
+        self._outboxes[channel_id].put_nowait(deals)
+
+    # Delivery
+    async def _sender(self, channel_id: int):
+        outbox = self._outboxes[channel_id]
+        bucket = self._buckets[channel_id]
+        while True:
+            deals = await outbox.get()
+            # Digests that queued up behind the rate limit go out together
+            while not outbox.empty() and len(deals) < self.deals_per_digest:
+                deals.extend(outbox.get_nowait())
+                outbox.task_done()
+            try:
+                for i in range(0, len(deals), self.deals_per_digest):
+                    await self._send_digest(channel_id, bucket, deals[i:i + self.deals_per_digest])
+            finally:
+                outbox.task_done()
+
+    async def _send_digest(self, channel_id: int, bucket: AsyncTokenBucket, deals: List[Dict]):
+        embeds = build_digest(deals)
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            if await bucket.acquire():
+                self.stats['rate_limit_waits'] += 1
+            try:
+                result = await self.client.send(channel_id, embeds)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+
+            if result.get('success'):
+                self.stats['digests_sent'] += 1
+                self.stats['deals_sent'] += len(deals)
+                return
+            if attempt < MAX_ATTEMPTS:
+                self.stats['retries'] += 1
+                await asyncio.sleep(result.get('retry_after') or 2 ** attempt)
+
+        self.stats['failed'] += len(deals)
+        logger.error(f"Deal digest to channel {channel_id} failed: {result.get('error')}")
+
+
+class DiscordPyClient:
+    """Adapter from a discord.py Client/Bot to the broadcaster's send interface"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def send(self, channel_id: int, embeds: List[Dict]) -> Dict:
+        import discord
+
+        try:
+            channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+            await channel.send(embeds=[discord.Embed.from_dict(embed) for embed in embeds])
+            return {'success': True}
+        except discord.HTTPException as e:
+            retry_after = getattr(e, 'retry_after', None) if e.status == 429 else None
+            return {'success': False, 'error': str(e), 'retry_after': retry_after}
+
+
+class FakeDiscordClient:
+    """In-process Discord stand-in that records messages and enforces a per-channel rate limit"""
+
+    def __init__(self, latency: float = 0.0, rate_limit: int = 5, per_seconds: float = 5.0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.per_seconds = per_seconds
+        self.messages = []
+        self.rate_limited = 0
+        self._history = {}
+
+    async def send(self, channel_id: int, embeds: List[Dict]) -> Dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        window = [t for t in self._history.get(channel_id, []) if t > now - self.per_seconds]
+        if len(window) >= self.rate_limit:
+            self.rate_limited += 1
+            self._history[channel_id] = window
+            return {'success': False, 'error': '429 Too Many Requests',
+                    'retry_after': window[0] + self.per_seconds - now}
+        window.append(now)
+        self._history[channel_id] = window
+        self.messages.append((channel_id, embeds))
+        return {'success': True}
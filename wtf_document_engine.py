@@ -0,0 +1,609 @@
+"""
+WTF Document Engine - Precompiled contract & LOI templates with bulk rendering
+Templates are parsed once into literal/field parts and rendered many times,
+so a full offer blast can be streamed straight into a ZIP archive.
+"""
+
+import sqlite3
+import json
+import uuid
+import re
+import zipfile
+import logging
+from string import Formatter
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+_formatter = Formatter()
+
+
+def _short_id():
+    return str(uuid.uuid4())[:8]
+
+
+# Built-in document templates (same wording as the original generators)
+BUILTIN_TEMPLATES = {
+    'purchase_agreement': {
+        'template_type': 'contract',
+        'template_name': 'Real Estate Purchase Agreement',
+        'filename': 'Purchase_Agreement_{property_address}_{contract_id}.txt',
+        'required': ['seller_name', 'buyer_name', 'property_address', 'purchase_price'],
+        'defaults': {
+            'seller_name': 'SELLER NAME',
+            'seller_address': 'SELLER ADDRESS',
+            'buyer_name': 'BUYER NAME',
+            'buyer_address': 'BUYER ADDRESS',
+            'property_address': 'PROPERTY ADDRESS',
+            'purchase_price': 0,
+            'earnest_money': 1000,
+            'inspection_period': 7,
+            'closing_date': 'TBD',
+            'financing_days': 21,
+            'closing_costs_paid_by': 'Split 50/50',
+            'special_terms': 'None',
+            'contract_id': _short_id
+        },
+        'content': """
+        REAL ESTATE PURCHASE AGREEMENT
+
+        This Purchase Agreement ("Agreement") is made on {generated_long_date} between:
+
+        SELLER: {seller_name}
+        Address: {seller_address}
+
+        BUYER: {buyer_name}
+        Address: {buyer_address}
+
+        PROPERTY INFORMATION:
+        Address: {property_address}
+        Legal Description: To be obtained from title company
+
+        PURCHASE TERMS:
+        Purchase Price: ${purchase_price:,.2f}
+        Earnest Money: ${earnest_money:,.2f}
+        Inspection Period: {inspection_period} days
+        Closing Date: {closing_date}
+
+        FINANCING:
+        This purchase is subject to buyer obtaining financing within {financing_days} days.
+
+        CONTINGENCIES:
+        1. Property inspection satisfactory to buyer
+        2. Clear title and survey
+        3. Property to be delivered in same condition as of acceptance
+
+        CLOSING COSTS:
+        Closing costs will be paid by: {closing_costs_paid_by}
+
+        SPECIAL PROVISIONS:
+        {special_terms}
+
+        This agreement shall be binding upon the parties, their heirs, successors, and assigns.
+
+        SELLER SIGNATURE: _________________________ DATE: _________
+        {seller_name}
+
+        BUYER SIGNATURE: _________________________ DATE: _________
+        {buyer_name}
+
+        Generated by WTF Platform on {generated_at}
+        Contract ID: {contract_id}
+        """
+    },
+    'assignment_contract': {
+        'template_type': 'contract',
+        'template_name': 'Assignment of Purchase Contract',
+        'filename': 'Assignment_{property_address}_{assignment_id}.txt',
+        'required': ['assignor_name', 'assignee_name', 'property_address', 'assignment_fee'],
+        'defaults': {
+            'assignor_name': 'ASSIGNOR NAME',
+            'assignee_name': 'ASSIGNEE NAME',
+            'property_address': 'PROPERTY ADDRESS',
+            'purchase_price': 0,
+            'original_contract_date': 'TBD',
+            'seller_name': 'SELLER NAME',
+            'assignment_fee': 5000,
+            'assignment_id': _short_id
+        },
+        'content': """
+        ASSIGNMENT OF REAL ESTATE PURCHASE CONTRACT
+
+        This Assignment Agreement is made on {generated_long_date} between:
+
+        ASSIGNOR (Original Buyer): {assignor_name}
+        ASSIGNEE (New Buyer): {assignee_name}
+
+        ORIGINAL CONTRACT INFORMATION:
+        Property Address: {property_address}
+        Original Purchase Price: ${purchase_price:,.2f}
+        Original Contract Date: {original_contract_date}
+        Seller: {seller_name}
+
+        ASSIGNMENT TERMS:
+        Assignment Fee: ${assignment_fee:,.2f}
+        Assignee shall assume all rights and obligations under the original purchase contract.
+
+        ASSIGNOR WARRANTIES:
+        1. Original contract is valid and in full force
+        2. No defaults exist under original contract
+        3. All conditions have been met or waived
+
+        ASSIGNEE ACKNOWLEDGMENTS:
+        1. Has reviewed original purchase contract
+        2. Accepts all terms and conditions
+        3. Will close directly with seller
+
+        ASSIGNMENT FEE PAYMENT:
+        Assignment fee of ${assignment_fee:,.2f} is due at closing.
+
+        ASSIGNOR SIGNATURE: _________________________ DATE: _________
+        {assignor_name}
+
+        ASSIGNEE SIGNATURE: _________________________ DATE: _________
+        {assignee_name}
+
+        Generated by WTF Platform on {generated_at}
+        Assignment ID: {assignment_id}
+        """
+    },
+    'loi': {
+        'template_type': 'loi',
+        'template_name': 'Letter of Intent',
+        'filename': 'LOI_{property_address}_{loi_id}.txt',
+        'required': ['property_address', 'seller_name', 'buyer_name', 'offer_price'],
+        'defaults': {
+            'seller_name': 'PROPERTY OWNER',
+            'property_address': 'PROPERTY ADDRESS',
+            'offer_price': 0,
+            'earnest_money': 1000,
+            'closing_timeframe': '30 days',
+            'inspection_period': '7 days',
+            'additional_terms': 'Cash purchase with quick closing',
+            'buyer_qualification': 'cash available and pre-approval',
+            'buyer_name': 'BUYER NAME',
+            'buyer_phone': 'BUYER PHONE',
+            'buyer_email': 'BUYER EMAIL',
+            'loi_id': _short_id
+        },
+        'content': """
+        LETTER OF INTENT TO PURCHASE REAL ESTATE
+
+        Date: {generated_long_date}
+
+        To: {seller_name}
+
+        Re: Purchase of Property at {property_address}
+
+        Dear Property Owner,
+
+        I am writing to express my serious interest in purchasing your property located at
+        {property_address}.
+
+        PROPOSED TERMS:
+
+        Purchase Price: ${offer_price:,.2f}
+        Earnest Money: ${earnest_money:,.2f}
+        Closing Timeframe: {closing_timeframe}
+        Inspection Period: {inspection_period}
+
+        CONDITIONS:
+        • Property to be sold in "AS-IS" condition
+        • Clear and marketable title
+        • All liens and encumbrances to be satisfied at closing
+        • Standard property inspection to be completed
+
+        ADDITIONAL TERMS:
+        {additional_terms}
+
+        This Letter of Intent is non-binding and is intended to outline the basic terms
+        for further negotiation. A formal purchase agreement will be prepared upon
+        mutual acceptance of these terms.
+
+        I am a serious buyer with {buyer_qualification}
+        and can close quickly. I would appreciate the opportunity to discuss this offer with you.
+
+        Please contact me at your earliest convenience.
+
+        Sincerely,
+
+        {buyer_name}
+        {buyer_phone}
+        {buyer_email}
+
+        Generated by WTF Platform on {generated_at}
+        LOI ID: {loi_id}
+        """
+    },
+    'wholesale_contract': {
+        'template_type': 'contract',
+        'template_name': 'Wholesale Purchase and Sale Agreement',
+        'filename': 'Wholesale_Contract_{property_address}.txt',
+        'required': ['property_address', 'acquisition_cost'],
+        'defaults': {
+            'property_address': '',
+            'city': '',
+            'state': '',
+            'zip_code': '',
+            'contact_name': '[SELLER NAME]',
+            'contact_phone': '[SELLER PHONE]',
+            'acquisition_cost': 0
+        },
+        'content': """REAL ESTATE PURCHASE AND SALE AGREEMENT
+(WHOLESALE CONTRACT)
+
+Property Address: {property_address}, {city}, {state} {zip_code}
+
+BUYER: [BUYER NAME]
+Address: [BUYER ADDRESS]
+
+SELLER: {contact_name}
+Phone: {contact_phone}
+
+PURCHASE PRICE: ${acquisition_cost:,.2f}
+
+EARNEST MONEY: $1,000.00 (to be deposited within 2 business days)
+
+INSPECTION PERIOD: 10 days from acceptance
+
+CLOSING DATE: 30 days from acceptance (or sooner if possible)
+
+FINANCING: This contract is contingent upon Buyer obtaining financing or is a CASH purchase.
+
+ASSIGNMENT: Buyer reserves the right to assign this contract to another party.
+
+PROPERTY CONDITION: Property is sold AS-IS, WHERE-IS.
+
+This contract is subject to Buyer's inspection and approval of the property, title, and all related documents.
+
+Generated on: {generated_at}
+Generated by: Wholesale2Flip Platform
+
+NOTE: This is a template contract. Please consult with a real estate attorney before use."""
+    },
+    'investor_loi': {
+        'template_type': 'loi',
+        'template_name': 'Investor Letter of Intent',
+        'filename': 'LOI_{property_address}.txt',
+        'required': ['property_address', 'acquisition_cost'],
+        'defaults': {
+            'contact_name': '[SELLER NAME]',
+            'property_address': '',
+            'city': '',
+            'state': '',
+            'zip_code': '',
+            'acquisition_cost': 0,
+            'property_type': 'N/A',
+            'bedrooms': 'N/A',
+            'bathrooms': 'N/A',
+            'square_feet': 'N/A',
+            'year_built': 'N/A'
+        },
+        'content': """LETTER OF INTENT (LOI)
+REAL ESTATE INVESTMENT OPPORTUNITY
+
+Date: {generated_date}
+
+To: {contact_name}
+Property: {property_address}, {city}, {state} {zip_code}
+
+Dear Property Owner,
+
+We are interested in purchasing your property located at the above address. Based on our preliminary analysis, we would like to submit the following offer:
+
+PROPOSED PURCHASE PRICE: ${acquisition_cost:,.2f}
+
+TERMS:
+- Cash Purchase (No Financing Contingency)
+- 10-Day Inspection Period
+- 30-Day Closing (Can close sooner if needed)
+- Buyer to pay all closing costs
+- Property purchased AS-IS
+
+PROPERTY DETAILS:
+- Type: {property_type}
+- Bedrooms: {bedrooms}
+- Bathrooms: {bathrooms}
+- Square Feet: {square_feet}
+- Year Built: {year_built}
+
+We are serious cash buyers and can close quickly. This offer is non-binding and subject to property inspection and title review.
+
+Please contact us at your earliest convenience to discuss this opportunity.
+
+Best regards,
+Wholesale2Flip Team
+
+Generated by: Wholesale2Flip Platform
+Date: {generated_at}"""
+    }
+}
+
+# Fields filled in by the engine at render time
+GENERATED_FIELDS = ('generated_long_date', 'generated_date', 'generated_at')
+
+
+class CompiledTemplate:
+    """A template parsed once into literal text and field lookups"""
+
+    def __init__(self, key: str, content: str, required: List[str] = None,
+                 defaults: Dict = None, filename: str = None,
+                 template_name: str = '', template_type: str = ''):
+        self.key = key
+        self.template_name = template_name or key
+        self.template_type = template_type
+        self.parts = self._compile(content)
+        self.fields = sorted({field for _, field, _ in self.parts if field})
+        self.required = list(required or [])
+        self.defaults = dict(defaults or {})
+        self.filename_parts = self._compile(filename or f"{key}_{{document_index}}.txt")
+
+    @staticmethod
+    def _compile(content: str) -> Tuple:
+        """Split str.format style content into (literal, field, format_spec) parts"""
+        parts = []
+        for literal, field, spec, conversion in _formatter.parse(content):
+            if conversion:
+                raise ValueError(f"Conversions are not supported in templates: !{conversion}")
+            if field is not None and (not field or not field.isidentifier()):
+                raise ValueError(f"Invalid template field: {{{field}}}")
+            parts.append((literal, field, spec or ''))
+        return tuple(parts)
+
+    def missing_fields(self, record: Dict) -> List[str]:
+        """Return required fields that are absent or blank in record"""
+        return [
+            field for field in self.required
+            if record.get(field) is None or record.get(field) == ''
+        ]
+
+    def _resolve(self, record: Dict, context: Dict) -> Dict:
+        values = dict(context)
+        values.update(record)
+        # Absent and None fields both take the template default
+        for field, default in self.defaults.items():
+            if values.get(field) is None:
+                values[field] = default() if callable(default) else default
+        return values
+
+    @staticmethod
+    def _join(parts: Tuple, values: Dict) -> str:
+        chunks = []
+        append = chunks.append
+        for literal, field, spec in parts:
+            if literal:
+                append(literal)
+            if field is not None:
+                value = values.get(field, '')
+                if not spec:
+                    append('' if value is None else str(value))
+                    continue
+                if value is None:
+                    raise ValueError(f"Missing required fields: {field}")
+                try:
+                    if isinstance(value, str) and spec[-1:] in _NUMERIC_SPECS:
+                        value = _to_number(value, integer=spec.endswith('d'))
+                    append(format(value, spec))
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid value for {field}: {value!r}") from None
+        return ''.join(chunks)
+
+    def render(self, record: Dict, context: Dict = None) -> str:
+        return self._join(self.parts, self._resolve(record, context or {}))
+
+    def render_with_filename(self, record: Dict, context: Dict = None) -> Tuple[str, str]:
+        values = self._resolve(record, context or {})
+        filename = _safe_filename(self._join(self.filename_parts, values))
+        return filename, self._join(self.parts, values)
+
+
+_NUMERIC_SPECS = set('bcdoxXneEfFgG%')
+
+# Row errors kept by write_zip; the rest are only counted
+MAX_REPORTED_ERRORS = 50
+
+
+def _to_number(value: str, integer: bool = False):
+    """Coerce CSV/form strings like '$185,000' for numeric format specs"""
+    cleaned = value.replace('$', '').replace(',', '').strip() or '0'
+    number = float(cleaned)
+    return int(number) if integer else number
+
+
+def _safe_filename(name: str) -> str:
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', name).strip('_')
+    return name[:120] or 'document.txt'
+
+
+def render_context(now: datetime = None) -> Dict:
+    """Date fields shared by every document rendered in one batch"""
+    now = now or datetime.now()
+    return {
+        'generated_long_date': now.strftime('%B %d, %Y'),
+        'generated_date': now.strftime('%Y-%m-%d'),
+        'generated_at': now.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+class DocumentEngine:
+    """Compiles templates once and renders contracts/LOIs singly or in bulk"""
+
+    def __init__(self, db_path: str = None, user_id: str = None, include_builtins: bool = True):
+        self.db_path = db_path
+        self.templates: Dict[str, CompiledTemplate] = {}
+
+        if include_builtins:
+            for key, spec in BUILTIN_TEMPLATES.items():
+                self.register(key, spec['content'], required=spec['required'],
+                              defaults=spec['defaults'], filename=spec['filename'],
+                              template_name=spec['template_name'],
+                              template_type=spec['template_type'])
+
+        if db_path:
+            self.load_from_database(user_id)
+
+    def register(self, key: str, content: str, required: List[str] = None,
+                 defaults: Dict = None, filename: str = None,
+                 template_name: str = '', template_type: str = '') -> CompiledTemplate:
+        """Compile and register a template under key"""
+        template = CompiledTemplate(key, content, required=required, defaults=defaults,
+                                    filename=filename, template_name=template_name,
+                                    template_type=template_type)
+        self.templates[key] = template
+        return template
+
+    def load_from_database(self, user_id: str = None) -> int:
+        """Compile templates from the templates table (user's own + public, or public only)"""
+        query = 'SELECT id, template_type, template_name, content, variables FROM templates'
+        params = []
+        if user_id:
+            query += ' WHERE user_id = ? OR is_public = 1'
+            params.append(user_id)
+        else:
+            query += ' WHERE is_public = 1'
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.cursor().execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"No database templates loaded from {self.db_path}: {str(e)}")
+            return 0
+        finally:
+            conn.close()
+
+        loaded = 0
+        for template_id, template_type, template_name, content, variables in rows:
+            try:
+                required = json.loads(variables) if variables else []
+                self.register(template_id, content, required=required,
+                              filename=f"{template_type}_{{document_index}}.txt",
+                              template_name=template_name, template_type=template_type)
+                loaded += 1
+            except (ValueError, TypeError) as e:
+                logger.error(f"Skipping template {template_name}: {str(e)}")
+
+        return loaded
+
+    def get_template(self, key: str) -> Optional[CompiledTemplate]:
+        template = self.templates.get(key)
+        if template is None:
+            # Allow lookups by display name for database templates
+            for candidate in self.templates.values():
+                if candidate.template_name == key:
+                    return candidate
+        return template
+
+    def list_templates(self, template_type: str = None) -> List[Dict]:
+        return [
+            {
+                'key': t.key,
+                'template_name': t.template_name,
+                'template_type': t.template_type,
+                'fields': t.fields,
+                'required': t.required
+            }
+            for t in self.templates.values()
+            if template_type is None or t.template_type == template_type
+        ]
+
+    def validate(self, key: str, record: Dict) -> Dict:
+        """Check record against the template's required fields"""
+        template = self.get_template(key)
+        if template is None:
+            return {'valid': False, 'missing': [], 'error': f"Unknown template: {key}"}
+
+        missing = template.missing_fields(record)
+        return {'valid': not missing, 'missing': missing}
+
+    def render(self, key: str, record: Dict, validate: bool = True) -> str:
+        """Render a single document
+
+        Raises ValueError when a required field is missing or blank; pass
+        validate=False to fill the gaps from the template defaults instead.
+        """
+        template = self.get_template(key)
+        if template is None:
+            raise KeyError(f"Unknown template: {key}")
+
+        if validate:
+            missing = template.missing_fields(record)
+            if missing:
+                raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        return template.render(record, render_context())
+
+    def render_many(self, key: str, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Render records one at a time, yielding results in input order
+
+        Records are consumed lazily, so memory stays flat no matter how long
+        the list is. Rendering is pure Python string work, so it runs on the
+        caller's thread: worker threads would only contend for the GIL.
+        """
+        template = self.get_template(key)
+        if template is None:
+            raise KeyError(f"Unknown template: {key}")
+
+        context = render_context()
+        for index, record in enumerate(records):
+            missing = template.missing_fields(record)
+            if missing:
+                yield {'index': index, 'error': f"Missing required fields: {', '.join(missing)}"}
+                continue
+            try:
+                filename, content = template.render_with_filename(
+                    record, dict(context, document_index=index + 1))
+            except ValueError as e:
+                yield {'index': index, 'error': str(e)}
+                continue
+            yield {'index': index, 'filename': filename, 'content': content}
+
+    def write_zip(self, key: str, records: Iterable[Dict], fileobj,
+                  compression: int = zipfile.ZIP_DEFLATED) -> Dict:
+        """Stream rendered documents into a ZIP archive written to fileobj
+
+        Failed rows are counted; only the first MAX_REPORTED_ERRORS are kept
+        for errors.txt and the result.
+        """
+        rendered = 0
+        failed = 0
+        errors = []
+        used_names = set()
+
+        with zipfile.ZipFile(fileobj, 'w', compression=compression) as archive:
+            for result in self.render_many(key, records):
+                if 'error' in result:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"Row {result['index'] + 1}: {result['error']}")
+                    continue
+
+                filename = result['filename']
+                if filename in used_names:
+                    stem, dot, ext = filename.rpartition('.')
+                    filename = f"{stem}_{result['index'] + 1}.{ext}" if dot else f"{filename}_{result['index'] + 1}"
+                used_names.add(filename)
+
+                archive.writestr(filename, result['content'])
+                rendered += 1
+
+            if failed:
+                if failed > len(errors):
+                    errors.append(f"... and {failed - len(errors)} more")
+                archive.writestr('errors.txt', '\n'.join(errors))
+
+        return {'rendered': rendered, 'failed': failed, 'errors': errors}
+
+    def record_usage(self, key: str, count: int):
+        """Bump usage_count for database templates after a bulk run"""
+        if not self.db_path or key in BUILTIN_TEMPLATES:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE templates SET usage_count = usage_count + ?, updated_at = ?
+            WHERE id = ?
+        ''', (count, datetime.now().isoformat(), key))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,628 @@
+"""
+WTF Email Engine - Campaign sends with per-recipient rows and tracked engagement
+
+Every recipient is a row in email_recipients. A send walks the pending rows in
+keyset batches, renders each batch from a template parsed once, and hands the
+messages to a pool of SMTP workers that each reuse one connection, throttled
+by a shared token bucket. Opens and clicks are counted in memory and flushed
+to the database in batches.
+
+    python -m wtf_email_engine stub --port 8025
+"""
+
+import argparse
+import json
+import logging
+import os
+import smtplib
+import socketserver
+import string
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.header import Header
+from email.utils import formatdate, make_msgid
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Delivery settings; the defaults point at the local stub server
+SMTP_SETTINGS = {
+    'host': os.environ.get('WTF_SMTP_HOST', 'localhost'),
+    'port': int(os.environ.get('WTF_SMTP_PORT', '8025')),
+    'username': os.environ.get('WTF_SMTP_USERNAME', ''),
+    'password': os.environ.get('WTF_SMTP_PASSWORD', ''),
+    'starttls': os.environ.get('WTF_SMTP_STARTTLS', '') == '1',
+    'sender': os.environ.get('WTF_SMTP_SENDER', 'deals@wholesale2flip.com'),
+    'workers': int(os.environ.get('WTF_SMTP_WORKERS', '8')),
+    'rate_per_second': float(os.environ.get('WTF_SMTP_RATE', '0')) or None
+}
+
+# Merge fields every template can use
+TEMPLATE_FIELDS = ['first_name', 'last_name', 'email', 'property_address', 'estimated_value', 'sender_name',
+                   'tracking_url']
+
+MAX_ATTEMPTS = 3
+
+
+class CompiledTemplate:
+    """str.format-style template parsed once and rendered many times; unknown fields render empty"""
+
+    def __init__(self, text: str):
+        self.text = text
+        try:
+            self.parts = [(literal, field, spec) for literal, field, spec, _ in string.Formatter().parse(text)]
+        except ValueError as e:
+            # Unbalanced braces: send the text as written
+            logger.warning(f"Template parse failed, rendering literally: {str(e)}")
+            self.parts = [(text, None, '')]
+        self.fields = sorted({field for _, field, _ in self.parts if field})
+
+    def render(self, values: Dict) -> str:
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                value = values.get(field, '')
+                if spec and value != '':
+                    try:
+                        value = format(value, spec)
+                    except (TypeError, ValueError):
+                        pass
+                out.append(str(value))
+        return ''.join(out)
+
+    def render_many(self, rows: List[Dict]) -> List[str]:
+        return [self.render(values) for values in rows]
+
+
+def build_message(sender: str, recipient: str, subject: str, body: str, token: str = '') -> bytes:
+    """Plain-text RFC 5322 message as CRLF bytes, ready for SMTP DATA"""
+    if not subject.isascii():
+        subject = Header(subject, 'utf-8').encode()
+    headers = [
+        f"From: {sender}",
+        f"To: {recipient}",
+        f"Subject: {subject}",
+        f"Date: {formatdate(localtime=True)}",
+        f"Message-ID: {make_msgid(domain=sender.rpartition('@')[2] or None)}",
+        "MIME-Version: 1.0",
+        "Content-Type: text/plain; charset=utf-8",
+        "Content-Transfer-Encoding: 8bit"
+    ]
+    if token:
+        headers.append(f"X-WTF-Recipient: {token}")
+    body = body.replace('\r\n', '\n').replace('\n', '\r\n')
+    return ('\r\n'.join(headers) + '\r\n\r\n' + body + '\r\n').encode('utf-8')
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst or max(1.0, rate_per_second))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SMTPSenderPool:
+    """Worker threads that each keep one SMTP connection open across many messages"""
+
+    def __init__(self, host: str = SMTP_SETTINGS['host'], port: int = SMTP_SETTINGS['port'],
+                 username: str = SMTP_SETTINGS['username'], password: str = SMTP_SETTINGS['password'],
+                 starttls: bool = SMTP_SETTINGS['starttls'], workers: int = SMTP_SETTINGS['workers'],
+                 rate_per_second: Optional[float] = SMTP_SETTINGS['rate_per_second'],
+                 messages_per_connection: int = 1000, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.workers = workers
+        self.messages_per_connection = messages_per_connection
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate_per_second) if rate_per_second else None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='smtp')
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.stats = {'connections': 0, 'sent': 0, 'failed': 0}
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        smtp.ehlo()
+        if self.starttls:
+            smtp.starttls()
+            smtp.ehlo()
+        if self.username:
+            smtp.login(self.username, self.password)
+        with self._lock:
+            self._connections.append(smtp)
+            self.stats['connections'] += 1
+        return smtp
+
+    def _connection(self) -> smtplib.SMTP:
+        """This worker's connection, recycled after messages_per_connection sends"""
+        local = self._local
+        if getattr(local, 'smtp', None) is None or local.sent >= self.messages_per_connection:
+            self._drop_connection()
+            local.smtp = self._connect()
+            local.sent = 0
+        return local.smtp
+
+    def _drop_connection(self):
+        smtp = getattr(self._local, 'smtp', None)
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+            with self._lock:
+                if smtp in self._connections:
+                    self._connections.remove(smtp)
+        self._local.smtp = None
+
+    def _send_one(self, sender: str, recipient: str, message: bytes) -> Optional[str]:
+        """None on success, otherwise the error text"""
+        if self.limiter:
+            self.limiter.acquire()
+        for attempt in range(2):
+            try:
+                self._connection().sendmail(sender, [recipient], message)
+                self._local.sent += 1
+                return None
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError) as e:
+                # Stale pooled connection: reconnect once
+                self._drop_connection()
+                if attempt:
+                    return str(e)
+            except smtplib.SMTPRecipientsRefused as e:
+                return str(e.recipients.get(recipient, e))
+            except smtplib.SMTPException as e:
+                try:
+                    self._local.smtp.rset()
+                except (smtplib.SMTPException, OSError):
+                    self._drop_connection()
+                return str(e)
+        return 'send failed'
+
+    def _send_chunk(self, sender: str, messages: List[Tuple]) -> List[Tuple]:
+        return [(key, self._send_one(sender, recipient, message)) for key, recipient, message in messages]
+
+    def send_batch(self, sender: str, messages: List[Tuple]) -> List[Tuple]:
+        """Send (key, recipient, message_bytes) tuples; returns (key, error or None) in input order"""
+        if not messages:
+            return []
+
+        # One contiguous chunk per worker keeps each connection busy with back-to-back sends
+        size = -(-len(messages) // self.workers)
+        futures = [self._pool.submit(self._send_chunk, sender, messages[i:i + size])
+                   for i in range(0, len(messages), size)]
+        results = [result for future in futures for result in future.result()]
+
+        failed = sum(1 for _, error in results if error)
+        with self._lock:
+            self.stats['sent'] += len(results) - failed
+            self.stats['failed'] += failed
+        return results
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for smtp in connections:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+
+class EmailCampaignEngine:
+    """Creates campaigns, stores one row per recipient and sends them in batches"""
+
+    def __init__(self, db_manager, sender: str = SMTP_SETTINGS['sender'], batch_size: int = 1000,
+                 tracking_base_url: str = ''):
+        self.db = db_manager
+        self.sender = sender
+        self.batch_size = batch_size
+        self.tracking_base_url = tracking_base_url.rstrip('/')
+
+    def create_campaign(self, user_id: str, campaign_name: str, subject: str, content: str,
+                        recipients: List[Dict], source: str = 'custom', scheduled_date: str = None) -> str:
+        """Create a draft campaign and its recipient rows; returns the campaign id"""
+
+        campaign_id = str(uuid.uuid4())
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        # recipient_list now only describes the audience; addresses live in email_recipients
+        cursor.execute('''
+            INSERT INTO email_campaigns (id, user_id, campaign_name, subject, content, recipient_list,
+                                         status, scheduled_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (campaign_id, user_id, campaign_name, subject, content,
+              json.dumps({'source': source, 'count': len(recipients)}),
+              'scheduled' if scheduled_date else 'draft', scheduled_date))
+
+        self._insert_recipients(cursor, campaign_id, recipients)
+        conn.commit()
+        conn.close()
+
+        return campaign_id
+
+    def add_recipients(self, campaign_id: str, recipients: List[Dict]) -> int:
+        """Append recipients; addresses already on the campaign are skipped"""
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        added = self._insert_recipients(cursor, campaign_id, recipients)
+        conn.commit()
+        conn.close()
+
+        return added
+
+    @staticmethod
+    def _insert_recipients(cursor, campaign_id: str, recipients: List[Dict]) -> int:
+        before = cursor.connection.total_changes
+        cursor.executemany('''
+            INSERT OR IGNORE INTO email_recipients (campaign_id, email, lead_id, merge_data, tracking_token)
+            VALUES (?, ?, ?, ?, ?)
+        ''', ((campaign_id, r['email'].strip().lower(), r.get('lead_id'),
+               json.dumps({k: v for k, v in r.items() if k not in ('email', 'lead_id')}), uuid.uuid4().hex)
+              for r in recipients if r.get('email')))
+        return cursor.connection.total_changes - before
+
+    def lead_recipients(self, user_id: str, statuses: Optional[List[str]] = None, min_score: int = 0) -> List[Dict]:
+        """Leads with an email address as recipient dicts"""
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        query = '''
+            SELECT id, email, first_name, last_name, property_address, estimated_value
+            FROM leads
+            WHERE user_id = ? AND email IS NOT NULL AND email != '' AND score >= ?
+        '''
+        params = [user_id, min_score]
+        if statuses:
+            query += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [{'lead_id': row[0], 'email': row[1], 'first_name': row[2] or '', 'last_name': row[3] or '',
+                 'property_address': row[4] or '', 'estimated_value': f"${row[5] or 0:,.0f}"} for row in rows]
+
+    def send_campaign(self, campaign_id: str, pool: SMTPSenderPool, sender_name: str = '',
+                      retry_failed: bool = False) -> Dict:
+        """Send every pending recipient; safe to call again after an interruption"""
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT subject, content FROM email_campaigns WHERE id = ?', (campaign_id,))
+        campaign = cursor.fetchone()
+        if not campaign:
+            conn.close()
+            return {'success': False, 'error': 'Campaign not found'}
+
+        subject_template = CompiledTemplate(campaign[0])
+        body_template = CompiledTemplate(campaign[1])
+        statuses = ('pending', 'failed') if retry_failed else ('pending',)
+
+        cursor.execute("UPDATE email_campaigns SET status = 'sending' WHERE id = ?", (campaign_id,))
+        conn.commit()
+
+        start = time.perf_counter()
+        sent = failed = 0
+        last_id = 0
+        while True:
+            # Keyset batches over the (campaign_id, status, id) index
+            cursor.execute(f'''
+                SELECT id, email, merge_data, tracking_token FROM email_recipients
+                WHERE campaign_id = ? AND status IN ({', '.join('?' for _ in statuses)}) AND attempts < ? AND id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (campaign_id, *statuses, MAX_ATTEMPTS, last_id, self.batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            merge_rows = []
+            for row_id, email, merge_data, token in rows:
+                values = json.loads(merge_data) if merge_data else {}
+                values['email'] = email
+                values.setdefault('sender_name', sender_name)
+                values['tracking_url'] = f"{self.tracking_base_url}/t/{token}" if self.tracking_base_url else ''
+                merge_rows.append(values)
+
+            subjects = subject_template.render_many(merge_rows)
+            bodies = body_template.render_many(merge_rows)
+            messages = [(row[0], row[1], build_message(self.sender, row[1], subject, body, row[3]))
+                        for row, subject, body in zip(rows, subjects, bodies)]
+
+            results = pool.send_batch(self.sender, messages)
+            now = datetime.now().isoformat()
+            ok = [(now, row_id) for row_id, error in results if error is None]
+            errors = [(error[:500], row_id) for row_id, error in results if error is not None]
+
+            cursor.executemany('''
+                UPDATE email_recipients SET status = 'sent', sent_at = ?, attempts = attempts + 1, error = NULL
+                WHERE id = ?
+            ''', ok)
+            cursor.executemany('''
+                UPDATE email_recipients SET status = 'failed', error = ?, attempts = attempts + 1 WHERE id = ?
+            ''', errors)
+            cursor.execute('UPDATE email_campaigns SET sent_count = sent_count + ? WHERE id = ?',
+                           (len(ok), campaign_id))
+            conn.commit()
+            sent += len(ok)
+            failed += len(errors)
+
+        seconds = time.perf_counter() - start
+        cursor.execute('''
+            UPDATE email_campaigns SET status = ?, sent_date = ? WHERE id = ?
+        ''', ('sent' if not failed else 'partial', datetime.now().isoformat(), campaign_id))
+        conn.commit()
+        conn.close()
+
+        logger.info(f"Campaign {campaign_id}: {sent} sent, {failed} failed in {seconds:.1f}s")
+        return {
+            'success': True,
+            'sent': sent,
+            'failed': failed,
+            'seconds': round(seconds, 3),
+            'messages_per_second': round(sent / seconds, 1) if seconds > 0 else 0
+        }
+
+    def get_campaign_stats(self, user_id: str, limit: int = 20) -> List[Dict]:
+        """Recent campaigns with recipient, open and click rates"""
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT c.id, c.campaign_name, c.status, c.sent_count, c.open_count, c.click_count, c.created_at,
+                   (SELECT COUNT(*) FROM email_recipients r WHERE r.campaign_id = c.id) as recipients
+            FROM email_campaigns c
+            WHERE c.user_id = ?
+            ORDER BY c.created_at DESC
+            LIMIT ?
+        ''', (user_id, limit))
+
+        campaigns = []
+        for row in cursor.fetchall():
+            sent_count = row[3] or 0
+            campaigns.append({
+                'id': row[0],
+                'campaign_name': row[1],
+                'status': row[2],
+                'recipients': row[7],
+                'sent': sent_count,
+                'opens': row[4] or 0,
+                'clicks': row[5] or 0,
+                'open_rate': (row[4] or 0) / sent_count * 100 if sent_count else 0,
+                'click_rate': (row[5] or 0) / sent_count * 100 if sent_count else 0,
+                'created_at': row[6]
+            })
+        conn.close()
+
+        return campaigns
+
+
+class EngagementTracker:
+    """Buffers open/click events in memory and flushes them to the database in batches
+
+    Campaign open_count/click_count count unique recipients; per-recipient
+    counters keep the raw totals and the first open/click time.
+    """
+
+    def __init__(self, db_manager, flush_every: int = 1000, flush_interval: float = 5.0):
+        self.db = db_manager
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._opens = defaultdict(int)
+        self._clicks = defaultdict(int)
+        self._first_seen = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.stats = {'events': 0, 'flushes': 0, 'rows_flushed': 0}
+
+    def record_open(self, token: str):
+        self._record(token, self._opens)
+
+    def record_click(self, token: str):
+        self._record(token, self._clicks)
+
+    def _record(self, token: str, counter: Dict):
+        with self._lock:
+            counter[token] += 1
+            self._first_seen.setdefault(token, datetime.now().isoformat())
+            self._pending += 1
+            self.stats['events'] += 1
+            due = self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered counters in one transaction; returns the number of recipients updated"""
+        with self._flush_lock:
+            with self._lock:
+                opens, self._opens = self._opens, defaultdict(int)
+                clicks, self._clicks = self._clicks, defaultdict(int)
+                first_seen, self._first_seen = self._first_seen, {}
+                self._pending = 0
+                self._last_flush = time.monotonic()
+
+            tokens = set(opens) | set(clicks)
+            if not tokens:
+                return 0
+
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    CREATE TEMP TABLE IF NOT EXISTS engagement_buffer (
+                        token TEXT PRIMARY KEY, opens INTEGER, clicks INTEGER, seen_at TEXT
+                    )
+                ''')
+                cursor.execute('DELETE FROM engagement_buffer')
+                cursor.executemany('INSERT INTO engagement_buffer VALUES (?, ?, ?, ?)',
+                                   [(t, opens.get(t, 0), clicks.get(t, 0), first_seen.get(t)) for t in tokens])
+
+                # Unique opens/clicks per campaign: recipients seen for the first time in this batch
+                cursor.execute('''
+                    UPDATE email_campaigns SET
+                        open_count = open_count + (
+                            SELECT COUNT(*) FROM engagement_buffer b
+                            JOIN email_recipients r ON r.tracking_token = b.token
+                            WHERE r.campaign_id = email_campaigns.id AND b.opens > 0 AND r.open_count = 0),
+                        click_count = click_count + (
+                            SELECT COUNT(*) FROM engagement_buffer b
+                            JOIN email_recipients r ON r.tracking_token = b.token
+                            WHERE r.campaign_id = email_campaigns.id AND b.clicks > 0 AND r.click_count = 0)
+                    WHERE id IN (
+                        SELECT r.campaign_id FROM engagement_buffer b
+                        JOIN email_recipients r ON r.tracking_token = b.token
+                    )
+                ''')
+                cursor.execute('''
+                    UPDATE email_recipients SET
+                        open_count = open_count + (SELECT opens FROM engagement_buffer WHERE token = tracking_token),
+                        click_count = click_count + (SELECT clicks FROM engagement_buffer WHERE token = tracking_token),
+                        first_opened_at = CASE
+                            WHEN first_opened_at IS NULL
+                                 AND (SELECT opens FROM engagement_buffer WHERE token = tracking_token) > 0
+                            THEN (SELECT seen_at FROM engagement_buffer WHERE token = tracking_token)
+                            ELSE first_opened_at END,
+                        first_clicked_at = CASE
+                            WHEN first_clicked_at IS NULL
+                                 AND (SELECT clicks FROM engagement_buffer WHERE token = tracking_token) > 0
+                            THEN (SELECT seen_at FROM engagement_buffer WHERE token = tracking_token)
+                            ELSE first_clicked_at END
+                    WHERE tracking_token IN (SELECT token FROM engagement_buffer)
+                ''')
+                updated = cursor.rowcount
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Engagement flush failed: {str(e)}")
+                # Put the counts back so the next flush retries them
+                with self._lock:
+                    for token, count in opens.items():
+                        self._opens[token] += count
+                    for token, count in clicks.items():
+                        self._clicks[token] += count
+                    for token, seen in first_seen.items():
+                        self._first_seen.setdefault(token, seen)
+                return 0
+            finally:
+                conn.close()
+
+            with self._lock:
+                self.stats['flushes'] += 1
+                self.stats['rows_flushed'] += updated
+            return updated
+
+
+# Local stub SMTP server (development and benchmarks)
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib; messages are counted and discarded"""
+
+    def handle(self):
+        write = self.wfile.write
+        write(b'220 wtf-stub ESMTP ready\r\n')
+        for line in self.rfile:
+            command = line[:4].upper()
+            if command == b'EHLO':
+                write(b'250-wtf-stub\r\n250-8BITMIME\r\n250-PIPELINING\r\n250 SIZE 52428800\r\n')
+            elif command == b'DATA':
+                write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                size = 0
+                for data_line in self.rfile:
+                    if data_line == b'.\r\n':
+                        break
+                    size += len(data_line)
+                self.server.record(size)
+                write(b'250 OK queued\r\n')
+            elif command == b'QUIT':
+                write(b'221 Bye\r\n')
+                return
+            elif command in (b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                write(b'250 OK\r\n')
+            else:
+                write(b'502 Command not implemented\r\n')
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """Threaded SMTP sink on localhost; port 0 picks a free port"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), _StubSMTPHandler)
+        self.message_count = 0
+        self.bytes_received = 0
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    def record(self, size: int):
+        with self._count_lock:
+            self.message_count += 1
+            self.bytes_received += size
+
+    def start(self) -> Tuple[str, int]:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.server_address
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WTF email engine')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stub = subparsers.add_parser('stub', help='Run a local stub SMTP server')
+    stub.add_argument('--host', default='127.0.0.1')
+    stub.add_argument('--port', type=int, default=SMTP_SETTINGS['port'])
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    server = StubSMTPServer(args.host, args.port)
+    print(f"Stub SMTP server listening on {args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{server.message_count:,} messages received")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
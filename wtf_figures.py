@@ -0,0 +1,216 @@
+"""
+WTF Figures - Memoized Plotly figure factory shared across sessions
+
+Charts are described by a spec (chart kind, column mapping, layout, trace
+style) and a data frame. The factory hashes both, and keeps the serialized
+figure JSON in a bounded LRU shared by every session in the process. A
+rerun that asks for the same chart gets a figure decoded from the cached JSON
+instead of running plotly.express again, and each caller gets its own copy.
+
+Line and scatter traces longer than max_points are downsampled with
+Largest-Triangle-Three-Buckets (LTTB) before they are cached. LTTB keeps the
+peaks and troughs a plain stride would drop, and it bounds the payload sent
+to the browser.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from wtf_instrumentation import TRACER
+from wtf_startup import lazy_import
+
+pd = lazy_import('pandas')
+px = lazy_import('plotly.express')
+pio = lazy_import('plotly.io')
+
+FIGURE_SETTINGS = {
+    'capacity': int(os.environ.get('WTF_FIGURE_CACHE_SIZE', 256)),
+    'max_bytes': int(os.environ.get('WTF_FIGURE_CACHE_BYTES', 32 * 1024 * 1024)),
+    'max_points': int(os.environ.get('WTF_FIGURE_MAX_POINTS', 2000))
+}
+
+# Transparent background and white text, as on every chart in the app
+DEFAULT_LAYOUT = {
+    'plot_bgcolor': 'rgba(0,0,0,0)',
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'font_color': 'white'
+}
+
+# Trace types whose points are ordered along x and can be downsampled
+_SERIES_TRACES = ('scatter', 'scattergl')
+
+
+def _plain(value):
+    return value.tolist() if hasattr(value, 'tolist') else str(value)
+
+
+def frame_key(data: Any) -> str:
+    """Content hash of a chart's input: a DataFrame, a dict of columns or plain JSON-able values"""
+    digest = hashlib.blake2b(digest_size=16)
+    if hasattr(data, 'columns') and hasattr(data, 'dtypes'):
+        digest.update(json.dumps([list(map(str, data.columns)), list(map(str, data.dtypes))]).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    else:
+        digest.update(json.dumps(data, sort_keys=True, separators=(',', ':'), default=_plain).encode())
+    return digest.hexdigest()
+
+
+def spec_key(spec: Dict) -> str:
+    return hashlib.blake2b(json.dumps(spec, sort_keys=True, default=_plain).encode(), digest_size=16).hexdigest()
+
+
+# Downsampling
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the `threshold` points Largest-Triangle-Three-Buckets keeps (first and last always)"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # Bucket i covers points [edges[i], edges[i + 1]); the first and last points are their own buckets
+    buckets = threshold - 2
+    edges = np.arange(buckets + 1) * (n - 2) // buckets + 1
+    edges = np.append(edges, n)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(buckets):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket is the triangle's third corner
+        next_end = edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def _x_positions(x) -> Optional[np.ndarray]:
+    """Numeric positions for an x column: numbers as-is, datetimes as epoch, anything else by index"""
+    values = np.asarray(x)
+    if values.dtype.kind in 'iuf':
+        return values.astype(float)
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    try:
+        return pd.to_datetime(values).values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    except (TypeError, ValueError):
+        return np.arange(len(values), dtype=float)
+
+
+def downsample_traces(figure_dict: Dict, max_points: int) -> int:
+    """LTTB-downsample long line/scatter traces in place; returns how many traces were reduced"""
+    reduced = 0
+    for trace in figure_dict.get('data', []):
+        if trace.get('type', 'scatter') not in _SERIES_TRACES:
+            continue
+        y = trace.get('y')
+        if y is None or len(y) <= max_points:
+            continue
+        y_values = np.asarray(y, dtype=float)
+        if not np.isfinite(y_values).all():
+            continue
+        n = len(y_values)
+        x = trace.get('x')
+        keep = lttb_indices(_x_positions(x) if x is not None else np.arange(n, dtype=float), y_values, max_points)
+
+        # Every per-point array on the trace (x, y, text, customdata, marker sizes/colors) is cut the same way
+        for holder in (trace, trace.get('marker') or {}):
+            for attr, value in list(holder.items()):
+                if isinstance(value, (list, tuple, np.ndarray)) and len(value) == n:
+                    holder[attr] = np.asarray(value)[keep]
+        reduced += 1
+    return reduced
+
+
+class FigureFactory:
+    """Builds Plotly figures through a bounded LRU of serialized figure JSON"""
+
+    def __init__(self, capacity: int = 256, max_bytes: int = 32 * 1024 * 1024, max_points: int = 2000):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.max_points = max_points
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            payload = self._cache.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def _put(self, key: str, payload: str):
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = payload
+            self._bytes += len(payload)
+            while self._cache and (len(self._cache) > self.capacity or self._bytes > self.max_bytes):
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _serialize(self, figure) -> str:
+        figure_dict = figure.to_dict()
+        downsample_traces(figure_dict, self.max_points)
+        return pio.to_json(figure_dict, validate=False)
+
+    def figure(self, name: str, data: Any, build: Callable):
+        """Figure from build(), cached under `name` and the content hash of `data`
+
+        `data` must hold everything build() reads, so equal data means an equal figure.
+        """
+        key = f"{name}:{frame_key(data)}"
+        payload = self._get(key)
+        if payload is None:
+            with TRACER.span(f"figure:{name}", 'render'):
+                payload = self._serialize(build())
+            self._put(key, payload)
+        return pio.from_json(payload)
+
+    def chart(self, spec: Dict, data: Any):
+        """plotly.express chart from a spec and a frame (DataFrame or dict of columns)
+
+        spec: {'kind': 'line' | 'bar' | 'scatter' | 'pie' | ..., <px keyword arguments>,
+               'layout': {...}, 'traces': {...}}. The layout is applied over DEFAULT_LAYOUT.
+        """
+        def build():
+            options = {k: v for k, v in spec.items() if k not in ('kind', 'layout', 'traces')}
+            frame = data if hasattr(data, 'columns') else pd.DataFrame(data)
+            figure = getattr(px, spec['kind'])(frame, **options)
+            figure.update_layout(**{**DEFAULT_LAYOUT, **spec.get('layout', {})})
+            if spec.get('traces'):
+                figure.update_traces(**spec['traces'])
+            return figure
+
+        return self.figure(f"{spec['kind']}:{spec_key(spec)}", data, build)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._cache), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': round(self.hits / total, 3) if total else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+
+# Process-wide factory; Streamlit sessions are threads of one process, so they all share it
+FIGURES = FigureFactory(FIGURE_SETTINGS['capacity'], FIGURE_SETTINGS['max_bytes'], FIGURE_SETTINGS['max_points'])
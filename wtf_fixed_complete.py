@@ -12,10 +12,7 @@ WTF (Wholesale2Flip) - PROFESSIONAL REAL ESTATE PLATFORM
 """
 
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import sqlite3
 import hashlib
@@ -23,11 +20,23 @@ import uuid
 import json
 import time
 import secrets
-import requests
 import re
 from typing import Dict, List, Optional, Any
 import math
 
+from wtf_market_data import MARKET_DATA as REFERENCE_MARKET_DATA
+
+from wtf_analysis import RealEstateCalculatorEngine
+from wtf_startup import lazy_import
+from wtf_instrumentation import TRACER
+from wtf_figures import FIGURES
+from wtf_fragments import cached_figure, fragment
+
+# Loaded on first use by the pages that chart or tabulate
+pd = lazy_import('pandas')
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+
 # Page configuration
 st.set_page_config(
     page_title="WTF - Wholesale on Steroids", 
@@ -198,29 +207,7 @@ class ProfessionalPropertyDataService:
     """Professional real estate data service with realistic market data"""
     
     # Market data from real sources
-    MARKET_DATA = {
-        'tx': {
-            'dallas': {'median_price': 425000, 'rent_psf': 1.2, 'appreciation': 0.045, 'tax_rate': 0.022},
-            'houston': {'median_price': 380000, 'rent_psf': 1.1, 'appreciation': 0.042, 'tax_rate': 0.021},
-            'austin': {'median_price': 550000, 'rent_psf': 1.4, 'appreciation': 0.055, 'tax_rate': 0.019},
-            'san antonio': {'median_price': 320000, 'rent_psf': 1.0, 'appreciation': 0.038, 'tax_rate': 0.023},
-            'porter': {'median_price': 285000, 'rent_psf': 1.15, 'appreciation': 0.041, 'tax_rate': 0.022}
-        },
-        'ca': {
-            'los angeles': {'median_price': 950000, 'rent_psf': 2.8, 'appreciation': 0.065, 'tax_rate': 0.015},
-            'san francisco': {'median_price': 1350000, 'rent_psf': 3.2, 'appreciation': 0.058, 'tax_rate': 0.012},
-            'san diego': {'median_price': 825000, 'rent_psf': 2.5, 'appreciation': 0.062, 'tax_rate': 0.016}
-        },
-        'fl': {
-            'miami': {'median_price': 485000, 'rent_psf': 1.8, 'appreciation': 0.055, 'tax_rate': 0.018},
-            'tampa': {'median_price': 365000, 'rent_psf': 1.5, 'appreciation': 0.048, 'tax_rate': 0.019},
-            'orlando': {'median_price': 325000, 'rent_psf': 1.4, 'appreciation': 0.045, 'tax_rate': 0.020}
-        },
-        'ny': {
-            'new york': {'median_price': 750000, 'rent_psf': 2.2, 'appreciation': 0.035, 'tax_rate': 0.028},
-            'buffalo': {'median_price': 185000, 'rent_psf': 0.9, 'appreciation': 0.025, 'tax_rate': 0.032}
-        }
-    }
+    MARKET_DATA = REFERENCE_MARKET_DATA
     
     @staticmethod
     def lookup_property_by_address(address, city, state):
@@ -577,84 +564,6 @@ class ProfessionalPropertyDataService:
             'growth_rate': np.random.uniform(-0.02, 0.08)
         }
 
-class RealEstateCalculatorEngine:
-    """Advanced real estate calculation engine"""
-    
-    @staticmethod
-    def calculate_deal_grade(property_data):
-        """Calculate professional deal grade A-D"""
-        
-        investment = property_data['investment_analysis']
-        wholesale = investment['wholesale']
-        rental = property_data['rental_analysis']
-        
-        score = 0
-        max_score = 100
-        
-        # Profit margin (40 points)
-        profit_margin = wholesale['profit_margin']
-        if profit_margin >= 30: score += 40
-        elif profit_margin >= 25: score += 35
-        elif profit_margin >= 20: score += 30
-        elif profit_margin >= 15: score += 25
-        elif profit_margin >= 10: score += 15
-        else: score += max(0, profit_margin * 1.5)
-        
-        # Location factors (25 points)
-        neighborhood = property_data['neighborhood_data']
-        if neighborhood['school_rating'] >= 8: score += 8
-        elif neighborhood['school_rating'] >= 6: score += 5
-        else: score += 2
-        
-        if neighborhood['crime_score'] >= 80: score += 8
-        elif neighborhood['crime_score'] >= 60: score += 5
-        else: score += 2
-        
-        if neighborhood['growth_rate'] > 0.05: score += 9
-        elif neighborhood['growth_rate'] > 0.02: score += 6
-        else: score += 3
-        
-        # Market conditions (20 points)
-        market = property_data['market_analysis']
-        market_points = 0
-        if market['market_trend'] == 'hot': market_points += 8
-        elif market['market_trend'] == 'warm': market_points += 6
-        else: market_points += 3
-        
-        if market['inventory_level'] == 'low': market_points += 6
-        else: market_points += 3
-        
-        if property_data['days_on_market'] > 60: market_points += 6  # Motivated seller
-        
-        score += market_points
-        
-        # Property condition (15 points)
-        condition_score = property_data['condition_score']
-        score += int(condition_score * 0.15)
-        
-        # Normalize score
-        final_score = min(100, max(0, score))
-        
-        if final_score >= 85:
-            grade = 'A'
-            strategy = 'Excellent deal - Multiple strategies viable'
-        elif final_score >= 70:
-            grade = 'B' 
-            strategy = 'Good deal - Fix & flip or wholesale'
-        elif final_score >= 55:
-            grade = 'C'
-            strategy = 'Marginal deal - Wholesale only'
-        else:
-            grade = 'D'
-            strategy = 'Pass - Insufficient margins'
-        
-        return {
-            'grade': grade,
-            'score': final_score,
-            'strategy': strategy,
-            'confidence': min(95, max(65, final_score + np.random.randint(-5, 10)))
-        }
-
 # Authentication and services
 class AuthenticationService:
     """Enhanced authentication with role-based access"""
@@ -1164,20 +1073,23 @@ def render_dashboard():
         revenue = [18000, 25000, 22000, 32000, 38000, 35000, 42000, 48000]
         deals = [2, 3, 2, 4, 4, 3, 5, 5]
         
-        fig_revenue = go.Figure()
-        fig_revenue.add_trace(go.Bar(x=months, y=revenue, name='Revenue', marker_color='#10B981'))
-        fig_revenue.add_trace(go.Scatter(x=months, y=[r*1000 for r in deals], mode='lines+markers', 
-                                       name='Deals Closed', yaxis='y2', line=dict(color='#8B5CF6', width=3)))
-        
-        fig_revenue.update_layout(
-            title='Monthly Revenue & Deal Volume',
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white',
-            yaxis2=dict(overlaying='y', side='right', title='Deals Closed')
-        )
+        def build_revenue():
+            fig_revenue = go.Figure()
+            fig_revenue.add_trace(go.Bar(x=months, y=revenue, name='Revenue', marker_color='#10B981'))
+            fig_revenue.add_trace(go.Scatter(x=months, y=[r*1000 for r in deals], mode='lines+markers', 
+                                           name='Deals Closed', yaxis='y2', line=dict(color='#8B5CF6', width=3)))
+            
+            fig_revenue.update_layout(
+                title='Monthly Revenue & Deal Volume',
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font_color='white',
+                yaxis2=dict(overlaying='y', side='right', title='Deals Closed')
+            )
+            return fig_revenue
         
-        st.plotly_chart(fig_revenue, use_container_width=True)
+        figure = cached_figure('dashboard_revenue', [months, revenue, deals], build_revenue)
+        st.plotly_chart(figure, use_container_width=True)
     
     with col2:
         # Deal grade distribution
@@ -1185,14 +1097,11 @@ def render_dashboard():
         counts = [67, 89, 52, 26]
         colors = ['#10B981', '#8B5CF6', '#F59E0B', '#EF4444']
         
-        fig_grades = go.Figure(data=[go.Pie(labels=grades, values=counts, 
-                                          marker_colors=colors, hole=0.4)])
-        fig_grades.update_layout(
-            title="Deal Grade Distribution",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white'
-        )
+        fig_grades = FIGURES.chart({
+            'kind': 'pie', 'names': 'grade', 'values': 'deals', 'color': 'grade',
+            'color_discrete_sequence': colors, 'hole': 0.4,
+            'title': 'Deal Grade Distribution'
+        }, {'grade': grades, 'deals': counts})
         
         st.plotly_chart(fig_grades, use_container_width=True)
 
@@ -1580,235 +1489,257 @@ def render_lead_manager():
     tab1, tab2, tab3, tab4 = st.tabs(["📞 All Leads", "➕ Add New Lead", "📊 Lead Analytics", "🔄 Follow-up Automation"])
     
     with tab1:
-        st.markdown("### 📋 Professional Lead Database")
-        
-        leads = MockDataService.get_leads()
-        
-        # Enhanced lead filters
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            status_filter = st.multiselect("Status Filter", 
-                                         ["New", "Warm", "Hot", "Cold"], 
-                                         default=["New", "Warm", "Hot"],
-                                         key="pro_lead_status_filter")
-        
-        with col2:
-            score_range = st.slider("Score Range", 0, 100, (70, 100), key="pro_lead_score_range")
-        
-        with col3:
-            equity_filter = st.number_input("Min Equity", min_value=0, value=50000, step=10000, key="pro_equity_filter")
-        
-        with col4:
-            source_filter = st.selectbox("Lead Source", ["All", "Direct Mail", "Cold Calling", "Online Marketing"], key="pro_source_filter")
-        
-        # Professional lead display
-        for lead in leads:
-            if (lead['status'] in status_filter and 
-                score_range[0] <= lead['score'] <= score_range[1] and
-                lead['equity'] >= equity_filter):
-                
-                status_colors = {'New': '#8B5CF6', 'Warm': '#F59E0B', 'Hot': '#10B981', 'Cold': '#6B7280'}
-                color = status_colors.get(lead['status'], '#6B7280')
-                
-                st.markdown(f"""
-                <div class='deal-card'>
-                    <div style='display: flex; justify-content: space-between; align-items: center;'>
-                        <div style='flex: 1;'>
-                            <h4 style='color: white; margin: 0;'>{lead['name']}</h4>
-                            <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
-                                📞 {lead['phone']} | 📧 {lead['email']}
-                            </p>
-                            <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
-                                🏠 {lead['address']}
-                            </p>
-                            <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
-                                💔 {lead['motivation']} | ⏰ {lead['timeline']} | 💰 ${lead['equity']:,} equity
-                            </p>
-                            <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.8rem;'>
-                                Source: {lead['lead_source']} | Property Value: ${lead['property_value']:,}
-                            </p>
-                        </div>
-                        <div style='text-align: center; margin: 0 2rem;'>
-                            <p style='color: {color}; margin: 0; font-weight: bold; font-size: 1.1rem;'>{lead['status']}</p>
-                            <p style='color: #F59E0B; margin: 0; font-weight: bold;'>Score: {lead['score']}</p>
-                            <small style='color: #9CA3AF;'>Last: {lead['last_contact'] or 'Never'}</small>
-                            <br><small style='color: #10B981;'>Next: {lead['next_followup']}</small>
-                        </div>
-                        <div style='display: flex; gap: 0.5rem; flex-direction: column;'>
-                            <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                                📞 Call Now
-                            </button>
-                            <button style='background: #8B5CF6; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                                📝 Add Note
-                            </button>
-                            <button style='background: #F59E0B; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                                📊 Analyze
-                            </button>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        render_lead_list_tab()
     
     with tab2:
-        st.markdown("### ➕ Add Professional Lead")
-        
-        with st.form("pro_add_lead_form"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("**Contact Information**")
-                first_name = st.text_input("First Name*", placeholder="Maria")
-                last_name = st.text_input("Last Name*", placeholder="Garcia")
-                phone = st.text_input("Phone*", placeholder="(555) 123-4567")
-                email = st.text_input("Email", placeholder="maria@email.com")
-                
-                st.markdown("**Lead Source**")
-                lead_source = st.selectbox("Source", [
-                    "Direct Mail", "Cold Calling", "Online Marketing", 
-                    "Referral", "Drive for Dollars", "Bandit Signs", "RVM Campaign"
-                ])
-                campaign_id = st.text_input("Campaign ID (if applicable)", placeholder="DM_2024_08")
-            
-            with col2:
-                st.markdown("**Motivation & Timeline**")
-                motivation = st.selectbox("Primary Motivation", [
-                    "Divorce", "Foreclosure", "Job Relocation", "Inheritance", 
-                    "Financial Hardship", "Downsizing", "Retirement", "Medical Bills", "Other"
-                ])
-                urgency = st.selectbox("Urgency Level", ["ASAP", "30 days", "60 days", "90 days", "6+ months"])
-                timeline = st.selectbox("Flexibility", ["Very Flexible", "Somewhat Flexible", "Inflexible"])
-                
-                st.markdown("**Property Condition**")
-                property_condition = st.selectbox("Current Condition", [
-                    "Excellent", "Good", "Fair", "Poor", "Needs Major Repairs", "Uninhabitable"
-                ])
-                
-                vacant = st.checkbox("Property is vacant")
-                rental_property = st.checkbox("Currently a rental property")
-            
-            st.markdown("**Property & Financial Information**")
-            col3, col4 = st.columns(2)
-            
-            with col3:
-                property_address = st.text_input("Property Address*", placeholder="123 Main St, Dallas, TX")
-                estimated_value = st.number_input("Estimated Market Value", min_value=0, value=250000, step=5000)
-                asking_price = st.number_input("Seller's Asking Price", min_value=0, value=240000, step=1000)
-            
-            with col4:
-                owed_amount = st.number_input("Amount Owed on Property", min_value=0, value=180000, step=1000)
-                monthly_payment = st.number_input("Current Monthly Payment", min_value=0, value=1500, step=50)
-                behind_payments = st.number_input("Months Behind on Payments", min_value=0, value=0, step=1)
-            
-            st.markdown("**Additional Information**")
-            notes = st.text_area("Lead Notes", placeholder="Additional information about the lead and property...")
+        render_add_lead_tab()
+    
+    with tab3:
+        render_lead_analytics_tab()
+    
+    with tab4:
+        render_followup_tab()
+
+@fragment('lead_manager.all_leads')
+def render_lead_list_tab():
+    """Filtered lead list"""
+    
+    st.markdown("### 📋 Professional Lead Database")
+    
+    leads = MockDataService.get_leads()
+    
+    # Enhanced lead filters
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        status_filter = st.multiselect("Status Filter", 
+                                     ["New", "Warm", "Hot", "Cold"], 
+                                     default=["New", "Warm", "Hot"],
+                                     key="pro_lead_status_filter")
+    
+    with col2:
+        score_range = st.slider("Score Range", 0, 100, (70, 100), key="pro_lead_score_range")
+    
+    with col3:
+        equity_filter = st.number_input("Min Equity", min_value=0, value=50000, step=10000, key="pro_equity_filter")
+    
+    with col4:
+        source_filter = st.selectbox("Lead Source", ["All", "Direct Mail", "Cold Calling", "Online Marketing"], key="pro_source_filter")
+    
+    # Professional lead display
+    for lead in leads:
+        if (lead['status'] in status_filter and 
+            score_range[0] <= lead['score'] <= score_range[1] and
+            lead['equity'] >= equity_filter):
             
-            # Professional lead scoring preview
-            st.markdown("### 📊 Lead Score Preview")
+            status_colors = {'New': '#8B5CF6', 'Warm': '#F59E0B', 'Hot': '#10B981', 'Cold': '#6B7280'}
+            color = status_colors.get(lead['status'], '#6B7280')
             
-            if first_name and motivation and urgency and estimated_value and owed_amount:
-                # Calculate professional lead score
-                score = 30  # Base score
-                
-                # Motivation scoring
-                motivation_scores = {
-                    "Foreclosure": 35, "Financial Hardship": 30, "Divorce": 28,
-                    "Medical Bills": 25, "Job Relocation": 20, "Inheritance": 18,
-                    "Retirement": 15, "Downsizing": 12, "Other": 10
-                }
-                score += motivation_scores.get(motivation, 10)
-                
-                # Urgency scoring
-                urgency_scores = {"ASAP": 25, "30 days": 20, "60 days": 15, "90 days": 10, "6+ months": 5}
-                score += urgency_scores.get(urgency, 5)
-                
-                # Financial scoring
-                equity = estimated_value - owed_amount
-                if equity > 100000: score += 20
-                elif equity > 50000: score += 15
-                elif equity > 25000: score += 10
-                elif equity > 0: score += 5
-                
-                # Condition scoring
-                condition_scores = {
-                    "Uninhabitable": 15, "Needs Major Repairs": 12, "Poor": 8,
-                    "Fair": 5, "Good": 2, "Excellent": 0
-                }
-                score += condition_scores.get(property_condition, 5)
-                
-                # Behind payments bonus
-                if behind_payments > 0: score += min(10, behind_payments * 2)
-                
-                # Vacant property bonus
-                if vacant: score += 5
-                
-                score = min(100, score)
-                
-                # Display score preview
-                score_color = '#10B981' if score >= 80 else '#F59E0B' if score >= 60 else '#EF4444'
-                
-                st.markdown(f"""
-                <div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; border-radius: 10px; border-left: 4px solid {score_color};'>
-                    <h4 style='color: {score_color}; margin: 0;'>Calculated Lead Score: {score}/100</h4>
-                    <p style='margin: 0.5rem 0; color: white;'>
-                        Equity: ${equity:,} | Motivation: {motivation} | Urgency: {urgency}
-                    </p>
+            st.markdown(f"""
+            <div class='deal-card'>
+                <div style='display: flex; justify-content: space-between; align-items: center;'>
+                    <div style='flex: 1;'>
+                        <h4 style='color: white; margin: 0;'>{lead['name']}</h4>
+                        <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
+                            📞 {lead['phone']} | 📧 {lead['email']}
+                        </p>
+                        <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
+                            🏠 {lead['address']}
+                        </p>
+                        <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
+                            💔 {lead['motivation']} | ⏰ {lead['timeline']} | 💰 ${lead['equity']:,} equity
+                        </p>
+                        <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.8rem;'>
+                            Source: {lead['lead_source']} | Property Value: ${lead['property_value']:,}
+                        </p>
+                    </div>
+                    <div style='text-align: center; margin: 0 2rem;'>
+                        <p style='color: {color}; margin: 0; font-weight: bold; font-size: 1.1rem;'>{lead['status']}</p>
+                        <p style='color: #F59E0B; margin: 0; font-weight: bold;'>Score: {lead['score']}</p>
+                        <small style='color: #9CA3AF;'>Last: {lead['last_contact'] or 'Never'}</small>
+                        <br><small style='color: #10B981;'>Next: {lead['next_followup']}</small>
+                    </div>
+                    <div style='display: flex; gap: 0.5rem; flex-direction: column;'>
+                        <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                            📞 Call Now
+                        </button>
+                        <button style='background: #8B5CF6; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                            📝 Add Note
+                        </button>
+                        <button style='background: #F59E0B; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                            📊 Analyze
+                        </button>
+                    </div>
                 </div>
-                """, unsafe_allow_html=True)
-            
-            submit_lead = st.form_submit_button("➕ Add Professional Lead", type="primary", use_container_width=True)
-            
-            if submit_lead:
-                if first_name and last_name and phone and property_address:
-                    st.success(f"""
-                    ✅ **Professional Lead Added Successfully!**
-                    
-                    **Lead Summary:**
-                    - Name: {first_name} {last_name}
-                    - Phone: {phone}
-                    - Score: {score}/100
-                    - Equity: ${equity:,}
-                    - Source: {lead_source}
-                    - Motivation: {motivation} ({urgency})
-                    
-                    **Next Steps:**
-                    - Lead added to follow-up queue
-                    - Automated drip campaign initiated
-                    - Property analysis scheduled
-                    - CRM notifications activated
-                    """)
-                else:
-                    st.error("Please fill in all required fields (marked with *)")
+            </div>
+            """, unsafe_allow_html=True)
+
+@fragment('lead_manager.add_lead')
+def render_add_lead_tab():
+    """Add-lead form with a live score preview"""
     
-    with tab3:
-        st.markdown("### 📊 Professional Lead Analytics")
-        
-        # Enhanced metrics
-        col1, col2, col3, col4, col5 = st.columns(5)
+    st.markdown("### ➕ Add Professional Lead")
+    
+    with st.form("pro_add_lead_form"):
+        col1, col2 = st.columns(2)
         
         with col1:
-            st.metric("Total Leads", "342", "+18 this week")
+            st.markdown("**Contact Information**")
+            first_name = st.text_input("First Name*", placeholder="Maria")
+            last_name = st.text_input("Last Name*", placeholder="Garcia")
+            phone = st.text_input("Phone*", placeholder="(555) 123-4567")
+            email = st.text_input("Email", placeholder="maria@email.com")
+            
+            st.markdown("**Lead Source**")
+            lead_source = st.selectbox("Source", [
+                "Direct Mail", "Cold Calling", "Online Marketing", 
+                "Referral", "Drive for Dollars", "Bandit Signs", "RVM Campaign"
+            ])
+            campaign_id = st.text_input("Campaign ID (if applicable)", placeholder="DM_2024_08")
         
         with col2:
-            st.metric("Hot Leads", "28", "+5 this week")
+            st.markdown("**Motivation & Timeline**")
+            motivation = st.selectbox("Primary Motivation", [
+                "Divorce", "Foreclosure", "Job Relocation", "Inheritance", 
+                "Financial Hardship", "Downsizing", "Retirement", "Medical Bills", "Other"
+            ])
+            urgency = st.selectbox("Urgency Level", ["ASAP", "30 days", "60 days", "90 days", "6+ months"])
+            timeline = st.selectbox("Flexibility", ["Very Flexible", "Somewhat Flexible", "Inflexible"])
+            
+            st.markdown("**Property Condition**")
+            property_condition = st.selectbox("Current Condition", [
+                "Excellent", "Good", "Fair", "Poor", "Needs Major Repairs", "Uninhabitable"
+            ])
+            
+            vacant = st.checkbox("Property is vacant")
+            rental_property = st.checkbox("Currently a rental property")
+        
+        st.markdown("**Property & Financial Information**")
+        col3, col4 = st.columns(2)
         
         with col3:
-            st.metric("Avg Score", "74.2", "+2.1 this week")
+            property_address = st.text_input("Property Address*", placeholder="123 Main St, Dallas, TX")
+            estimated_value = st.number_input("Estimated Market Value", min_value=0, value=250000, step=5000)
+            asking_price = st.number_input("Seller's Asking Price", min_value=0, value=240000, step=1000)
         
         with col4:
-            st.metric("Conversion Rate", "18.5%", "+1.2% vs last month")
+            owed_amount = st.number_input("Amount Owed on Property", min_value=0, value=180000, step=1000)
+            monthly_payment = st.number_input("Current Monthly Payment", min_value=0, value=1500, step=50)
+            behind_payments = st.number_input("Months Behind on Payments", min_value=0, value=0, step=1)
         
-        with col5:
-            st.metric("Avg Deal Size", "$25,847", "+$2,340 vs last month")
+        st.markdown("**Additional Information**")
+        notes = st.text_area("Lead Notes", placeholder="Additional information about the lead and property...")
         
-        # Professional analytics charts
-        col1, col2 = st.columns(2)
+        # Professional lead scoring preview
+        st.markdown("### 📊 Lead Score Preview")
         
-        with col1:
-            # Lead source performance
-            sources = ['Direct Mail', 'Cold Calling', 'Online Marketing', 'RVM Campaigns', 'Referrals']
-            conversion_rates = [24.5, 18.7, 16.2, 21.3, 32.1]
+        if first_name and motivation and urgency and estimated_value and owed_amount:
+            # Calculate professional lead score
+            score = 30  # Base score
             
+            # Motivation scoring
+            motivation_scores = {
+                "Foreclosure": 35, "Financial Hardship": 30, "Divorce": 28,
+                "Medical Bills": 25, "Job Relocation": 20, "Inheritance": 18,
+                "Retirement": 15, "Downsizing": 12, "Other": 10
+            }
+            score += motivation_scores.get(motivation, 10)
+            
+            # Urgency scoring
+            urgency_scores = {"ASAP": 25, "30 days": 20, "60 days": 15, "90 days": 10, "6+ months": 5}
+            score += urgency_scores.get(urgency, 5)
+            
+            # Financial scoring
+            equity = estimated_value - owed_amount
+            if equity > 100000: score += 20
+            elif equity > 50000: score += 15
+            elif equity > 25000: score += 10
+            elif equity > 0: score += 5
+            
+            # Condition scoring
+            condition_scores = {
+                "Uninhabitable": 15, "Needs Major Repairs": 12, "Poor": 8,
+                "Fair": 5, "Good": 2, "Excellent": 0
+            }
+            score += condition_scores.get(property_condition, 5)
+            
+            # Behind payments bonus
+            if behind_payments > 0: score += min(10, behind_payments * 2)
+            
+            # Vacant property bonus
+            if vacant: score += 5
+            
+            score = min(100, score)
+            
+            # Display score preview
+            score_color = '#10B981' if score >= 80 else '#F59E0B' if score >= 60 else '#EF4444'
+            
+            st.markdown(f"""
+            <div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; border-radius: 10px; border-left: 4px solid {score_color};'>
+                <h4 style='color: {score_color}; margin: 0;'>Calculated Lead Score: {score}/100</h4>
+                <p style='margin: 0.5rem 0; color: white;'>
+                    Equity: ${equity:,} | Motivation: {motivation} | Urgency: {urgency}
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        submit_lead = st.form_submit_button("➕ Add Professional Lead", type="primary", use_container_width=True)
+        
+        if submit_lead:
+            if first_name and last_name and phone and property_address:
+                st.success(f"""
+                ✅ **Professional Lead Added Successfully!**
+                
+                **Lead Summary:**
+                - Name: {first_name} {last_name}
+                - Phone: {phone}
+                - Score: {score}/100
+                - Equity: ${equity:,}
+                - Source: {lead_source}
+                - Motivation: {motivation} ({urgency})
+                
+                **Next Steps:**
+                - Lead added to follow-up queue
+                - Automated drip campaign initiated
+                - Property analysis scheduled
+                - CRM notifications activated
+                """)
+            else:
+                st.error("Please fill in all required fields (marked with *)")
+
+@fragment('lead_manager.analytics')
+def render_lead_analytics_tab():
+    """Lead source conversion, score distribution and ROI by source"""
+    
+    st.markdown("### 📊 Professional Lead Analytics")
+    
+    # Enhanced metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        st.metric("Total Leads", "342", "+18 this week")
+    
+    with col2:
+        st.metric("Hot Leads", "28", "+5 this week")
+    
+    with col3:
+        st.metric("Avg Score", "74.2", "+2.1 this week")
+    
+    with col4:
+        st.metric("Conversion Rate", "18.5%", "+1.2% vs last month")
+    
+    with col5:
+        st.metric("Avg Deal Size", "$25,847", "+$2,340 vs last month")
+    
+    # Professional analytics charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Lead source performance
+        sources = ['Direct Mail', 'Cold Calling', 'Online Marketing', 'RVM Campaigns', 'Referrals']
+        conversion_rates = [24.5, 18.7, 16.2, 21.3, 32.1]
+        
+        def build_conversion():
             fig_conversion = px.bar(
                 x=sources,
                 y=conversion_rates,
@@ -1822,13 +1753,18 @@ def render_lead_manager():
                 paper_bgcolor='rgba(0,0,0,0)',
                 font_color='white'
             )
-            st.plotly_chart(fig_conversion, use_container_width=True)
+            return fig_conversion
         
-        with col2:
-            # Lead scoring distribution
-            score_ranges = ['90-100', '80-89', '70-79', '60-69', '50-59', '<50']
-            lead_counts = [28, 45, 62, 78, 89, 40]
-            
+        figure = cached_figure('lead_source_conversion', [sources, conversion_rates], build_conversion)
+        
+        st.plotly_chart(figure, use_container_width=True)
+    
+    with col2:
+        # Lead scoring distribution
+        score_ranges = ['90-100', '80-89', '70-79', '60-69', '50-59', '<50']
+        lead_counts = [28, 45, 62, 78, 89, 40]
+        
+        def build_scores():
             fig_scores = px.pie(
                 values=lead_counts,
                 names=score_ranges,
@@ -1839,123 +1775,130 @@ def render_lead_manager():
                 paper_bgcolor='rgba(0,0,0,0)',
                 font_color='white'
             )
-            st.plotly_chart(fig_scores, use_container_width=True)
+            return fig_scores
         
-        # ROI by lead source
-        st.markdown("### 💰 ROI Analysis by Lead Source")
+        figure = cached_figure('lead_score_distribution', [score_ranges, lead_counts], build_scores)
         
-        roi_data = [
-            {'source': 'Direct Mail - Divorce Lists', 'cost_per_lead': 12.50, 'conversion': 24.5, 'avg_deal': 28500, 'roi': 485},
-            {'source': 'RVM - Pre-Foreclosure', 'cost_per_lead': 3.25, 'conversion': 21.3, 'avg_deal': 32100, 'roi': 2087},
-            {'source': 'Cold Calling - FSBO', 'cost_per_lead': 8.75, 'conversion': 18.7, 'avg_deal': 24800, 'roi': 530},
-            {'source': 'Online - SEO/PPC', 'cost_per_lead': 45.00, 'conversion': 16.2, 'avg_deal': 31200, 'roi': 112},
-            {'source': 'Referrals', 'cost_per_lead': 150.00, 'conversion': 32.1, 'avg_deal': 35400, 'roi': 76}
-        ]
+        st.plotly_chart(figure, use_container_width=True)
+    
+    # ROI by lead source
+    st.markdown("### 💰 ROI Analysis by Lead Source")
+    
+    roi_data = [
+        {'source': 'Direct Mail - Divorce Lists', 'cost_per_lead': 12.50, 'conversion': 24.5, 'avg_deal': 28500, 'roi': 485},
+        {'source': 'RVM - Pre-Foreclosure', 'cost_per_lead': 3.25, 'conversion': 21.3, 'avg_deal': 32100, 'roi': 2087},
+        {'source': 'Cold Calling - FSBO', 'cost_per_lead': 8.75, 'conversion': 18.7, 'avg_deal': 24800, 'roi': 530},
+        {'source': 'Online - SEO/PPC', 'cost_per_lead': 45.00, 'conversion': 16.2, 'avg_deal': 31200, 'roi': 112},
+        {'source': 'Referrals', 'cost_per_lead': 150.00, 'conversion': 32.1, 'avg_deal': 35400, 'roi': 76}
+    ]
+    
+    for i, data in enumerate(roi_data, 1):
+        roi_color = '#10B981' if data['roi'] > 500 else '#F59E0B' if data['roi'] > 200 else '#EF4444'
         
-        for i, data in enumerate(roi_data, 1):
-            roi_color = '#10B981' if data['roi'] > 500 else '#F59E0B' if data['roi'] > 200 else '#EF4444'
-            
-            st.markdown(f"""
-            <div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; margin: 0.5rem 0; border-radius: 10px; 
-                        border-left: 4px solid {roi_color};'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
+        st.markdown(f"""
+        <div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; margin: 0.5rem 0; border-radius: 10px; 
+                    border-left: 4px solid {roi_color};'>
+            <div style='display: flex; justify-content: space-between; align-items: center;'>
+                <div>
+                    <strong style='color: white;'>#{i}. {data['source']}</strong>
+                </div>
+                <div style='display: flex; gap: 2rem; text-align: center;'>
                     <div>
-                        <strong style='color: white;'>#{i}. {data['source']}</strong>
+                        <p style='color: {roi_color}; font-weight: bold; margin: 0;'>{data['roi']}%</p>
+                        <small style='color: #9CA3AF;'>ROI</small>
                     </div>
-                    <div style='display: flex; gap: 2rem; text-align: center;'>
-                        <div>
-                            <p style='color: {roi_color}; font-weight: bold; margin: 0;'>{data['roi']}%</p>
-                            <small style='color: #9CA3AF;'>ROI</small>
-                        </div>
-                        <div>
-                            <p style='color: #10B981; font-weight: bold; margin: 0;'>${data['cost_per_lead']:.2f}</p>
-                            <small style='color: #9CA3AF;'>Cost/Lead</small>
-                        </div>
-                        <div>
-                            <p style='color: #F59E0B; font-weight: bold; margin: 0;'>{data['conversion']:.1f}%</p>
-                            <small style='color: #9CA3AF;'>Conversion</small>
-                        </div>
-                        <div>
-                            <p style='color: #8B5CF6; font-weight: bold; margin: 0;'>${data['avg_deal']:,}</p>
-                            <small style='color: #9CA3AF;'>Avg Deal</small>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with tab4:
-        st.markdown("### 🔄 Automated Follow-up System")
-        
-        # Today's automated tasks
-        st.markdown("#### 📅 Today's Automated Follow-ups")
-        
-        automated_tasks = [
-            {'name': 'Maria Garcia', 'action': 'RVM Drop', 'time': '10:00 AM', 'campaign': 'Divorce Follow-up', 'status': 'Scheduled'},
-            {'name': 'David Brown', 'action': 'Email Sequence #3', 'time': '2:00 PM', 'campaign': 'Relocation Nurture', 'status': 'Sent'},
-            {'name': 'Jennifer Lee', 'action': 'SMS Check-in', 'time': '4:00 PM', 'campaign': 'Inheritance Series', 'status': 'Pending'},
-            {'name': 'Robert Wilson', 'action': 'Personal Call', 'time': '5:30 PM', 'campaign': 'Hot Lead Priority', 'status': 'Manual Required'}
-        ]
-        
-        for task in automated_tasks:
-            status_colors = {'Scheduled': '#8B5CF6', 'Sent': '#10B981', 'Pending': '#F59E0B', 'Manual Required': '#EF4444'}
-            color = status_colors.get(task['status'], '#6B7280')
-            
-            st.markdown(f"""
-            <div class='deal-card'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
                     <div>
-                        <h5 style='color: white; margin: 0;'>{task['name']}</h5>
-                        <small style='color: #9CA3AF;'>{task['action']} | {task['campaign']}</small>
+                        <p style='color: #10B981; font-weight: bold; margin: 0;'>${data['cost_per_lead']:.2f}</p>
+                        <small style='color: #9CA3AF;'>Cost/Lead</small>
                     </div>
-                    <div style='text-align: center;'>
-                        <p style='color: white; margin: 0; font-weight: bold;'>{task['time']}</p>
-                        <small style='color: {color}; font-weight: bold;'>{task['status']}</small>
+                    <div>
+                        <p style='color: #F59E0B; font-weight: bold; margin: 0;'>{data['conversion']:.1f}%</p>
+                        <small style='color: #9CA3AF;'>Conversion</small>
                     </div>
                     <div>
-                        <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; 
-                                       border-radius: 8px; cursor: pointer;'>
-                            ✅ Complete
-                        </button>
+                        <p style='color: #8B5CF6; font-weight: bold; margin: 0;'>${data['avg_deal']:,}</p>
+                        <small style='color: #9CA3AF;'>Avg Deal</small>
                     </div>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
-        
-        # Automation performance
-        st.markdown("#### 🤖 Automation Performance")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("""
-            <div class='metric-card success-metric'>
-                <h4 style='color: #10B981; margin: 0;'>Email Campaigns</h4>
-                <p style='margin: 0.5rem 0;'>Open Rate: 34.2%</p>
-                <p style='margin: 0.5rem 0;'>Click Rate: 8.7%</p>
-                <p style='margin: 0;'>Response Rate: 12.4%</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-            <div class='metric-card'>
-                <h4 style='color: #8B5CF6; margin: 0;'>RVM Campaigns</h4>
-                <p style='margin: 0.5rem 0;'>Delivery Rate: 94.8%</p>
-                <p style='margin: 0.5rem 0;'>Listen Rate: 67.3%</p>
-                <p style='margin: 0;'>Response Rate: 15.2%</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("""
-            <div class='metric-card warning-metric'>
-                <h4 style='color: #F59E0B; margin: 0;'>SMS Campaigns</h4>
-                <p style='margin: 0.5rem 0;'>Delivery Rate: 98.1%</p>
-                <p style='margin: 0.5rem 0;'>Read Rate: 89.4%</p>
-                <p style='margin: 0;'>Response Rate: 22.8%</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+@fragment('lead_manager.follow_ups')
+def render_followup_tab():
+    """Today's automated follow-ups and automation performance"""
+    
+    st.markdown("### 🔄 Automated Follow-up System")
+    
+    # Today's automated tasks
+    st.markdown("#### 📅 Today's Automated Follow-ups")
+    
+    automated_tasks = [
+        {'name': 'Maria Garcia', 'action': 'RVM Drop', 'time': '10:00 AM', 'campaign': 'Divorce Follow-up', 'status': 'Scheduled'},
+        {'name': 'David Brown', 'action': 'Email Sequence #3', 'time': '2:00 PM', 'campaign': 'Relocation Nurture', 'status': 'Sent'},
+        {'name': 'Jennifer Lee', 'action': 'SMS Check-in', 'time': '4:00 PM', 'campaign': 'Inheritance Series', 'status': 'Pending'},
+        {'name': 'Robert Wilson', 'action': 'Personal Call', 'time': '5:30 PM', 'campaign': 'Hot Lead Priority', 'status': 'Manual Required'}
+    ]
+    
+    for task in automated_tasks:
+        status_colors = {'Scheduled': '#8B5CF6', 'Sent': '#10B981', 'Pending': '#F59E0B', 'Manual Required': '#EF4444'}
+        color = status_colors.get(task['status'], '#6B7280')
+        
+        st.markdown(f"""
+        <div class='deal-card'>
+            <div style='display: flex; justify-content: space-between; align-items: center;'>
+                <div>
+                    <h5 style='color: white; margin: 0;'>{task['name']}</h5>
+                    <small style='color: #9CA3AF;'>{task['action']} | {task['campaign']}</small>
+                </div>
+                <div style='text-align: center;'>
+                    <p style='color: white; margin: 0; font-weight: bold;'>{task['time']}</p>
+                    <small style='color: {color}; font-weight: bold;'>{task['status']}</small>
+                </div>
+                <div>
+                    <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; 
+                                   border-radius: 8px; cursor: pointer;'>
+                        ✅ Complete
+                    </button>
+                </div>
             </div>
-            """, unsafe_allow_html=True)
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Automation performance
+    st.markdown("#### 🤖 Automation Performance")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("""
+        <div class='metric-card success-metric'>
+            <h4 style='color: #10B981; margin: 0;'>Email Campaigns</h4>
+            <p style='margin: 0.5rem 0;'>Open Rate: 34.2%</p>
+            <p style='margin: 0.5rem 0;'>Click Rate: 8.7%</p>
+            <p style='margin: 0;'>Response Rate: 12.4%</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div class='metric-card'>
+            <h4 style='color: #8B5CF6; margin: 0;'>RVM Campaigns</h4>
+            <p style='margin: 0.5rem 0;'>Delivery Rate: 94.8%</p>
+            <p style='margin: 0.5rem 0;'>Listen Rate: 67.3%</p>
+            <p style='margin: 0;'>Response Rate: 15.2%</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown("""
+        <div class='metric-card warning-metric'>
+            <h4 style='color: #F59E0B; margin: 0;'>SMS Campaigns</h4>
+            <p style='margin: 0.5rem 0;'>Delivery Rate: 98.1%</p>
+            <p style='margin: 0.5rem 0;'>Read Rate: 89.4%</p>
+            <p style='margin: 0;'>Response Rate: 22.8%</p>
+        </div>
+        """, unsafe_allow_html=True)
 
 def render_rvm_campaigns():
     """PROFESSIONAL RVM Campaign Manager"""
@@ -1977,335 +1920,357 @@ def render_rvm_campaigns():
     tab1, tab2, tab3, tab4 = st.tabs(["📞 New Campaign", "📊 Active Campaigns", "📈 Analytics", "🎵 Voice Library"])
     
     with tab1:
-        st.markdown("### 🎯 Create Professional RVM Campaign")
+        render_new_rvm_campaign_tab()
+    
+    with tab2:
+        render_active_rvm_campaigns_tab()
+    
+    with tab3:
+        render_rvm_analytics_tab()
+    
+    with tab4:
+        render_voice_library_tab()
+
+@fragment('rvm_campaigns.new_campaign')
+def render_new_rvm_campaign_tab():
+    """New RVM campaign form"""
+    
+    st.markdown("### 🎯 Create Professional RVM Campaign")
+    
+    with st.form("professional_rvm_campaign"):
+        col1, col2 = st.columns(2)
         
-        with st.form("professional_rvm_campaign"):
-            col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Campaign Configuration**")
+            campaign_name = st.text_input("Campaign Name*", placeholder="Q3 Motivated Sellers - Divorce")
+            campaign_type = st.selectbox("Campaign Type", [
+                "Motivated Sellers - Divorce",
+                "Motivated Sellers - Foreclosure", 
+                "Pre-Foreclosure Follow-up",
+                "Inherited Property Outreach",
+                "FSBO Follow-up",
+                "Cash Buyer Alerts",
+                "Expired Listing Follow-up"
+            ])
+            
+            caller_id = st.text_input("Caller ID*", placeholder="(555) 123-4567")
+            call_time_start = st.time_input("Start Time", value=datetime.strptime("09:00", "%H:%M").time())
+            call_time_end = st.time_input("End Time", value=datetime.strptime("18:00", "%H:%M").time())
+            
+            timezone = st.selectbox("Timezone", ["Central", "Eastern", "Mountain", "Pacific"])
             
-            with col1:
-                st.markdown("**Campaign Configuration**")
-                campaign_name = st.text_input("Campaign Name*", placeholder="Q3 Motivated Sellers - Divorce")
-                campaign_type = st.selectbox("Campaign Type", [
-                    "Motivated Sellers - Divorce",
-                    "Motivated Sellers - Foreclosure", 
-                    "Pre-Foreclosure Follow-up",
-                    "Inherited Property Outreach",
-                    "FSBO Follow-up",
-                    "Cash Buyer Alerts",
-                    "Expired Listing Follow-up"
+        with col2:
+            st.markdown("**Voice Message Setup**")
+            voice_option = st.radio("Voice Message", ["Pre-recorded Template", "Upload Custom Audio", "Text-to-Speech"])
+            
+            if voice_option == "Pre-recorded Template":
+                audio_template = st.selectbox("Template", [
+                    "Motivated Seller - Empathetic Approach",
+                    "Motivated Seller - Direct Value Prop",
+                    "Pre-Foreclosure - Helpful Solution",
+                    "Inherited Property - No Pressure",
+                    "FSBO - Agent Alternative"
                 ])
                 
-                caller_id = st.text_input("Caller ID*", placeholder="(555) 123-4567")
-                call_time_start = st.time_input("Start Time", value=datetime.strptime("09:00", "%H:%M").time())
-                call_time_end = st.time_input("End Time", value=datetime.strptime("18:00", "%H:%M").time())
-                
-                timezone = st.selectbox("Timezone", ["Central", "Eastern", "Mountain", "Pacific"])
-                
-            with col2:
-                st.markdown("**Voice Message Setup**")
-                voice_option = st.radio("Voice Message", ["Pre-recorded Template", "Upload Custom Audio", "Text-to-Speech"])
-                
-                if voice_option == "Pre-recorded Template":
-                    audio_template = st.selectbox("Template", [
-                        "Motivated Seller - Empathetic Approach",
-                        "Motivated Seller - Direct Value Prop",
-                        "Pre-Foreclosure - Helpful Solution",
-                        "Inherited Property - No Pressure",
-                        "FSBO - Agent Alternative"
-                    ])
-                    
-                    st.audio("https://www.soundjay.com/misc/sounds/bell-ringing-05.wav", format="audio/wav")
-                    
-                elif voice_option == "Upload Custom Audio":
-                    uploaded_audio = st.file_uploader("Upload Audio File", type=['mp3', 'wav', 'm4a'])
-                    if uploaded_audio:
-                        st.success("✅ Audio file uploaded successfully")
+                st.audio("https://www.soundjay.com/misc/sounds/bell-ringing-05.wav", format="audio/wav")
                 
-                else:  # Text-to-Speech
-                    voice_gender = st.selectbox("Voice", ["Female - Professional", "Male - Friendly", "Female - Warm"])
-                    tts_script = st.text_area("Script", placeholder="Hi, this is Sarah from ABC Investments...")
-            
-            st.markdown("### 👥 Advanced Targeting")
+            elif voice_option == "Upload Custom Audio":
+                uploaded_audio = st.file_uploader("Upload Audio File", type=['mp3', 'wav', 'm4a'])
+                if uploaded_audio:
+                    st.success("✅ Audio file uploaded successfully")
             
-            col3, col4 = st.columns(2)
-            
-            with col3:
-                recipient_source = st.selectbox("Recipients", [
-                    "Lead Database - Filtered",
-                    "Upload CSV List", 
-                    "Manual Phone Entry",
-                    "Integration - Podio/REI",
-                    "Previous Campaign Non-Responders"
-                ])
-                
-                if recipient_source == "Lead Database - Filtered":
-                    st.markdown("**Lead Filters:**")
-                    lead_statuses = st.multiselect("Lead Status", ["New", "Warm", "Cold", "Attempted"], default=["New", "Warm"])
-                    score_range = st.slider("Score Range", 0, 100, (70, 100))
-                    motivation_filter = st.multiselect("Motivation", ["Divorce", "Foreclosure", "Inheritance", "Relocation"])
-                    equity_min = st.number_input("Minimum Equity", min_value=0, value=25000, step=5000)
-                    
-                    # Calculate estimated recipients
-                    estimated_recipients = len([l for l in MockDataService.get_leads() 
-                                              if l['status'] in lead_statuses and l['score'] >= score_range[0]])
-                    st.info(f"📊 Estimated Recipients: {estimated_recipients}")
-                
-                elif recipient_source == "Upload CSV List":
-                    uploaded_csv = st.file_uploader("Upload CSV", type=['csv'])
-                    if uploaded_csv:
-                        estimated_recipients = 450  # Mock
-                        st.success(f"✅ {estimated_recipients} recipients loaded")
-                    else:
-                        estimated_recipients = 0
-                
+            else:  # Text-to-Speech
+                voice_gender = st.selectbox("Voice", ["Female - Professional", "Male - Friendly", "Female - Warm"])
+                tts_script = st.text_area("Script", placeholder="Hi, this is Sarah from ABC Investments...")
+        
+        st.markdown("### 👥 Advanced Targeting")
+        
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            recipient_source = st.selectbox("Recipients", [
+                "Lead Database - Filtered",
+                "Upload CSV List", 
+                "Manual Phone Entry",
+                "Integration - Podio/REI",
+                "Previous Campaign Non-Responders"
+            ])
+            
+            if recipient_source == "Lead Database - Filtered":
+                st.markdown("**Lead Filters:**")
+                lead_statuses = st.multiselect("Lead Status", ["New", "Warm", "Cold", "Attempted"], default=["New", "Warm"])
+                score_range = st.slider("Score Range", 0, 100, (70, 100))
+                motivation_filter = st.multiselect("Motivation", ["Divorce", "Foreclosure", "Inheritance", "Relocation"])
+                equity_min = st.number_input("Minimum Equity", min_value=0, value=25000, step=5000)
+                
+                # Calculate estimated recipients
+                estimated_recipients = len([l for l in MockDataService.get_leads() 
+                                          if l['status'] in lead_statuses and l['score'] >= score_range[0]])
+                st.info(f"📊 Estimated Recipients: {estimated_recipients}")
+            
+            elif recipient_source == "Upload CSV List":
+                uploaded_csv = st.file_uploader("Upload CSV", type=['csv'])
+                if uploaded_csv:
+                    estimated_recipients = 450  # Mock
+                    st.success(f"✅ {estimated_recipients} recipients loaded")
                 else:
                     estimated_recipients = 0
             
-            with col4:
-                st.markdown("**Advanced Options:**")
-                
-                enable_ab_test = st.checkbox("Enable A/B Testing")
-                if enable_ab_test:
-                    ab_split = st.slider("A/B Split %", 10, 90, 50)
-                    st.info(f"Group A: {ab_split}% | Group B: {100-ab_split}%")
-                
-                drip_campaign = st.checkbox("Multi-touch Drip Campaign")
-                if drip_campaign:
-                    touch_points = st.number_input("Number of Touches", min_value=2, max_value=7, value=3)
-                    touch_interval = st.number_input("Days Between Touches", min_value=1, max_value=14, value=3)
-                
-                smart_timing = st.checkbox("AI Smart Timing", value=True)
-                if smart_timing:
-                    st.info("🤖 AI will optimize delivery times based on recipient patterns")
-                
-                compliance_mode = st.selectbox("Compliance", ["Standard", "TCPA Strict", "Custom"])
+            else:
+                estimated_recipients = 0
+        
+        with col4:
+            st.markdown("**Advanced Options:**")
             
-            # Cost calculation and launch
-            if estimated_recipients > 0:
-                base_cost = 0.015
-                total_touches = touch_points if drip_campaign else 1
-                total_messages = estimated_recipients * total_touches
-                total_cost = total_messages * base_cost
-                
-                expected_responses = int(total_messages * 0.165)  # 16.5% avg
-                cost_per_response = total_cost / expected_responses if expected_responses > 0 else 0
-                
-                st.markdown(f"""
-                <div class='metric-card success-metric'>
-                    <h4 style='color: #10B981; margin: 0;'>Campaign Cost Analysis</h4>
-                    <div style='display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1rem; margin: 1rem 0;'>
-                        <div style='text-align: center;'>
-                            <p style='color: white; font-weight: bold; margin: 0;'>{total_messages:,}</p>
-                            <small>Total Messages</small>
-                        </div>
-                        <div style='text-align: center;'>
-                            <p style='color: white; font-weight: bold; margin: 0;'>${total_cost:.2f}</p>
-                            <small>Total Cost</small>
-                        </div>
-                        <div style='text-align: center;'>
-                            <p style='color: white; font-weight: bold; margin: 0;'>{expected_responses}</p>
-                            <small>Expected Responses</small>
-                        </div>
-                    </div>
-                    <p style='margin: 0; text-align: center;'>
-                        Cost per Response: ${cost_per_response:.2f} | ROI Potential: 1,450%+
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+            enable_ab_test = st.checkbox("Enable A/B Testing")
+            if enable_ab_test:
+                ab_split = st.slider("A/B Split %", 10, 90, 50)
+                st.info(f"Group A: {ab_split}% | Group B: {100-ab_split}%")
             
-            # Launch button
-            launch_campaign = st.form_submit_button("🚀 Launch Professional Campaign", type="primary", use_container_width=True)
+            drip_campaign = st.checkbox("Multi-touch Drip Campaign")
+            if drip_campaign:
+                touch_points = st.number_input("Number of Touches", min_value=2, max_value=7, value=3)
+                touch_interval = st.number_input("Days Between Touches", min_value=1, max_value=14, value=3)
             
-            if launch_campaign:
-                if not campaign_name or not caller_id:
-                    st.error("Campaign name and caller ID are required")
-                elif estimated_recipients == 0:
-                    st.error("Please select recipients")
-                else:
-                    with st.spinner("🚀 Launching professional RVM campaign..."):
-                        time.sleep(2.5)
-                    
-                    campaign_id = f"RVM_{str(uuid.uuid4())[:8].upper()}"
-                    
-                    st.success(f"""
-                    🎉 **Professional Campaign "{campaign_name}" Launched Successfully!**
-                    
-                    📊 **Campaign Details:**
-                    - Campaign ID: {campaign_id}
-                    - Recipients: {estimated_recipients:,}
-                    - Total Messages: {total_messages:,}
-                    - Estimated Cost: ${total_cost:.2f}
-                    - Expected Responses: {expected_responses}
-                    - Delivery Window: {call_time_start} - {call_time_end} {timezone}
-                    - Template: {audio_template if voice_option == "Pre-recorded Template" else voice_option}
-                    
-                    🔔 **Real-time Monitoring:**
-                    - Live dashboard activated
-                    - Response tracking enabled
-                    - Auto-lead scoring active
-                    - CRM integration synchronized
-                    """)
-    
-    with tab2:
-        st.markdown("### 📊 Active Campaign Dashboard")
-        
-        # Professional campaign tracking
-        campaigns = [
-            {
-                'id': 'RVM_A8F4B2C1',
-                'name': 'Q3 Divorce Outreach - Dallas',
-                'status': 'Sending',
-                'sent': 2847,
-                'total': 4200,
-                'responses': 187,
-                'cost': 63.00,
-                'response_rate': 6.57,
-                'created': '2024-08-09 09:30',
-                'template': 'Motivated Seller - Empathetic',
-                'target': 'Divorce leads, 80+ score'
-            },
-            {
-                'id': 'RVM_B7E3A9D5',
-                'name': 'Pre-Foreclosure Follow-up - Houston',
-                'status': 'Completed', 
-                'sent': 1856,
-                'total': 1856,
-                'responses': 298,
-                'cost': 27.84,
-                'response_rate': 16.05,
-                'created': '2024-08-08 14:20',
-                'template': 'Pre-Foreclosure Solution',
-                'target': 'Pre-foreclosure, 90+ score'
-            },
-            {
-                'id': 'RVM_C9F6E2A8',
-                'name': 'Inherited Property - Austin',
-                'status': 'Scheduled',
-                'sent': 0,
-                'total': 3450,
-                'responses': 0,
-                'cost': 51.75,
-                'response_rate': 0,
-                'created': '2024-08-09 16:00',
-                'template': 'Inheritance - No Pressure',
-                'target': 'Inherited properties, any score'
-            }
-        ]
+            smart_timing = st.checkbox("AI Smart Timing", value=True)
+            if smart_timing:
+                st.info("🤖 AI will optimize delivery times based on recipient patterns")
+            
+            compliance_mode = st.selectbox("Compliance", ["Standard", "TCPA Strict", "Custom"])
         
-        for campaign in campaigns:
-            progress = (campaign['sent'] / campaign['total']) * 100 if campaign['total'] > 0 else 0
-            
-            status_colors = {'Sending': '#F59E0B', 'Completed': '#10B981', 'Scheduled': '#8B5CF6', 'Paused': '#6B7280'}
-            status_color = status_colors.get(campaign['status'], '#6B7280')
-            
-            # Performance indicators
-            if campaign['response_rate'] > 15:
-                performance = "🔥 Excellent"
-                perf_color = "#10B981"
-            elif campaign['response_rate'] > 10:
-                performance = "✅ Good"
-                perf_color = "#8B5CF6"
-            elif campaign['response_rate'] > 5:
-                performance = "⚠️ Average"
-                perf_color = "#F59E0B"
-            else:
-                performance = "❌ Poor"
-                perf_color = "#EF4444"
+        # Cost calculation and launch
+        if estimated_recipients > 0:
+            base_cost = 0.015
+            total_touches = touch_points if drip_campaign else 1
+            total_messages = estimated_recipients * total_touches
+            total_cost = total_messages * base_cost
+            
+            expected_responses = int(total_messages * 0.165)  # 16.5% avg
+            cost_per_response = total_cost / expected_responses if expected_responses > 0 else 0
             
             st.markdown(f"""
-            <div class='deal-card'>
-                <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;'>
-                    <div>
-                        <h4 style='color: white; margin: 0;'>{campaign['name']}</h4>
-                        <p style='color: #9CA3AF; margin: 0; font-size: 0.9rem;'>
-                            ID: {campaign['id']} | Created: {campaign['created']}
-                        </p>
-                        <p style='color: #9CA3AF; margin: 0; font-size: 0.9rem;'>
-                            Template: {campaign['template']} | Target: {campaign['target']}
-                        </p>
-                    </div>
-                    <div style='text-align: right;'>
-                        <span style='background: {status_color}; color: white; padding: 0.3rem 0.8rem; 
-                                     border-radius: 15px; font-size: 0.8rem; font-weight: bold;'>
-                            {campaign['status']}
-                        </span>
-                        <p style='color: {perf_color}; margin: 0.5rem 0; font-weight: bold;'>{performance}</p>
-                    </div>
-                </div>
-                
-                <div style='display: grid; grid-template-columns: repeat(5, 1fr); gap: 1rem; margin-bottom: 1rem;'>
-                    <div style='text-align: center;'>
-                        <p style='color: #8B5CF6; font-weight: bold; margin: 0;'>{campaign['sent']:,}/{campaign['total']:,}</p>
-                        <small style='color: #9CA3AF;'>Sent</small>
-                    </div>
-                    <div style='text-align: center;'>
-                        <p style='color: #10B981; font-weight: bold; margin: 0;'>{campaign['responses']}</p>
-                        <small style='color: #9CA3AF;'>Responses</small>
-                    </div>
+            <div class='metric-card success-metric'>
+                <h4 style='color: #10B981; margin: 0;'>Campaign Cost Analysis</h4>
+                <div style='display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1rem; margin: 1rem 0;'>
                     <div style='text-align: center;'>
-                        <p style='color: #F59E0B; font-weight: bold; margin: 0;'>{campaign['response_rate']:.1f}%</p>
-                        <small style='color: #9CA3AF;'>Response Rate</small>
+                        <p style='color: white; font-weight: bold; margin: 0;'>{total_messages:,}</p>
+                        <small>Total Messages</small>
                     </div>
                     <div style='text-align: center;'>
-                        <p style='color: #3B82F6; font-weight: bold; margin: 0;'>${campaign['cost']:.2f}</p>
-                        <small style='color: #9CA3AF;'>Cost</small>
+                        <p style='color: white; font-weight: bold; margin: 0;'>${total_cost:.2f}</p>
+                        <small>Total Cost</small>
                     </div>
                     <div style='text-align: center;'>
-                        <p style='color: #EF4444; font-weight: bold; margin: 0;'>${campaign['cost']/max(1, campaign['responses']):.2f}</p>
-                        <small style='color: #9CA3AF;'>Cost/Response</small>
+                        <p style='color: white; font-weight: bold; margin: 0;'>{expected_responses}</p>
+                        <small>Expected Responses</small>
                     </div>
                 </div>
-                
-                <div class='progress-container'>
-                    <div class='progress-bar' style='width: {progress}%; background: {status_color};'></div>
-                </div>
-                
-                <div style='margin-top: 1rem; display: flex; gap: 1rem;'>
-                    <button style='background: #8B5CF6; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                        📊 Live Analytics
-                    </button>
-                    <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                        📞 View Responses
-                    </button>
-                    <button style='background: #F59E0B; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                        ⏸️ Pause
-                    </button>
-                    <button style='background: #EF4444; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                        🗑️ Stop
-                    </button>
-                </div>
+                <p style='margin: 0; text-align: center;'>
+                    Cost per Response: ${cost_per_response:.2f} | ROI Potential: 1,450%+
+                </p>
             </div>
             """, unsafe_allow_html=True)
-    
-    with tab3:
-        st.markdown("### 📈 Professional RVM Analytics")
-        
-        # Enhanced metrics dashboard
-        col1, col2, col3, col4, col5 = st.columns(5)
-        
-        with col1:
-            st.metric("Total Campaigns", "127", "+8 this month")
-        
-        with col2:
-            st.metric("Messages Sent", "48,947", "+5,247 this month")
         
-        with col3:
-            st.metric("Total Responses", "4,285", "+398 this month")
-        
-        with col4:
-            st.metric("Avg Response Rate", "12.4%", "+2.1% vs last month")
-        
-        with col5:
-            st.metric("Cost per Lead", "$3.25", "-$0.75 vs last month")
-        
-        # Professional analytics charts
-        col1, col2 = st.columns(2)
+        # Launch button
+        launch_campaign = st.form_submit_button("🚀 Launch Professional Campaign", type="primary", use_container_width=True)
         
-        with col1:
-            # Response rates by campaign type
-            campaign_types = ['Pre-Foreclosure', 'Divorce', 'Inheritance', 'FSBO', 'Expired Listings']
-            response_rates = [16.2, 14.8, 12.1, 9.4, 8.7]
+        if launch_campaign:
+            if not campaign_name or not caller_id:
+                st.error("Campaign name and caller ID are required")
+            elif estimated_recipients == 0:
+                st.error("Please select recipients")
+            else:
+                with st.spinner("🚀 Launching professional RVM campaign..."):
+                    time.sleep(2.5)
+                
+                campaign_id = f"RVM_{str(uuid.uuid4())[:8].upper()}"
+                
+                st.success(f"""
+                🎉 **Professional Campaign "{campaign_name}" Launched Successfully!**
+                
+                📊 **Campaign Details:**
+                - Campaign ID: {campaign_id}
+                - Recipients: {estimated_recipients:,}
+                - Total Messages: {total_messages:,}
+                - Estimated Cost: ${total_cost:.2f}
+                - Expected Responses: {expected_responses}
+                - Delivery Window: {call_time_start} - {call_time_end} {timezone}
+                - Template: {audio_template if voice_option == "Pre-recorded Template" else voice_option}
+                
+                🔔 **Real-time Monitoring:**
+                - Live dashboard activated
+                - Response tracking enabled
+                - Auto-lead scoring active
+                - CRM integration synchronized
+                """)
+
+@fragment('rvm_campaigns.active')
+def render_active_rvm_campaigns_tab():
+    """Active campaigns with live stats"""
+    
+    st.markdown("### 📊 Active Campaign Dashboard")
+    
+    # Professional campaign tracking
+    campaigns = [
+        {
+            'id': 'RVM_A8F4B2C1',
+            'name': 'Q3 Divorce Outreach - Dallas',
+            'status': 'Sending',
+            'sent': 2847,
+            'total': 4200,
+            'responses': 187,
+            'cost': 63.00,
+            'response_rate': 6.57,
+            'created': '2024-08-09 09:30',
+            'template': 'Motivated Seller - Empathetic',
+            'target': 'Divorce leads, 80+ score'
+        },
+        {
+            'id': 'RVM_B7E3A9D5',
+            'name': 'Pre-Foreclosure Follow-up - Houston',
+            'status': 'Completed', 
+            'sent': 1856,
+            'total': 1856,
+            'responses': 298,
+            'cost': 27.84,
+            'response_rate': 16.05,
+            'created': '2024-08-08 14:20',
+            'template': 'Pre-Foreclosure Solution',
+            'target': 'Pre-foreclosure, 90+ score'
+        },
+        {
+            'id': 'RVM_C9F6E2A8',
+            'name': 'Inherited Property - Austin',
+            'status': 'Scheduled',
+            'sent': 0,
+            'total': 3450,
+            'responses': 0,
+            'cost': 51.75,
+            'response_rate': 0,
+            'created': '2024-08-09 16:00',
+            'template': 'Inheritance - No Pressure',
+            'target': 'Inherited properties, any score'
+        }
+    ]
+    
+    for campaign in campaigns:
+        progress = (campaign['sent'] / campaign['total']) * 100 if campaign['total'] > 0 else 0
+        
+        status_colors = {'Sending': '#F59E0B', 'Completed': '#10B981', 'Scheduled': '#8B5CF6', 'Paused': '#6B7280'}
+        status_color = status_colors.get(campaign['status'], '#6B7280')
+        
+        # Performance indicators
+        if campaign['response_rate'] > 15:
+            performance = "🔥 Excellent"
+            perf_color = "#10B981"
+        elif campaign['response_rate'] > 10:
+            performance = "✅ Good"
+            perf_color = "#8B5CF6"
+        elif campaign['response_rate'] > 5:
+            performance = "⚠️ Average"
+            perf_color = "#F59E0B"
+        else:
+            performance = "❌ Poor"
+            perf_color = "#EF4444"
+        
+        st.markdown(f"""
+        <div class='deal-card'>
+            <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;'>
+                <div>
+                    <h4 style='color: white; margin: 0;'>{campaign['name']}</h4>
+                    <p style='color: #9CA3AF; margin: 0; font-size: 0.9rem;'>
+                        ID: {campaign['id']} | Created: {campaign['created']}
+                    </p>
+                    <p style='color: #9CA3AF; margin: 0; font-size: 0.9rem;'>
+                        Template: {campaign['template']} | Target: {campaign['target']}
+                    </p>
+                </div>
+                <div style='text-align: right;'>
+                    <span style='background: {status_color}; color: white; padding: 0.3rem 0.8rem; 
+                                 border-radius: 15px; font-size: 0.8rem; font-weight: bold;'>
+                        {campaign['status']}
+                    </span>
+                    <p style='color: {perf_color}; margin: 0.5rem 0; font-weight: bold;'>{performance}</p>
+                </div>
+            </div>
+            
+            <div style='display: grid; grid-template-columns: repeat(5, 1fr); gap: 1rem; margin-bottom: 1rem;'>
+                <div style='text-align: center;'>
+                    <p style='color: #8B5CF6; font-weight: bold; margin: 0;'>{campaign['sent']:,}/{campaign['total']:,}</p>
+                    <small style='color: #9CA3AF;'>Sent</small>
+                </div>
+                <div style='text-align: center;'>
+                    <p style='color: #10B981; font-weight: bold; margin: 0;'>{campaign['responses']}</p>
+                    <small style='color: #9CA3AF;'>Responses</small>
+                </div>
+                <div style='text-align: center;'>
+                    <p style='color: #F59E0B; font-weight: bold; margin: 0;'>{campaign['response_rate']:.1f}%</p>
+                    <small style='color: #9CA3AF;'>Response Rate</small>
+                </div>
+                <div style='text-align: center;'>
+                    <p style='color: #3B82F6; font-weight: bold; margin: 0;'>${campaign['cost']:.2f}</p>
+                    <small style='color: #9CA3AF;'>Cost</small>
+                </div>
+                <div style='text-align: center;'>
+                    <p style='color: #EF4444; font-weight: bold; margin: 0;'>${campaign['cost']/max(1, campaign['responses']):.2f}</p>
+                    <small style='color: #9CA3AF;'>Cost/Response</small>
+                </div>
+            </div>
+            
+            <div class='progress-container'>
+                <div class='progress-bar' style='width: {progress}%; background: {status_color};'></div>
+            </div>
             
+            <div style='margin-top: 1rem; display: flex; gap: 1rem;'>
+                <button style='background: #8B5CF6; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                    📊 Live Analytics
+                </button>
+                <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                    📞 View Responses
+                </button>
+                <button style='background: #F59E0B; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                    ⏸️ Pause
+                </button>
+                <button style='background: #EF4444; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                    🗑️ Stop
+                </button>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+@fragment('rvm_campaigns.analytics')
+def render_rvm_analytics_tab():
+    """Response and delivery analytics across campaigns"""
+    
+    st.markdown("### 📈 Professional RVM Analytics")
+    
+    # Enhanced metrics dashboard
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        st.metric("Total Campaigns", "127", "+8 this month")
+    
+    with col2:
+        st.metric("Messages Sent", "48,947", "+5,247 this month")
+    
+    with col3:
+        st.metric("Total Responses", "4,285", "+398 this month")
+    
+    with col4:
+        st.metric("Avg Response Rate", "12.4%", "+2.1% vs last month")
+    
+    with col5:
+        st.metric("Cost per Lead", "$3.25", "-$0.75 vs last month")
+    
+    # Professional analytics charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Response rates by campaign type
+        campaign_types = ['Pre-Foreclosure', 'Divorce', 'Inheritance', 'FSBO', 'Expired Listings']
+        response_rates = [16.2, 14.8, 12.1, 9.4, 8.7]
+        
+        def build_response():
             fig_response = px.bar(
                 x=campaign_types,
                 y=response_rates,
@@ -2319,13 +2284,18 @@ def render_rvm_campaigns():
                 paper_bgcolor='rgba(0,0,0,0)',
                 font_color='white'
             )
-            st.plotly_chart(fig_response, use_container_width=True)
+            return fig_response
         
-        with col2:
-            # Daily performance trend
-            days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-            response_by_day = [14.2, 15.8, 16.1, 15.4, 13.9, 9.8, 7.2]
-            
+        figure = cached_figure('rvm_response_by_type', [campaign_types, response_rates], build_response)
+        
+        st.plotly_chart(figure, use_container_width=True)
+    
+    with col2:
+        # Daily performance trend
+        days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        response_by_day = [14.2, 15.8, 16.1, 15.4, 13.9, 9.8, 7.2]
+        
+        def build_daily():
             fig_daily = px.line(
                 x=days,
                 y=response_by_day,
@@ -2338,131 +2308,138 @@ def render_rvm_campaigns():
                 paper_bgcolor='rgba(0,0,0,0)',
                 font_color='white'
             )
-            st.plotly_chart(fig_daily, use_container_width=True)
+            return fig_daily
         
-        # Top performing campaigns
-        st.markdown("### 🏆 Top Performing Campaigns (Last 30 Days)")
+        figure = cached_figure('rvm_response_by_day', [days, response_by_day], build_daily)
         
-        top_campaigns = [
-            {'name': 'Pre-Foreclosure Houston Q3', 'messages': 4250, 'responses': 687, 'rate': 16.16, 'cost': 63.75, 'deals': 12},
-            {'name': 'Divorce Dallas Metro', 'messages': 3890, 'responses': 576, 'rate': 14.81, 'cost': 58.35, 'deals': 9},
-            {'name': 'Inheritance Austin Central', 'messages': 2150, 'responses': 301, 'rate': 14.00, 'cost': 32.25, 'deals': 7},
-            {'name': 'FSBO Follow-up DFW', 'messages': 5200, 'responses': 650, 'rate': 12.50, 'cost': 78.00, 'deals': 8},
-            {'name': 'Expired Listing San Antonio', 'messages': 1800, 'responses': 207, 'rate': 11.50, 'cost': 27.00, 'deals': 4}
-        ]
+        st.plotly_chart(figure, use_container_width=True)
+    
+    # Top performing campaigns
+    st.markdown("### 🏆 Top Performing Campaigns (Last 30 Days)")
+    
+    top_campaigns = [
+        {'name': 'Pre-Foreclosure Houston Q3', 'messages': 4250, 'responses': 687, 'rate': 16.16, 'cost': 63.75, 'deals': 12},
+        {'name': 'Divorce Dallas Metro', 'messages': 3890, 'responses': 576, 'rate': 14.81, 'cost': 58.35, 'deals': 9},
+        {'name': 'Inheritance Austin Central', 'messages': 2150, 'responses': 301, 'rate': 14.00, 'cost': 32.25, 'deals': 7},
+        {'name': 'FSBO Follow-up DFW', 'messages': 5200, 'responses': 650, 'rate': 12.50, 'cost': 78.00, 'deals': 8},
+        {'name': 'Expired Listing San Antonio', 'messages': 1800, 'responses': 207, 'rate': 11.50, 'cost': 27.00, 'deals': 4}
+    ]
+    
+    for i, campaign in enumerate(top_campaigns, 1):
+        deals_ratio = campaign['deals'] / max(1, campaign['responses']) * 100
+        roi = (campaign['deals'] * 25000 - campaign['cost']) / campaign['cost'] * 100  # Assume $25k avg deal
         
-        for i, campaign in enumerate(top_campaigns, 1):
-            deals_ratio = campaign['deals'] / max(1, campaign['responses']) * 100
-            roi = (campaign['deals'] * 25000 - campaign['cost']) / campaign['cost'] * 100  # Assume $25k avg deal
-            
-            roi_color = '#10B981' if roi > 1000 else '#F59E0B' if roi > 500 else '#EF4444'
-            
-            st.markdown(f"""
-            <div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; margin: 0.5rem 0; border-radius: 10px; 
-                        border-left: 4px solid #10B981;'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
+        roi_color = '#10B981' if roi > 1000 else '#F59E0B' if roi > 500 else '#EF4444'
+        
+        st.markdown(f"""
+        <div style='background: rgba(16, 185, 129, 0.1); padding: 1rem; margin: 0.5rem 0; border-radius: 10px; 
+                    border-left: 4px solid #10B981;'>
+            <div style='display: flex; justify-content: space-between; align-items: center;'>
+                <div>
+                    <strong style='color: white;'>#{i}. {campaign['name']}</strong>
+                </div>
+                <div style='display: flex; gap: 2rem; text-align: center;'>
                     <div>
-                        <strong style='color: white;'>#{i}. {campaign['name']}</strong>
+                        <p style='color: #10B981; font-weight: bold; margin: 0;'>{campaign['rate']:.1f}%</p>
+                        <small style='color: #9CA3AF;'>Response Rate</small>
                     </div>
-                    <div style='display: flex; gap: 2rem; text-align: center;'>
-                        <div>
-                            <p style='color: #10B981; font-weight: bold; margin: 0;'>{campaign['rate']:.1f}%</p>
-                            <small style='color: #9CA3AF;'>Response Rate</small>
-                        </div>
-                        <div>
-                            <p style='color: #8B5CF6; font-weight: bold; margin: 0;'>{campaign['responses']}</p>
-                            <small style='color: #9CA3AF;'>Total Responses</small>
-                        </div>
-                        <div>
-                            <p style='color: #F59E0B; font-weight: bold; margin: 0;'>{campaign['deals']}</p>
-                            <small style='color: #9CA3AF;'>Deals Closed</small>
-                        </div>
-                        <div>
-                            <p style='color: {roi_color}; font-weight: bold; margin: 0;'>{roi:.0f}%</p>
-                            <small style='color: #9CA3AF;'>ROI</small>
-                        </div>
+                    <div>
+                        <p style='color: #8B5CF6; font-weight: bold; margin: 0;'>{campaign['responses']}</p>
+                        <small style='color: #9CA3AF;'>Total Responses</small>
+                    </div>
+                    <div>
+                        <p style='color: #F59E0B; font-weight: bold; margin: 0;'>{campaign['deals']}</p>
+                        <small style='color: #9CA3AF;'>Deals Closed</small>
+                    </div>
+                    <div>
+                        <p style='color: {roi_color}; font-weight: bold; margin: 0;'>{roi:.0f}%</p>
+                        <small style='color: #9CA3AF;'>ROI</small>
                     </div>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
-    
-    with tab4:
-        st.markdown("### 🎵 Professional Voice Library")
-        
-        st.markdown("""
-        <div class='feature-card'>
-            <h4 style='color: white; text-align: center; margin: 0;'>🎙️ Professional Voice Templates</h4>
-            <p style='color: white; text-align: center; margin: 0.5rem 0;'>
-                Professionally recorded messages optimized for maximum response rates
-            </p>
         </div>
         """, unsafe_allow_html=True)
-        
-        voice_templates = [
-            {
-                'name': 'Motivated Seller - Empathetic Approach',
-                'duration': '18 seconds',
-                'response_rate': '14.8%',
-                'best_for': 'Divorce, Financial Hardship',
-                'voice': 'Female - Warm & Caring',
-                'script': 'Hi, this is Sarah with ABC Home Solutions. I understand you might be going through a difficult time right now, and I wanted to reach out because we help families in your exact situation...'
-            },
-            {
-                'name': 'Pre-Foreclosure - Solution Focused',
-                'duration': '22 seconds',
-                'response_rate': '16.2%',
-                'best_for': 'Pre-foreclosure, Behind on payments',
-                'voice': 'Male - Professional & Confident',
-                'script': 'Hi, this is Mike from DFW Property Solutions. I know dealing with foreclosure can be incredibly stressful, but there are still options available to you...'
-            },
-            {
-                'name': 'Inherited Property - No Pressure',
-                'duration': '20 seconds',
-                'response_rate': '12.1%',
-                'best_for': 'Inherited properties, Estate sales',
-                'voice': 'Female - Gentle & Understanding',
-                'script': 'Hi, I\'m calling about the property you recently inherited. I know this can be an overwhelming time, and you might be wondering what to do with the property...'
-            },
-            {
-                'name': 'FSBO - Agent Alternative',
-                'duration': '19 seconds',
-                'response_rate': '9.4%',
-                'best_for': 'FSBO, Tired of showing',
-                'voice': 'Male - Friendly & Direct',
-                'script': 'Hi, I noticed your property for sale and wanted to offer you an alternative to working with agents and showing your home to countless people...'
-            }
-        ]
-        
-        for template in voice_templates:
-            response_color = '#10B981' if float(template['response_rate'].rstrip('%')) > 14 else '#F59E0B' if float(template['response_rate'].rstrip('%')) > 10 else '#EF4444'
-            
-            st.markdown(f"""
-            <div class='deal-card'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
-                    <div style='flex: 1;'>
-                        <h5 style='color: white; margin: 0;'>{template['name']}</h5>
-                        <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
-                            🎙️ {template['voice']} | ⏱️ {template['duration']} | 🎯 {template['best_for']}
-                        </p>
-                        <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.8rem; font-style: italic;'>
-                            "{template['script'][:80]}..."
-                        </p>
-                    </div>
-                    <div style='text-align: center; margin: 0 2rem;'>
-                        <p style='color: {response_color}; margin: 0; font-weight: bold; font-size: 1.2rem;'>{template['response_rate']}</p>
-                        <small style='color: #9CA3AF;'>Avg Response</small>
-                    </div>
-                    <div style='display: flex; gap: 0.5rem; flex-direction: column;'>
-                        <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                            ▶️ Preview
-                        </button>
-                        <button style='background: #8B5CF6; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
-                            📋 Use Template
-                        </button>
-                    </div>
+
+@fragment('rvm_campaigns.voice_library')
+def render_voice_library_tab():
+    """Recorded voice messages and templates"""
+    
+    st.markdown("### 🎵 Professional Voice Library")
+    
+    st.markdown("""
+    <div class='feature-card'>
+        <h4 style='color: white; text-align: center; margin: 0;'>🎙️ Professional Voice Templates</h4>
+        <p style='color: white; text-align: center; margin: 0.5rem 0;'>
+            Professionally recorded messages optimized for maximum response rates
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    voice_templates = [
+        {
+            'name': 'Motivated Seller - Empathetic Approach',
+            'duration': '18 seconds',
+            'response_rate': '14.8%',
+            'best_for': 'Divorce, Financial Hardship',
+            'voice': 'Female - Warm & Caring',
+            'script': 'Hi, this is Sarah with ABC Home Solutions. I understand you might be going through a difficult time right now, and I wanted to reach out because we help families in your exact situation...'
+        },
+        {
+            'name': 'Pre-Foreclosure - Solution Focused',
+            'duration': '22 seconds',
+            'response_rate': '16.2%',
+            'best_for': 'Pre-foreclosure, Behind on payments',
+            'voice': 'Male - Professional & Confident',
+            'script': 'Hi, this is Mike from DFW Property Solutions. I know dealing with foreclosure can be incredibly stressful, but there are still options available to you...'
+        },
+        {
+            'name': 'Inherited Property - No Pressure',
+            'duration': '20 seconds',
+            'response_rate': '12.1%',
+            'best_for': 'Inherited properties, Estate sales',
+            'voice': 'Female - Gentle & Understanding',
+            'script': 'Hi, I\'m calling about the property you recently inherited. I know this can be an overwhelming time, and you might be wondering what to do with the property...'
+        },
+        {
+            'name': 'FSBO - Agent Alternative',
+            'duration': '19 seconds',
+            'response_rate': '9.4%',
+            'best_for': 'FSBO, Tired of showing',
+            'voice': 'Male - Friendly & Direct',
+            'script': 'Hi, I noticed your property for sale and wanted to offer you an alternative to working with agents and showing your home to countless people...'
+        }
+    ]
+    
+    for template in voice_templates:
+        response_color = '#10B981' if float(template['response_rate'].rstrip('%')) > 14 else '#F59E0B' if float(template['response_rate'].rstrip('%')) > 10 else '#EF4444'
+        
+        st.markdown(f"""
+        <div class='deal-card'>
+            <div style='display: flex; justify-content: space-between; align-items: center;'>
+                <div style='flex: 1;'>
+                    <h5 style='color: white; margin: 0;'>{template['name']}</h5>
+                    <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.9rem;'>
+                        🎙️ {template['voice']} | ⏱️ {template['duration']} | 🎯 {template['best_for']}
+                    </p>
+                    <p style='color: #9CA3AF; margin: 0.2rem 0; font-size: 0.8rem; font-style: italic;'>
+                        "{template['script'][:80]}..."
+                    </p>
+                </div>
+                <div style='text-align: center; margin: 0 2rem;'>
+                    <p style='color: {response_color}; margin: 0; font-weight: bold; font-size: 1.2rem;'>{template['response_rate']}</p>
+                    <small style='color: #9CA3AF;'>Avg Response</small>
+                </div>
+                <div style='display: flex; gap: 0.5rem; flex-direction: column;'>
+                    <button style='background: #10B981; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                        ▶️ Preview
+                    </button>
+                    <button style='background: #8B5CF6; color: white; border: none; padding: 0.5rem 1rem; border-radius: 8px; cursor: pointer;'>
+                        📋 Use Template
+                    </button>
                 </div>
             </div>
-            """, unsafe_allow_html=True)
+        </div>
+        """, unsafe_allow_html=True)
 
 def render_buyer_network():
     """PROFESSIONAL Buyer Network Manager"""
@@ -3948,6 +3925,13 @@ def render_analytics():
 def main():
     """Main application logic"""
     
+    page = st.session_state.current_page if st.session_state.authenticated else 'landing'
+    with TRACER.rerun(page=page, user_id=st.session_state.user_data.get('id', '')):
+        _route_page()
+
+def _route_page():
+    """Render the landing page or the page selected in the sidebar"""
+    
     if not st.session_state.authenticated:
         render_landing_page()
     else:
@@ -3955,6 +3939,7 @@ def main():
         
         # Route to appropriate page
         current_page = st.session_state.current_page
+        TRACER.set_page(current_page)
         
         if current_page == 'dashboard':
             render_dashboard()
@@ -23,6 +23,8 @@ import re
 from typing import Dict, List, Optional, Any
 import math
 
+from wtf_market_data import MARKET_DATA as REFERENCE_MARKET_DATA
+
 # Page configuration
 st.set_page_config(
     page_title="WTF - Wholesale on Steroids", 
@@ -193,34 +195,7 @@ class RealEstateDataService:
     """Enhanced real estate data service with realistic market data"""
     
     # Real market data by city/state
-    MARKET_DATA = {
-        'tx': {
-            'houston': {'median_price': 380000, 'rent_psf': 1.1, 'appreciation': 0.042, 'tax_rate': 0.021},
-            'dallas': {'median_price': 425000, 'rent_psf': 1.2, 'appreciation': 0.045, 'tax_rate': 0.022},
-            'austin': {'median_price': 550000, 'rent_psf': 1.4, 'appreciation': 0.055, 'tax_rate': 0.019},
-            'san antonio': {'median_price': 320000, 'rent_psf': 1.0, 'appreciation': 0.038, 'tax_rate': 0.023},
-            'fort worth': {'median_price': 385000, 'rent_psf': 1.15, 'appreciation': 0.041, 'tax_rate': 0.022},
-            'plano': {'median_price': 485000, 'rent_psf': 1.3, 'appreciation': 0.048, 'tax_rate': 0.020},
-            'arlington': {'median_price': 345000, 'rent_psf': 1.1, 'appreciation': 0.039, 'tax_rate': 0.023}
-        },
-        'ca': {
-            'los angeles': {'median_price': 950000, 'rent_psf': 2.8, 'appreciation': 0.065, 'tax_rate': 0.015},
-            'san francisco': {'median_price': 1350000, 'rent_psf': 3.2, 'appreciation': 0.058, 'tax_rate': 0.012},
-            'san diego': {'median_price': 825000, 'rent_psf': 2.5, 'appreciation': 0.062, 'tax_rate': 0.016},
-            'sacramento': {'median_price': 485000, 'rent_psf': 1.8, 'appreciation': 0.051, 'tax_rate': 0.017}
-        },
-        'fl': {
-            'miami': {'median_price': 485000, 'rent_psf': 1.8, 'appreciation': 0.055, 'tax_rate': 0.018},
-            'tampa': {'median_price': 365000, 'rent_psf': 1.5, 'appreciation': 0.048, 'tax_rate': 0.019},
-            'orlando': {'median_price': 325000, 'rent_psf': 1.4, 'appreciation': 0.045, 'tax_rate': 0.020},
-            'jacksonville': {'median_price': 285000, 'rent_psf': 1.2, 'appreciation': 0.041, 'tax_rate': 0.021}
-        },
-        'ny': {
-            'new york': {'median_price': 750000, 'rent_psf': 2.2, 'appreciation': 0.035, 'tax_rate': 0.028},
-            'buffalo': {'median_price': 185000, 'rent_psf': 0.9, 'appreciation': 0.025, 'tax_rate': 0.032},
-            'rochester': {'median_price': 165000, 'rent_psf': 0.85, 'appreciation': 0.028, 'tax_rate': 0.030}
-        }
-    }
+    MARKET_DATA = REFERENCE_MARKET_DATA
     
     @staticmethod
     def lookup_property_by_address(address, city, state):
@@ -0,0 +1,332 @@
+"""
+WTF Follow-ups - Lead follow-up scheduler backed by a due-time priority queue
+
+Leads with a next_followup are held in a min-heap ordered by (due time,
+lead id). The heap is loaded through lead_changes, which triggers on leads
+keep numbered in commit order, so a refresh reads only leads changed since
+the last seq it saw. Deleted leads leave a tombstone there and drop out of
+the queue. A tick
+pops every entry that has come due, marks the lead overdue and sends the
+newly due follow-ups to NotificationManager as one notification per user,
+written in batches of batch_size notifications per transaction.
+
+Entries are never removed from the heap in place. A rescheduled or cleared
+follow-up pushes a new entry and the old one is skipped when it surfaces
+(lazy deletion). Per-user overdue counters move as entries pass, and each
+user's own heap answers "call next" by popping its first few entries.
+Reads cost O(1) for a count and O(k log n) for a list, where the old
+dashboard query scanned the user's leads.
+
+The (due, lead id) of the last follow-up notified is stored in
+scheduler_watermarks. After a restart, follow-ups at or below it are counted
+as overdue but not notified again. A tick that fails partway through its
+notifications retries them all on the next tick, and a crash before the
+watermark write sends them again after the restart; none are dropped. On the
+first run the watermark starts at the current time, so follow-ups that were
+already overdue do not all fire at once.
+"""
+
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FOLLOWUP_SETTINGS = {
+    'refresh_interval': float(os.environ.get('WTF_FOLLOWUP_REFRESH_INTERVAL', '5')),
+    'batch_size': int(os.environ.get('WTF_FOLLOWUP_BATCH_SIZE', '200')),
+    'load_batch': int(os.environ.get('WTF_FOLLOWUP_LOAD_BATCH', '5000'))
+}
+
+WATERMARK_NAME = 'lead_followups'
+
+# Names per notification before the rest are summarized as "and N more"
+NOTIFY_NAMES = 3
+
+
+def due_key(value) -> Optional[str]:
+    """next_followup as a fixed-width local ISO timestamp, so string order is time order
+
+    Leads store '2024-06-01 12:00:00', '2024-06-01T12:00:00.123456' and bare dates;
+    None for empty or unreadable values.
+    """
+    if not value:
+        return None
+    try:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat(timespec='microseconds')
+
+
+class FollowUpScheduler:
+    """Due-time queue of lead follow-ups with overdue counts and call lists per user"""
+
+    def __init__(self, db_manager, notifications, batch_size: int = 200, refresh_interval: float = 5.0,
+                 load_batch: int = 5000):
+        self.db = db_manager
+        self.notifications = notifications
+        self.batch_size = batch_size
+        self.refresh_interval = refresh_interval
+        self.load_batch = load_batch
+        self._lock = threading.RLock()
+        self._heap = []           # (due, lead_id) not yet passed, across all users
+        self._user_heaps = {}     # user_id -> [(due, lead_id)], passed or not, for call_next
+        self._due = {}            # lead_id -> due of its live entry
+        self._leads = {}          # lead_id -> (user_id, name, property_address)
+        self._passed = set()      # leads whose live entry has come due
+        self._notify = set()      # leads rescheduled while running; notified even below the watermark
+        self._overdue = {}        # user_id -> number of leads in _passed
+        self._live = {}           # user_id -> number of leads in _due
+        self._loaded = 0          # lead_changes seq of the last change read
+        self._fired = None        # (due, lead_id) of the last follow-up notified; read on first tick
+        self._next_tick = 0.0
+        self._thread = None
+        self._stop = threading.Event()
+        self.stats = {'loaded': 0, 'fired': 0, 'notifications': 0, 'batches': 0}
+
+    # Watermark
+    def _read_watermark(self, cursor) -> Tuple[str, str]:
+        row = cursor.execute('SELECT due_at, lead_id FROM scheduler_watermarks WHERE name = ?',
+                             (WATERMARK_NAME,)).fetchone()
+        if row:
+            return row[0], row[1]
+        return datetime.now().isoformat(timespec='microseconds'), ''
+
+    def _write_watermark(self, watermark: Tuple[str, str]):
+        conn = self.db.get_connection()
+        try:
+            conn.cursor().execute('''
+                INSERT INTO scheduler_watermarks (name, due_at, lead_id, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (name) DO UPDATE SET due_at = excluded.due_at, lead_id = excluded.lead_id,
+                                                 updated_at = excluded.updated_at
+            ''', (WATERMARK_NAME, *watermark))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Loading
+    def refresh(self) -> int:
+        """Apply lead rows changed since the last refresh; returns how many were read"""
+        with self._lock:
+            conn = self.db.get_connection()
+            try:
+                cursor = conn.cursor()
+                if self._fired is None:
+                    self._fired = self._read_watermark(cursor)
+                first_load = self._loaded == 0
+                read = 0
+                while True:
+                    # updated_at has one-second precision and lead ids are random, so rows are
+                    # read by change seq; a change whose lead row is gone is a delete
+                    rows = cursor.execute('''
+                        SELECT c.seq, c.lead_id, l.user_id, l.next_followup, l.first_name, l.last_name,
+                               l.property_address
+                        FROM lead_changes c
+                        LEFT JOIN leads l ON l.id = c.lead_id
+                        WHERE c.seq > ?
+                        ORDER BY c.seq
+                        LIMIT ?
+                    ''', (self._loaded, self.load_batch)).fetchall()
+                    for seq, lead_id, user_id, next_followup, first_name, last_name, address in rows:
+                        if user_id is None:
+                            self._drop(lead_id)
+                        else:
+                            name = ' '.join(part for part in (first_name, last_name) if part) or 'Lead'
+                            self._apply(lead_id, user_id, due_key(next_followup), name, address, first_load)
+                        self._loaded = seq
+                    read += len(rows)
+                    if len(rows) < self.load_batch:
+                        break
+            finally:
+                conn.close()
+            if first_load:
+                heapq.heapify(self._heap)
+                for heap in self._user_heaps.values():
+                    heapq.heapify(heap)
+            self.stats['loaded'] += read
+            return read
+
+    def _apply(self, lead_id: str, user_id: str, due: Optional[str], name: str, address: str,
+               first_load: bool = False):
+        """Point a lead at its current follow-up; the superseded heap entries go stale"""
+        if lead_id in self._due and self._due[lead_id] == due and self._leads[lead_id][0] == user_id:
+            self._leads[lead_id] = (user_id, name, address)
+            return
+        self._drop(lead_id)
+        if due is None:
+            return
+        self._due[lead_id] = due
+        self._leads[lead_id] = (user_id, name, address)
+        self._live[user_id] = self._live.get(user_id, 0) + 1
+        push = list.append if first_load else heapq.heappush
+        push(self._heap, (due, lead_id))
+        push(self._user_heaps.setdefault(user_id, []), (due, lead_id))
+        if not first_load:
+            self._notify.add(lead_id)
+
+    def _drop(self, lead_id: str):
+        if lead_id not in self._due:
+            return
+        del self._due[lead_id]
+        self._notify.discard(lead_id)
+        lead = self._leads.pop(lead_id)
+        self._live[lead[0]] -= 1
+        if lead_id in self._passed:
+            self._passed.discard(lead_id)
+            self._overdue[lead[0]] -= 1
+
+    # Firing
+    def tick(self, now: Optional[datetime] = None, force: bool = False) -> int:
+        """Refresh, then pass and notify every follow-up due before now; returns how many came due
+
+        Runs at most once per refresh_interval unless forced.
+        """
+        if not force and time.monotonic() < self._next_tick:
+            return 0
+        with self._lock:
+            if not force and time.monotonic() < self._next_tick:
+                return 0
+            self._next_tick = time.monotonic() + self.refresh_interval
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Follow-up refresh failed: {str(e)}")
+                return 0
+
+            passed = self._pop_due((now or datetime.now()).isoformat(timespec='microseconds'))
+            due = [entry for entry in passed if entry > self._fired or entry[1] in self._notify]
+            if due and not self._fire(due):
+                self._unpass(passed)
+                return 0
+            self._notify.difference_update(lead_id for _, lead_id in passed)
+            self._compact()
+            return len(passed)
+
+    def _pop_due(self, now_key: str) -> List[Tuple[str, str]]:
+        """Live entries due before now_key, in due order, counted as overdue"""
+        batch = []
+        while self._heap and self._heap[0][0] < now_key:
+            due, lead_id = heapq.heappop(self._heap)
+            if self._due.get(lead_id) != due or lead_id in self._passed:
+                continue
+            self._passed.add(lead_id)
+            user_id = self._leads[lead_id][0]
+            self._overdue[user_id] = self._overdue.get(user_id, 0) + 1
+            batch.append((due, lead_id))
+        return batch
+
+    def _unpass(self, batch: List[Tuple[str, str]]):
+        """Put entries whose notifications failed back on the queue for the next tick"""
+        for due, lead_id in batch:
+            self._passed.discard(lead_id)
+            self._overdue[self._leads[lead_id][0]] -= 1
+            heapq.heappush(self._heap, (due, lead_id))
+
+    def _fire(self, due: List[Tuple[str, str]]) -> bool:
+        """One notification per user for newly due follow-ups, batch_size per transaction,
+        then advance the watermark
+        """
+        by_user = {}
+        for _, lead_id in due:
+            user_id, name, _ = self._leads[lead_id]
+            by_user.setdefault(user_id, []).append(name)
+
+        items = []
+        for user_id, names in by_user.items():
+            shown = ', '.join(names[:NOTIFY_NAMES])
+            if len(names) > NOTIFY_NAMES:
+                shown += f" and {len(names) - NOTIFY_NAMES} more"
+            items.append({
+                'user_id': user_id,
+                'title': f"📞 {len(names)} follow-up{'s' if len(names) != 1 else ''} due",
+                'message': f"Time to call {shown}",
+                'type': 'warning',
+                'action_url': '/lead_manager',
+                'priority': 2
+            })
+        try:
+            for start in range(0, len(items), self.batch_size):
+                self.notifications.create_notifications(items[start:start + self.batch_size])
+                self.stats['batches'] += 1
+        except Exception as e:
+            logger.warning(f"Follow-up notifications failed: {str(e)}")
+            return False
+
+        self._fired = max(self._fired, max(due))
+        self._write_watermark(self._fired)
+        self.stats['fired'] += len(due)
+        self.stats['notifications'] += len(items)
+        return True
+
+    # Reads
+    def overdue_count(self, user_id: str) -> int:
+        """Leads whose next follow-up has passed"""
+        self.tick()
+        with self._lock:
+            return self._overdue.get(user_id, 0)
+
+    def call_next(self, user_id: str, limit: int = 10) -> List[Dict]:
+        """The user's leads with the earliest follow-ups, overdue ones first"""
+        self.tick()
+        with self._lock:
+            heap = self._user_heaps.get(user_id, [])
+            taken, seen = [], set()
+            while heap and len(seen) < limit:
+                entry = heapq.heappop(heap)
+                due, lead_id = entry
+                if self._due.get(lead_id) != due or self._leads[lead_id][0] != user_id or lead_id in seen:
+                    continue
+                seen.add(lead_id)
+                taken.append(entry)
+            for entry in taken:
+                heapq.heappush(heap, entry)
+            if len(heap) > 2 * self._live.get(user_id, 0) + 64:
+                heap[:] = [(due, lead_id) for due, lead_id in set(heap)
+                           if self._due.get(lead_id) == due and self._leads[lead_id][0] == user_id]
+                heapq.heapify(heap)
+
+            calls = []
+            for due, lead_id in taken:
+                _, name, address = self._leads[lead_id]
+                calls.append({'lead_id': lead_id, 'name': name, 'property_address': address,
+                              'next_followup': due, 'overdue': lead_id in self._passed})
+            return calls
+
+    def _compact(self):
+        """Rebuild the due queue once most of its entries are stale"""
+        if len(self._heap) > 2 * (len(self._due) - len(self._passed)) + 1024:
+            self._heap = [(due, lead_id) for lead_id, due in self._due.items() if lead_id not in self._passed]
+            heapq.heapify(self._heap)
+
+    # Background ticking
+    def start(self) -> threading.Thread:
+        """Tick every refresh_interval on a daemon thread, so follow-ups fire while no page is open"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='followups', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.tick(force=True)
+            except Exception as e:
+                logger.warning(f"Follow-up tick failed: {str(e)}")
+            self._stop.wait(self.refresh_interval)
+
+    def stop(self):
+        self._stop.set()
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'scheduled': len(self._due) - len(self._passed), 'overdue': len(self._passed),
+                    'heap_entries': len(self._heap), 'watermark': self._fired}
@@ -0,0 +1,144 @@
+"""
+WTF Fragments - Section-level reruns for the heavy Streamlit pages
+
+Page sections (strategy tabs, what-if explorer, lead and campaign tabs) are
+wrapped with `fragment`, which hands them to st.fragment: a widget inside a
+section reruns only that section instead of the whole script. Sections take
+everything they render as arguments, so a fragment rerun replays them with
+the inputs of the last full run.
+
+Figures are built through `cached_figure`, keyed by a stable hash of the data
+they plot, so a rerun that leaves a chart's inputs unchanged reuses the
+figure from the shared cache in wtf_figures instead of rebuilding it.
+
+Fragment reruns are recorded on TRACER as reruns of "<page> / <section>"
+(kind 'fragment'). To measure rerun wall time per interaction before and
+after, run the app once with fragments off and once with them on, clicking
+through the same widgets, then compare the two logs:
+
+    WTF_FRAGMENTS=0 WTF_RERUN_LOG=before.jsonl streamlit run wtf_fixed_complete.py
+    WTF_RERUN_LOG=after.jsonl streamlit run wtf_fixed_complete.py
+    python -m wtf_fragments compare before.jsonl after.jsonl
+"""
+
+import argparse
+import functools
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from wtf_instrumentation import TRACER, _percentile
+from wtf_startup import lazy_import
+
+st = lazy_import('streamlit')
+
+FRAGMENT_SETTINGS = {
+    'enabled': os.environ.get('WTF_FRAGMENTS', '1') != '0'
+}
+
+_PAGE_KEY = '_wtf_fragment_page'
+
+
+def _st_fragment() -> Optional[Callable]:
+    if not FRAGMENT_SETTINGS['enabled']:
+        return None
+    return getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+
+def fragments_enabled() -> bool:
+    """Whether sections decorated with `fragment` rerun on their own (and honour run_every)"""
+    return _st_fragment() is not None
+
+
+def fragment(name: str, run_every: Optional[float] = None) -> Callable:
+    """Render the decorated section as a Streamlit fragment named `name`
+
+    Inside a full rerun the section is a span of that rerun; on its own
+    (fragment) rerun it is recorded as a rerun of "<page> / <name>". With
+    run_every the fragment also reruns itself every run_every seconds. Falls back
+    to plain calls when WTF_FRAGMENTS=0 or Streamlit has no fragment support.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def section(*args, **kwargs):
+            record = TRACER.current()
+            if record is not None:
+                st.session_state[_PAGE_KEY] = (record['page'], record['user_id'])
+                with TRACER.span(name, 'fragment'):
+                    return fn(*args, **kwargs)
+            page, user_id = st.session_state.get(_PAGE_KEY, ('unknown', ''))
+            with TRACER.rerun(page=f"{page} / {name}", user_id=user_id, kind='fragment'):
+                return fn(*args, **kwargs)
+
+        st_fragment = _st_fragment()
+        if st_fragment is None:
+            return section
+        return st_fragment(section, run_every=run_every) if run_every else st_fragment(section)
+    return decorator
+
+
+def cached_figure(name: str, data: Any, build: Callable):
+    """Figure from build(), reused while `data` hashes the same (shared cache, see wtf_figures)"""
+    from wtf_figures import FIGURES  # numpy-backed; loaded with the first figure, not with the app
+    return FIGURES.figure(name, data, build)
+
+
+# Rerun log comparison
+def load_rerun_log(path: str) -> List[Dict]:
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_reruns(reruns: List[Dict]) -> Dict[str, Dict]:
+    """Wall time per page, counting a section's fragment reruns under its page"""
+    pages = {}
+    for rerun in reruns:
+        pages.setdefault(rerun['page'].split(' / ')[0], []).append(rerun)
+
+    summary = {}
+    for page, items in pages.items():
+        durations = [r['duration_ms'] for r in items]
+        summary[page] = {
+            'reruns': len(items),
+            'fragment_reruns': sum(1 for r in items if r.get('kind') == 'fragment'),
+            'mean_ms': round(sum(durations) / len(durations), 2),
+            'p50_ms': round(_percentile(durations, 50), 2),
+            'p90_ms': round(_percentile(durations, 90), 2)
+        }
+    return summary
+
+
+def compare_logs(before_path: str, after_path: str) -> List[Dict]:
+    before = summarize_reruns(load_rerun_log(before_path))
+    after = summarize_reruns(load_rerun_log(after_path))
+    rows = []
+    for page in sorted(set(before) | set(after)):
+        b, a = before.get(page, {}), after.get(page, {})
+        row = {'page': page, 'before_reruns': b.get('reruns', 0), 'after_reruns': a.get('reruns', 0),
+               'after_fragment_reruns': a.get('fragment_reruns', 0),
+               'before_p50_ms': b.get('p50_ms'), 'after_p50_ms': a.get('p50_ms'),
+               'before_mean_ms': b.get('mean_ms'), 'after_mean_ms': a.get('mean_ms')}
+        if b.get('mean_ms') and a.get('mean_ms'):
+            row['speedup'] = round(b['mean_ms'] / a['mean_ms'], 2)
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rerun wall time per page from WTF_RERUN_LOG files')
+    sub = parser.add_subparsers(dest='command', required=True)
+    summary_cmd = sub.add_parser('summary', help='Summarize one rerun log')
+    summary_cmd.add_argument('log')
+    compare_cmd = sub.add_parser('compare', help='Compare a log without fragments to one with them')
+    compare_cmd.add_argument('before')
+    compare_cmd.add_argument('after')
+    args = parser.parse_args()
+
+    if args.command == 'summary':
+        print(json.dumps(summarize_reruns(load_rerun_log(args.log)), indent=2))
+    else:
+        print(json.dumps(compare_logs(args.before, args.after), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+"""
+WTF Instrumentation - Span timings, query counts and rows returned per rerun
+
+Each Streamlit script run is wrapped in ``TRACER.rerun(...)``; spans recorded
+while it is active (page renderers, service calls, analysis math, SQL) are
+attached to it. Finished reruns are kept in a bounded ring buffer that backs
+the admin Performance page and the Chrome trace-event export.
+
+Partial reruns of a page section (Streamlit fragments) are recorded as reruns
+of kind 'fragment'. Setting WTF_RERUN_LOG appends one JSON line per finished
+rerun, so wall time per interaction can be compared across runs of the app.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+_TRACED_ATTR = '__wtf_traced__'
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _sql_label(sql: str) -> str:
+    """Collapse whitespace so the same statement always gets the same span name"""
+    return ' '.join(sql.split())[:120]
+
+
+class Tracer:
+    """Records spans for the active rerun and keeps the last `capacity` reruns"""
+
+    def __init__(self, capacity: int = 200, max_spans: int = 5000, log_path: Optional[str] = None):
+        self.capacity = capacity
+        self.max_spans = max_spans
+        self.log_path = log_path
+        self.reruns = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._active = contextvars.ContextVar('wtf_active_rerun', default=None)
+        self._origin = time.perf_counter()
+
+    # Rerun lifecycle
+    @contextmanager
+    def rerun(self, page: str = '', user_id: str = '', kind: str = 'full'):
+        """Collect every span recorded inside the block into one rerun record"""
+        record = {
+            'id': str(uuid.uuid4()),
+            'page': page,
+            'kind': kind,
+            'user_id': user_id,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'start': time.perf_counter(),
+            'duration_ms': 0.0,
+            'queries': 0,
+            'rows': 0,
+            'query_ms': 0.0,
+            'dropped_spans': 0,
+            'thread': threading.get_ident(),
+            'spans': [],
+            '_depth': 0
+        }
+        token = self._active.set(record)
+        try:
+            yield record
+        finally:
+            self._active.reset(token)
+            record['duration_ms'] = (time.perf_counter() - record['start']) * 1000
+            record.pop('_depth', None)
+            with self._lock:
+                self.reruns.append(record)
+                if self.log_path:
+                    self._log(record)
+
+    def _log(self, record: Dict):
+        line = {key: record[key] for key in ('started_at', 'page', 'kind', 'user_id', 'queries', 'rows')}
+        line['duration_ms'] = round(record['duration_ms'], 3)
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(line) + '\n')
+        except OSError:
+            self.log_path = None
+
+    def current(self) -> Optional[Dict]:
+        return self._active.get()
+
+    def set_page(self, page: str, user_id: str = None):
+        """Label the active rerun once routing has picked a page"""
+        record = self._active.get()
+        if record is not None:
+            record['page'] = page
+            if user_id is not None:
+                record['user_id'] = user_id
+
+    # Spans
+    def _open(self, record: Dict, name: str, category: str, args: Dict) -> Dict:
+        span = {'name': name, 'cat': category, 'start': time.perf_counter(), 'dur_ms': 0.0,
+                'depth': record['_depth'], 'args': args}
+        record['_depth'] += 1
+        return span
+
+    def _close(self, record: Dict, span: Dict):
+        span['dur_ms'] = (time.perf_counter() - span['start']) * 1000
+        record['_depth'] -= 1
+        self._append(record, span)
+
+    def _append(self, record: Dict, span: Dict):
+        if len(record['spans']) < self.max_spans:
+            record['spans'].append(span)
+        else:
+            record['dropped_spans'] += 1
+
+    def add_span(self, name: str, category: str, start: float, dur_ms: float, **args):
+        """Record a block timed elsewhere (a pool worker) as a child of the current span"""
+        record = self._active.get()
+        if record is not None:
+            self._append(record, {'name': name, 'cat': category, 'start': start, 'dur_ms': dur_ms,
+                                  'depth': record['_depth'], 'args': args})
+
+    @contextmanager
+    def span(self, name: str, category: str = 'app', **args):
+        """Time a block; a no-op outside of a rerun"""
+        record = self._active.get()
+        if record is None:
+            yield None
+            return
+        span = self._open(record, name, category, args)
+        try:
+            yield span
+        finally:
+            self._close(record, span)
+
+    def traced(self, name: str = None, category: str = 'app') -> Callable:
+        """Decorator form of span()"""
+        def decorator(fn):
+            if getattr(fn, _TRACED_ATTR, False):
+                return fn
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                record = self._active.get()
+                if record is None:
+                    return fn(*args, **kwargs)
+                span = self._open(record, label, category, {})
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._close(record, span)
+
+            setattr(wrapper, _TRACED_ATTR, True)
+            return wrapper
+        return decorator
+
+    def instrument_class(self, cls, category: str = 'service'):
+        """Trace every public method defined on cls; safe to call repeatedly"""
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_'):
+                continue
+            name = f"{cls.__name__}.{attr}"
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(self.traced(name, category)(value.__func__)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attr, classmethod(self.traced(name, category)(value.__func__)))
+            elif inspect.isfunction(value):
+                setattr(cls, attr, self.traced(name, category)(value))
+        return cls
+
+    def instrument_functions(self, namespace: Dict, prefix: str = 'render_', category: str = 'render'):
+        """Trace every function in namespace (usually globals()) whose name starts with prefix"""
+        for attr, value in list(namespace.items()):
+            if attr.startswith(prefix) and inspect.isfunction(value):
+                namespace[attr] = self.traced(attr, category)(value)
+
+    # Queries
+    def record_query(self, sql: str, duration: float, start: float) -> Optional[Dict]:
+        """Attach a finished statement to the active rerun; returns the span so rows can be added"""
+        record = self._active.get()
+        if record is None:
+            return None
+        span = {'name': _sql_label(sql), 'cat': 'db', 'start': start, 'dur_ms': duration * 1000,
+                'depth': record['_depth'], 'args': {'rows': 0}}
+        record['queries'] += 1
+        record['query_ms'] += duration * 1000
+        if len(record['spans']) < self.max_spans:
+            record['spans'].append(span)
+        else:
+            record['dropped_spans'] += 1
+        return span
+
+    def record_rows(self, span: Optional[Dict], rows: int):
+        record = self._active.get()
+        if record is None or not rows:
+            return
+        record['rows'] += rows
+        if span is not None:
+            span['args']['rows'] += rows
+
+    # Reporting
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return list(self.reruns)
+
+    def clear(self):
+        with self._lock:
+            self.reruns.clear()
+
+    def page_summary(self) -> List[Dict]:
+        """Per-page rerun latency, query count and rows returned (full and fragment reruns apart)"""
+        pages = {}
+        for rerun in self.snapshot():
+            pages.setdefault((rerun['page'] or 'unknown', rerun.get('kind', 'full')), []).append(rerun)
+
+        summary = []
+        for (page, kind), reruns in pages.items():
+            durations = [r['duration_ms'] for r in reruns]
+            summary.append({
+                'page': page,
+                'kind': kind,
+                'reruns': len(reruns),
+                'mean_ms': round(sum(durations) / len(durations), 2),
+                'p90_ms': round(_percentile(durations, 90), 2),
+                'max_ms': round(max(durations), 2),
+                'avg_queries': round(sum(r['queries'] for r in reruns) / len(reruns), 1),
+                'avg_rows': round(sum(r['rows'] for r in reruns) / len(reruns), 1),
+                'avg_query_ms': round(sum(r['query_ms'] for r in reruns) / len(reruns), 2)
+            })
+        return sorted(summary, key=lambda s: s['mean_ms'], reverse=True)
+
+    def span_summary(self, category: str = None, limit: int = 25) -> List[Dict]:
+        """Aggregate spans by name across the buffer, slowest total time first"""
+        spans = {}
+        for rerun in self.snapshot():
+            for span in rerun['spans']:
+                if category and span['cat'] != category:
+                    continue
+                spans.setdefault((span['cat'], span['name']), []).append(span)
+
+        summary = []
+        for (cat, name), items in spans.items():
+            durations = [s['dur_ms'] for s in items]
+            summary.append({
+                'category': cat,
+                'name': name,
+                'calls': len(items),
+                'total_ms': round(sum(durations), 2),
+                'mean_ms': round(sum(durations) / len(durations), 3),
+                'p90_ms': round(_percentile(durations, 90), 3),
+                'rows': sum(s['args'].get('rows', 0) for s in items)
+            })
+        return sorted(summary, key=lambda s: s['total_ms'], reverse=True)[:limit]
+
+    def to_chrome_trace(self, reruns: List[Dict] = None) -> Dict:
+        """Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope)"""
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 0, 'args': {'name': 'wtf'}}]
+        for rerun in (reruns if reruns is not None else self.snapshot()):
+            tid = rerun['thread']
+            events.append({
+                'name': f"rerun:{rerun['page'] or 'unknown'}",
+                'cat': 'rerun',
+                'ph': 'X',
+                'ts': round((rerun['start'] - self._origin) * 1e6, 3),
+                'dur': round(rerun['duration_ms'] * 1000, 3),
+                'pid': 1,
+                'tid': tid,
+                'args': {'user_id': rerun['user_id'], 'queries': rerun['queries'], 'rows': rerun['rows'],
+                         'started_at': rerun['started_at']}
+            })
+            for span in rerun['spans']:
+                events.append({
+                    'name': span['name'],
+                    'cat': span['cat'],
+                    'ph': 'X',
+                    'ts': round((span['start'] - self._origin) * 1e6, 3),
+                    'dur': round(span['dur_ms'] * 1000, 3),
+                    'pid': 1,
+                    'tid': tid,
+                    'args': span['args']
+                })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+# Process-wide tracer; imported modules survive Streamlit reruns so the buffer does too
+TRACER = Tracer(log_path=os.environ.get('WTF_RERUN_LOG') or None)
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that reports statement time and rows fetched to TRACER"""
+
+    _span = None
+
+    def execute(self, sql, parameters=()):
+        if TRACER.current() is None:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._span = TRACER.record_query(sql, time.perf_counter() - start, start)
+
+    def executemany(self, sql, seq_of_parameters):
+        if TRACER.current() is None:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._span = TRACER.record_query(sql, time.perf_counter() - start, start)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            TRACER.record_rows(self._span, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        TRACER.record_rows(self._span, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        TRACER.record_rows(self._span, len(rows))
+        return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors are TracedCursor"""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def traced_connect(database: str, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect() with statement timing and row counting"""
+    with TRACER.span('sqlite3.connect', 'db'):
+        return sqlite3.connect(database, factory=TracedConnection, **kwargs)
@@ -0,0 +1,427 @@
+"""
+WTF Market Data - Reference market figures and the persistent market-data store
+
+Local CSV/Parquet feeds are bulk loaded into the market_data table. Analysis
+reads through MarketDataStore, which resolves zip -> city -> state -> built-in
+reference figures and keeps results in an in-memory TTL cache.
+
+    python -m wtf_market_data load feeds/market_2024_06.csv --db wtf_ultimate.db
+    python -m wtf_market_data lookup --zip 77001 --city Houston --state TX
+"""
+
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+from wtf_schema import DATABASE_PATH, create_schema
+
+logger = logging.getLogger(__name__)
+
+# Market data by state/city (union of the data service tables)
+MARKET_DATA = {
+    'tx': {
+        'houston': {'median_price': 380000, 'rent_psf': 1.1, 'appreciation': 0.042, 'tax_rate': 0.021},
+        'dallas': {'median_price': 425000, 'rent_psf': 1.2, 'appreciation': 0.045, 'tax_rate': 0.022},
+        'austin': {'median_price': 550000, 'rent_psf': 1.4, 'appreciation': 0.055, 'tax_rate': 0.019},
+        'san antonio': {'median_price': 320000, 'rent_psf': 1.0, 'appreciation': 0.038, 'tax_rate': 0.023},
+        'fort worth': {'median_price': 385000, 'rent_psf': 1.15, 'appreciation': 0.041, 'tax_rate': 0.022},
+        'plano': {'median_price': 485000, 'rent_psf': 1.3, 'appreciation': 0.048, 'tax_rate': 0.020},
+        'arlington': {'median_price': 345000, 'rent_psf': 1.1, 'appreciation': 0.039, 'tax_rate': 0.023},
+        'porter': {'median_price': 285000, 'rent_psf': 1.15, 'appreciation': 0.041, 'tax_rate': 0.022}
+    },
+    'ca': {
+        'los angeles': {'median_price': 950000, 'rent_psf': 2.8, 'appreciation': 0.065, 'tax_rate': 0.015},
+        'san francisco': {'median_price': 1350000, 'rent_psf': 3.2, 'appreciation': 0.058, 'tax_rate': 0.012},
+        'san diego': {'median_price': 825000, 'rent_psf': 2.5, 'appreciation': 0.062, 'tax_rate': 0.016},
+        'sacramento': {'median_price': 485000, 'rent_psf': 1.8, 'appreciation': 0.051, 'tax_rate': 0.017}
+    },
+    'fl': {
+        'miami': {'median_price': 485000, 'rent_psf': 1.8, 'appreciation': 0.055, 'tax_rate': 0.018},
+        'tampa': {'median_price': 365000, 'rent_psf': 1.5, 'appreciation': 0.048, 'tax_rate': 0.019},
+        'orlando': {'median_price': 325000, 'rent_psf': 1.4, 'appreciation': 0.045, 'tax_rate': 0.020},
+        'jacksonville': {'median_price': 285000, 'rent_psf': 1.2, 'appreciation': 0.041, 'tax_rate': 0.021}
+    },
+    'ny': {
+        'new york': {'median_price': 750000, 'rent_psf': 2.2, 'appreciation': 0.035, 'tax_rate': 0.028},
+        'buffalo': {'median_price': 185000, 'rent_psf': 0.9, 'appreciation': 0.025, 'tax_rate': 0.032},
+        'rochester': {'median_price': 165000, 'rent_psf': 0.85, 'appreciation': 0.028, 'tax_rate': 0.030}
+    }
+}
+
+# Leading zip code digits by state, used to build plausible zip codes
+STATE_ZIP_PREFIXES = {
+    'tx': ['750', '752', '770', '773', '787', '782', '761', '750', '760'],
+    'ca': ['900', '941', '921', '958'],
+    'fl': ['331', '336', '328', '322'],
+    'ny': ['100', '142', '146']
+}
+
+# Per-square-foot reference figures by city (RealPropertyDataService valuations)
+CITY_SQFT_DATA = {
+    # Major Texas Markets
+    'houston': {'median_sqft_price': 150, 'rent_per_sqft': 1.2, 'appreciation': 0.05},
+    'dallas': {'median_sqft_price': 160, 'rent_per_sqft': 1.3, 'appreciation': 0.06},
+    'austin': {'median_sqft_price': 280, 'rent_per_sqft': 1.8, 'appreciation': 0.08},
+    'san antonio': {'median_sqft_price': 140, 'rent_per_sqft': 1.1, 'appreciation': 0.04},
+    'fort worth': {'median_sqft_price': 155, 'rent_per_sqft': 1.25, 'appreciation': 0.055},
+    'porter': {'median_sqft_price': 145, 'rent_per_sqft': 1.15, 'appreciation': 0.045},
+
+    # Major National Markets
+    'phoenix': {'median_sqft_price': 200, 'rent_per_sqft': 1.4, 'appreciation': 0.07},
+    'atlanta': {'median_sqft_price': 170, 'rent_per_sqft': 1.2, 'appreciation': 0.06},
+    'tampa': {'median_sqft_price': 190, 'rent_per_sqft': 1.35, 'appreciation': 0.065},
+    'charlotte': {'median_sqft_price': 180, 'rent_per_sqft': 1.25, 'appreciation': 0.055},
+    'nashville': {'median_sqft_price': 220, 'rent_per_sqft': 1.5, 'appreciation': 0.07},
+    'denver': {'median_sqft_price': 250, 'rent_per_sqft': 1.6, 'appreciation': 0.06},
+    'las vegas': {'median_sqft_price': 180, 'rent_per_sqft': 1.3, 'appreciation': 0.065}
+}
+
+# Numeric metrics stored per market_data row
+MARKET_METRICS = [
+    'median_home_price', 'median_rent', 'days_on_market', 'price_per_sqft', 'inventory_months',
+    'price_growth_yoy', 'rent_growth_yoy', 'cap_rate', 'vacancy_rate', 'population_growth',
+    'job_growth', 'crime_index', 'school_ratings', 'foreclosure_rate', 'new_construction', 'flip_activity'
+]
+
+# National figures for metrics that neither the feeds nor the reference tables cover
+NATIONAL_DEFAULTS = {
+    'days_on_market': 35.0,
+    'inventory_months': 3.5,
+    'rent_growth_yoy': 4.0,
+    'vacancy_rate': 6.0,
+    'population_growth': 1.5,
+    'job_growth': 2.0,
+    'crime_index': 50.0,
+    'school_ratings': 7.0,
+    'foreclosure_rate': 0.8,
+    'new_construction': 150.0,
+    'flip_activity': 80.0
+}
+
+# Typical single-family size used to turn per-sqft reference rents into monthly rents
+REFERENCE_SQFT = 1800
+
+
+# USPS codes by full state name; normalize_state accepts either form
+STATE_CODES = {
+    'alabama': 'al', 'alaska': 'ak', 'arizona': 'az', 'arkansas': 'ar', 'california': 'ca',
+    'colorado': 'co', 'connecticut': 'ct', 'delaware': 'de', 'district of columbia': 'dc',
+    'florida': 'fl', 'georgia': 'ga', 'hawaii': 'hi', 'idaho': 'id', 'illinois': 'il',
+    'indiana': 'in', 'iowa': 'ia', 'kansas': 'ks', 'kentucky': 'ky', 'louisiana': 'la',
+    'maine': 'me', 'maryland': 'md', 'massachusetts': 'ma', 'michigan': 'mi', 'minnesota': 'mn',
+    'mississippi': 'ms', 'missouri': 'mo', 'montana': 'mt', 'nebraska': 'ne', 'nevada': 'nv',
+    'new hampshire': 'nh', 'new jersey': 'nj', 'new mexico': 'nm', 'new york': 'ny',
+    'north carolina': 'nc', 'north dakota': 'nd', 'ohio': 'oh', 'oklahoma': 'ok', 'oregon': 'or',
+    'pennsylvania': 'pa', 'rhode island': 'ri', 'south carolina': 'sc', 'south dakota': 'sd',
+    'tennessee': 'tn', 'texas': 'tx', 'utah': 'ut', 'vermont': 'vt', 'virginia': 'va',
+    'washington': 'wa', 'west virginia': 'wv', 'wisconsin': 'wi', 'wyoming': 'wy'
+}
+VALID_STATE_CODES = frozenset(STATE_CODES.values())
+
+
+def normalize_state(state) -> str:
+    """Lowercase USPS code for a code or full state name; '' when it is neither"""
+    name = ' '.join(str(state or '').replace('.', '').lower().split())
+    if name in VALID_STATE_CODES:
+        return name
+    return STATE_CODES.get(name, '')
+
+
+def normalize_city(city) -> str:
+    return ' '.join(str(city or '').replace(',', ' ').lower().split())
+
+
+def normalize_zip(zip_code) -> str:
+    digits = ''.join(ch for ch in str(zip_code or '') if ch.isdigit())
+    return digits[:5].zfill(5) if digits else ''
+
+
+def describe_market(metrics: Dict) -> Dict:
+    """Qualitative labels derived from the numeric metrics"""
+    inventory = metrics['inventory_months']
+    vacancy = metrics['vacancy_rate']
+    cap_rate = metrics['cap_rate']
+    return {
+        'market_temperature': ('Hot' if inventory < 2 else 'Warm' if inventory < 3 else
+                               'Balanced' if inventory < 5 else 'Cool' if inventory < 6.5 else 'Cold'),
+        'rental_demand': 'Very High' if vacancy < 4 else 'High' if vacancy < 7 else 'Medium' if vacancy < 10 else 'Low',
+        'investor_activity': ('Very High' if cap_rate > 8 else 'High' if cap_rate > 6.5 else
+                              'Medium' if cap_rate > 5 else 'Low')
+    }
+
+
+def reference_metrics(city_data: Dict) -> Dict:
+    """Metric set for a MARKET_DATA city entry"""
+    median_price = city_data['median_price']
+    median_rent = city_data['rent_psf'] * REFERENCE_SQFT
+    metrics = dict(NATIONAL_DEFAULTS)
+    metrics.update({
+        'median_home_price': float(median_price),
+        'median_rent': round(median_rent, 2),
+        'price_per_sqft': round(median_price / REFERENCE_SQFT, 2),
+        'price_growth_yoy': round(city_data['appreciation'] * 100, 2),
+        # Gross yield less ~40% operating expenses
+        'cap_rate': round(median_rent * 12 * 0.6 / median_price * 100, 2)
+    })
+    return metrics
+
+
+def _average(rows: List[Dict]) -> Dict:
+    averaged = {}
+    for metric in MARKET_METRICS:
+        values = [row[metric] for row in rows if row.get(metric) is not None]
+        averaged[metric] = sum(values) / len(values) if values else None
+    return averaged
+
+
+def _row_id(zip_code: str, city: str, state: str, data_date: str) -> str:
+    return hashlib.sha1(f"{zip_code}|{city}|{state}|{data_date}".encode()).hexdigest()
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value == value else None  # NaN from Parquet
+    text = str(value).strip().replace(',', '').replace('$', '').replace('%', '')
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def read_feed(path: str) -> Iterator[Dict]:
+    """Yield raw rows from a CSV or Parquet feed"""
+    if path.lower().endswith(('.parquet', '.pq')):
+        # Parquet needs pandas + pyarrow; CSV feeds have no extra dependencies
+        import pandas as pd
+        for record in pd.read_parquet(path).to_dict('records'):
+            yield record
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for record in csv.DictReader(f):
+                yield record
+
+
+def load_market_feed(path: str, db_path: str = DATABASE_PATH, batch_size: int = 5000,
+                     default_date: str = None) -> Dict:
+    """Bulk upsert a feed into market_data; rows are keyed by zip/city/state/date"""
+    default_date = default_date or time.strftime('%Y-%m-%d')
+    columns = ['id', 'zip_code', 'city', 'state'] + MARKET_METRICS + ['data_date']
+    sql = (f"INSERT OR REPLACE INTO market_data ({', '.join(columns)}) "
+           f"VALUES ({', '.join('?' for _ in columns)})")
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    create_schema(cursor)
+
+    start = time.perf_counter()
+    loaded = skipped = 0
+    batch = []
+    for record in read_feed(path):
+        record = {str(k).strip().lower(): v for k, v in record.items()}
+        state = normalize_state(record.get('state'))
+        if not state:
+            skipped += 1
+            continue
+        zip_code = normalize_zip(record.get('zip_code') or record.get('zip'))
+        city = normalize_city(record.get('city'))
+        data_date = str(record.get('data_date') or record.get('date') or default_date)[:10]
+
+        batch.append([_row_id(zip_code, city, state, data_date), zip_code, city, state] +
+                     [_to_float(record.get(metric)) for metric in MARKET_METRICS] + [data_date])
+        if len(batch) >= batch_size:
+            cursor.executemany(sql, batch)
+            loaded += len(batch)
+            batch = []
+
+    if batch:
+        cursor.executemany(sql, batch)
+        loaded += len(batch)
+
+    conn.commit()
+    cursor.execute('ANALYZE market_data')
+    conn.close()
+
+    seconds = time.perf_counter() - start
+    logger.info(f"Loaded {loaded} market rows from {path} in {seconds:.2f}s ({skipped} skipped)")
+    return {'loaded': loaded, 'skipped': skipped, 'seconds': round(seconds, 3)}
+
+
+class MarketDataStore:
+    """Read-through market metrics with zip -> city -> state -> reference fallback"""
+
+    def __init__(self, db_path: str = DATABASE_PATH, ttl_seconds: float = 3600, max_entries: int = 20000):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'db_queries': 0}
+
+    # Cache
+    def _cached(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return True, entry[1]
+            self.stats['misses'] += 1
+            return False, None
+
+    def _store(self, key, value):
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def invalidate(self):
+        """Drop cached lookups, e.g. after loading a new feed"""
+        with self._lock:
+            self._cache.clear()
+
+    # Levels
+    def _query_latest(self, where: str, params: tuple) -> Optional[Dict]:
+        """Average of the most recent rows matching where, or None"""
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {', '.join(MARKET_METRICS)}, data_date FROM market_data
+                WHERE {where} AND data_date = (SELECT MAX(data_date) FROM market_data WHERE {where})
+            """, params + params)
+            rows = cursor.fetchall()
+            conn.close()
+            self.stats['db_queries'] += 1
+        except sqlite3.Error as e:
+            logger.warning(f"Market data lookup failed: {str(e)}")
+            return None
+
+        if not rows:
+            return None
+        averaged = _average([dict(zip(MARKET_METRICS, row[:-1])) for row in rows])
+        averaged['data_date'] = rows[0][-1]
+        return averaged
+
+    @staticmethod
+    def _reference(city: str, state: str) -> Dict:
+        state_data = MARKET_DATA.get(state, {})
+        if city in state_data:
+            return dict(reference_metrics(state_data[city]), data_date=None)
+        cities = list(state_data.values()) or [c for s in MARKET_DATA.values() for c in s.values()]
+        return dict(_average([reference_metrics(c) for c in cities]), data_date=None)
+
+    def _level(self, level: str, zip_code: str, city: str, state: str) -> Optional[Dict]:
+        key = (level, zip_code, city, state)
+        found, value = self._cached(key)
+        if found:
+            return value
+
+        if level == 'zip':
+            value = self._query_latest('zip_code = ?', (zip_code,))
+        elif level == 'city':
+            value = self._query_latest('state = ? AND city = ?', (state, city))
+        elif level == 'state':
+            value = self._query_latest('state = ?', (state,))
+        else:
+            value = self._reference(city, state)
+
+        # Misses are cached too, so uncovered areas don't query the database every time
+        self._store(key, value)
+        return value
+
+    # Public API
+    def get_market_data(self, zip_code: str = '', city: str = '', state: str = '') -> Dict:
+        """Metrics from the most specific level with data; gaps are filled from broader levels"""
+        zip_code, city, state = normalize_zip(zip_code), normalize_city(city), normalize_state(state)
+        key = ('resolved', zip_code, city, state)
+        found, value = self._cached(key)
+        if found:
+            return dict(value)
+
+        levels = (['zip'] if zip_code else []) + (['city'] if city and state else []) + \
+                 (['state'] if state else []) + ['reference']
+
+        resolved = {}
+        resolution = data_date = None
+        for level in levels:
+            metrics = self._level(level, zip_code, city, state)
+            if not metrics:
+                continue
+            if resolution is None:
+                resolution, data_date = level, metrics.get('data_date')
+            for metric in MARKET_METRICS:
+                if resolved.get(metric) is None and metrics.get(metric) is not None:
+                    resolved[metric] = metrics[metric]
+            if all(resolved.get(metric) is not None for metric in MARKET_METRICS):
+                break
+
+        for metric, default in NATIONAL_DEFAULTS.items():
+            if resolved.get(metric) is None:
+                resolved[metric] = default
+        for metric in ('new_construction', 'flip_activity'):
+            resolved[metric] = int(round(resolved[metric]))
+
+        resolved.update(describe_market(resolved))
+        resolved['resolution'] = resolution
+        resolved['data_date'] = data_date
+
+        self._store(key, resolved)
+        return dict(resolved)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_market_store(db_path: str = DATABASE_PATH) -> MarketDataStore:
+    """Process-wide store for db_path, created on first use"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None or _default_store.db_path != db_path:
+            _default_store = MarketDataStore(db_path)
+        return _default_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WTF market data feeds')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    load = subparsers.add_parser('load', help='Bulk load CSV/Parquet feeds into market_data')
+    load.add_argument('paths', nargs='+')
+    load.add_argument('--db', default=DATABASE_PATH)
+    load.add_argument('--date', default=None, help='data_date for rows without one (YYYY-MM-DD)')
+
+    lookup = subparsers.add_parser('lookup', help='Resolve metrics for a location')
+    lookup.add_argument('--db', default=DATABASE_PATH)
+    lookup.add_argument('--zip', default='')
+    lookup.add_argument('--city', default='')
+    lookup.add_argument('--state', default='')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'load':
+        for path in args.paths:
+            print(path, load_market_feed(path, args.db, default_date=args.date))
+    else:
+        metrics = MarketDataStore(args.db).get_market_data(args.zip, args.city, args.state)
+        for name, value in metrics.items():
+            print(f"{name:>20}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,405 @@
+"""
+WTF PDF Reports - Pure-Python PDF rendering for deal analysis reports
+Reports are built on a worker pool and cached by a hash of their inputs,
+so re-downloading an unchanged analysis never re-renders it.
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+PAGE_WIDTH = 612   # US Letter, points
+PAGE_HEIGHT = 792
+MARGIN = 54
+
+# Brand colors (RGB 0-1) matching the app theme
+COLORS = {
+    'purple': (0.545, 0.361, 0.965),
+    'green': (0.063, 0.725, 0.506),
+    'amber': (0.961, 0.620, 0.043),
+    'red': (0.937, 0.267, 0.267),
+    'gray': (0.420, 0.447, 0.502),
+    'light': (0.953, 0.957, 0.965),
+    'text': (0.067, 0.094, 0.153),
+    'white': (1, 1, 1)
+}
+
+GRADE_COLORS = {'A': 'green', 'B': 'purple', 'C': 'amber', 'D': 'red'}
+
+
+def _escape(text: str) -> bytes:
+    """Encode text for a PDF string literal using WinAnsi (cp1252)"""
+    raw = str(text).encode('cp1252', errors='replace')
+    return raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _text_width(text: str, size: float) -> float:
+    # Helvetica averages roughly half an em per glyph; good enough for wrapping
+    return len(text) * size * 0.5
+
+
+def _wrap(text: str, size: float, width: float) -> List[str]:
+    max_chars = max(10, int(width / (size * 0.5)))
+    lines = []
+    for paragraph in str(text).split('\n'):
+        words = paragraph.split()
+        line = ''
+        for word in words:
+            candidate = f"{line} {word}" if line else word
+            if len(candidate) > max_chars and line:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+class PDFDocument:
+    """Minimal PDF writer: Helvetica text, lines and filled rectangles"""
+
+    def __init__(self, title: str = ''):
+        self.title = title
+        self.pages: List[List[bytes]] = []
+        self.y = 0
+        self.new_page()
+
+    # Page & drawing primitives
+    def new_page(self):
+        self.pages.append([])
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _ops(self) -> List[bytes]:
+        return self.pages[-1]
+
+    def ensure_space(self, height: float):
+        if self.y - height < MARGIN:
+            self.new_page()
+
+    def text(self, x: float, y: float, text: str, size: float = 10, bold: bool = False,
+             color: Tuple = COLORS['text']):
+        font = b'/F2' if bold else b'/F1'
+        self._ops().append(
+            b'BT %.3f %.3f %.3f rg %s %.1f Tf %.2f %.2f Td (%s) Tj ET' % (
+                color[0], color[1], color[2], font, size, x, y, _escape(text)))
+
+    def rect(self, x: float, y: float, w: float, h: float, color: Tuple):
+        self._ops().append(b'%.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f' % (
+            color[0], color[1], color[2], x, y, w, h))
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, color: Tuple = COLORS['gray'],
+             width: float = 0.5):
+        self._ops().append(b'%.3f %.3f %.3f RG %.2f w %.2f %.2f m %.2f %.2f l S' % (
+            color[0], color[1], color[2], width, x1, y1, x2, y2))
+
+    # Flow layout helpers
+    def heading(self, text: str, color: str = 'purple'):
+        self.ensure_space(34)
+        self.y -= 10
+        self.rect(MARGIN, self.y - 6, PAGE_WIDTH - 2 * MARGIN, 22, COLORS[color])
+        self.text(MARGIN + 8, self.y, text, size=12, bold=True, color=COLORS['white'])
+        self.y -= 26
+
+    def paragraph(self, text: str, size: float = 10, bold: bool = False, color: str = 'text',
+                  indent: float = 0):
+        leading = size * 1.35
+        for line in _wrap(text, size, PAGE_WIDTH - 2 * MARGIN - indent):
+            self.ensure_space(leading)
+            self.text(MARGIN + indent, self.y, line, size=size, bold=bold, color=COLORS[color])
+            self.y -= leading
+
+    def key_values(self, rows: List[Tuple[str, str]], columns: int = 2):
+        col_width = (PAGE_WIDTH - 2 * MARGIN) / columns
+        for start in range(0, len(rows), columns):
+            self.ensure_space(16)
+            for offset, (label, value) in enumerate(rows[start:start + columns]):
+                x = MARGIN + offset * col_width
+                self.text(x, self.y, label, size=9, color=COLORS['gray'])
+                self.text(x + col_width * 0.45, self.y, value, size=10, bold=True)
+            self.y -= 16
+
+    def table(self, headers: List[str], rows: List[List[str]]):
+        col_width = (PAGE_WIDTH - 2 * MARGIN) / len(headers)
+        self.ensure_space(20)
+        self.rect(MARGIN, self.y - 5, PAGE_WIDTH - 2 * MARGIN, 18, COLORS['light'])
+        for i, header in enumerate(headers):
+            self.text(MARGIN + 4 + i * col_width, self.y, header, size=9, bold=True)
+        self.y -= 18
+        for row in rows:
+            self.ensure_space(15)
+            for i, cell in enumerate(row):
+                self.text(MARGIN + 4 + i * col_width, self.y, cell, size=9)
+            self.line(MARGIN, self.y - 4, PAGE_WIDTH - MARGIN, self.y - 4, COLORS['light'])
+            self.y -= 15
+        self.y -= 6
+
+    def spacer(self, height: float = 8):
+        self.y -= height
+
+    # Serialization
+    def to_bytes(self) -> bytes:
+        objects: List[bytes] = []
+
+        def add(body: bytes) -> int:
+            objects.append(body)
+            return len(objects)
+
+        catalog_id = add(b'')  # placeholder, filled once pages id is known
+        pages_id = add(b'')
+        font_regular = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                           b'/Encoding /WinAnsiEncoding >>')
+        font_bold = add(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+                        b'/Encoding /WinAnsiEncoding >>')
+
+        page_ids = []
+        total = len(self.pages)
+        for number, ops in enumerate(self.pages, start=1):
+            footer = b'BT 0.420 0.447 0.502 rg /F1 8 Tf %.2f %.2f Td (%s) Tj ET' % (
+                MARGIN, MARGIN / 2, _escape(f"WTF Platform - Deal Analysis Report | Page {number} of {total}"))
+            stream = zlib.compress(b'\n'.join(ops + [footer]))
+            content_id = add(b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (
+                len(stream), stream))
+            page_ids.append(add(
+                b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+                b'/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>' % (
+                    pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_regular, font_bold, content_id)))
+
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+        objects[pages_id - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+        objects[catalog_id - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % pages_id
+        info_id = add(b'<< /Title (%s) /Producer (WTF Platform) /CreationDate (D:%s) >>' % (
+            _escape(self.title), datetime.now().strftime('%Y%m%d%H%M%S').encode()))
+
+        output = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+
+        xref_offset = len(output)
+        output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            output += b'%010d 00000 n \n' % offset
+        output += b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            len(objects) + 1, catalog_id, info_id, xref_offset)
+        return bytes(output)
+
+
+def _money(value) -> str:
+    try:
+        return f"${float(value):,.0f}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _pct(value) -> str:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return 'Infinite' if value == float('inf') else f"{value:.1f}%"
+
+
+def render_analysis_report(property_data: Dict, metrics: Dict, strategies: Dict,
+                           market_data: Dict, ai_insights: List[Dict]) -> bytes:
+    """Render the complete deal analysis report as PDF bytes"""
+    address = f"{property_data['address']}, {property_data['city']}, {property_data['state']}"
+    pdf = PDFDocument(title=f"Deal Analysis - {address}")
+
+    # Title block
+    pdf.rect(0, PAGE_HEIGHT - 110, PAGE_WIDTH, 110, COLORS['purple'])
+    pdf.text(MARGIN, PAGE_HEIGHT - 60, 'WTF PLATFORM', size=22, bold=True, color=COLORS['white'])
+    pdf.text(MARGIN, PAGE_HEIGHT - 82, 'Comprehensive Deal Analysis Report', size=13, color=COLORS['white'])
+    pdf.text(MARGIN, PAGE_HEIGHT - 100, address, size=10, color=COLORS['white'])
+
+    grade = metrics['overall_grade']
+    grade_color = COLORS[GRADE_COLORS.get(grade, 'gray')]
+    pdf.rect(PAGE_WIDTH - MARGIN - 70, PAGE_HEIGHT - 98, 70, 70, grade_color)
+    pdf.text(PAGE_WIDTH - MARGIN - 47, PAGE_HEIGHT - 72, grade, size=34, bold=True, color=COLORS['white'])
+    pdf.text(PAGE_WIDTH - MARGIN - 52, PAGE_HEIGHT - 92, f"{metrics['grade_score']}/100", size=9,
+             color=COLORS['white'])
+    pdf.y = PAGE_HEIGHT - 130
+
+    pdf.heading('PROPERTY INFORMATION')
+    pdf.key_values([
+        ('Property Type', property_data['property_type'].replace('_', ' ').title()),
+        ('List Price', _money(property_data['list_price'])),
+        ('Bedrooms', str(property_data['bedrooms'])),
+        ('Bathrooms', str(property_data['bathrooms'])),
+        ('Square Feet', f"{property_data['square_feet']:,}"),
+        ('Year Built', str(property_data['year_built']))
+    ])
+
+    pdf.heading('ANALYSIS SUMMARY')
+    pdf.key_values([
+        ('Overall Grade', f"{grade} ({metrics['grade_score']}/100)"),
+        ('Confidence Level', f"{metrics['confidence_level']}%"),
+        ('ARV', _money(metrics['arv'])),
+        ('Rehab Cost', _money(metrics['rehab_cost'])),
+        ('Max Offer (70%)', _money(metrics['max_offers']['70_percent'])),
+        ('Profit Potential', _money(metrics['profit_potential']))
+    ])
+    pdf.paragraph(f"Recommended Strategy: {metrics['recommended_strategy']}", bold=True)
+
+    pdf.heading('MAX OFFER BY RULE', color='green')
+    pdf.table(['Rule', 'Max Offer', 'Spread to ARV'], [
+        [rule.replace('_percent', '%'), _money(offer), _money(metrics['arv'] - offer)]
+        for rule, offer in metrics['max_offers'].items()
+    ])
+
+    pdf.heading('INVESTMENT STRATEGIES', color='green')
+    wholesale = strategies['wholesale']['best_scenario']
+    fix_flip = strategies['fix_flip']['best_scenario']
+    buy_hold = strategies['buy_hold']['best_scenario']
+    rows = [
+        ['Wholesale', f"Fee {_money(wholesale['assignment_fee'])}", _money(wholesale['net_profit']),
+         _pct(wholesale['roi'])],
+        ['Fix & Flip', fix_flip['timeline'], _money(fix_flip['gross_profit']), _pct(fix_flip['roi'])],
+        ['Buy & Hold', f"{_money(buy_hold['monthly_cash_flow'])}/mo", f"Cap {_pct(buy_hold['cap_rate'])}",
+         _pct(buy_hold['cash_on_cash'])]
+    ]
+    if 'brrrr' in strategies:
+        brrrr = strategies['brrrr']['best_scenario']
+        rows.append(['BRRRR', f"{_pct(brrrr['recovery_percentage'])} recovered",
+                     f"{_money(brrrr['monthly_cash_flow'])}/mo", _pct(brrrr['cash_on_cash'])])
+    pdf.table(['Strategy', 'Terms', 'Profit / Cash Flow', 'Return'], rows)
+
+    pdf.heading('MARKET ANALYSIS', color='amber')
+    pdf.key_values([
+        ('Median Home Price', _money(market_data['median_home_price'])),
+        ('Days on Market', str(market_data['days_on_market'])),
+        ('Price Growth YoY', f"{market_data['price_growth_yoy']:+.1f}%"),
+        ('Market Temperature', str(market_data['market_temperature']))
+    ])
+
+    if ai_insights:
+        pdf.heading('AI INSIGHTS')
+        for insight in ai_insights:
+            pdf.ensure_space(50)
+            pdf.paragraph(f"{insight['type'].upper()}: {insight['title']} ({insight['confidence']}% confidence)",
+                          bold=True)
+            pdf.paragraph(insight['description'], size=9, indent=10)
+            pdf.paragraph(f"Action: {insight['action']}", size=9, color='green', indent=10)
+            pdf.spacer(4)
+
+    pdf.heading('DISCLAIMER', color='amber')
+    pdf.paragraph(
+        "This analysis is for informational purposes only and should not be considered as investment "
+        "advice. Property values, market conditions, and investment returns can vary significantly. "
+        "Always conduct your own due diligence and consult with qualified professionals before making "
+        "investment decisions.", size=8, color='gray')
+    pdf.paragraph(
+        f"Report generated by WTF Platform on {datetime.now().strftime('%Y-%m-%d at %H:%M')} | "
+        f"Data sources: {', '.join(property_data.get('data_sources', ['Estimates']))}",
+        size=8, color='gray')
+
+    return pdf.to_bytes()
+
+
+def report_cache_key(property_data: Dict, metrics: Dict, strategies: Dict,
+                     market_data: Dict = None, ai_insights: List[Dict] = None) -> str:
+    """Content hash of everything that ends up in the report"""
+    payload = json.dumps([property_data, metrics, strategies, market_data, ai_insights],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportService:
+    """Renders PDF reports on a worker pool with a content-addressed cache"""
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 64, cache_dir: str = None,
+                 use_processes: bool = False):
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = pool_class(max_workers=max_workers)
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self._cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'rendered': 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.pdf") if self.cache_dir else None
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            self._cache_put(key, data, persist=False)
+            return data
+        return None
+
+    def _cache_put(self, key: str, data: bytes, persist: bool = True):
+        self._cache[key] = data
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        path = self._disk_path(key)
+        if persist and path:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def submit(self, property_data: Dict, metrics: Dict, strategies: Dict,
+               market_data: Dict, ai_insights: List[Dict]) -> Future:
+        """Return a future for the report, served from cache when unchanged"""
+        key = report_cache_key(property_data, metrics, strategies, market_data, ai_insights)
+
+        with self._lock:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats['hits'] += 1
+                future = Future()
+                future.set_result(cached)
+                return future
+
+            # Concurrent requests for the same report share one render
+            if key in self._inflight:
+                self.stats['hits'] += 1
+                return self._inflight[key]
+
+            self.stats['misses'] += 1
+            future = self.executor.submit(render_analysis_report, property_data, metrics,
+                                          strategies, market_data, ai_insights)
+            self._inflight[key] = future
+
+        def _store(done: Future):
+            with self._lock:
+                self._inflight.pop(key, None)
+                if done.exception() is None:
+                    self.stats['rendered'] += 1
+                    self._cache_put(key, done.result())
+
+        future.add_done_callback(_store)
+        return future
+
+    def get_report(self, property_data: Dict, metrics: Dict, strategies: Dict,
+                   market_data: Dict, ai_insights: List[Dict], timeout: float = 30) -> Optional[bytes]:
+        """Blocking helper for UI callers"""
+        try:
+            return self.submit(property_data, metrics, strategies, market_data, ai_insights).result(timeout)
+        except Exception as e:
+            logger.error(f"Failed to generate PDF report: {str(e)}")
+            return None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -1,148 +1,3 @@
-})
-    
-    # Financial insights
-    if metrics['profit_potential'] > 50000:
-        insights.append({
-            'type': 'financial',
-            'title': 'High Profit Potential',
-            'description': f"Deal shows exceptional profit potential of ${metrics['profit_potential']:,.0f}. Consider multiple exit strategies.",
-            'action': 'Secure contract quickly and evaluate all strategies',
-            'confidence': 92
-        })
-    
-    # Risk insights
-    if property_data['year_built'] < 1950:
-        insights.append({
-            'type': 'risk',
-            'title': 'Older Property Risk',
-            'description': f"Property built in {property_data['year_built']} may have hidden issues (lead, asbestos, electrical).",
-            'action': 'Budget extra for inspections and environmental testing',
-            'confidence': 80
-        })
-    
-    # Neighborhood insights
-    if property_data['school_rating'] >= 8:
-        insights.append({
-            'type': 'opportunity',
-            'title': 'Excellent School District',
-            'description': f"School rating of {property_data['school_rating']}/10 attracts families and supports property values.",
-            'action': 'Market to family buyers and emphasize school district',
-            'confidence': 95
-        })
-    
-    return insights
-
-def generate_risk_analysis(property_data, metrics, market_data):
-    """Generate comprehensive risk analysis"""
-    
-    risks = []
-    risk_score = 0
-    
-    # Market risks
-    if market_data['inventory_months'] > 6:
-        risks.append({
-            'category': 'Market',
-            'risk': 'High Inventory',
-            'description': f"{market_data['inventory_months']:.1f} months inventory indicates buyer's market",
-            'impact': 'High',
-            'mitigation': 'Price aggressively, consider rent-ready condition'
-        })
-        risk_score += 20
-    
-    # Property risks
-    if property_data['year_built'] < 1960:
-        risks.append({
-            'category': 'Property',
-            'risk': 'Older Construction',
-            'description': 'Potential for outdated systems, materials, and code issues',
-            'impact': 'Medium',
-            'mitigation': 'Comprehensive inspection, extra rehab budget'
-        })
-        risk_score += 15
-    
-    # Financial risks
-    if metrics['profit_potential'] < 15000:
-        risks.append({
-            'category': 'Financial',
-            'risk': 'Thin Margins',
-            'description': f"Low profit potential of ${metrics['profit_potential']:,.0f}",
-            'impact': 'High',
-            'mitigation': 'Negotiate lower price or find cost savings'
-        })
-        risk_score += 25
-    
-    # Location risks
-    if property_data.get('crime_score', 50) < 40:
-        risks.append({
-            'category': 'Location',
-            'risk': 'High Crime Area',
-            'description': 'Crime score below 40 may affect resale and rental demand',
-            'impact': 'Medium',
-            'mitigation': 'Target cash buyers, price for quick sale'
-        })
-        risk_score += 10
-    
-    # Market timing risks
-    if market_data['price_growth_yoy'] < 0:
-        risks.append({
-            'category': 'Timing',
-            'risk': 'Declining Market',
-            'description': f"Market down {abs(market_data['price_growth_yoy']):.1f}% year-over-year",
-            'impact': 'High',
-            'mitigation': 'Focus on cash flow, avoid speculation'
-        })
-        risk_score += 20
-    
-    # Overall risk assessment
-    if risk_score <= 20:
-        risk_level = 'Low'
-        risk_color = '#10B981'
-    elif risk_score <= 40:
-        risk_level = 'Medium'
-        risk_color = '#F59E0B'
-    else:
-        risk_level = 'High'
-        risk_color = '#EF4444'
-    
-    return {
-        'risks': risks,
-        'risk_score': risk_score,
-        'risk_level': risk_level,
-        'risk_color': risk_color,
-        'recommendation': 'Proceed with caution' if risk_score > 40 else 'Acceptable risk' if risk_score > 20 else 'Low risk opportunity'
-    }
-
-def generate_enhanced_comparables(property_data):
-    """Generate enhanced comparable sales"""
-    
-    comparables = []
-    base_price = property_data['list_price']
-    
-    for i in range(6):
-        # Generate realistic comparable properties
-        comp_price = base_price * np.random.uniform(0.85, 1.15)
-        comp_sqft = property_data['square_feet'] * np.random.uniform(0.9, 1.1)
-        days_ago = np.random.randint(15, 180)
-        
-        comparables.append({
-            'address': f"{np.random.randint(100, 9999)} {np.random.choice(['Oak', 'Elm', 'Pine', 'Maple', 'Cedar', 'Birch'])} {np.random.choice(['St', 'Ave', 'Dr', 'Ln', 'Ct'])}",
-            'price': comp_price,
-            'sqft': comp_sqft,
-            'price_per_sqft': comp_price / comp_sqft,
-            'bedrooms': property_data['bedrooms'] + np.random.randint(-1, 2),
-            'bathrooms': property_data['bathrooms'] + np.random.uniform(-0.5, 1.0),
-            'year_built': property_data['year_built'] + np.random.randint(-10, 10),
-            'days_ago': days_ago,
-            'status': 'Sold',
-            'dom': np.random.randint(5, 90),
-            'distance': np.random.uniform(0.1, 2.5)
-        })
-    
-    # Sort by relevance (price similarity)
-    comparables.sort(key=lambda x: abs(x['price'] - base_price))
-    
-    return comparables
-
 # Enhanced rendering functions
 def render_enhanced_wholesale_analysis(wholesale_data):
     """Render enhanced wholesale analysis"""
@@ -246,7 +101,7 @@ def render_enhanced_buy_hold_analysis(buy_hold_data):
         st.markdown("**Monthly Expense Breakdown:**")
         expenses = best['expense_breakdown']
         st.markdown(f"""
-        - **PITI:** ${expenses['piti']:,.0f}
+        - **Mortgage (P&I):** ${expenses['piti']:,.0f}
         - **Taxes:** ${expenses['taxes']:,.0f}
         - **Insurance:** ${expenses['insurance']:,.0f}
         - **Maintenance:** ${expenses['maintenance']:,.0f}
@@ -340,8 +195,86 @@ def render_creative_finance_analysis(creative_data):
     
     st.warning(f"⚠️ **Legal Disclaimer:** {creative_data['legal_requirements']}")
 
+@fragment('deal_analyzer.what_if')
+def render_sensitivity_explorer(inputs):
+    """Render offer/rehab/ARV/fee what-if heatmaps from the cached sensitivity grid
+    
+    A fragment: slider moves rerun only the explorer, not the analysis above it.
+    """
+    from wtf_sensitivity import heatmap, what_if
+    
+    st.markdown(f"## 🎛️ What-If Explorer: {inputs['address']}")
+    
+    grid = get_sensitivity_engine().grid(inputs['arv'], inputs['rehab_cost'], inputs['list_price'], inputs['params'])
+    axes = grid['axes']
+    
+    metric_labels = {
+        'Buyer Flip Profit': 'buyer_profit',
+        'Buyer ROI (%)': 'buyer_roi',
+        'Total Spread': 'spread',
+        'Deal Grade Score': 'grade_score'
+    }
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metric_label = st.selectbox("Metric", list(metric_labels.keys()), key="whatif_metric")
+    with col2:
+        rehab_multiplier = st.select_slider("Rehab Overrun", options=axes['rehab_multiplier'], value=1.0,
+                                            format_func=lambda v: f"{v:.2f}x", key="whatif_rehab")
+    with col3:
+        arv_haircut = st.select_slider("ARV Haircut", options=axes['arv_haircut'], value=0.0,
+                                       format_func=lambda v: f"{v:.0%}", key="whatif_haircut")
+    
+    surface = heatmap(grid, metric_labels[metric_label], x='offer_pct', y='assignment_fee',
+                      fixed={'rehab_multiplier': rehab_multiplier, 'arv_haircut': arv_haircut})
+    
+    def build_heatmap():
+        fig = go.Figure(go.Heatmap(
+            x=[f"{v:.0%}" for v in surface['x']],
+            y=[f"${v:,.0f}" for v in surface['y']],
+            z=surface['z'],
+            colorscale='RdYlGn',
+            zmid=0 if surface['metric'] in ('buyer_profit', 'buyer_roi', 'spread') else None
+        ))
+        fig.update_layout(
+            title=f"{metric_label}: Offer % of ARV vs Assignment Fee",
+            xaxis_title='Offer (% of ARV)',
+            yaxis_title='Assignment Fee',
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='white',
+            height=420
+        )
+        return fig
+    
+    figure = cached_figure('whatif_heatmap', [surface, metric_label], build_heatmap)
+    st.plotly_chart(figure, use_container_width=True)
+    
+    # Single point readout
+    col1, col2 = st.columns(2)
+    with col1:
+        offer_pct = st.select_slider("Offer % of ARV", options=axes['offer_pct'], value=0.70,
+                                     format_func=lambda v: f"{v:.0%}", key="whatif_offer")
+    with col2:
+        fee = st.select_slider("Assignment Fee", options=axes['assignment_fee'], value=15000.0,
+                               format_func=lambda v: f"${v:,.0f}", key="whatif_fee")
+    
+    point = what_if(grid, offer_pct=offer_pct, rehab_multiplier=rehab_multiplier,
+                    arv_haircut=arv_haircut, assignment_fee=fee)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Contract Price", f"${point['contract_price']:,.0f}")
+    with col2:
+        st.metric("Your Net", f"${point['wholesale_profit']:,.0f}")
+    with col3:
+        st.metric("Buyer Profit", f"${point['buyer_profit']:,.0f}", f"{point['buyer_roi']:.1f}% ROI")
+    with col4:
+        st.metric("Deal Grade", point['grade'], f"{point['grade_score']:.0f}/100")
+
 def render_strategy_comparison(strategies):
     """Render strategy comparison chart"""
+    from wtf_figures import FIGURES
     
     st.markdown("### 📊 Strategy Comparison")
     
@@ -379,43 +312,32 @@ def render_strategy_comparison(strategies):
     risks.append(3)  # Medium-High risk
     timelines.append(365)  # 1 year
     
+    # One frame feeds both charts
+    comparison = {'strategy': strategy_names, 'roi': rois, 'risk': risks, 'timeline_days': timelines,
+                  'marker_size': [20] * len(strategy_names)}
+    
     # Create comparison chart
     col1, col2 = st.columns(2)
     
     with col1:
         # ROI comparison
-        fig_roi = px.bar(
-            x=strategy_names, 
-            y=rois,
-            title='ROI Comparison (%)',
-            color=rois,
-            color_continuous_scale='Viridis'
-        )
-        fig_roi.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white'
-        )
+        fig_roi = FIGURES.chart({
+            'kind': 'bar', 'x': 'strategy', 'y': 'roi', 'color': 'roi',
+            'color_continuous_scale': 'Viridis',
+            'title': 'ROI Comparison (%)',
+            'labels': {'strategy': 'Strategy', 'roi': 'ROI (%)'}
+        }, comparison)
         st.plotly_chart(fig_roi, use_container_width=True)
     
     with col2:
         # Risk vs Timeline
-        fig_risk = px.scatter(
-            x=timelines,
-            y=risks,
-            text=strategy_names,
-            title='Risk vs Timeline',
-            size=[20, 20, 20, 20],
-            color=rois
-        )
-        fig_risk.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white',
-            xaxis_title='Timeline (Days)',
-            yaxis_title='Risk Level (1-5)'
-        )
-        fig_risk.update_traces(textposition="top center")
+        fig_risk = FIGURES.chart({
+            'kind': 'scatter', 'x': 'timeline_days', 'y': 'risk', 'text': 'strategy',
+            'size': 'marker_size', 'color': 'roi',
+            'title': 'Risk vs Timeline',
+            'layout': {'xaxis_title': 'Timeline (Days)', 'yaxis_title': 'Risk Level (1-5)'},
+            'traces': {'textposition': 'top center'}
+        }, comparison)
         st.plotly_chart(fig_risk, use_container_width=True)
     
     # Recommendation matrix
@@ -532,22 +454,25 @@ def render_enhanced_market_analysis(market_data):
     
     # Market trends chart
     months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug']
-    price_trend = [market_data['median_home_price'] * (1 + np.random.uniform(-0.02, 0.02)) for _ in months]
     
-    fig_trend = px.line(
-        x=months, 
-        y=price_trend,
-        title='Market Price Trend',
-        labels={'x': 'Month', 'y': 'Median Price ($)'}
-    )
-    fig_trend.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font_color='white'
-    )
-    fig_trend.update_traces(line_color='#10B981', line_width=3)
+    def build_trend():
+        price_trend = [market_data['median_home_price'] * (1 + np.random.uniform(-0.02, 0.02)) for _ in months]
+        fig_trend = px.line(
+            x=months, 
+            y=price_trend,
+            title='Market Price Trend',
+            labels={'x': 'Month', 'y': 'Median Price ($)'}
+        )
+        fig_trend.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='white'
+        )
+        fig_trend.update_traces(line_color='#10B981', line_width=3)
+        return fig_trend
     
-    st.plotly_chart(fig_trend, use_container_width=True)
+    figure = cached_figure('market_price_trend', market_data, build_trend)
+    st.plotly_chart(figure, use_container_width=True)
     
     # Investment climate
     investor_activity = market_data['investor_activity']
@@ -673,78 +598,50 @@ def render_risk_assessment(risk_analysis):
             """, unsafe_allow_html=True)
     else:
         st.success("✅ No significant risks identified")
-
-# Helper functions for database operations
-def save_ultimate_analysis_to_db(user_id, property_data, metrics, analysis_result):
-    """Save complete analysis to database"""
     
-    try:
-        conn = services['db'].get_connection()
-        cursor = conn.cursor()
+    # Monte Carlo profit distribution
+    simulation = risk_analysis.get('simulation')
+    if simulation:
+        st.markdown(f"**Simulated Flip Outcomes ({simulation['samples']:,} paths):**")
         
-        property_id = str(uuid.uuid4())
+        percentiles = simulation['profit_percentiles']
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Median Profit", f"${percentiles['p50']:,.0f}")
+        with col2:
+            st.metric("Probability of Loss", f"{simulation['probability_of_loss']:.1%}")
+        with col3:
+            st.metric("95% VaR", f"${simulation['var_95']:,.0f}")
+        with col4:
+            st.metric("Expected Shortfall", f"${simulation['expected_shortfall_95']:,.0f}")
         
-        # Prepare property data for database
-        property_insert = {
-            'id': property_id,
-            'user_id': user_id,
-            'address': property_data['address'],
-            'city': property_data['city'],
-            'state': property_data['state'],
-            'zip_code': property_data.get('zip_code', ''),
-            'property_type': property_data['property_type'],
-            'bedrooms': property_data['bedrooms'],
-            'bathrooms': property_data['bathrooms'],
-            'square_feet': property_data['square_feet'],
-            'year_built': property_data['year_built'],
-            'list_price': property_data['list_price'],
-            'zestimate': property_data.get('zestimate', 0),
-            'rent_estimate': property_data.get('rent_estimate', 0),
-            'arv': metrics['arv'],
-            'rehab_cost': metrics['rehab_cost'],
-            'max_offer': metrics['max_offers']['70_percent'],
-            'profit_potential': metrics['profit_potential'],
-            'condition': property_data.get('condition', 'fair'),
-            'days_on_market': property_data.get('days_on_market', 0),
-            'price_per_sqft': property_data.get('price_per_sqft', 0),
-            'neighborhood': property_data.get('neighborhood', ''),
-            'school_rating': property_data.get('school_rating', 0),
-            'crime_score': property_data.get('crime_score', 0),
-            'walkability': property_data.get('walkability', 0),
-            'property_taxes': property_data.get('property_taxes', 0),
-            'hoa_fees': property_data.get('hoa_fees', 0),
-            'data_sources': ','.join(property_data.get('data_sources', [])),
-            'analysis_data': json.dumps({
-                'metrics': metrics,
-                'strategies': analysis_result.get('strategies', {}),
-                'market_data': analysis_result.get('market_data', {}),
-                'ai_insights': analysis_result.get('ai_insights', []),
-                'risk_analysis': analysis_result.get('risk_analysis', {}),
-                'grade': metrics['overall_grade'],
-                'grade_score': metrics['grade_score'],
-                'confidence_level': metrics['confidence_level']
-            }),
-            'images': json.dumps([]),
-            'notes': f"Analysis completed on {datetime.now().strftime('%Y-%m-%d %H:%M')}. Grade: {metrics['overall_grade']} ({metrics['grade_score']}/100)"
-        }
-        
-        # Insert property
-        columns = ', '.join(property_insert.keys())
-        placeholders = ', '.join(['?' for _ in property_insert.values()])
-        
-        cursor.execute(f'''
-            INSERT INTO properties ({columns})
-            VALUES ({placeholders})
-        ''', list(property_insert.values()))
-        
-        conn.commit()
-        conn.close()
-        
-        return property_id
+        edges = simulation['histogram']['edges']
+        centers = [(edges[i] + edges[i + 1]) / 2 for i in range(len(edges) - 1)]
+        fig = go.Figure(go.Bar(
+            x=centers, y=simulation['histogram']['counts'],
+            marker_color=['#EF4444' if c < 0 else '#10B981' for c in centers]
+        ))
+        fig.update_layout(
+            title='Profit Distribution',
+            xaxis_title='Profit ($)',
+            yaxis_title='Simulated Outcomes',
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font_color='white',
+            height=320
+        )
+        st.plotly_chart(fig, use_container_width=True)
         
-    except Exception as e:
-        logger.error(f"Failed to save analysis: {str(e)}")
-        return None
+        st.caption(f"P5 ${percentiles['p5']:,.0f} · P25 ${percentiles['p25']:,.0f} · P75 ${percentiles['p75']:,.0f} · "
+                   f"P95 ${percentiles['p95']:,.0f} · Below target: {simulation['probability_below_target']:.0%} · "
+                   f"Rental fallback negative cash flow: {simulation['probability_negative_cash_flow']:.0%}")
+
+# Helper functions for database operations
+def save_ultimate_analysis_to_db(user_id, property_data, metrics, analysis_result):
+    """Save complete analysis to database; re-saving an address updates its property in place"""
+    
+    result = get_analysis_store().save(user_id, property_data, metrics, analysis_result)
+    return result['property_id'] if result['success'] else None
 
 def create_deal_from_analysis(user_id, property_data, metrics):
     """Create deal from analysis"""
@@ -801,104 +698,30 @@ def create_deal_from_analysis(user_id, property_data, metrics):
         return None
 
 def generate_ultimate_pdf_report(property_data, metrics, strategies, market_data, ai_insights):
-    """Generate comprehensive PDF report"""
+    """Start the comprehensive PDF report; returns a Future for the PDF bytes"""
     
-    try:
-        # This would normally use a PDF generation library like ReportLab
-        # For now, we'll create a mock PDF-like content
-        
-        report_content = f"""
-WTF PLATFORM - COMPREHENSIVE DEAL ANALYSIS REPORT
-================================================================
-
-PROPERTY INFORMATION
--------------------
-Address: {property_data['address']}, {property_data['city']}, {property_data['state']}
-Property Type: {property_data['property_type'].replace('_', ' ').title()}
-Bedrooms: {property_data['bedrooms']} | Bathrooms: {property_data['bathrooms']}
-Square Feet: {property_data['square_feet']:,} | Year Built: {property_data['year_built']}
-List Price: ${property_data['list_price']:,}
-
-ANALYSIS SUMMARY
---------------
-Overall Grade: {metrics['overall_grade']} ({metrics['grade_score']}/100)
-Confidence Level: {metrics['confidence_level']}%
-Recommended Strategy: {metrics['recommended_strategy']}
-
-KEY METRICS
-----------
-ARV (After Repair Value): ${metrics['arv']:,}
-Estimated Rehab Cost: ${metrics['rehab_cost']:,}
-Max Offer (70% Rule): ${metrics['max_offers']['70_percent']:,}
-Profit Potential: ${metrics['profit_potential']:,}
-
-INVESTMENT STRATEGIES
--------------------
-1. WHOLESALE STRATEGY
-   Best Assignment Fee: ${strategies['wholesale']['best_scenario']['assignment_fee']:,}
-   Net Profit: ${strategies['wholesale']['best_scenario']['net_profit']:,}
-   ROI: {strategies['wholesale']['best_scenario']['roi']:.1f}%
-
-2. FIX & FLIP STRATEGY
-   Gross Profit: ${strategies['fix_flip']['best_scenario']['gross_profit']:,}
-   ROI: {strategies['fix_flip']['best_scenario']['roi']:.1f}%
-   Timeline: {strategies['fix_flip']['best_scenario']['timeline']}
-
-3. BUY & HOLD STRATEGY
-   Monthly Cash Flow: ${strategies['buy_hold']['best_scenario']['monthly_cash_flow']:,}
-   Cash-on-Cash Return: {strategies['buy_hold']['best_scenario']['cash_on_cash']:.1f}%
-   Cap Rate: {strategies['buy_hold']['best_scenario']['cap_rate']:.1f}%
-
-MARKET ANALYSIS
---------------
-Median Home Price: ${market_data['median_home_price']:,}
-Days on Market: {market_data['days_on_market']}
-Price Growth YoY: {market_data['price_growth_yoy']:+.1f}%
-Market Temperature: {market_data['market_temperature']}
-
-AI INSIGHTS
------------
-"""
-        
-        for insight in ai_insights:
-            report_content += f"""
-{insight['type'].upper()}: {insight['title']}
-{insight['description']}
-Action: {insight['action']}
-Confidence: {insight['confidence']}%
-"""
-        
-        report_content += f"""
-
-DISCLAIMER
-----------
-This analysis is for informational purposes only and should not be considered as investment advice. 
-Property values, market conditions, and investment returns can vary significantly. Always conduct 
-your own due diligence and consult with qualified professionals before making investment decisions.
-
-Report generated by WTF Platform on {datetime.now().strftime('%Y-%m-%d at %H:%M')}
-Data sources: {', '.join(property_data.get('data_sources', ['Estimates']))}
-
-© 2024 WTF Platform - Wholesale on Steroids
-"""
-        
-        # Convert to bytes (mock PDF)
-        return report_content.encode('utf-8')
-        
-    except Exception as e:
-        logger.error(f"Failed to generate PDF report: {str(e)}")
-        return None
+    # Rendered on the report worker pool; a report already in the memory or disk
+    # cache comes back as a completed future without queueing a render
+    return get_report_service().submit(property_data, metrics, strategies, market_data, ai_insights)
 
 # Continue with the main application routing
 def main():
     """Main application router"""
     
+    # Every rerun is traced for the admin Performance page
+    with TRACER.rerun(page='landing', user_id=st.session_state.user_data.get('id', '')):
+        _route_page()
+
+def _route_page():
+    """Render the landing page or the page selected in the sidebar"""
+    
     # Landing page or authenticated app
     if not st.session_state.authenticated:
         render_ultimate_landing_page()
     else:
         # Render sidebar and get selected page
         selected_page = render_ultimate_sidebar()
+        TRACER.set_page(selected_page)
         
         # Route to selected page
         if selected_page == "dashboard":
@@ -927,6 +750,8 @@ def main():
             render_account_settings()
         elif selected_page == "admin_dashboard":
             render_admin_dashboard()
+        elif selected_page == "performance":
+            render_performance_dashboard()
         elif selected_page == "platform_analytics":
             render_platform_analytics()
         elif selected_page == "user_management":
@@ -959,9 +784,112 @@ def render_lead_manager():
     st.info("🚧 Lead Manager coming soon! This will include lead tracking, scoring, and follow-up automation.")
 
 def render_deal_pipeline():
-    """Render deal pipeline management"""
+    """Render the deal pipeline board; only columns whose version changed are re-fetched"""
     st.markdown('<h1 class="main-header">📋 Deal Pipeline</h1>', unsafe_allow_html=True)
-    st.info("🚧 Deal Pipeline coming soon! This will include deal tracking, milestone management, and closing coordination.")
+    
+    user_id = st.session_state.user_data.get('id')
+    pipeline = services['pipeline']
+    
+    # Cached columns survive reruns; the version check is a single counter read
+    board = st.session_state.get('pipeline_board')
+    if not board or board['user_id'] != user_id:
+        board = {'user_id': user_id, 'columns': {}}
+    known_versions = {stage: column['version'] for stage, column in board['columns'].items()}
+    fresh = pipeline.get_board(user_id, known_versions)
+    board['columns'].update(fresh['columns'])
+    board['stages'] = fresh['stages']
+    board['counts'] = fresh['counts']
+    st.session_state.pipeline_board = board
+    
+    counts = board['counts']
+    stage_data = lambda stage: counts.get(stage, {'count': 0, 'value': 0, 'weighted_value': 0})
+    open_stages = [stage for stage in board['stages'] if stage not in ('closed', 'dead')]
+    
+    # Pipeline metrics from the stage counters
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Pipeline Value", f"${sum(stage_data(s)['value'] for s in open_stages):,.0f}")
+    with col2:
+        st.metric("Active Deals", f"{sum(stage_data(s)['count'] for s in open_stages):,}")
+    with col3:
+        st.metric("Weighted Forecast", f"${sum(stage_data(s)['weighted_value'] for s in open_stages):,.0f}")
+    with col4:
+        st.metric("Closed Revenue", f"${stage_data('closed')['value']:,.0f}")
+    
+    # Deal flow funnel
+    fig_funnel = go.Figure(go.Funnel(
+        y=[PIPELINE_STAGES.get(stage, {}).get('label', stage.replace('_', ' ').title()) for stage in open_stages + ['closed']],
+        x=[stage_data(stage)['count'] for stage in open_stages + ['closed']],
+        textinfo="value+percent initial",
+        marker_color=[PIPELINE_STAGES.get(stage, {}).get('color', '#6B7280') for stage in open_stages + ['closed']]
+    ))
+    fig_funnel.update_layout(
+        title="Deal Pipeline Funnel",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font_color='white'
+    )
+    st.plotly_chart(fig_funnel, use_container_width=True)
+    
+    # Stage transitions
+    loaded_deals = {deal['id']: deal for column in board['columns'].values() for deal in column['deals']}
+    if loaded_deals:
+        with st.form("move_deal_form"):
+            col1, col2, col3 = st.columns([3, 2, 1])
+            with col1:
+                deal_id = st.selectbox("Deal", list(loaded_deals),
+                                       format_func=lambda d: f"{loaded_deals[d]['title']} ({loaded_deals[d]['stage'].replace('_', ' ').title()})")
+            with col2:
+                to_stage = st.selectbox("Move to", board['stages'],
+                                        format_func=lambda s: PIPELINE_STAGES.get(s, {}).get('label', s.replace('_', ' ').title()))
+            with col3:
+                st.markdown("<br>", unsafe_allow_html=True)
+                move = st.form_submit_button("➡️ Move", use_container_width=True)
+            
+            if move:
+                result = pipeline.move_deal(user_id, deal_id, to_stage)
+                if result['success']:
+                    services['activity_logger'].log_activity(
+                        user_id, 'deal_update', f"Moved deal from {result['from_stage']} to {to_stage}",
+                        'deal', deal_id)
+                    st.success("Deal moved!")
+                    st.rerun()
+                else:
+                    st.error(f"Could not move deal: {result['error']}")
+    
+    # Kanban board
+    st.markdown("### 📋 Kanban Board")
+    
+    cols = st.columns(len(board['stages']))
+    for col, stage in zip(cols, board['stages']):
+        column = board['columns'].get(stage, {'deals': [], 'cursor': None})
+        info = PIPELINE_STAGES.get(stage, {'label': stage.replace('_', ' ').title(), 'color': '#6B7280'})
+        
+        with col:
+            st.markdown(f"""
+            <div style='background: {info['color']}; padding: 0.5rem; border-radius: 8px; margin-bottom: 1rem;'>
+                <h5 style='color: white; text-align: center; margin: 0;'>{info['label']}</h5>
+                <p style='color: white; text-align: center; margin: 0; font-size: 0.8rem;'>
+                    {stage_data(stage)['count']:,} deals • ${stage_data(stage)['value']:,.0f}
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            for deal in column['deals']:
+                st.markdown(f"""
+                <div style='background: rgba(255,255,255,0.1); padding: 0.75rem; border-radius: 8px; margin-bottom: 0.5rem; border: 1px solid rgba(255,255,255,0.2);'>
+                    <p style='color: white; margin: 0; font-size: 0.85rem; font-weight: bold;'>{deal['title']}</p>
+                    <p style='color: #10B981; margin: 0;'>${deal['assignment_fee'] or 0:,.0f}</p>
+                    <p style='color: #F59E0B; margin: 0; font-size: 0.75rem;'>{deal['probability'] or 0}% probability</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Keyset pagination: fetch the next page after the last card shown
+            if column['cursor'] and st.button("Load more", key=f"pipeline_more_{stage}", use_container_width=True):
+                page = pipeline.get_column_page(user_id, stage, column['cursor'])
+                column['deals'].extend(page['deals'])
+                column['cursor'] = page['cursor']
+                st.rerun()
 
 def render_buyer_network():
     """Render buyer network system"""
@@ -979,9 +907,100 @@ def render_loi_generator():
     st.info("🚧 LOI Generator coming soon! This will include professional LOI templates, automated calculations, and tracking.")
 
 def render_email_campaigns():
-    """Render email campaign system"""
+    """Render email campaign builder and per-campaign delivery stats"""
+    from wtf_email_engine import SMTPSenderPool, TEMPLATE_FIELDS
     st.markdown('<h1 class="main-header">📧 Email Campaigns</h1>', unsafe_allow_html=True)
-    st.info("🚧 Email Campaigns coming soon! This will include lead nurturing, buyer outreach, and automated follow-ups.")
+    
+    user_id = st.session_state.user_data.get('id')
+    engine = get_email_engine()
+    
+    tab1, tab2 = st.tabs(["📤 Send Campaign", "📊 Campaign Analytics"])
+    
+    with tab1:
+        with st.form("email_campaign_form"):
+            campaign_name = st.text_input("Campaign Name*", placeholder="Monthly Property Update")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                statuses = st.multiselect("Lead Status", ['new', 'contacted', 'interested', 'callback', 'not_interested'],
+                                          default=['new', 'contacted', 'interested'])
+            with col2:
+                min_score = st.slider("Minimum Lead Score", 0, 100, 0)
+            
+            subject = st.text_input("Subject Line*", placeholder="Update on your property at {property_address}")
+            content = st.text_area("Email Content*", height=200, value="""Hi {first_name},
+
+I wanted to reach out about your property at {property_address}. We have cash buyers looking in your area right now.
+
+Would you be open to a no-obligation offer?
+
+Best regards,
+{sender_name}""")
+            st.markdown(f"**Available Tokens:** {', '.join('{' + field + '}' for field in TEMPLATE_FIELDS)}")
+            send_now = st.checkbox("Send immediately", value=True)
+            
+            if st.form_submit_button("🚀 Create Campaign", type="primary"):
+                if not (campaign_name and subject and content):
+                    st.error("Please fill in all required fields")
+                else:
+                    usage_check = services['usage_tracker'].check_usage_limit(user_id, 'email_campaigns')
+                    recipients = engine.lead_recipients(user_id, statuses, min_score)
+                    
+                    if not usage_check['allowed']:
+                        st.error("You've reached your email campaign limit for this month. Please upgrade your plan.")
+                    elif not recipients:
+                        st.warning("No leads with an email address match this audience.")
+                    else:
+                        campaign_id = engine.create_campaign(user_id, campaign_name, subject, content, recipients,
+                                                             source=f"leads:{','.join(statuses) or 'all'}:{min_score}")
+                        services['usage_tracker'].track_usage(user_id, 'email_campaigns', details=campaign_name)
+                        services['activity_logger'].log_activity(
+                            user_id, 'email_campaign', f"Created campaign {campaign_name} ({len(recipients)} recipients)",
+                            'email_campaign', campaign_id)
+                        
+                        if send_now:
+                            pool = SMTPSenderPool()
+                            try:
+                                with st.spinner(f"Sending to {len(recipients):,} recipients..."):
+                                    result = engine.send_campaign(
+                                        campaign_id, pool, sender_name=st.session_state.user_data.get('full_name', ''))
+                            finally:
+                                pool.close()
+                            
+                            if result['success'] and not result['failed']:
+                                st.success(f"✅ Sent {result['sent']:,} emails ({result['messages_per_second']:,.0f} msgs/sec)")
+                            else:
+                                st.warning(f"Sent {result.get('sent', 0):,} emails, {result.get('failed', 0):,} failed. "
+                                           "Failed recipients are retried on the next send.")
+                        else:
+                            st.success(f"✅ Campaign saved as draft with {len(recipients):,} recipients")
+    
+    with tab2:
+        campaigns = engine.get_campaign_stats(user_id)
+        if not campaigns:
+            st.info("No campaigns yet. Create your first campaign to start tracking engagement.")
+            return
+        
+        total_sent = sum(c['sent'] for c in campaigns)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Campaigns", len(campaigns))
+        with col2:
+            st.metric("Emails Sent", f"{total_sent:,}")
+        with col3:
+            st.metric("Open Rate", f"{sum(c['opens'] for c in campaigns) / total_sent * 100:.1f}%" if total_sent else "0.0%")
+        with col4:
+            st.metric("Click Rate", f"{sum(c['clicks'] for c in campaigns) / total_sent * 100:.1f}%" if total_sent else "0.0%")
+        
+        st.dataframe(pd.DataFrame([{
+            'Campaign': c['campaign_name'],
+            'Status': c['status'].title(),
+            'Recipients': c['recipients'],
+            'Sent': c['sent'],
+            'Open Rate': f"{c['open_rate']:.1f}%",
+            'Click Rate': f"{c['click_rate']:.1f}%",
+            'Created': c['created_at']
+        } for c in campaigns]), use_container_width=True, hide_index=True)
 
 def render_lightning_leads():
     """Render lightning leads system"""
@@ -1008,6 +1027,77 @@ def render_admin_dashboard():
     st.markdown('<h1 class="main-header">🏠 Admin Dashboard</h1>', unsafe_allow_html=True)
     st.info("🚧 Admin Dashboard coming soon! This will include platform overview, user management, and system monitoring.")
 
+def render_performance_dashboard():
+    """Render per-rerun timings, query counts and hot spans from the tracer ring buffer"""
+    from wtf_figures import FIGURES
+    st.markdown('<h1 class="main-header">⚡ Performance</h1>', unsafe_allow_html=True)
+    
+    reruns = TRACER.snapshot()
+    if not reruns:
+        st.info("No reruns recorded yet. Navigate around the platform to collect timings.")
+        return
+    
+    # Buffer overview
+    durations = [r['duration_ms'] for r in reruns]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Reruns Captured", f"{len(reruns)} / {TRACER.capacity}")
+    with col2:
+        st.metric("Avg Rerun", f"{sum(durations) / len(durations):,.1f} ms")
+    with col3:
+        st.metric("Avg Queries / Rerun", f"{sum(r['queries'] for r in reruns) / len(reruns):,.1f}")
+    with col4:
+        st.metric("Avg Rows / Rerun", f"{sum(r['rows'] for r in reruns) / len(reruns):,.0f}")
+    
+    st.markdown("### 📄 Pages")
+    st.dataframe(pd.DataFrame(TRACER.page_summary()), use_container_width=True, hide_index=True)
+    
+    st.markdown("### 🖼️ Figure Cache")
+    figure_stats = FIGURES.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Cached Figures", f"{figure_stats['entries']} / {FIGURES.capacity}")
+    with col2:
+        st.metric("Cache Size", f"{figure_stats['bytes'] / 1024 / 1024:,.1f} MB")
+    with col3:
+        st.metric("Hit Rate", f"{figure_stats['hit_rate']:.0%}")
+    with col4:
+        st.metric("Builds", f"{figure_stats['misses']:,}")
+    
+    st.markdown("### 🔥 Hot Spans")
+    category = st.selectbox("Category", ['all', 'render', 'fragment', 'service', 'analysis', 'db'], key="perf_category")
+    spans = TRACER.span_summary(category=None if category == 'all' else category)
+    if spans:
+        st.dataframe(pd.DataFrame(spans), use_container_width=True, hide_index=True)
+    else:
+        st.info("No spans recorded for this category.")
+    
+    st.markdown("### 🕒 Recent Reruns")
+    recent = [{
+        'started_at': r['started_at'],
+        'page': r['page'],
+        'duration_ms': round(r['duration_ms'], 2),
+        'queries': r['queries'],
+        'rows': r['rows'],
+        'query_ms': round(r['query_ms'], 2),
+        'spans': len(r['spans'])
+    } for r in reversed(reruns[-25:])]
+    st.dataframe(pd.DataFrame(recent), use_container_width=True, hide_index=True)
+    
+    # Export for chrome://tracing / Perfetto
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "📥 Export Chrome Trace",
+            data=json.dumps(TRACER.to_chrome_trace()),
+            file_name=f"wtf_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+    with col2:
+        if st.button("🗑️ Clear Buffer"):
+            TRACER.clear()
+            st.rerun()
+
 def render_platform_analytics():
     """Render platform analytics"""
     st.markdown('<h1 class="main-header">📊 Platform Analytics</h1>', unsafe_allow_html=True)
@@ -1033,6 +1123,9 @@ def render_available_deals():
     st.markdown('<h1 class="main-header">🔍 Available Deals</h1>', unsafe_allow_html=True)
     st.info("🚧 Available Deals coming soon! This will include deal marketplace, filtering, and purchase options.")
 
+# Trace every page renderer
+TRACER.instrument_functions(globals(), prefix='render_', category='render')
+
 # Run the application
 if __name__ == "__main__":
     main()
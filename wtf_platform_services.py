@@ -0,0 +1,1156 @@
+"""
+WTF Platform Services - Subscription limits, usage tracking, notifications,
+activity logging, the deal pipeline board, property search, buyer counts
+by state and buyer matching on top of the platform database
+"""
+
+import uuid
+import json
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from wtf_schema import DATABASE_PATH
+from wtf_instrumentation import traced_connect
+
+logger = logging.getLogger(__name__)
+
+# Subscription tiers with complete features
+SUBSCRIPTION_TIERS = {
+    'free': {
+        'name': 'Free Starter',
+        'price': 0,
+        'monthly_price': 0,
+        'features': {
+            'deal_analysis': 5,
+            'lead_management': 10,
+            'buyer_network': False,
+            'loi_generation': 2,
+            'contract_generation': 0,
+            'data_sources': ['Basic Estimates'],
+            'support': 'Community',
+            'api_access': False,
+            'white_label': False,
+            'advanced_analytics': False,
+            'bulk_operations': False,
+            'email_campaigns': 0,
+            'custom_templates': False,
+            'priority_support': False,
+            'training_access': False
+        },
+        'color': '#6B7280',
+        'icon': '🆓'
+    },
+    'starter': {
+        'name': 'Starter Pro',
+        'price': 97,
+        'monthly_price': 97,
+        'features': {
+            'deal_analysis': 50,
+            'lead_management': 100,
+            'buyer_network': True,
+            'loi_generation': 25,
+            'contract_generation': 10,
+            'data_sources': ['Zillow', 'Basic Market Data'],
+            'support': 'Email',
+            'api_access': False,
+            'white_label': False,
+            'advanced_analytics': True,
+            'bulk_operations': True,
+            'email_campaigns': 100,
+            'custom_templates': False,
+            'priority_support': False,
+            'training_access': True
+        },
+        'color': '#10B981',
+        'icon': '🚀'
+    },
+    'pro': {
+        'name': 'Professional',
+        'price': 197,
+        'monthly_price': 197,
+        'features': {
+            'deal_analysis': 200,
+            'lead_management': 500,
+            'buyer_network': True,
+            'loi_generation': 100,
+            'contract_generation': 50,
+            'data_sources': ['Zillow', 'PropStream', 'Privy', 'Market Data'],
+            'support': 'Priority Support',
+            'api_access': True,
+            'white_label': False,
+            'advanced_analytics': True,
+            'bulk_operations': True,
+            'email_campaigns': 500,
+            'custom_templates': True,
+            'priority_support': True,
+            'training_access': True
+        },
+        'color': '#8B5CF6',
+        'icon': '💎'
+    },
+    'enterprise': {
+        'name': 'Enterprise',
+        'price': 497,
+        'monthly_price': 497,
+        'features': {
+            'deal_analysis': -1,  # Unlimited
+            'lead_management': -1,
+            'buyer_network': True,
+            'loi_generation': -1,
+            'contract_generation': -1,
+            'data_sources': ['All Sources', 'Custom Integrations'],
+            'support': '24/7 Phone + Dedicated Manager',
+            'api_access': True,
+            'white_label': True,
+            'advanced_analytics': True,
+            'bulk_operations': True,
+            'email_campaigns': -1,
+            'custom_templates': True,
+            'priority_support': True,
+            'training_access': True
+        },
+        'color': '#F59E0B',
+        'icon': '👑'
+    }
+}
+
+# Platform database connection factory
+class PlatformDatabase:
+    """Opens connections to the platform database"""
+    
+    def __init__(self, db_path: str = DATABASE_PATH):
+        self.db_path = db_path
+    
+    def get_connection(self):
+        return traced_connect(self.db_path)
+    
+    @contextmanager
+    def connection(self):
+        """A connection that is closed (or handed back to the pool) when the block exits"""
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+class PooledConnection:
+    """Checked-out pool connection; close() hands it back to the pool instead of closing it"""
+    
+    def __init__(self, pool: 'PooledPlatformDatabase', conn):
+        self._pool = pool
+        self._conn = conn
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def close(self):
+        if self._conn is not None:
+            self._pool._release(self._conn)
+            self._conn = None
+    
+    def __del__(self):
+        # A cursor can outlive this wrapper and still be reading, so a leaked connection is
+        # never reused: its pool slot is freed and the connection closes once nothing uses it
+        if self._conn is not None:
+            logger.warning("Pooled connection was never closed; use PlatformDatabase.connection()")
+            self._conn = None
+            self._pool._forget()
+
+class PooledPlatformDatabase(PlatformDatabase):
+    """PlatformDatabase backed by up to `size` reusable connections shared across threads
+    
+    get_connection() waits while every connection is checked out. Callers release
+    connections explicitly, with `with db.connection() as conn:` or conn.close();
+    anything left uncommitted is rolled back when the connection returns to the pool.
+    """
+    
+    def __init__(self, db_path: str = DATABASE_PATH, size: int = 8, timeout: float = 30.0):
+        super().__init__(db_path)
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    def get_connection(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                return PooledConnection(self, self._idle.get_nowait())
+            except queue.Empty:
+                pass
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                return PooledConnection(self, traced_connect(self.db_path, check_same_thread=False,
+                                                             timeout=self.timeout))
+            # Wait briefly, then re-check: a slot freed by a leaked connection wakes no one
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise queue.Empty
+            try:
+                return PooledConnection(self, self._idle.get(timeout=min(remaining, 0.05)))
+            except queue.Empty:
+                continue
+    
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+    
+    def _forget(self):
+        """Give up the slot of a leaked connection, so get_connection() can open a replacement"""
+        with self._lock:
+            self._created -= 1
+    
+    def close_all(self):
+        """Close the idle connections (call once nothing is checked out)"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+# Usage Tracking Manager
+class UsageTrackingManager:
+    """Complete usage tracking and management system"""
+    
+    def __init__(self, db_manager: PlatformDatabase):
+        self.db = db_manager
+    
+    def check_usage_limit(self, user_id: str, action_type: str) -> Dict:
+        """Check if user can perform action based on subscription limits"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT subscription_tier FROM users WHERE id = ?', (user_id,))
+            result = cursor.fetchone()
+            
+            if not result:
+                return {'allowed': False, 'error': 'User not found'}
+            
+            subscription_tier = result[0]
+            limits = SUBSCRIPTION_TIERS[subscription_tier]['features']
+            
+            if action_type not in limits:
+                return {'allowed': True, 'remaining': -1}
+            
+            limit = limits[action_type]
+            
+            if limit == -1:  # Unlimited
+                return {'allowed': True, 'remaining': -1}
+            
+            # Get current usage for this month
+            current_date = datetime.now().date()
+            month_start = current_date.replace(day=1)
+            
+            cursor.execute('''
+                SELECT COALESCE(SUM(count), 0)
+                FROM usage_tracking
+                WHERE user_id = ? AND action_type = ? AND date >= ?
+            ''', (user_id, action_type, month_start))
+            
+            current_usage = cursor.fetchone()[0]
+        
+        remaining = limit - current_usage
+        allowed = remaining > 0
+        
+        return {
+            'allowed': allowed,
+            'remaining': max(0, remaining),
+            'limit': limit,
+            'current_usage': current_usage
+        }
+    
+    def track_usage(self, user_id: str, action_type: str, count: int = 1, details: str = ''):
+        """Track user action usage with details"""
+        
+        current_date = datetime.now().date()
+        tracking_id = str(uuid.uuid4())
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, count FROM usage_tracking
+                WHERE user_id = ? AND action_type = ? AND date = ?
+            ''', (user_id, action_type, current_date))
+            
+            existing = cursor.fetchone()
+            
+            if existing:
+                new_count = existing[1] + count
+                cursor.execute('''
+                    UPDATE usage_tracking SET count = ?, details = ? WHERE id = ?
+                ''', (new_count, details, existing[0]))
+            else:
+                cursor.execute('''
+                    INSERT INTO usage_tracking (id, user_id, action_type, resource_used, count, date, details)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (tracking_id, user_id, action_type, action_type, count, current_date, details))
+            
+            conn.commit()
+    
+    def get_usage_summary(self, user_id: str) -> Dict:
+        """Get comprehensive usage summary"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT subscription_tier FROM users WHERE id = ?', (user_id,))
+            result = cursor.fetchone()
+            
+            if not result:
+                return {}
+            
+            subscription_tier = result[0]
+            limits = SUBSCRIPTION_TIERS[subscription_tier]['features']
+            
+            current_date = datetime.now().date()
+            month_start = current_date.replace(day=1)
+            
+            cursor.execute('''
+                SELECT action_type, SUM(count)
+                FROM usage_tracking
+                WHERE user_id = ? AND date >= ?
+                GROUP BY action_type
+            ''', (user_id, month_start))
+            
+            usage_data = dict(cursor.fetchall())
+        
+        summary = {}
+        for action_type, limit in limits.items():
+            if isinstance(limit, int):
+                current_usage = usage_data.get(action_type, 0)
+                summary[action_type] = {
+                    'limit': limit,
+                    'used': current_usage,
+                    'remaining': max(0, limit - current_usage) if limit != -1 else -1,
+                    'percentage': (current_usage / limit * 100) if limit > 0 else 0
+                }
+        
+        return summary
+    
+    def get_usage_analytics(self, user_id: str, days: int = 30) -> Dict:
+        """Get usage analytics for specified period"""
+        
+        start_date = datetime.now().date() - timedelta(days=days)
+        
+        with self.db.connection() as conn:
+            usage_data = conn.cursor().execute('''
+                SELECT date, action_type, SUM(count) as total
+                FROM usage_tracking
+                WHERE user_id = ? AND date >= ?
+                GROUP BY date, action_type
+                ORDER BY date DESC
+            ''', (user_id, start_date)).fetchall()
+        
+        # Process data for analytics
+        analytics = {
+            'daily_usage': {},
+            'action_totals': {},
+            'trends': {}
+        }
+        
+        for date, action_type, total in usage_data:
+            if date not in analytics['daily_usage']:
+                analytics['daily_usage'][date] = {}
+            analytics['daily_usage'][date][action_type] = total
+            
+            if action_type not in analytics['action_totals']:
+                analytics['action_totals'][action_type] = 0
+            analytics['action_totals'][action_type] += total
+        
+        return analytics
+
+# Notification Manager
+class NotificationManager:
+    """Complete notification system"""
+    
+    def __init__(self, db_manager: PlatformDatabase):
+        self.db = db_manager
+    
+    def create_notification(self, user_id: str, title: str, message: str, 
+                          notification_type: str = 'info', action_url: str = '', 
+                          priority: int = 1, expires_hours: int = 24):
+        """Create a new notification"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            notification_id = str(uuid.uuid4())
+            expires_at = datetime.now() + timedelta(hours=expires_hours)
+            
+            cursor.execute('''
+                INSERT INTO notifications (id, user_id, title, message, type, action_url, priority, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (notification_id, user_id, title, message, notification_type, action_url, priority, expires_at))
+            
+            conn.commit()
+        
+        return notification_id
+    
+    def create_notifications(self, notifications: List[Dict], expires_hours: int = 24) -> List[str]:
+        """Create a batch of notifications in one transaction
+        
+        Each item has user_id, title and message, and optionally type, action_url and priority.
+        """
+        
+        expires_at = datetime.now() + timedelta(hours=expires_hours)
+        rows = [
+            (str(uuid.uuid4()), n['user_id'], n['title'], n['message'], n.get('type', 'info'),
+             n.get('action_url', ''), n.get('priority', 1), expires_at)
+            for n in notifications
+        ]
+        
+        conn = self.db.get_connection()
+        try:
+            conn.cursor().executemany('''
+                INSERT INTO notifications (id, user_id, title, message, type, action_url, priority, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.commit()
+        finally:
+            conn.close()
+        
+        return [row[0] for row in rows]
+    
+    def get_user_notifications(self, user_id: str, unread_only: bool = False) -> List[Dict]:
+        """Get user notifications"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                SELECT id, title, message, type, read_status, action_url, priority, created_at
+                FROM notifications
+                WHERE user_id = ? AND (expires_at IS NULL OR expires_at > ?)
+            '''
+            params = [user_id, datetime.now()]
+            
+            if unread_only:
+                query += ' AND read_status = 0'
+            
+            query += ' ORDER BY priority DESC, created_at DESC LIMIT 50'
+            
+            cursor.execute(query, params)
+            notifications = cursor.fetchall()
+        
+        return [
+            {
+                'id': n[0],
+                'title': n[1],
+                'message': n[2],
+                'type': n[3],
+                'read_status': n[4],
+                'action_url': n[5],
+                'priority': n[6],
+                'created_at': n[7]
+            }
+            for n in notifications
+        ]
+    
+    def mark_notification_read(self, notification_id: str, user_id: str):
+        """Mark notification as read"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE notifications SET read_status = 1 
+                WHERE id = ? AND user_id = ?
+            ''', (notification_id, user_id))
+            
+            conn.commit()
+    
+    def mark_all_read(self, user_id: str):
+        """Mark all notifications as read for user"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE notifications SET read_status = 1 WHERE user_id = ?
+            ''', (user_id,))
+            
+            conn.commit()
+
+# Activity Logger
+class ActivityLogger:
+    """Complete activity logging system"""
+    
+    def __init__(self, db_manager: PlatformDatabase):
+        self.db = db_manager
+    
+    def log_activity(self, user_id: str, action_type: str, description: str,
+                    entity_type: str = '', entity_id: str = '', metadata: Dict = None):
+        """Log user activity"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            activity_id = str(uuid.uuid4())
+            
+            cursor.execute('''
+                INSERT INTO activity_log (id, user_id, action_type, action_description, 
+                                        entity_type, entity_id, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (activity_id, user_id, action_type, description, entity_type, entity_id,
+                  json.dumps(metadata) if metadata else None))
+            
+            conn.commit()
+    
+    def get_user_activity(self, user_id: str, limit: int = 100) -> List[Dict]:
+        """Get user activity log"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT action_type, action_description, entity_type, entity_id, created_at, metadata
+                FROM activity_log
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (user_id, limit))
+            
+            activities = cursor.fetchall()
+        
+        return [
+            {
+                'action_type': a[0],
+                'description': a[1],
+                'entity_type': a[2],
+                'entity_id': a[3],
+                'created_at': a[4],
+                'metadata': json.loads(a[5]) if a[5] else None
+            }
+            for a in activities
+        ]
+
+# Dashboard Data Service
+class DashboardDataService:
+    """Aggregate queries behind the wholesaler dashboard
+    
+    With a follow-up scheduler (wtf_followups), overdue follow-ups are read
+    from its queue instead of being counted in the lead scan.
+    """
+    
+    def __init__(self, db_manager: PlatformDatabase, followups=None):
+        self.db = db_manager
+        self.followups = followups
+    
+    def get_dashboard_stats(self, user_id: str) -> Dict:
+        """Get deal, lead and property statistics for a user"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            # User's deals statistics
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_deals,
+                    COUNT(CASE WHEN stage = 'closed' THEN 1 END) as closed_deals,
+                    COUNT(CASE WHEN stage IN ('under_contract', 'pending') THEN 1 END) as active_deals,
+                    SUM(CASE WHEN stage = 'closed' THEN assignment_fee ELSE 0 END) as total_revenue,
+                    AVG(CASE WHEN stage = 'closed' THEN assignment_fee ELSE NULL END) as avg_deal_size,
+                    SUM(CASE WHEN stage IN ('under_contract', 'pending') THEN assignment_fee ELSE 0 END) as pipeline_value
+                FROM deals d
+                WHERE d.user_id = ?
+            ''', (user_id,))
+            
+            deal_stats = cursor.fetchone()
+            
+            # User's leads statistics
+            now = datetime.now()
+            overdue = '0' if self.followups else 'COUNT(CASE WHEN next_followup < :now THEN 1 END)'
+            cursor.execute(f'''
+                SELECT 
+                    COUNT(*) as total_leads,
+                    COUNT(CASE WHEN status = 'interested' THEN 1 END) as hot_leads,
+                    COUNT(CASE WHEN status = 'new' THEN 1 END) as new_leads,
+                    {overdue} as overdue_followups,
+                    AVG(score) as avg_score,
+                    COUNT(CASE WHEN last_contact > :since THEN 1 END) as contacted_today
+                FROM leads
+                WHERE user_id = :user_id
+            ''', {'now': now.isoformat(), 'since': (now - timedelta(days=1)).isoformat(), 'user_id': user_id})
+            
+            lead_stats = cursor.fetchone()
+            if self.followups:
+                lead_stats = lead_stats[:3] + (self.followups.overdue_count(user_id),) + lead_stats[4:]
+            
+            # Properties statistics
+            cursor.execute('''
+                SELECT 
+                    COUNT(*) as total_properties,
+                    AVG(profit_potential) as avg_profit,
+                    COUNT(CASE WHEN profit_potential > 20000 THEN 1 END) as grade_a_deals
+                FROM properties
+                WHERE user_id = ?
+            ''', (user_id,))
+            
+            property_stats = cursor.fetchone()
+            
+        
+        return {
+            'deal_stats': deal_stats,
+            'lead_stats': lead_stats,
+            'property_stats': property_stats
+        }
+    
+    def get_recent_deals(self, user_id: str, limit: int = 5) -> List[tuple]:
+        """Get the most recent deals with their property address"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT d.title, d.stage, d.assignment_fee, d.probability, d.created_at,
+                       p.address
+                FROM deals d
+                LEFT JOIN properties p ON d.property_id = p.id
+                WHERE d.user_id = ?
+                ORDER BY d.created_at DESC
+                LIMIT ?
+            ''', (user_id, limit))
+            
+            recent_deals = cursor.fetchall()
+        
+        return recent_deals
+    
+    def get_recent_leads(self, user_id: str, limit: int = 5) -> List[tuple]:
+        """Get the most recent leads"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT first_name, last_name, status, score, property_address, created_at
+                FROM leads
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+                LIMIT ?
+            ''', (user_id, limit))
+            
+            recent_leads = cursor.fetchall()
+        
+        return recent_leads
+
+# Pipeline stages in board order
+PIPELINE_STAGES = {
+    'prospecting': {'label': 'Prospecting', 'color': '#6B7280', 'probability': 10},
+    'analysis': {'label': 'Analysis', 'color': '#8B5CF6', 'probability': 20},
+    'negotiation': {'label': 'Negotiation', 'color': '#F59E0B', 'probability': 35},
+    'under_contract': {'label': 'Under Contract', 'color': '#3B82F6', 'probability': 60},
+    'marketing': {'label': 'Marketing', 'color': '#EC4899', 'probability': 70},
+    'closing': {'label': 'Closing', 'color': '#14B8A6', 'probability': 90},
+    'closed': {'label': 'Closed', 'color': '#10B981', 'probability': 100},
+    'dead': {'label': 'Dead', 'color': '#EF4444', 'probability': 0}
+}
+
+# Pipeline Board Service
+class PipelineDataService:
+    """Stage-grouped deal board with keyset pagination and versioned columns
+    
+    Stage counts and versions come from pipeline_stage_counts, which triggers
+    keep in step with deals. Callers pass the versions they already hold and
+    only columns whose version moved are re-fetched.
+    """
+    
+    CARD_COLUMNS = ('id', 'title', 'stage', 'status', 'contract_price', 'assignment_fee', 'probability',
+                    'expected_close_date', 'deal_type', 'updated_at')
+    
+    def __init__(self, db_manager: PlatformDatabase, page_size: int = 25):
+        self.db = db_manager
+        self.page_size = page_size
+    
+    def get_stage_counts(self, user_id: str) -> Dict[str, Dict]:
+        """Deal count, value and version per stage (one primary-key range read)"""
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT stage, deal_count, total_value, weighted_value, version
+                FROM pipeline_stage_counts
+                WHERE user_id = ?
+            ''', (user_id,))
+            
+            counts = {
+                row[0]: {'count': row[1], 'value': row[2] or 0, 'weighted_value': row[3] or 0, 'version': row[4]}
+                for row in cursor.fetchall()
+            }
+        
+        return counts
+    
+    @staticmethod
+    def board_stages(counts: Dict[str, Dict]) -> List[str]:
+        """Known stages in order, then any other stage that still holds deals"""
+        extra = sorted(stage for stage, data in counts.items() if stage not in PIPELINE_STAGES and data['count'] > 0)
+        return list(PIPELINE_STAGES) + extra
+    
+    def get_board(self, user_id: str, known_versions: Optional[Dict[str, int]] = None,
+                  page_size: Optional[int] = None) -> Dict:
+        """Stage counters plus the first page of every column whose version changed
+        
+        All stale columns are loaded in one statement: a UNION ALL of per-stage
+        LIMIT queries, each an index range scan on idx_deals_pipeline.
+        """
+        page_size = page_size or self.page_size
+        known_versions = known_versions or {}
+        counts = self.get_stage_counts(user_id)
+        stages = self.board_stages(counts)
+        
+        stale = [stage for stage in stages
+                 if stage not in known_versions or known_versions[stage] != counts.get(stage, {}).get('version', 0)]
+        columns = {stage: {'deals': [], 'cursor': None, 'version': counts.get(stage, {}).get('version', 0)}
+                   for stage in stale}
+        
+        # Only stages that hold deals need a query
+        queried = [stage for stage in stale if counts.get(stage, {}).get('count', 0) > 0]
+        if queried:
+            select = f'''
+                SELECT * FROM (
+                    SELECT {', '.join(self.CARD_COLUMNS)} FROM deals
+                    WHERE user_id = ? AND stage = ?
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT ?
+                )
+            '''
+            params = []
+            for stage in queried:
+                params.extend([user_id, stage, page_size + 1])
+            
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(' UNION ALL '.join([select] * len(queried)), params)
+                rows = cursor.fetchall()
+            
+            grouped = {stage: [] for stage in queried}
+            for row in rows:
+                grouped[row[2]].append(dict(zip(self.CARD_COLUMNS, row)))
+            for stage, deals in grouped.items():
+                columns[stage].update(self._page(deals, page_size))
+        
+        return {'stages': stages, 'counts': counts, 'columns': columns}
+    
+    def get_column_page(self, user_id: str, stage: str, cursor_key: Optional[List] = None,
+                        page_size: Optional[int] = None) -> Dict:
+        """Next page of one column after cursor_key = [updated_at, id] of the last card shown"""
+        page_size = page_size or self.page_size
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            if cursor_key:
+                cursor.execute(f'''
+                    SELECT {', '.join(self.CARD_COLUMNS)} FROM deals
+                    WHERE user_id = ? AND stage = ? AND (updated_at, id) < (?, ?)
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT ?
+                ''', (user_id, stage, cursor_key[0], cursor_key[1], page_size + 1))
+            else:
+                cursor.execute(f'''
+                    SELECT {', '.join(self.CARD_COLUMNS)} FROM deals
+                    WHERE user_id = ? AND stage = ?
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT ?
+                ''', (user_id, stage, page_size + 1))
+            
+            deals = [dict(zip(self.CARD_COLUMNS, row)) for row in cursor.fetchall()]
+        
+        return self._page(deals, page_size)
+    
+    @staticmethod
+    def _page(deals: List[Dict], page_size: int) -> Dict:
+        """Trim the look-ahead row and build the cursor for the next page"""
+        has_more = len(deals) > page_size
+        deals = deals[:page_size]
+        cursor_key = [deals[-1]['updated_at'], deals[-1]['id']] if has_more else None
+        return {'deals': deals, 'cursor': cursor_key}
+    
+    def move_deal(self, user_id: str, deal_id: str, to_stage: str, probability: Optional[int] = None) -> Dict:
+        """Move a deal to another stage; the deal row and both stage counters change in one transaction"""
+        
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            # Take the write lock up front so the read and the update see the same row
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('SELECT stage FROM deals WHERE id = ? AND user_id = ?', (deal_id, user_id))
+            row = cursor.fetchone()
+            if not row:
+                conn.rollback()
+                return {'success': False, 'error': 'Deal not found'}
+            
+            from_stage = row[0]
+            if from_stage == to_stage:
+                conn.rollback()
+                return {'success': True, 'from_stage': from_stage, 'to_stage': to_stage, 'counts': {}}
+            
+            if probability is None:
+                probability = PIPELINE_STAGES.get(to_stage, {}).get('probability', 10)
+            
+            # Counters and versions are updated by trg_deals_pipeline_update
+            cursor.execute('''
+                UPDATE deals SET
+                    stage = ?,
+                    probability = ?,
+                    status = CASE WHEN ? IN ('closed', 'dead') THEN ?
+                                  WHEN status IN ('closed', 'dead') THEN 'active'
+                                  ELSE status END,
+                    actual_close_date = CASE WHEN ? = 'closed' THEN ? ELSE actual_close_date END,
+                    updated_at = ?
+                WHERE id = ? AND user_id = ?
+            ''', (to_stage, probability, to_stage, to_stage, to_stage, datetime.now().isoformat(),
+                  datetime.now().strftime('%Y-%m-%d %H:%M:%S'), deal_id, user_id))
+            
+            cursor.execute('''
+                SELECT stage, deal_count, total_value, weighted_value, version
+                FROM pipeline_stage_counts
+                WHERE user_id = ? AND stage IN (?, ?)
+            ''', (user_id, from_stage, to_stage))
+            counts = {
+                row[0]: {'count': row[1], 'value': row[2] or 0, 'weighted_value': row[3] or 0, 'version': row[4]}
+                for row in cursor.fetchall()
+            }
+            
+            conn.commit()
+            return {'success': True, 'from_stage': from_stage, 'to_stage': to_stage, 'counts': counts}
+        
+        except Exception as e:
+            conn.rollback()
+            return {'success': False, 'error': str(e)}
+        
+        finally:
+            conn.close()
+
+# Property Search Service
+class PropertySearchService:
+    """Full-text property search with indexed filters and keyset pagination
+
+    Text goes through properties_fts (address, city, state, zip, neighborhood,
+    notes). Price/type/analysis filters and the sort orders line up with the
+    idx_properties_user_* indexes, and each page continues from the sort key
+    of the last row shown instead of an OFFSET, so deep pages cost the same as
+    the first one.
+    """
+
+    RESULT_COLUMNS = ('id', 'address', 'city', 'state', 'zip_code', 'property_type', 'bedrooms', 'bathrooms',
+                      'square_feet', 'year_built', 'list_price', 'arv', 'rehab_cost', 'max_offer',
+                      'profit_potential', 'condition', 'neighborhood', 'status', 'created_at',
+                      'grade', 'grade_score', 'confidence', 'best_strategy', 'best_roi')
+
+    # Sort name -> (key expression, direction); rows with a NULL key are left out of that order
+    SORTS = {
+        'newest': ('p.created_at', 'DESC'),
+        'oldest': ('p.created_at', 'ASC'),
+        'price_asc': ('p.list_price', 'ASC'),
+        'price_desc': ('p.list_price', 'DESC'),
+        'grade_desc': ('p.grade_score', 'DESC'),
+        'confidence_desc': ('p.confidence', 'DESC'),
+        'roi_desc': ('p.best_roi', 'DESC'),
+        'relevance': ('f.rank', 'ASC')
+    }
+
+    TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+    def __init__(self, db_manager: PlatformDatabase, page_size: int = 25):
+        self.db = db_manager
+        self.page_size = page_size
+
+    @classmethod
+    def match_query(cls, text: str) -> str:
+        """FTS5 query for free text: every word must match, the last one as a prefix"""
+        tokens = cls.TOKEN_RE.findall((text or '').lower())
+        if not tokens:
+            return ''
+        return ' '.join(f'"{token}"' for token in tokens[:-1]) + f' "{tokens[-1]}"*'
+
+    @staticmethod
+    def _as_list(value) -> List:
+        if isinstance(value, str):
+            return [v.strip() for v in value.split(',') if v.strip()]
+        return list(value) if isinstance(value, (list, tuple)) else [value]
+
+    def search(self, user_id: str, text: str = '', filters: Optional[Dict] = None, sort: str = '',
+               cursor_key: Optional[List] = None, page_size: Optional[int] = None) -> Dict:
+        """One page of the user's matching properties plus the cursor for the next page
+
+        filters: min_price, max_price, property_type, min_bedrooms, condition, city, state,
+        status, grade, best_strategy, min_grade_score, min_confidence, min_roi (the list
+        filters accept a list or comma-separated string). Analysis fields come from the
+        promoted columns, so no analysis payload is decoded.
+        """
+        page_size = page_size or self.page_size
+        filters = filters or {}
+        match = self.match_query(text)
+        sort = sort or ('relevance' if match else 'newest')
+        if sort not in self.SORTS or (sort == 'relevance' and not match):
+            return {'success': False, 'error': f"Unsupported sort: {sort}"}
+        key, direction = self.SORTS[sort]
+
+        where, params = ['p.user_id = ?'], [user_id]
+        if match:
+            where.append('f.properties_fts MATCH ?')
+            params.append(match)
+        if filters.get('min_price') is not None:
+            where.append('p.list_price >= ?')
+            params.append(float(filters['min_price']))
+        if filters.get('max_price') is not None:
+            where.append('p.list_price <= ?')
+            params.append(float(filters['max_price']))
+        if filters.get('min_bedrooms') is not None:
+            where.append('p.bedrooms >= ?')
+            params.append(int(filters['min_bedrooms']))
+        for name, column in (('min_grade_score', 'grade_score'), ('min_confidence', 'confidence'),
+                             ('min_roi', 'best_roi')):
+            if filters.get(name) is not None:
+                where.append(f'p.{column} >= ?')
+                params.append(float(filters[name]))
+        for column in ('property_type', 'condition', 'city', 'state', 'status', 'grade', 'best_strategy'):
+            if filters.get(column):
+                values = self._as_list(filters[column])
+                where.append(f"p.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if key != 'f.rank':
+            where.append(f'{key} IS NOT NULL')
+        if cursor_key:
+            where.append(f"({key}, p.id) {'<' if direction == 'DESC' else '>'} (?, ?)")
+            params.extend(cursor_key[:2])
+
+        source = 'properties_fts f JOIN properties p ON p.rowid = f.rowid' if match else 'properties p'
+        sql = f'''
+            SELECT {', '.join('p.' + c for c in self.RESULT_COLUMNS)}, {key}
+            FROM {source}
+            WHERE {' AND '.join(where)}
+            ORDER BY {key} {direction}, p.id {direction}
+            LIMIT ?
+        '''
+        params.append(page_size + 1)
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        except sqlite3.OperationalError as e:
+            return {'success': False, 'error': f"Search failed: {str(e)}"}
+        finally:
+            conn.close()
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        properties = [dict(zip(self.RESULT_COLUMNS, row)) for row in rows]
+        next_key = [rows[-1][-1], rows[-1][0]] if has_more else None
+        return {'success': True, 'properties': properties, 'cursor': next_key, 'sort': sort}
+
+    def find_by_address(self, user_id: str, address: str) -> Optional[Dict]:
+        """Best text match for an address typed in full, or None"""
+        result = self.search(user_id, address, sort='relevance', page_size=1)
+        if not result.get('success') or not result['properties']:
+            return None
+        return result['properties'][0]
+
+    def rebuild_index(self):
+        """Rebuild properties_fts from properties (after a VACUUM renumbers rowids)"""
+        with self.db.connection() as conn:
+            conn.cursor().execute("INSERT INTO properties_fts (properties_fts) VALUES ('rebuild')")
+            conn.commit()
+
+# Buyer Counts by State
+US_STATE_NAMES = {
+    'AL': 'ALABAMA', 'AK': 'ALASKA', 'AZ': 'ARIZONA', 'AR': 'ARKANSAS', 'CA': 'CALIFORNIA', 'CO': 'COLORADO',
+    'CT': 'CONNECTICUT', 'DE': 'DELAWARE', 'DC': 'DISTRICT OF COLUMBIA', 'FL': 'FLORIDA', 'GA': 'GEORGIA',
+    'HI': 'HAWAII', 'ID': 'IDAHO', 'IL': 'ILLINOIS', 'IN': 'INDIANA', 'IA': 'IOWA', 'KS': 'KANSAS',
+    'KY': 'KENTUCKY', 'LA': 'LOUISIANA', 'ME': 'MAINE', 'MD': 'MARYLAND', 'MA': 'MASSACHUSETTS',
+    'MI': 'MICHIGAN', 'MN': 'MINNESOTA', 'MS': 'MISSISSIPPI', 'MO': 'MISSOURI', 'MT': 'MONTANA',
+    'NE': 'NEBRASKA', 'NV': 'NEVADA', 'NH': 'NEW HAMPSHIRE', 'NJ': 'NEW JERSEY', 'NM': 'NEW MEXICO',
+    'NY': 'NEW YORK', 'NC': 'NORTH CAROLINA', 'ND': 'NORTH DAKOTA', 'OH': 'OHIO', 'OK': 'OKLAHOMA',
+    'OR': 'OREGON', 'PA': 'PENNSYLVANIA', 'RI': 'RHODE ISLAND', 'SC': 'SOUTH CAROLINA', 'SD': 'SOUTH DAKOTA',
+    'TN': 'TENNESSEE', 'TX': 'TEXAS', 'UT': 'UTAH', 'VT': 'VERMONT', 'VA': 'VIRGINIA', 'WA': 'WASHINGTON',
+    'WV': 'WEST VIRGINIA', 'WI': 'WISCONSIN', 'WY': 'WYOMING'
+}
+
+# States drawn on the Buy Boxes map; always present in the snapshot, even at zero
+MAP_STATES = [
+    'ALABAMA', 'ARIZONA', 'COLORADO', 'DELAWARE', 'FLORIDA', 'GEORGIA', 'IDAHO', 'INDIANA', 'KANSAS',
+    'KENTUCKY', 'LOUISIANA', 'MARYLAND', 'MICHIGAN', 'MISSISSIPPI', 'MISSOURI', 'NEBRASKA', 'NEVADA',
+    'NEW JERSEY', 'NEW MEXICO', 'NEW YORK', 'NORTH CAROLINA', 'OHIO', 'OKLAHOMA', 'OREGON', 'PENNSYLVANIA',
+    'SOUTH CAROLINA', 'TENNESSEE', 'TEXAS', 'UTAH', 'VIRGINIA', 'WASHINGTON', 'WEST VIRGINIA', 'WISCONSIN'
+]
+
+BUYER_COUNT_FIELDS = {'fix_flip': 'fixFlipCount', 'creative': 'creativeCount', 'section8': 'section8Count'}
+
+
+class BuyerStateCountsService:
+    """Buyer counts per state and category for the Buy Boxes map
+    
+    buyer_state_counts is kept in step with buyers by triggers, so a refresh
+    is one small table read. The encoded snapshot is held in memory and only
+    rebuilt when the table's summed versions move; requests in between are
+    answered from memory, or with 304 when the client's ETag still matches.
+    """
+    
+    def __init__(self, db_manager: PlatformDatabase, check_interval: float = 1.0):
+        self.db = db_manager
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._version = None
+        self._snapshot = ([], b'[]', '"0"')
+    
+    def _current_version(self) -> tuple:
+        conn = self.db.get_connection()
+        try:
+            return tuple(conn.cursor().execute('SELECT SUM(version), COUNT(*) FROM buyer_state_counts').fetchone())
+        finally:
+            conn.close()
+    
+    def _build(self) -> tuple:
+        conn = self.db.get_connection()
+        try:
+            rows = conn.cursor().execute('''
+                SELECT state, category, buyer_count FROM buyer_state_counts WHERE buyer_count > 0
+            ''').fetchall()
+        finally:
+            conn.close()
+    
+        empty = dict.fromkeys(BUYER_COUNT_FIELDS.values(), 0)
+        by_state = {name: {'state': name, **empty} for name in MAP_STATES}
+        for state, category, count in rows:
+            name = US_STATE_NAMES.get(state, state)
+            by_state.setdefault(name, {'state': name, **empty})[BUYER_COUNT_FIELDS[category]] += count
+    
+        # Map states in display order, then anything else buyers target
+        data = [by_state[name] for name in MAP_STATES]
+        data += [by_state[name] for name in sorted(set(by_state) - set(MAP_STATES))]
+        body = json.dumps(data, separators=(',', ':')).encode()
+        return data, body, f'"{zlib.crc32(body):08x}"'
+    
+    def snapshot(self) -> tuple:
+        """(rows, encoded JSON, ETag), re-checked against the table at most once per check_interval"""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                version = self._current_version()
+                if version != self._version:
+                    self._snapshot = self._build()
+                    self._version = version
+                self._checked_at = time.monotonic()
+        return self._snapshot
+    
+    def invalidate(self):
+        """Make the next snapshot() re-check the table"""
+        self._checked_at = 0.0
+
+# Buyer Matching Service
+class BuyerMatcher:
+    """Scores buyers against a property; buyer rows are
+    (id, name, email, phone, property_types, min_price, max_price, states,
+    cities, deal_types, verified, proof_of_funds)"""
+    
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self._location_columns = None
+    
+    def _buyer_columns(self, cursor) -> str:
+        # The ultimate schema names the location columns target_states/target_cities
+        if self._location_columns is None:
+            cursor.execute('PRAGMA table_info(buyers)')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'target_states' in columns:
+                self._location_columns = 'target_states, target_cities'
+            else:
+                self._location_columns = 'states, cities'
+        return (f"id, name, email, phone, property_types, min_price, max_price, "
+                f"{self._location_columns}, deal_types, verified, proof_of_funds")
+    
+    def find_matches(self, property_data: Dict) -> List[Dict]:
+        """Find matching buyers for a property"""
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT {self._buyer_columns(cursor)} FROM buyers 
+                WHERE min_price <= ? 
+                AND max_price >= ?
+            ''', (property_data.get('list_price', 0), property_data.get('list_price', 0)))
+            
+            buyers = cursor.fetchall()
+        
+        matches = []
+        for buyer in buyers:
+            score = self.calculate_match_score(property_data, buyer)
+            if score > 50:
+                matches.append({
+                    'buyer': buyer,
+                    'match_score': score,
+                    'match_reasons': self.get_match_reasons(property_data, buyer)
+                })
+        
+        return sorted(matches, key=lambda x: x['match_score'], reverse=True)
+    
+    def calculate_match_score(self, property_data: Dict, buyer: tuple) -> int:
+        """Calculate match score between property and buyer"""
+        score = 0
+        
+        # Property type match (30 points)
+        buyer_types = buyer[4].split(',') if buyer[4] else []
+        if property_data.get('property_type') in buyer_types:
+            score += 30
+        
+        # Price range match (25 points)
+        list_price = property_data.get('list_price', 0)
+        if buyer[5] <= list_price <= buyer[6]:
+            score += 25
+        
+        # Location match (20 points)
+        buyer_states = buyer[7].split(',') if buyer[7] else []
+        if property_data.get('state') in buyer_states:
+            score += 20
+        
+        # Verification bonus (25 points)
+        if buyer[10]:  # verified
+            score += 15
+        if buyer[11]:  # proof of funds
+            score += 10
+        
+        return min(score, 100)
+    
+    def get_match_reasons(self, property_data: Dict, buyer: tuple) -> List[str]:
+        """Get reasons why buyer matches property"""
+        reasons = []
+        
+        buyer_types = buyer[4].split(',') if buyer[4] else []
+        if property_data.get('property_type') in buyer_types:
+            reasons.append('Property type match')
+        
+        list_price = property_data.get('list_price', 0)
+        if buyer[5] <= list_price <= buyer[6]:
+            reasons.append('Price range match')
+        
+        buyer_states = buyer[7].split(',') if buyer[7] else []
+        if property_data.get('state') in buyer_states:
+            reasons.append('Location preference')
+        
+        if buyer[11]:  # proof of funds
+            reasons.append('Verified buyer with proof of funds')
+        
+        return reasons
@@ -0,0 +1,187 @@
+"""
+WTF Projections - Vectorized amortization and cash-flow projection engine
+
+Every input broadcasts to a 1-D array of scenarios; schedules are
+(scenarios x months) NumPy arrays, so thousands of loan/rent paths are
+projected, amortized and solved for IRR in a single call.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# Defaults used when the analyzer parameters do not specify them
+DEFAULT_TERM_YEARS = 30
+DEFAULT_HORIZON_YEARS = 10
+DEFAULT_RENT_GROWTH = 0.03
+DEFAULT_EXPENSE_GROWTH = 0.03
+DEFAULT_SELLING_COST_RATE = 0.08  # 6% realtor + 2% closing
+
+
+def _scenarios(*values) -> tuple:
+    """Broadcast scalars/arrays to a common 1-D float scenario axis"""
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=float)) for v in values])
+    return tuple(a.ravel() for a in arrays)
+
+
+def _powers(base: np.ndarray, count: int) -> np.ndarray:
+    """base ** [0..count] per row, built with a running product instead of pow()"""
+    out = np.empty((base.shape[0], count + 1))
+    out[:, 0] = 1.0
+    if count:
+        np.cumprod(np.broadcast_to(base[:, None], (base.shape[0], count)), axis=1, out=out[:, 1:])
+    return out
+
+
+def monthly_payment(principal, annual_rate, term_months) -> np.ndarray:
+    """Level principal-and-interest payment; handles zero-rate loans"""
+    principal, annual_rate, term_months = _scenarios(principal, annual_rate, term_months)
+    r = annual_rate / 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = principal * r / (1 - (1 + r) ** -term_months)
+    return np.where(r == 0, principal / np.maximum(term_months, 1), payment)
+
+
+def amortization_schedule(principal, annual_rate, term_months, horizon_months: int = None) -> Dict:
+    """Monthly payment, interest, principal and ending balance as (scenarios x months) arrays"""
+    principal, annual_rate, term_months = _scenarios(principal, annual_rate, term_months)
+    horizon = int(horizon_months or term_months.max())
+    payment = monthly_payment(principal, annual_rate, term_months)
+    r = (annual_rate / 12)[:, None]
+    months = np.arange(1, horizon + 1)[None, :]
+
+    # Closed-form balance after k payments: B_k = P(1+r)^k - pmt((1+r)^k - 1)/r
+    growth = _powers(1 + r[:, 0], horizon)[:, 1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        balance = principal[:, None] * growth - payment[:, None] * (growth - 1) / r
+    balance = np.where(r == 0, principal[:, None] - payment[:, None] * months, balance)
+
+    # Loans end at their term; nothing is owed or paid afterwards
+    active = months <= term_months[:, None]
+    balance = np.where(active, np.maximum(balance, 0.0), 0.0)
+
+    opening = np.concatenate([principal[:, None], balance[:, :-1]], axis=1)
+    interest = np.where(active, opening * r, 0.0)
+    principal_paid = opening - balance
+    return {
+        'payment': np.where(active, payment[:, None], 0.0),
+        'interest': interest,
+        'principal': principal_paid,
+        'balance': balance
+    }
+
+
+def irr(cash_flows, low: float = -0.5, high: float = 1.0, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """Per-period IRR of each row of cash_flows (scenarios x periods)
+
+    Safeguarded Newton iterations on all rows at once: a Newton step is taken
+    when it stays inside the row's sign-change bracket, otherwise the bracket is
+    bisected. Rows without a sign change on [low, high] return NaN.
+    """
+    cf = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    weighted = cf * np.arange(cf.shape[1])[None, :]
+    scale = np.maximum(np.abs(cf).max(axis=1), 1.0)
+
+    def npv(rate):
+        factor = 1 / (1 + rate)
+        discount = _powers(factor, cf.shape[1] - 1)
+        return np.einsum('ij,ij->i', cf, discount), -np.einsum('ij,ij->i', weighted, discount) * factor
+
+    lo = np.full(cf.shape[0], low)
+    hi = np.full(cf.shape[0], high)
+    f_lo, _ = npv(lo)
+    f_hi, _ = npv(hi)
+    solvable = np.sign(f_lo) != np.sign(f_hi)
+
+    # Start from the rate that grows total outlay into total inflow over the term
+    inflow = np.where(cf > 0, cf, 0).sum(axis=1)
+    outflow = np.maximum(-np.where(cf < 0, cf, 0).sum(axis=1), 1e-9)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        guess = (inflow / outflow) ** (2 / max(cf.shape[1] - 1, 1)) - 1
+    rate = np.clip(np.nan_to_num(guess, nan=0.01), low + tol, high - tol)
+    for _ in range(max_iter):
+        f, slope = npv(rate)
+        done = (np.abs(f) <= tol * scale) | (hi - lo <= tol)
+        if np.all(done | ~solvable):
+            break
+
+        # Shrink the bracket around the root
+        same_side = np.sign(f) == np.sign(f_lo)
+        lo = np.where(same_side, rate, lo)
+        f_lo = np.where(same_side, f, f_lo)
+        hi = np.where(same_side, hi, rate)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate - f / slope
+        inside = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        rate = np.where(done, rate, np.where(inside, newton, (lo + hi) / 2))
+
+    return np.where(solvable, rate, np.nan)
+
+
+def project_rental(purchase_price, cash_invested, loan_amount, annual_rate, monthly_rent,
+                   monthly_taxes=0.0, monthly_insurance=0.0, monthly_hoa=0.0, operating_rate=0.0,
+                   appreciation=0.03, rent_growth=DEFAULT_RENT_GROWTH, expense_growth=DEFAULT_EXPENSE_GROWTH,
+                   term_years=DEFAULT_TERM_YEARS, horizon_years: int = DEFAULT_HORIZON_YEARS,
+                   selling_cost_rate=DEFAULT_SELLING_COST_RATE) -> Dict:
+    """Project monthly rental cash flows, loan balance and sale for every scenario
+
+    operating_rate is the share of gross rent lost to vacancy, maintenance,
+    management and capex. Rent and fixed expenses step up once a year. Returns
+    first-year metrics, horizon equity and annualized IRR as 1-D arrays plus the
+    monthly cash-flow and balance schedules.
+    """
+    (purchase_price, cash_invested, loan_amount, annual_rate, monthly_rent, monthly_taxes,
+     monthly_insurance, monthly_hoa, operating_rate, appreciation, rent_growth, expense_growth,
+     term_years, selling_cost_rate) = _scenarios(
+        purchase_price, cash_invested, loan_amount, annual_rate, monthly_rent, monthly_taxes,
+        monthly_insurance, monthly_hoa, operating_rate, appreciation, rent_growth, expense_growth,
+        term_years, selling_cost_rate)
+
+    horizon = int(horizon_years) * 12
+    schedule = amortization_schedule(loan_amount, annual_rate, term_years * 12, horizon)
+    years = int(horizon_years)
+
+    # Annual step-ups expanded to months
+    rent = monthly_rent[:, None] * np.repeat(_powers(1 + rent_growth, years - 1), 12, axis=1)
+    fixed_expenses = ((monthly_taxes + monthly_insurance + monthly_hoa)[:, None] *
+                      np.repeat(_powers(1 + expense_growth, years - 1), 12, axis=1))
+    operating_expenses = rent * operating_rate[:, None]
+    noi = rent - operating_expenses - fixed_expenses
+    cash_flow = noi - schedule['payment']
+
+    # Sale at the end of the horizon
+    sale_value = purchase_price * (1 + appreciation) ** years
+    ending_balance = schedule['balance'][:, -1]
+    sale_proceeds = sale_value * (1 - selling_cost_rate) - ending_balance
+
+    flows = np.concatenate([-cash_invested[:, None], cash_flow], axis=1)
+    flows[:, -1] += sale_proceeds
+    monthly_irr = irr(flows)
+
+    first_year_noi = noi[:, :12].sum(axis=1)
+    first_year_debt_service = schedule['payment'][:, :12].sum(axis=1)
+    first_year_cash_flow = cash_flow[:, :12].sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dscr = np.where(first_year_debt_service > 0, first_year_noi / first_year_debt_service, np.inf)
+        cash_on_cash = np.where(cash_invested > 0, first_year_cash_flow / cash_invested * 100, np.inf)
+        cap_rate = np.where(purchase_price > 0, first_year_noi / purchase_price * 100, 0.0)
+
+    return {
+        'monthly_payment': schedule['payment'][:, 0],
+        'monthly_cash_flow': cash_flow[:, 0],
+        'annual_cash_flow': first_year_cash_flow,
+        'noi': first_year_noi,
+        'dscr': dscr,
+        'cash_on_cash': cash_on_cash,
+        'cap_rate': cap_rate,
+        'horizon_value': sale_value,
+        'horizon_balance': ending_balance,
+        'horizon_equity': sale_value - ending_balance,
+        'sale_proceeds': sale_proceeds,
+        'total_cash_flow': cash_flow.sum(axis=1),
+        'irr': (1 + monthly_irr) ** 12 - 1,
+        'cash_flows': cash_flow,
+        'balances': schedule['balance']
+    }
@@ -0,0 +1,134 @@
+"""
+WTF Risk Simulation - Monte Carlo downside analysis for flip deals
+
+Samples ARV, rehab overrun, holding time, financing rate and rent for every
+path at once with NumPy and reports profit percentiles, probability of loss
+and VaR / expected-shortfall style metrics. simulate_pipeline() runs a whole
+pipeline of deals across cores on a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from wtf_projections import monthly_payment
+
+DEFAULT_SAMPLES = 20000
+MIN_SAMPLES = 1000
+MAX_SAMPLES = 100000
+PROFIT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Distribution assumptions; every key can be overridden per deal
+DEFAULT_ASSUMPTIONS = {
+    'arv_volatility': 0.08,          # sd of the ARV multiplier before market adjustments
+    'rehab_overrun_median': 1.05,    # lognormal rehab multiplier
+    'rehab_overrun_sigma': 0.15,
+    'old_construction_sigma': 0.10,  # extra sigma for pre-1960 houses
+    'holding_delay_shape': 2.0,      # gamma-distributed months beyond plan
+    'rate_volatility': 0.0075,       # sd of the financing rate shift
+    'rent_volatility': 0.10,
+    'selling_cost_rate': 0.08,
+    'closing_cost_rate': 0.03,
+    'monthly_carry_rate': 0.0015,    # taxes, insurance and utilities per month on purchase + rehab
+    'rental_expense_rate': 0.35,     # non-debt rental expenses as a share of rent
+    'loan_to_value': 0.75
+}
+
+
+def _temperature_volatility(market_data: Dict) -> float:
+    """Cooler, slower markets widen the resale distribution"""
+    inventory = market_data.get('inventory_months', 4.0)
+    temperature = {'Hot': 0.8, 'Warm': 0.9, 'Balanced': 1.0, 'Cool': 1.15, 'Cold': 1.3}
+    return temperature.get(market_data.get('market_temperature'), 1.0) * (1 + max(0.0, inventory - 4) * 0.05)
+
+
+def simulate_deal(deal: Dict, samples: int = DEFAULT_SAMPLES, seed=None) -> Dict:
+    """Monte Carlo profit distribution for one flip
+
+    deal keys: purchase_price, arv, rehab_cost, holding_months, interest_rate (%),
+    monthly_rent and optionally year_built, market_data, target_profit and
+    assumptions (overrides for DEFAULT_ASSUMPTIONS).
+    """
+    samples = int(min(MAX_SAMPLES, max(MIN_SAMPLES, samples)))
+    a = dict(DEFAULT_ASSUMPTIONS, **deal.get('assumptions', {}))
+    market_data = deal.get('market_data') or {}
+    rng = np.random.default_rng(seed)
+
+    purchase_price = float(deal['purchase_price'])
+    arv = float(deal['arv'])
+    rehab_cost = float(deal['rehab_cost'])
+    holding_months = float(deal.get('holding_months', 6))
+    interest_rate = float(deal.get('interest_rate', 10)) / 100
+    monthly_rent = float(deal.get('monthly_rent', 0))
+
+    # Resale value drifts with the market over the holding period
+    drift = market_data.get('price_growth_yoy', 0.0) / 100 * holding_months / 12
+    arv_sd = a['arv_volatility'] * _temperature_volatility(market_data)
+    arv_s = arv * np.clip(rng.normal(1 + drift, arv_sd, samples), 0.3, None)
+
+    # Rehab overruns are right-skewed
+    sigma = a['rehab_overrun_sigma'] + (a['old_construction_sigma'] if deal.get('year_built', 2000) < 1960 else 0)
+    rehab_s = rehab_cost * rng.lognormal(np.log(a['rehab_overrun_median']), sigma, samples)
+
+    # Delays scale with how long homes sit in this market
+    delay_scale = max(market_data.get('inventory_months', 4.0), 0.5) / 4
+    months_s = holding_months + rng.gamma(a['holding_delay_shape'], delay_scale, samples)
+
+    rate_s = np.clip(interest_rate + rng.normal(0, a['rate_volatility'], samples), 0.0, None)
+    rent_s = monthly_rent * np.clip(rng.normal(1, a['rent_volatility'], samples), 0.0, None)
+
+    # Flip exit
+    capital = purchase_price + rehab_s
+    financing = capital * rate_s / 12 * months_s
+    carrying = capital * a['monthly_carry_rate'] * months_s
+    closing = purchase_price * a['closing_cost_rate']
+    profit = arv_s * (1 - a['selling_cost_rate']) - capital - financing - carrying - closing
+
+    # Rental fallback: refinance at LTV on the simulated value and rent it out
+    payment = monthly_payment(arv_s * a['loan_to_value'], rate_s, 360)
+    rental_cash_flow = rent_s * (1 - a['rental_expense_rate']) - payment
+
+    percentiles = np.percentile(profit, PROFIT_PERCENTILES)
+    p5 = percentiles[0]
+    tail = profit[profit <= p5]
+    target_profit = deal.get('target_profit', 15000)
+    counts, edges = np.histogram(profit, bins=30)
+
+    return {
+        'samples': samples,
+        'expected_profit': float(profit.mean()),
+        'profit_std': float(profit.std()),
+        'profit_percentiles': {f"p{p}": float(v) for p, v in zip(PROFIT_PERCENTILES, percentiles)},
+        'probability_of_loss': float((profit < 0).mean()),
+        'probability_below_target': float((profit < target_profit).mean()),
+        'target_profit': target_profit,
+        'var_95': float(max(0.0, -p5)),
+        'expected_shortfall_95': float(max(0.0, -tail.mean())) if tail.size else 0.0,
+        'worst_case': float(profit.min()),
+        'median_holding_months': float(np.median(months_s)),
+        'rental_cash_flow_p50': float(np.median(rental_cash_flow)),
+        'probability_negative_cash_flow': float((rental_cash_flow < 0).mean()),
+        'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()}
+    }
+
+
+def simulate_pipeline(deals: List[Dict], samples: int = DEFAULT_SAMPLES, workers: Optional[int] = None,
+                      seed=None) -> List[Dict]:
+    """Simulate every deal on a process pool; results keep the input order
+
+    Each deal gets an independent child seed so results are reproducible for
+    a given seed regardless of worker count.
+    """
+    if not deals:
+        return []
+    seeds = np.random.SeedSequence(seed).spawn(len(deals))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(deals) == 1:
+        return [simulate_deal(deal, samples, s) for deal, s in zip(deals, seeds)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(deals) // (workers * 4))
+        return list(pool.map(simulate_deal, deals, [samples] * len(deals), seeds, chunksize=chunksize))
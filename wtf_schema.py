@@ -0,0 +1,697 @@
+"""
+WTF Platform schema - table definitions for the ultimate platform database
+"""
+
+import json
+import sqlite3
+import zlib
+
+DATABASE_PATH = 'wtf_ultimate.db'
+
+# Table name -> CREATE statement, in dependency order
+ULTIMATE_SCHEMA = {
+    # Enhanced users table
+    'users': '''
+        CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            role TEXT NOT NULL,
+            full_name TEXT,
+            phone TEXT,
+            company TEXT,
+            subscription_tier TEXT DEFAULT 'free',
+            subscription_status TEXT DEFAULT 'active',
+            subscription_start TIMESTAMP,
+            subscription_end TIMESTAMP,
+            whop_user_id TEXT,
+            stripe_customer_id TEXT,
+            trial_used BOOLEAN DEFAULT 0,
+            api_key TEXT,
+            last_activity TIMESTAMP,
+            preferences TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1
+        )
+    ''',
+    # Enhanced properties table
+    'properties': '''
+        CREATE TABLE IF NOT EXISTS properties (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            address TEXT NOT NULL,
+            city TEXT NOT NULL,
+            state TEXT NOT NULL,
+            zip_code TEXT NOT NULL,
+            property_type TEXT NOT NULL,
+            bedrooms INTEGER,
+            bathrooms REAL,
+            square_feet INTEGER,
+            year_built INTEGER,
+            list_price REAL,
+            zestimate REAL DEFAULT 0,
+            rent_estimate REAL DEFAULT 0,
+            arv REAL DEFAULT 0,
+            rehab_cost REAL DEFAULT 0,
+            max_offer REAL DEFAULT 0,
+            profit_potential REAL DEFAULT 0,
+            condition TEXT DEFAULT 'fair',
+            days_on_market INTEGER DEFAULT 0,
+            price_per_sqft REAL DEFAULT 0,
+            neighborhood TEXT,
+            school_rating INTEGER DEFAULT 0,
+            crime_score INTEGER DEFAULT 0,
+            walkability INTEGER DEFAULT 0,
+            last_sale_date TEXT,
+            last_sale_price REAL DEFAULT 0,
+            property_taxes REAL DEFAULT 0,
+            hoa_fees REAL DEFAULT 0,
+            data_sources TEXT,
+            analysis_data TEXT,
+            images TEXT,
+            notes TEXT,
+            status TEXT DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Enhanced leads table
+    'leads': '''
+        CREATE TABLE IF NOT EXISTS leads (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            first_name TEXT,
+            last_name TEXT,
+            phone TEXT,
+            email TEXT,
+            property_address TEXT NOT NULL,
+            property_id TEXT,
+            motivation TEXT,
+            timeline TEXT,
+            source TEXT,
+            status TEXT DEFAULT 'new',
+            score INTEGER DEFAULT 0,
+            property_condition TEXT DEFAULT 'fair',
+            estimated_value REAL DEFAULT 0,
+            owed_amount REAL DEFAULT 0,
+            monthly_payment REAL DEFAULT 0,
+            equity REAL DEFAULT 0,
+            notes TEXT,
+            assigned_to TEXT,
+            last_contact TIMESTAMP,
+            next_followup TIMESTAMP,
+            contact_attempts INTEGER DEFAULT 0,
+            call_outcome TEXT,
+            tags TEXT,
+            priority TEXT DEFAULT 'medium',
+            conversion_probability REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (property_id) REFERENCES properties (id)
+        )
+    ''',
+    # Enhanced deals table
+    'deals': '''
+        CREATE TABLE IF NOT EXISTS deals (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            property_id TEXT,
+            lead_id TEXT,
+            buyer_id TEXT,
+            contract_price REAL DEFAULT 0,
+            assignment_fee REAL DEFAULT 0,
+            status TEXT DEFAULT 'lead',
+            stage TEXT DEFAULT 'prospecting',
+            probability INTEGER DEFAULT 10,
+            expected_close_date TIMESTAMP,
+            actual_close_date TIMESTAMP,
+            profit_margin REAL DEFAULT 0,
+            roi REAL DEFAULT 0,
+            deal_type TEXT DEFAULT 'wholesale',
+            commission REAL DEFAULT 0,
+            expenses REAL DEFAULT 0,
+            net_profit REAL DEFAULT 0,
+            documents TEXT,
+            notes TEXT,
+            milestones TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (property_id) REFERENCES properties (id),
+            FOREIGN KEY (lead_id) REFERENCES leads (id),
+            FOREIGN KEY (buyer_id) REFERENCES buyers (id)
+        )
+    ''',
+    # Enhanced buyers table
+    'buyers': '''
+        CREATE TABLE IF NOT EXISTS buyers (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            phone TEXT,
+            company TEXT,
+            property_types TEXT,
+            min_price REAL,
+            max_price REAL,
+            target_states TEXT,
+            target_cities TEXT,
+            deal_types TEXT,
+            verified BOOLEAN DEFAULT 0,
+            proof_of_funds BOOLEAN DEFAULT 0,
+            cash_available REAL DEFAULT 0,
+            acquisition_criteria TEXT,
+            preferred_areas TEXT,
+            max_rehab_tolerance REAL DEFAULT 0,
+            min_roi_required REAL DEFAULT 0,
+            investment_focus TEXT,
+            communication_preferences TEXT,
+            last_activity TIMESTAMP,
+            deals_closed INTEGER DEFAULT 0,
+            total_invested REAL DEFAULT 0,
+            rating REAL DEFAULT 0,
+            notes TEXT,
+            tags TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Contracts table
+    'contracts': '''
+        CREATE TABLE IF NOT EXISTS contracts (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            deal_id TEXT,
+            lead_id TEXT,
+            contract_type TEXT NOT NULL,
+            buyer_name TEXT NOT NULL,
+            seller_name TEXT NOT NULL,
+            property_address TEXT NOT NULL,
+            purchase_price REAL NOT NULL,
+            earnest_money REAL DEFAULT 0,
+            closing_date TEXT,
+            terms TEXT,
+            status TEXT DEFAULT 'draft',
+            generated_content TEXT,
+            document_url TEXT,
+            signatures TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            signed_at TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (deal_id) REFERENCES deals (id),
+            FOREIGN KEY (lead_id) REFERENCES leads (id)
+        )
+    ''',
+    # LOIs table
+    'lois': '''
+        CREATE TABLE IF NOT EXISTS lois (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            lead_id TEXT,
+            property_address TEXT NOT NULL,
+            seller_name TEXT NOT NULL,
+            buyer_name TEXT NOT NULL,
+            offer_price REAL NOT NULL,
+            earnest_money REAL DEFAULT 1000,
+            closing_date TEXT,
+            inspection_period INTEGER DEFAULT 7,
+            financing_contingency BOOLEAN DEFAULT 1,
+            terms TEXT,
+            status TEXT DEFAULT 'draft',
+            generated_content TEXT,
+            sent_date TIMESTAMP,
+            response_date TIMESTAMP,
+            response_status TEXT,
+            follow_up_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (lead_id) REFERENCES leads (id)
+        )
+    ''',
+    # Market data table
+    'market_data': '''
+        CREATE TABLE IF NOT EXISTS market_data (
+            id TEXT PRIMARY KEY,
+            zip_code TEXT NOT NULL,
+            city TEXT NOT NULL,
+            state TEXT NOT NULL,
+            median_home_price REAL,
+            median_rent REAL,
+            days_on_market REAL,
+            price_per_sqft REAL,
+            inventory_months REAL,
+            price_growth_yoy REAL,
+            rent_growth_yoy REAL,
+            cap_rate REAL,
+            vacancy_rate REAL,
+            population_growth REAL,
+            job_growth REAL,
+            crime_index REAL,
+            school_ratings REAL,
+            foreclosure_rate REAL,
+            new_construction REAL,
+            flip_activity REAL,
+            data_date TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''',
+    # Usage tracking table
+    'usage_tracking': '''
+        CREATE TABLE IF NOT EXISTS usage_tracking (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            action_type TEXT NOT NULL,
+            resource_used TEXT NOT NULL,
+            count INTEGER DEFAULT 1,
+            date DATE NOT NULL,
+            details TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Activity log table
+    'activity_log': '''
+        CREATE TABLE IF NOT EXISTS activity_log (
+            id TEXT PRIMARY KEY,
+            user_id TEXT,
+            action_type TEXT NOT NULL,
+            action_description TEXT NOT NULL,
+            entity_type TEXT,
+            entity_id TEXT,
+            ip_address TEXT,
+            user_agent TEXT,
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Email campaigns table
+    'email_campaigns': '''
+        CREATE TABLE IF NOT EXISTS email_campaigns (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            campaign_name TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            content TEXT NOT NULL,
+            recipient_list TEXT NOT NULL,
+            status TEXT DEFAULT 'draft',
+            sent_count INTEGER DEFAULT 0,
+            open_count INTEGER DEFAULT 0,
+            click_count INTEGER DEFAULT 0,
+            scheduled_date TIMESTAMP,
+            sent_date TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # One row per campaign recipient, with delivery status and engagement counters
+    'email_recipients': '''
+        CREATE TABLE IF NOT EXISTS email_recipients (
+            id INTEGER PRIMARY KEY,
+            campaign_id TEXT NOT NULL,
+            email TEXT NOT NULL,
+            lead_id TEXT,
+            merge_data TEXT,
+            tracking_token TEXT NOT NULL,
+            status TEXT DEFAULT 'pending',
+            attempts INTEGER DEFAULT 0,
+            error TEXT,
+            sent_at TIMESTAMP,
+            open_count INTEGER DEFAULT 0,
+            click_count INTEGER DEFAULT 0,
+            first_opened_at TIMESTAMP,
+            first_clicked_at TIMESTAMP,
+            FOREIGN KEY (campaign_id) REFERENCES email_campaigns (id),
+            FOREIGN KEY (lead_id) REFERENCES leads (id)
+        )
+    ''',
+    # Templates table
+    'templates': '''
+        CREATE TABLE IF NOT EXISTS templates (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            template_type TEXT NOT NULL,
+            template_name TEXT NOT NULL,
+            content TEXT NOT NULL,
+            variables TEXT,
+            is_public BOOLEAN DEFAULT 0,
+            usage_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Notifications table
+    'notifications': '''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            message TEXT NOT NULL,
+            type TEXT DEFAULT 'info',
+            read_status BOOLEAN DEFAULT 0,
+            action_url TEXT,
+            priority INTEGER DEFAULT 1,
+            expires_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Analytics table
+    'analytics': '''
+        CREATE TABLE IF NOT EXISTS analytics (
+            id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            metric_type TEXT NOT NULL,
+            metric_value REAL NOT NULL,
+            dimensions TEXT,
+            date DATE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    # Per-stage deal counters for the pipeline board (maintained by triggers)
+    'pipeline_stage_counts': '''
+        CREATE TABLE IF NOT EXISTS pipeline_stage_counts (
+            user_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            deal_count INTEGER DEFAULT 0,
+            total_value REAL DEFAULT 0,
+            weighted_value REAL DEFAULT 0,
+            version INTEGER DEFAULT 0,
+            PRIMARY KEY (user_id, stage)
+        )
+    ''',
+    # Buyers per (state, Buy Boxes category), maintained by triggers on buyers
+    'buyer_state_counts': '''
+        CREATE TABLE IF NOT EXISTS buyer_state_counts (
+            state TEXT NOT NULL,
+            category TEXT NOT NULL,
+            buyer_count INTEGER DEFAULT 0,
+            version INTEGER DEFAULT 0,
+            PRIMARY KEY (state, category)
+        )
+    ''',
+    # Compressed analysis payloads, stored once per content hash and referenced by properties.analysis_hash
+    'analysis_blobs': '''
+        CREATE TABLE IF NOT EXISTS analysis_blobs (
+            hash TEXT PRIMARY KEY,
+            codec TEXT NOT NULL,
+            raw_size INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''',
+    # Progress markers for background schedulers, e.g. the last lead follow-up notified (wtf_followups)
+    'scheduler_watermarks': '''
+        CREATE TABLE IF NOT EXISTS scheduler_watermarks (
+            name TEXT PRIMARY KEY,
+            due_at TEXT NOT NULL,
+            lead_id TEXT NOT NULL DEFAULT '',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''',
+    # Latest change per lead, numbered in commit order (maintained by triggers on leads). A deleted
+    # lead keeps its row as a tombstone, so incremental readers such as wtf_followups see deletes too.
+    'lead_changes': '''
+        CREATE TABLE IF NOT EXISTS lead_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id TEXT NOT NULL UNIQUE
+        )
+    ''',
+    # Full-text index over the property text columns; external content, so it stores only
+    # the index and reads the text back from properties by rowid
+    'properties_fts': '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5 (
+            address, city, state, zip_code, neighborhood, notes,
+            content = 'properties', content_rowid = 'rowid',
+            tokenize = 'unicode61', prefix = '2 3'
+        )
+    '''
+}
+
+
+# Columns added after a table first shipped; applied to existing databases
+ADDED_COLUMNS = {
+    'market_data': {'foreclosure_rate': 'REAL', 'new_construction': 'REAL', 'flip_activity': 'REAL'},
+    # Saved analyses are upserted by (user_id, address_key), and their most filtered fields are
+    # copied out of the payload; see wtf_analysis_store
+    'properties': {'address_key': 'TEXT', 'analysis_hash': 'TEXT', 'content_hash': 'TEXT',
+                   'grade': 'TEXT', 'grade_score': 'REAL', 'confidence': 'REAL', 'best_strategy': 'TEXT',
+                   'best_roi': 'REAL'}
+}
+
+# Lookup indexes every database needs
+SCHEMA_INDEXES = [
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_market_zip_date ON market_data (zip_code, city, state, data_date)',
+    'CREATE INDEX IF NOT EXISTS idx_market_city_date ON market_data (state, city, data_date)',
+    'CREATE INDEX IF NOT EXISTS idx_market_state_date ON market_data (state, data_date)',
+    'CREATE INDEX IF NOT EXISTS idx_deals_pipeline ON deals (user_id, stage, updated_at DESC, id DESC)',
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_recipients_campaign_email ON email_recipients (campaign_id, email)',
+    'CREATE INDEX IF NOT EXISTS idx_recipients_campaign_status ON email_recipients (campaign_id, status, id)',
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_recipients_token ON email_recipients (tracking_token)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_updated ON properties (updated_at, id)',
+    'CREATE INDEX IF NOT EXISTS idx_templates_updated ON templates (updated_at, id)',
+    'CREATE INDEX IF NOT EXISTS idx_leads_updated ON leads (updated_at, id)',
+    # API bearer tokens that are not JWTs are looked up as API keys on every request
+    'CREATE INDEX IF NOT EXISTS idx_users_api_key ON users (api_key) WHERE api_key IS NOT NULL',
+    # Property search: each filter/sort combination is a range scan in keyset order
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_created ON properties (user_id, created_at, id)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_price ON properties (user_id, list_price, id)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_type_created ON properties (user_id, property_type, created_at, id)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_type_price ON properties (user_id, property_type, list_price, id)',
+    # One analysed property per user and address; rows saved before address keys stay NULL and unmerged
+    '''CREATE UNIQUE INDEX IF NOT EXISTS idx_properties_user_address_key ON properties (user_id, address_key)
+       WHERE address_key IS NOT NULL''',
+    'CREATE INDEX IF NOT EXISTS idx_properties_analysis_hash ON properties (analysis_hash) WHERE analysis_hash IS NOT NULL',
+    # Analysis list views filter and sort on the promoted columns, never on the payload
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_grade ON properties (user_id, grade, grade_score, id)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_grade_score ON properties (user_id, grade_score, id)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_confidence ON properties (user_id, confidence, id)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_user_best_roi ON properties (user_id, best_roi, id)'
+]
+
+# Buyer deal_types -> Buy Boxes map category. Section 8 investors are the buy-and-hold rental buyers.
+BUYER_CATEGORIES = {
+    'fix_flip': 'fix_flip',
+    'creative': 'creative',
+    'subject_to': 'creative',
+    'seller_finance': 'creative',
+    'section8': 'section8',
+    'buy_hold': 'section8'
+}
+
+
+def _buyer_state_categories(row: str) -> str:
+    """FROM/WHERE yielding (state, category) pairs for a buyers row; the comma lists are split with json_each"""
+    def split(column):
+        cleaned = f"replace(replace(COALESCE({row}.{column}, ''), '\\', ''), '\"', '')"
+        return f"""json_each('["' || replace({cleaned}, ',', '","') || '"]')"""
+    case = ' '.join(f"WHEN '{deal_type}' THEN '{category}'" for deal_type, category in BUYER_CATEGORIES.items())
+    return f"""
+        upper(trim(s.value)) AS state, CASE lower(trim(d.value)) {case} END AS category
+        FROM {split('target_states')} s, {split('deal_types')} d
+        WHERE trim(s.value) <> '' AND category IS NOT NULL
+    """
+
+
+# Fills a table created by this run from existing rows
+BACKFILLS = {
+    'pipeline_stage_counts': '''
+        INSERT OR REPLACE INTO pipeline_stage_counts
+            (user_id, stage, deal_count, total_value, weighted_value, version)
+        SELECT user_id, stage, COUNT(*), SUM(COALESCE(assignment_fee, 0)),
+               SUM(COALESCE(assignment_fee, 0) * COALESCE(probability, 0) / 100.0), 1
+        FROM deals
+        GROUP BY user_id, stage
+    ''',
+    'buyer_state_counts': f'''
+        INSERT OR REPLACE INTO buyer_state_counts (state, category, buyer_count, version)
+        SELECT state, category, COUNT(*), 1
+        FROM (SELECT DISTINCT b.id, {_buyer_state_categories('b').replace('FROM ', 'FROM buyers b, ', 1)})
+        GROUP BY state, category
+    ''',
+    'properties_fts': "INSERT INTO properties_fts (properties_fts) VALUES ('rebuild')",
+    'lead_changes': 'INSERT INTO lead_changes (lead_id) SELECT id FROM leads ORDER BY updated_at, id'
+}
+
+# Keep pipeline_stage_counts in step with every write to deals, in the writer's transaction.
+# Any change bumps the version of the stages involved so boards know which columns to re-fetch.
+SCHEMA_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_deals_pipeline_insert AFTER INSERT ON deals
+    BEGIN
+        INSERT INTO pipeline_stage_counts (user_id, stage, deal_count, total_value, weighted_value, version)
+        VALUES (NEW.user_id, NEW.stage, 1, COALESCE(NEW.assignment_fee, 0),
+                COALESCE(NEW.assignment_fee, 0) * COALESCE(NEW.probability, 0) / 100.0, 1)
+        ON CONFLICT (user_id, stage) DO UPDATE SET
+            deal_count = deal_count + 1,
+            total_value = total_value + excluded.total_value,
+            weighted_value = weighted_value + excluded.weighted_value,
+            version = version + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_deals_pipeline_delete AFTER DELETE ON deals
+    BEGIN
+        UPDATE pipeline_stage_counts SET
+            deal_count = deal_count - 1,
+            total_value = total_value - COALESCE(OLD.assignment_fee, 0),
+            weighted_value = weighted_value - COALESCE(OLD.assignment_fee, 0) * COALESCE(OLD.probability, 0) / 100.0,
+            version = version + 1
+        WHERE user_id = OLD.user_id AND stage = OLD.stage;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_deals_pipeline_update AFTER UPDATE ON deals
+    BEGIN
+        UPDATE pipeline_stage_counts SET
+            deal_count = deal_count - 1,
+            total_value = total_value - COALESCE(OLD.assignment_fee, 0),
+            weighted_value = weighted_value - COALESCE(OLD.assignment_fee, 0) * COALESCE(OLD.probability, 0) / 100.0,
+            version = version + 1
+        WHERE user_id = OLD.user_id AND stage = OLD.stage;
+        INSERT INTO pipeline_stage_counts (user_id, stage, deal_count, total_value, weighted_value, version)
+        VALUES (NEW.user_id, NEW.stage, 1, COALESCE(NEW.assignment_fee, 0),
+                COALESCE(NEW.assignment_fee, 0) * COALESCE(NEW.probability, 0) / 100.0, 1)
+        ON CONFLICT (user_id, stage) DO UPDATE SET
+            deal_count = deal_count + 1,
+            total_value = total_value + excluded.total_value,
+            weighted_value = weighted_value + excluded.weighted_value,
+            version = version + 1;
+    END
+    ''',
+    # Keep properties_fts in step with the property text columns
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_properties_fts_insert AFTER INSERT ON properties
+    BEGIN
+        INSERT INTO properties_fts (rowid, address, city, state, zip_code, neighborhood, notes)
+        VALUES (NEW.rowid, NEW.address, NEW.city, NEW.state, NEW.zip_code, NEW.neighborhood, NEW.notes);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_properties_fts_delete AFTER DELETE ON properties
+    BEGIN
+        INSERT INTO properties_fts (properties_fts, rowid, address, city, state, zip_code, neighborhood, notes)
+        VALUES ('delete', OLD.rowid, OLD.address, OLD.city, OLD.state, OLD.zip_code, OLD.neighborhood, OLD.notes);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_properties_fts_update
+    AFTER UPDATE OF address, city, state, zip_code, neighborhood, notes ON properties
+    BEGIN
+        INSERT INTO properties_fts (properties_fts, rowid, address, city, state, zip_code, neighborhood, notes)
+        VALUES ('delete', OLD.rowid, OLD.address, OLD.city, OLD.state, OLD.zip_code, OLD.neighborhood, OLD.notes);
+        INSERT INTO properties_fts (rowid, address, city, state, zip_code, neighborhood, notes)
+        VALUES (NEW.rowid, NEW.address, NEW.city, NEW.state, NEW.zip_code, NEW.neighborhood, NEW.notes);
+    END
+    ''',
+    # Keep buyer_state_counts in step with buyers; every touched row bumps its version (the map ETag)
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_buyers_state_counts_insert AFTER INSERT ON buyers
+    BEGIN
+        INSERT INTO buyer_state_counts (state, category, buyer_count, version)
+        SELECT DISTINCT state, category, 1, 1 FROM (SELECT {_buyer_state_categories('NEW')})
+        WHERE true
+        ON CONFLICT (state, category) DO UPDATE SET
+            buyer_count = buyer_count + 1,
+            version = version + 1;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_buyers_state_counts_delete AFTER DELETE ON buyers
+    BEGIN
+        UPDATE buyer_state_counts SET buyer_count = buyer_count - 1, version = version + 1
+        WHERE (state, category) IN (SELECT {_buyer_state_categories('OLD')});
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_buyers_state_counts_update AFTER UPDATE OF target_states, deal_types ON buyers
+    WHEN OLD.target_states IS NOT NEW.target_states OR OLD.deal_types IS NOT NEW.deal_types
+    BEGIN
+        UPDATE buyer_state_counts SET buyer_count = buyer_count - 1, version = version + 1
+        WHERE (state, category) IN (SELECT {_buyer_state_categories('OLD')});
+        INSERT INTO buyer_state_counts (state, category, buyer_count, version)
+        SELECT DISTINCT state, category, 1, 1 FROM (SELECT {_buyer_state_categories('NEW')})
+        WHERE true
+        ON CONFLICT (state, category) DO UPDATE SET
+            buyer_count = buyer_count + 1,
+            version = version + 1;
+    END
+    ''',
+    # Every write to a lead moves its lead_changes row to the next seq. Writers are serialized,
+    # so a reader that has seen seq N has also seen every change numbered below it.
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_leads_changes_insert AFTER INSERT ON leads
+    BEGIN
+        INSERT OR REPLACE INTO lead_changes (lead_id) VALUES (NEW.id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_leads_changes_update AFTER UPDATE ON leads
+    BEGIN
+        INSERT OR REPLACE INTO lead_changes (lead_id) SELECT OLD.id WHERE OLD.id <> NEW.id;
+        INSERT OR REPLACE INTO lead_changes (lead_id) VALUES (NEW.id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_leads_changes_delete AFTER DELETE ON leads
+    BEGIN
+        INSERT OR REPLACE INTO lead_changes (lead_id) VALUES (OLD.id);
+    END
+    '''
+]
+
+
+def create_schema(cursor: sqlite3.Cursor):
+    """Create every platform table, column, index and trigger that does not exist yet"""
+    existing_tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for ddl in ULTIMATE_SCHEMA.values():
+        cursor.execute(ddl)
+
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})').fetchall()}
+        for column, column_type in columns.items():
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
+    for ddl in SCHEMA_INDEXES:
+        cursor.execute(ddl)
+
+    for table, backfill in BACKFILLS.items():
+        if table not in existing_tables:
+            cursor.execute(backfill)
+
+    for ddl in SCHEMA_TRIGGERS:
+        cursor.execute(ddl)
+
+
+# Fingerprint of all DDL above, kept in PRAGMA user_version so startup can skip create_schema
+SCHEMA_VERSION = zlib.crc32(json.dumps(
+    [ULTIMATE_SCHEMA, ADDED_COLUMNS, SCHEMA_INDEXES, BACKFILLS, SCHEMA_TRIGGERS], sort_keys=True
+).encode()) & 0x7FFFFFFF
+
+
+def ensure_schema(db_path: str = DATABASE_PATH) -> bool:
+    """Run create_schema unless db_path is already at SCHEMA_VERSION; returns True if it ran"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+            return False
+
+        # Re-check under the write lock so concurrent cold starts migrate once
+        conn.execute('BEGIN IMMEDIATE')
+        if conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+            conn.execute('ROLLBACK')
+            return False
+        create_schema(conn.cursor())
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        conn.execute('COMMIT')
+        return True
+    finally:
+        conn.close()
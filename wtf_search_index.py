@@ -0,0 +1,408 @@
+"""
+WTF Search Index - Local BM25 retrieval over scripts, templates and past analyses
+
+Documents are tokenized once into a term-major sparse matrix (CSC-style
+indptr/indices/data arrays). New documents land in a small delta segment
+that is merged into the matrix when it grows, so inserts stay cheap and
+top-k queries only touch the postings of the query terms. Nothing leaves
+the machine: sources are the built-in script library, the templates table
+and the saved property analyses.
+
+    python -m wtf_search_index "divorce seller behind on payments" --user <user_id>
+"""
+
+import argparse
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from wtf_analysis_store import decode_analysis
+from wtf_assistant import FULL_SCRIPT_TEMPLATE, RESPONSES, SCRIPT_TYPES
+from wtf_schema import DATABASE_PATH
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*%?")
+
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could did do does for from had has
+have he her here him his how i if in into is it its just me more my no not of on or our out she so some than
+that the their them then there these they this to too up us was we were what when where which who why will
+with would you your
+""".split())
+
+# Document kinds
+KINDS = ('script', 'template', 'property')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word/number tokens without stopwords; keeps 70% and 3.5 intact"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class SearchIndex:
+    """Incremental BM25 index with visibility filtering by owner and kind"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, min_merge: int = 2000):
+        self.k1 = k1
+        self.b = b
+        self.min_merge = min_merge
+        self._lock = threading.RLock()
+
+        self.vocab = {}
+        self.df = []
+
+        # Per-row document state; rows are never reused, replaced docs leave a dead row
+        self.doc_ids = []
+        self.docs = []
+        self.rows = {}
+        self.row_terms = []
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.live = np.zeros(0, dtype=bool)
+        self.kind_codes = np.zeros(0, dtype=np.int8)
+        self.owner_codes = np.zeros(0, dtype=np.int32)
+        self.owners = {None: 0}
+        self.live_count = 0
+        self.total_len = 0.0
+
+        # Merged postings: term t spans indices/data[indptr[t]:indptr[t + 1]]
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.data = np.zeros(0, dtype=np.float32)
+
+        # Delta postings since the last merge: term id -> ([rows], [tfs])
+        self.delta = {}
+        self.delta_size = 0
+        self.stats = {'documents': 0, 'merges': 0, 'queries': 0}
+
+    # Writes
+    def add_document(self, doc_id: str, text: str, kind: str, owner: Optional[str] = None,
+                     title: str = '', metadata: Dict = None):
+        """Index doc_id, replacing any earlier version; owner None means visible to everyone"""
+        counts = Counter(tokenize(f"{title} {text}"))
+        with self._lock:
+            self._remove(doc_id)
+            row = len(self.doc_ids)
+            self._grow(row + 1)
+
+            self.doc_ids.append(doc_id)
+            self.docs.append({'id': doc_id, 'kind': kind, 'title': title, 'owner': owner,
+                              'snippet': ' '.join(text.split())[:280], 'metadata': metadata or {}})
+            self.rows[doc_id] = row
+            term_ids = []
+            length = float(sum(counts.values()))
+            self.doc_len[row] = length
+            self.live[row] = True
+            self.kind_codes[row] = KINDS.index(kind)
+            self.owner_codes[row] = self.owners.setdefault(owner, len(self.owners))
+            self.live_count += 1
+            self.total_len += length
+
+            for term, tf in counts.items():
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    term_id = self.vocab[term] = len(self.df)
+                    self.df.append(0)
+                self.df[term_id] += 1
+                term_ids.append(term_id)
+                postings = self.delta.setdefault(term_id, ([], []))
+                postings[0].append(row)
+                postings[1].append(tf)
+            self.row_terms.append(tuple(term_ids))
+            self.delta_size += len(counts)
+            self.stats['documents'] = self.live_count
+
+            # Merge once the delta is a tenth of the matrix, keeping merge cost amortized
+            if self.delta_size >= max(self.min_merge, len(self.indices) // 10):
+                self.merge()
+
+    def remove_document(self, doc_id: str) -> bool:
+        with self._lock:
+            removed = self._remove(doc_id)
+            self.stats['documents'] = self.live_count
+            return removed
+
+    def _remove(self, doc_id: str) -> bool:
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self.live[row] = False
+        self.live_count -= 1
+        self.total_len -= float(self.doc_len[row])
+        for term_id in self.row_terms[row]:
+            self.df[term_id] -= 1
+        self.row_terms[row] = ()
+        return True
+
+    def _grow(self, size: int):
+        if size <= len(self.doc_len):
+            return
+        capacity = max(size, 2 * len(self.doc_len), 64)
+        for name in ('doc_len', 'live', 'kind_codes', 'owner_codes'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def merge(self):
+        """Fold the delta segment into the term-major arrays, dropping dead rows"""
+        with self._lock:
+            terms = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))
+            rows = [self.indices]
+            tfs = [self.data]
+            term_parts = [terms]
+            for term_id, (delta_rows, delta_tfs) in self.delta.items():
+                term_parts.append(np.full(len(delta_rows), term_id, dtype=np.int64))
+                rows.append(np.asarray(delta_rows, dtype=np.int32))
+                tfs.append(np.asarray(delta_tfs, dtype=np.float32))
+
+            terms = np.concatenate(term_parts)
+            rows = np.concatenate(rows)
+            tfs = np.concatenate(tfs)
+            keep = self.live[rows]
+            terms, rows, tfs = terms[keep], rows[keep], tfs[keep]
+
+            order = np.lexsort((rows, terms))
+            self.indices = rows[order]
+            self.data = tfs[order]
+            self.indptr = np.zeros(len(self.df) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(terms, minlength=len(self.df)), out=self.indptr[1:])
+
+            self.delta = {}
+            self.delta_size = 0
+            self.stats['merges'] += 1
+
+    # Reads
+    def _postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        if term_id + 1 < len(self.indptr):
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            rows, tfs = self.indices[start:end], self.data[start:end]
+        else:
+            rows, tfs = self.indices[:0], self.data[:0]
+        if term_id in self.delta:
+            delta_rows, delta_tfs = self.delta[term_id]
+            rows = np.concatenate([rows, np.asarray(delta_rows, dtype=np.int32)])
+            tfs = np.concatenate([tfs, np.asarray(delta_tfs, dtype=np.float32)])
+        return rows, tfs
+
+    def search(self, query: str, k: int = 5, owner: Optional[str] = None,
+               kinds: Iterable[str] = None) -> List[Dict]:
+        """Top-k documents by BM25, limited to shared docs plus those owned by owner"""
+        terms = [self.vocab[t] for t in dict.fromkeys(tokenize(query)) if t in self.vocab]
+        with self._lock:
+            self.stats['queries'] += 1
+            if not terms or not self.live_count:
+                return []
+
+            size = len(self.doc_ids)
+            avg_len = self.total_len / self.live_count or 1.0
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[:size] / avg_len)
+            scores = np.zeros(size, dtype=np.float32)
+            for term_id in terms:
+                df = self.df[term_id]
+                if df <= 0:
+                    continue
+                rows, tfs = self._postings(term_id)
+                idf = math.log(1 + (self.live_count - df + 0.5) / (df + 0.5))
+                np.add.at(scores, rows, idf * tfs * (self.k1 + 1) / (tfs + norm[rows]))
+
+            visible = self.live[:size] & (scores > 0)
+            owner_code = self.owners.get(owner)
+            owned = self.owner_codes[:size] == 0
+            if owner_code:
+                owned |= self.owner_codes[:size] == owner_code
+            visible &= owned
+            if kinds is not None:
+                visible &= np.isin(self.kind_codes[:size], [KINDS.index(kind) for kind in kinds])
+
+            candidates = np.nonzero(visible)[0]
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+            return [{**self.docs[row], 'score': round(float(scores[row]), 4)} for row in candidates]
+
+
+def _flatten(value, depth: int = 0) -> Iterable[str]:
+    """String leaves of nested analysis JSON (keys for scalars so 'grade A' stays searchable)"""
+    if depth > 4:
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                yield from _flatten(item, depth + 1)
+            elif isinstance(item, str):
+                yield f"{key.replace('_', ' ')} {item}"
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, str):
+                yield item
+            else:
+                yield from _flatten(item, depth + 1)
+
+
+def script_documents() -> Iterable[Dict]:
+    """Built-in script library: canned assistant replies, script openers and 5x5 sections"""
+    for ai_type, replies in RESPONSES.items():
+        for intent, text in replies.items():
+            yield {'doc_id': f"script:{ai_type}:{intent}", 'kind': 'script', 'text': text,
+                   'title': f"{ai_type.title()} - {intent.replace('_', ' ').title()}"}
+
+    for script_type, data in SCRIPT_TYPES.items():
+        yield {'doc_id': f"script:{script_type}", 'kind': 'script', 'title': data['title'],
+               'text': f"{data['introduction']}\n{data['opening']}", 'metadata': {'script_type': script_type}}
+
+    for section in re.split(r'\n(?=## )', FULL_SCRIPT_TEMPLATE):
+        heading, _, body = section.strip().partition('\n')
+        if '{' in heading or not body.strip():
+            continue
+        title = heading.lstrip('# ').strip()
+        yield {'doc_id': f"script:5x5:{title}", 'kind': 'script', 'title': f"5x5 Script - {title}", 'text': body}
+
+
+class DatabaseSearchIndex(SearchIndex):
+    """SearchIndex fed from wtf_ultimate.db, picking up new rows by (updated_at, id) watermark"""
+
+    SOURCES = {
+        'templates': '''
+            SELECT id, user_id, is_public, template_type, template_name, content, updated_at
+            FROM templates
+            WHERE updated_at > ? OR (updated_at = ? AND id > ?)
+            ORDER BY updated_at, id
+        ''',
+        'properties': '''
+            SELECT p.id, p.user_id, p.address, p.city, p.state, p.zip_code, p.property_type, p.bedrooms,
+                   p.bathrooms, p.square_feet, p.list_price, p.arv, p.rehab_cost, p.max_offer,
+                   p.profit_potential, p.condition, p.notes, p.analysis_data,
+                   b.codec AS analysis_codec, b.data AS analysis_blob, p.updated_at
+            FROM properties p
+            LEFT JOIN analysis_blobs b ON b.hash = p.analysis_hash
+            WHERE p.updated_at > ? OR (p.updated_at = ? AND p.id > ?)
+            ORDER BY p.updated_at, p.id
+        '''
+    }
+
+    def __init__(self, db_path: str = DATABASE_PATH, refresh_interval: float = 5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.watermarks = {table: ('', '') for table in self.SOURCES}
+        self._next_refresh = 0.0
+        for doc in script_documents():
+            self.add_document(doc['doc_id'], doc['text'], doc['kind'], title=doc['title'],
+                              metadata=doc.get('metadata'))
+        self.stats['rows_indexed'] = 0
+
+    def refresh(self, force: bool = False) -> int:
+        """Index rows inserted since the last refresh; returns how many were added"""
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return 0
+        self._next_refresh = now + self.refresh_interval
+        if not os.path.exists(self.db_path):
+            return 0
+
+        added = 0
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            for table, sql in self.SOURCES.items():
+                updated_at, last_id = self.watermarks[table]
+                cursor.execute(sql, (updated_at, updated_at, last_id))
+                columns = [d[0] for d in cursor.description]
+                for row in cursor.fetchall():
+                    record = dict(zip(columns, row))
+                    if table == 'templates':
+                        self.add_template(record)
+                    else:
+                        self.add_property(record)
+                    self.watermarks[table] = (record['updated_at'] or '', record['id'])
+                    added += 1
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Search index refresh failed: {str(e)}")
+        self.stats['rows_indexed'] += added
+        return added
+
+    def add_template(self, template: Dict):
+        owner = None if template.get('is_public') else template.get('user_id')
+        self.add_document(f"template:{template['id']}", template.get('content') or '', 'template', owner=owner,
+                          title=template.get('template_name') or '',
+                          metadata={'template_type': template.get('template_type')})
+
+    def add_property(self, prop: Dict):
+        """Index a saved property with the text of its analysis for comparable-deal lookups"""
+        analysis = decode_analysis(prop.get('analysis_data'), prop.get('analysis_codec'), prop.get('analysis_blob'))
+
+        strategies = analysis.get('strategies', {})
+        grade = analysis.get('grade') or analysis.get('investment_grade')
+        text = ' '.join(str(part) for part in [
+            prop.get('address'), prop.get('city'), prop.get('state'), prop.get('zip_code'),
+            (prop.get('property_type') or '').replace('_', ' '), prop.get('condition'),
+            f"{prop.get('bedrooms') or ''} bed {prop.get('bathrooms') or ''} bath",
+            f"grade {grade}" if grade else '',
+            ' '.join(s.replace('_', ' ') for s in strategies) if strategies else '',
+            prop.get('notes') or '',
+            *_flatten({k: v for k, v in analysis.items() if k not in ('strategies', 'market_data')})
+        ] if part)
+
+        self.add_document(f"property:{prop['id']}", text, 'property', owner=prop.get('user_id'),
+                          title=prop.get('address') or '', metadata={
+                              'city': prop.get('city'), 'state': prop.get('state'),
+                              'list_price': prop.get('list_price'), 'arv': prop.get('arv'),
+                              'max_offer': prop.get('max_offer'), 'profit_potential': prop.get('profit_potential'),
+                              'grade': grade, 'grade_score': analysis.get('grade_score')})
+
+    def search(self, query: str, k: int = 5, owner: Optional[str] = None,
+               kinds: Iterable[str] = None) -> List[Dict]:
+        self.refresh()
+        return super().search(query, k=k, owner=owner, kinds=kinds)
+
+    def comparable_deals(self, property_data: Dict, owner: Optional[str], k: int = 3) -> List[Dict]:
+        """The owner's past analyses most similar to property_data"""
+        query = ' '.join(str(property_data.get(field) or '') for field in
+                         ('address', 'city', 'state', 'zip_code', 'property_type', 'condition', 'strategy'))
+        results = self.search(query, k=k + 1, owner=owner, kinds=['property'])
+        return [r for r in results if r['owner'] == owner and r['title'] != property_data.get('address')][:k]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_search_index(db_path: str = DATABASE_PATH) -> DatabaseSearchIndex:
+    """Process-wide index for db_path, built on first use"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None or _default_index.db_path != db_path:
+            _default_index = DatabaseSearchIndex(db_path)
+        return _default_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the local script/template/deal index')
+    parser.add_argument('query')
+    parser.add_argument('--db', default=DATABASE_PATH)
+    parser.add_argument('--user', default=None, help='Include documents owned by this user id')
+    parser.add_argument('--kind', action='append', choices=KINDS)
+    parser.add_argument('-k', type=int, default=5)
+    args = parser.parse_args()
+
+    index = get_search_index(args.db)
+    start = time.perf_counter()
+    index.refresh(force=True)
+    logger.info(f"Indexed {index.live_count} documents in {time.perf_counter() - start:.2f}s")
+    for result in index.search(args.query, k=args.k, owner=args.user, kinds=args.kind):
+        print(f"{result['score']:8.3f}  [{result['kind']}] {result['title']}  {result['snippet'][:100]}")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    main()
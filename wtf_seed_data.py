@@ -0,0 +1,414 @@
+"""
+WTF Seed Data - Deterministic synthetic data generator for load testing
+
+Creates production-scale volumes of users, properties, leads, buyers, deals,
+usage and activity rows in the ultimate platform schema. The same seed and
+--as-of date always produce the same database.
+
+    python wtf_seed_data.py --db bench.db --users 200 --properties 50000 --seed 42
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Iterator, Tuple
+
+from wtf_market_data import MARKET_DATA, STATE_ZIP_PREFIXES
+from wtf_schema import create_schema
+
+BATCH_SIZE = 5000
+
+# Preset volumes; every count can be overridden from the command line
+SIZE_PRESETS = {
+    'small': {'users': 20, 'properties': 1000, 'leads': 2000, 'buyers': 200, 'deals': 500,
+              'usage_days': 30, 'activity': 5000, 'notifications': 500},
+    'medium': {'users': 200, 'properties': 20000, 'leads': 40000, 'buyers': 2000, 'deals': 10000,
+               'usage_days': 60, 'activity': 100000, 'notifications': 10000},
+    'large': {'users': 1000, 'properties': 200000, 'leads': 400000, 'buyers': 10000, 'deals': 100000,
+              'usage_days': 90, 'activity': 1000000, 'notifications': 100000}
+}
+
+FIRST_NAMES = ['James', 'Maria', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David', 'Sarah', 'Thomas',
+               'Lisa', 'Carlos', 'Angela', 'Kevin', 'Nicole', 'Brian', 'Rachel', 'Marcus', 'Emily']
+LAST_NAMES = ['Smith', 'Garcia', 'Johnson', 'Brown', 'Lee', 'Davis', 'Martinez', 'Wilson', 'Anderson',
+              'Chen', 'Taylor', 'Thomas', 'Moore', 'Jackson', 'White', 'Harris', 'Clark', 'Lewis']
+STREET_NAMES = ['Elm', 'Oak', 'Pine', 'Maple', 'Cedar', 'Main', 'Park', 'Lake', 'Hill', 'Washington',
+                'Sunset', 'Willow', 'Magnolia', 'Pecan', 'Highland', 'River', 'Meadow', 'Forest']
+STREET_TYPES = ['Street', 'Avenue', 'Road', 'Drive', 'Lane', 'Boulevard', 'Court', 'Way']
+NEIGHBORHOODS = ['Downtown', 'Midtown', 'Uptown', 'Suburbs', 'Historic District', 'Waterfront']
+
+# (value, weight) tables for categorical columns
+TIER_WEIGHTS = [('free', 50), ('starter', 25), ('pro', 18), ('enterprise', 7)]
+PROPERTY_TYPE_WEIGHTS = [('single_family', 70), ('townhouse', 10), ('condo', 8), ('multi_family', 12)]
+CONDITION_WEIGHTS = [('excellent', 8), ('good', 27), ('fair', 35), ('poor', 20), ('needs_rehab', 10)]
+LEAD_STATUS_WEIGHTS = [('new', 35), ('contacted', 25), ('interested', 15), ('callback', 12),
+                       ('not_interested', 8), ('converted', 5)]
+LEAD_SOURCE_WEIGHTS = [('cold_calling', 30), ('direct_mail', 20), ('driving_for_dollars', 12),
+                       ('referral', 10), ('seo', 10), ('ppc', 8), ('facebook', 10)]
+MOTIVATIONS = ['Divorce', 'Financial hardship', 'Job relocation', 'Inherited property', 'Tired landlord',
+               'Foreclosure', 'Downsizing', 'Medical bills', 'Code violations']
+TIMELINES = ['ASAP', '30-60 days', '60-90 days', 'Flexible', '3-6 months']
+DEAL_STAGE_WEIGHTS = [('prospecting', 30), ('analysis', 20), ('negotiation', 15), ('under_contract', 12),
+                      ('marketing', 10), ('closing', 6), ('closed', 7)]
+DEAL_TYPE_WEIGHTS = [('wholesale', 65), ('fix_flip', 15), ('buy_hold', 10), ('creative_finance', 10)]
+USAGE_ACTIONS = [('deal_analysis', 3.0), ('lead_management', 4.0), ('loi_generation', 0.8),
+                 ('contract_generation', 0.3), ('email_campaigns', 0.5)]
+ACTIVITY_TYPES = [('login', 20), ('deal_analysis', 30), ('lead_update', 25), ('deal_update', 12),
+                  ('loi_generated', 8), ('contract_generated', 5)]
+NOTIFICATION_TYPES = [('info', 60), ('warning', 25), ('success', 15)]
+
+# Bulk-load pragmas: no journal or fsync while loading, big page cache
+BULK_LOAD_PRAGMAS = [
+    'PRAGMA journal_mode = OFF',
+    'PRAGMA synchronous = OFF',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -262144',
+    'PRAGMA locking_mode = EXCLUSIVE',
+    'PRAGMA foreign_keys = OFF'
+]
+RESTORE_PRAGMAS = [
+    'PRAGMA locking_mode = NORMAL',
+    'PRAGMA synchronous = FULL',
+    'PRAGMA journal_mode = DELETE'
+]
+
+
+class SyntheticDataGenerator:
+    """Generates realistic, seed-deterministic platform data"""
+
+    def __init__(self, seed: int = 42, as_of: datetime = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.as_of = as_of or datetime.now().replace(microsecond=0)
+        self.markets = [
+            (state, city, data)
+            for state, cities in MARKET_DATA.items()
+            for city, data in cities.items()
+        ]
+        # Bigger markets see proportionally more activity
+        self.market_weights = [math.sqrt(data['median_price']) for _, _, data in self.markets]
+
+    # Primitive helpers
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _choice(self, weighted: List[Tuple[str, float]]) -> str:
+        values, weights = zip(*weighted)
+        return self.rng.choices(values, weights=weights)[0]
+
+    def _timestamp(self, max_days_ago: int, min_days_ago: int = 0) -> str:
+        seconds = self.rng.randint(min_days_ago * 86400, max_days_ago * 86400)
+        return (self.as_of - timedelta(seconds=seconds)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _phone(self) -> str:
+        return f"({self.rng.randint(200, 999)}) {self.rng.randint(200, 999)}-{self.rng.randint(0, 9999):04d}"
+
+    def _market(self) -> Tuple[str, str, Dict]:
+        return self.rng.choices(self.markets, weights=self.market_weights)[0]
+
+    def _zip_code(self, state: str) -> str:
+        prefixes = STATE_ZIP_PREFIXES.get(state, ['100'])
+        return f"{self.rng.choice(prefixes)}{self.rng.randint(0, 99):02d}"
+
+    def _address(self) -> str:
+        return (f"{self.rng.randint(100, 9999)} {self.rng.choice(STREET_NAMES)} "
+                f"{self.rng.choice(STREET_TYPES)}")
+
+    # Row generators
+    def users(self, count: int) -> Iterator[Tuple]:
+        password_hash = hashlib.sha256('demo123'.encode()).hexdigest()
+        preferences = json.dumps({'notifications': True, 'email_updates': True, 'theme': 'dark'})
+        for i in range(count):
+            role = 'admin' if i == 0 else ('buyer' if self.rng.random() < 0.15 else 'wholesaler')
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            username = f"user{i:06d}"
+            yield (self._uuid(), username, f"{username}@example.com", password_hash, role,
+                   f"{first} {last}", self._phone(), f"{last} Investments LLC",
+                   'enterprise' if i == 0 else self._choice(TIER_WEIGHTS),
+                   f"{self.rng.getrandbits(128):032x}", preferences, self._timestamp(365, 30))
+
+    def properties(self, count: int, user_ids: List[str]) -> Iterator[Tuple]:
+        current_year = self.as_of.year
+        for _ in range(count):
+            state, city, market = self._market()
+            property_type = self._choice(PROPERTY_TYPE_WEIGHTS)
+            condition = self._choice(CONDITION_WEIGHTS)
+            bedrooms = max(1, min(6, int(round(self.rng.gauss(3.2, 0.9)))))
+            bathrooms = max(1.0, round(bedrooms * self.rng.uniform(0.5, 0.9) * 2) / 2)
+            square_feet = max(600, int(self.rng.gauss(550 + bedrooms * 420, 250)))
+            year_built = min(current_year, int(self.rng.triangular(1920, current_year, 1995)))
+
+            # Prices are lognormal around the city median, scaled by size
+            size_factor = square_feet / 1900
+            list_price = round(market['median_price'] * size_factor * self.rng.lognormvariate(0, 0.22), -2)
+            arv = round(list_price * self.rng.uniform(1.05, 1.35), -2)
+            rehab_per_sqft = {'excellent': 0, 'good': 8, 'fair': 18, 'poor': 32, 'needs_rehab': 50}[condition]
+            rehab_cost = square_feet * rehab_per_sqft + 15000
+            max_offer = max(0, arv * 0.70 - rehab_cost)
+            rent_estimate = round(square_feet * market['rent_psf'] * self.rng.uniform(0.85, 1.15))
+
+            yield (self._uuid(), self.rng.choice(user_ids), self._address(), city.title(), state.upper(),
+                   self._zip_code(state), property_type, bedrooms, bathrooms, square_feet, year_built,
+                   list_price, round(list_price * self.rng.uniform(0.95, 1.05)), rent_estimate, arv,
+                   rehab_cost, max_offer, arv - max_offer - rehab_cost, condition,
+                   int(self.rng.expovariate(1 / 35)), round(list_price / square_feet, 2),
+                   f"{city.title()} - {self.rng.choice(NEIGHBORHOODS)}", self.rng.randint(3, 10),
+                   self.rng.randint(30, 95), self.rng.randint(20, 98),
+                   round(list_price * market['tax_rate']), self.rng.choice([0, 0, 0, 75, 150, 250]),
+                   'Synthetic', *[self._timestamp(365)] * 2)
+
+    def leads(self, count: int, user_ids: List[str], property_rows: List[Tuple]) -> Iterator[Tuple]:
+        for _ in range(count):
+            prop = self.rng.choice(property_rows) if property_rows else None
+            status = self._choice(LEAD_STATUS_WEIGHTS)
+            score = max(0, min(100, int(self.rng.betavariate(2.5, 2.0) * 100)))
+            estimated_value = prop[12] if prop else round(self.rng.uniform(120000, 600000), -3)
+            owed = round(estimated_value * self.rng.uniform(0, 0.9), -2)
+            created_at = self._timestamp(180)
+
+            # Active leads get a follow-up within +/- two weeks of as_of
+            next_followup = None
+            if status in ('new', 'contacted', 'interested', 'callback'):
+                offset = timedelta(hours=self.rng.randint(-14 * 24, 14 * 24))
+                next_followup = (self.as_of + offset).strftime('%Y-%m-%d %H:%M:%S')
+
+            address = f"{prop[2]}, {prop[3]}, {prop[4]}" if prop else self._address()
+            yield (self._uuid(), self.rng.choice(user_ids), self.rng.choice(FIRST_NAMES),
+                   self.rng.choice(LAST_NAMES), self._phone(), f"lead{self.rng.getrandbits(32):08x}@example.com",
+                   address, prop[0] if prop else None, self.rng.choice(MOTIVATIONS),
+                   self.rng.choice(TIMELINES), self._choice(LEAD_SOURCE_WEIGHTS), status, score,
+                   prop[18] if prop else 'fair', estimated_value, owed, round(owed * 0.0065, 2),
+                   estimated_value - owed, self._timestamp(30), next_followup,
+                   self.rng.randint(0, 8), 'high' if score >= 75 else 'medium' if score >= 45 else 'low',
+                   round(score / 100 * self.rng.uniform(0.6, 1.0), 3), created_at, created_at)
+
+    def buyers(self, count: int, user_ids: List[str]) -> Iterator[Tuple]:
+        states = list(MARKET_DATA.keys())
+        for _ in range(count):
+            target_states = self.rng.sample(states, k=self.rng.randint(1, min(3, len(states))))
+            target_cities = [self.rng.choice(list(MARKET_DATA[s].keys())).title() for s in target_states]
+            min_price = round(self.rng.uniform(50000, 400000), -4)
+            max_price = min_price + round(self.rng.uniform(100000, 800000), -4)
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            yield (self._uuid(), self.rng.choice(user_ids), f"{first} {last}",
+                   f"{first.lower()}.{last.lower()}{self.rng.randint(1, 999)}@example.com", self._phone(),
+                   f"{last} Capital", ','.join(self.rng.sample([p for p, _ in PROPERTY_TYPE_WEIGHTS],
+                                                               k=self.rng.randint(1, 3))),
+                   min_price, max_price, ','.join(s.upper() for s in target_states), ','.join(target_cities),
+                   ','.join(self.rng.sample(['cash', 'creative', 'subject_to', 'fix_flip', 'buy_hold'],
+                                            k=self.rng.randint(1, 3))),
+                   int(self.rng.random() < 0.7), int(self.rng.random() < 0.6),
+                   round(max_price * self.rng.uniform(0.5, 3.0), -3), self.rng.randint(0, 60),
+                   round(self.rng.uniform(3.0, 5.0), 1), self._timestamp(720))
+
+    def deals(self, count: int, user_ids: List[str], property_rows: List[Tuple]) -> Iterator[Tuple]:
+        for _ in range(count):
+            prop = self.rng.choice(property_rows) if property_rows else None
+            stage = self._choice(DEAL_STAGE_WEIGHTS)
+            contract_price = prop[16] if prop else round(self.rng.uniform(80000, 400000), -3)
+            assignment_fee = round(self.rng.lognormvariate(math.log(15000), 0.45), -2)
+            profit = (prop[17] if prop else assignment_fee)
+            created_at = self._timestamp(240)
+            yield (self._uuid(), self.rng.choice(user_ids),
+                   f"{prop[2] if prop else self._address()} - {stage.replace('_', ' ').title()}",
+                   prop[0] if prop else None, contract_price, assignment_fee,
+                   'closed' if stage == 'closed' else 'active', stage,
+                   {'prospecting': 10, 'analysis': 20, 'negotiation': 35, 'under_contract': 60,
+                    'marketing': 70, 'closing': 90, 'closed': 100}[stage],
+                   (self.as_of + timedelta(days=self.rng.randint(-30, 60))).strftime('%Y-%m-%d'),
+                   profit, round(profit / contract_price * 100, 2) if contract_price else 0,
+                   self._choice(DEAL_TYPE_WEIGHTS), assignment_fee if stage == 'closed' else 0,
+                   created_at, created_at)
+
+    def usage(self, days: int, user_ids: List[str]) -> Iterator[Tuple]:
+        """One row per (user, day, action), matching track_usage's daily rollup"""
+        start = self.as_of.date() - timedelta(days=days - 1)
+        for user_id in user_ids:
+            intensity = self.rng.lognormvariate(0, 0.6)
+            for offset in range(days):
+                day = start + timedelta(days=offset)
+                for action, rate in USAGE_ACTIONS:
+                    count = self._poisson(rate * intensity)
+                    if count:
+                        yield (self._uuid(), user_id, action, action, count, day.isoformat(), '',
+                               f"{day.isoformat()} 12:00:00")
+
+    def activity(self, count: int, user_ids: List[str]) -> Iterator[Tuple]:
+        for _ in range(count):
+            action = self._choice(ACTIVITY_TYPES)
+            yield (self._uuid(), self.rng.choice(user_ids), action,
+                   f"{action.replace('_', ' ').title()} performed", '', '',
+                   json.dumps({'ip_address': '127.0.0.1', 'user_agent': 'Synthetic'}),
+                   self._timestamp(90))
+
+    def notifications(self, count: int, user_ids: List[str]) -> Iterator[Tuple]:
+        for _ in range(count):
+            created = self._timestamp(14)
+            expires = (datetime.strptime(created, '%Y-%m-%d %H:%M:%S') +
+                       timedelta(hours=self.rng.choice([24, 72, 168, 720]))).strftime('%Y-%m-%d %H:%M:%S')
+            yield (self._uuid(), self.rng.choice(user_ids), 'Pipeline update',
+                   'A deal in your pipeline needs attention', self._choice(NOTIFICATION_TYPES),
+                   int(self.rng.random() < 0.55), '/deal_pipeline', self.rng.randint(1, 3), expires, created)
+
+    def _poisson(self, lam: float) -> int:
+        # Knuth's method; rates here are small so the loop is short
+        threshold = math.exp(-lam)
+        k, p = 0, 1.0
+        while True:
+            p *= self.rng.random()
+            if p <= threshold:
+                return k
+            k += 1
+
+
+INSERT_SQL = {
+    'users': '''INSERT INTO users (id, username, email, password_hash, role, full_name, phone, company,
+                subscription_tier, api_key, preferences, created_at) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)''',
+    'properties': '''INSERT INTO properties (id, user_id, address, city, state, zip_code, property_type,
+                bedrooms, bathrooms, square_feet, year_built, list_price, zestimate, rent_estimate, arv,
+                rehab_cost, max_offer, profit_potential, condition, days_on_market, price_per_sqft,
+                neighborhood, school_rating, crime_score, walkability, property_taxes, hoa_fees,
+                data_sources, created_at, updated_at)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''',
+    'leads': '''INSERT INTO leads (id, user_id, first_name, last_name, phone, email, property_address,
+                property_id, motivation, timeline, source, status, score, property_condition,
+                estimated_value, owed_amount, monthly_payment, equity, last_contact, next_followup,
+                contact_attempts, priority, conversion_probability, created_at, updated_at)
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''',
+    'buyers': '''INSERT INTO buyers (id, user_id, name, email, phone, company, property_types, min_price,
+                max_price, target_states, target_cities, deal_types, verified, proof_of_funds,
+                cash_available, deals_closed, rating, created_at) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''',
+    'deals': '''INSERT INTO deals (id, user_id, title, property_id, contract_price, assignment_fee, status,
+                stage, probability, expected_close_date, profit_margin, roi, deal_type, net_profit,
+                created_at, updated_at) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)''',
+    'usage_tracking': '''INSERT INTO usage_tracking (id, user_id, action_type, resource_used, count, date,
+                details, created_at) VALUES (?,?,?,?,?,?,?,?)''',
+    'activity_log': '''INSERT INTO activity_log (id, user_id, action_type, action_description, entity_type,
+                entity_id, metadata, created_at) VALUES (?,?,?,?,?,?,?,?)''',
+    'notifications': '''INSERT INTO notifications (id, user_id, title, message, type, read_status, action_url,
+                priority, expires_at, created_at) VALUES (?,?,?,?,?,?,?,?,?,?)'''
+}
+
+# Indexes the hot-path queries rely on; built after the load, which is much faster
+SEED_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_properties_user ON properties (user_id, created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_leads_user ON leads (user_id, status)',
+    'CREATE INDEX IF NOT EXISTS idx_leads_followup ON leads (next_followup)',
+    'CREATE INDEX IF NOT EXISTS idx_deals_user_stage ON deals (user_id, stage)',
+    'CREATE INDEX IF NOT EXISTS idx_usage_user_action_date ON usage_tracking (user_id, action_type, date)',
+    'CREATE INDEX IF NOT EXISTS idx_activity_user ON activity_log (user_id, created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications (user_id, read_status, expires_at)'
+]
+
+
+def _insert_batches(cursor: sqlite3.Cursor, table: str, rows: Iterator[Tuple],
+                    collect: List = None) -> int:
+    """executemany in BATCH_SIZE chunks; optionally keep the rows for later tables"""
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            cursor.executemany(INSERT_SQL[table], batch)
+            total += len(batch)
+            if collect is not None:
+                collect.extend(batch)
+            batch = []
+    if batch:
+        cursor.executemany(INSERT_SQL[table], batch)
+        total += len(batch)
+        if collect is not None:
+            collect.extend(batch)
+    return total
+
+
+def seed_database(db_path: str, volumes: Dict, seed: int = 42, as_of: datetime = None,
+                  reset: bool = False, verbose: bool = True) -> Dict:
+    """Populate db_path with synthetic data; returns row counts and timings"""
+    generator = SyntheticDataGenerator(seed=seed, as_of=as_of)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    cursor = conn.cursor()
+
+    for pragma in BULK_LOAD_PRAGMAS:
+        cursor.execute(pragma)
+
+    create_schema(cursor)
+    if reset:
+        for table in INSERT_SQL:
+            cursor.execute(f'DELETE FROM {table}')
+
+    counts = {}
+    timings = {}
+
+    def load(table, rows, collect=None):
+        start = time.perf_counter()
+        cursor.execute('BEGIN')
+        counts[table] = _insert_batches(cursor, table, rows, collect)
+        cursor.execute('COMMIT')
+        timings[table] = round(time.perf_counter() - start, 3)
+        if verbose:
+            print(f"  {table:<16} {counts[table]:>10,} rows  {timings[table]:>7.2f}s")
+
+    user_rows: List[Tuple] = []
+    property_rows: List[Tuple] = []
+
+    load('users', generator.users(volumes['users']), user_rows)
+    wholesaler_ids = [row[0] for row in user_rows if row[4] != 'buyer'] or [row[0] for row in user_rows]
+    all_user_ids = [row[0] for row in user_rows]
+
+    load('properties', generator.properties(volumes['properties'], wholesaler_ids), property_rows)
+    load('leads', generator.leads(volumes['leads'], wholesaler_ids, property_rows))
+    load('buyers', generator.buyers(volumes['buyers'], all_user_ids))
+    load('deals', generator.deals(volumes['deals'], wholesaler_ids, property_rows))
+    load('usage_tracking', generator.usage(volumes['usage_days'], all_user_ids))
+    load('activity_log', generator.activity(volumes['activity'], all_user_ids))
+    load('notifications', generator.notifications(volumes['notifications'], all_user_ids))
+
+    start = time.perf_counter()
+    for ddl in SEED_INDEXES:
+        cursor.execute(ddl)
+    cursor.execute('ANALYZE')
+    timings['indexes'] = round(time.perf_counter() - start, 3)
+
+    for pragma in RESTORE_PRAGMAS:
+        cursor.execute(pragma)
+    conn.close()
+
+    return {'db_path': db_path, 'seed': seed, 'as_of': generator.as_of.isoformat(),
+            'counts': counts, 'timings': timings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic WTF platform data for load testing')
+    parser.add_argument('--db', default='wtf_synthetic.db', help='SQLite database to populate')
+    parser.add_argument('--size', choices=sorted(SIZE_PRESETS), default='small', help='Volume preset')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--as-of', help='Anchor date (YYYY-MM-DD) for timestamps; defaults to today')
+    parser.add_argument('--reset', action='store_true', help='Delete existing rows in seeded tables first')
+    for name in SIZE_PRESETS['small']:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name,
+                            help=f"Override {name} count")
+    args = parser.parse_args()
+
+    volumes = dict(SIZE_PRESETS[args.size])
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+
+    as_of = datetime.strptime(args.as_of, '%Y-%m-%d') if args.as_of else None
+
+    print(f"Seeding {args.db} (size={args.size}, seed={args.seed})")
+    start = time.perf_counter()
+    result = seed_database(args.db, volumes, seed=args.seed, as_of=as_of, reset=args.reset)
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    print(json.dumps(result['counts']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+WTF Sensitivity - What-if grids for max-offer decisions
+
+Evaluates offer % x rehab multiplier x ARV haircut x assignment fee in one
+NumPy broadcast and returns compact float32 arrays for heatmaps. Grids are
+cached by a hash of their inputs, so moving a slider on the analyzer page only
+re-slices a grid that already exists.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+AXES = ('offer_pct', 'rehab_multiplier', 'arv_haircut', 'assignment_fee')
+
+DEFAULT_AXES = {
+    'offer_pct': np.round(np.arange(0.60, 0.9001, 0.01), 2),
+    'rehab_multiplier': np.array([0.8, 0.9, 1.0, 1.1, 1.25, 1.5]),
+    'arv_haircut': np.array([0.0, 0.05, 0.10, 0.15, 0.20]),
+    'assignment_fee': np.array([5000, 8000, 12000, 15000, 20000, 25000, 30000, 40000, 50000], dtype=float)
+}
+
+# Fixed wholesale closing costs (marketing, legal, inspection, earnest money)
+WHOLESALE_COSTS = 1000 + 800 + 500 + 1000
+
+GRADES = np.array(['A', 'B', 'C', 'D'])
+
+
+def _grade_codes(score: np.ndarray) -> np.ndarray:
+    """0..3 for A..D using the analyzer's grade thresholds"""
+    return np.select([score >= 85, score >= 70, score >= 55], [0, 1, 2], default=3).astype(np.int8)
+
+
+def evaluate_grid(arv: float, rehab_cost: float, list_price: float, params: Dict,
+                  axes: Optional[Dict] = None, market_score: float = 16) -> Dict:
+    """Profit, ROI and grade for every combination of the four axes
+
+    The contract price follows the analyzer's max-offer rule
+    (ARV x offer % - estimated rehab). The end buyer flips at the realized ARV
+    with the real rehab cost, using the fix & flip cost model. market_score
+    stands in for the random market component of calculate_deal_grade_score.
+    """
+    axes = {name: np.asarray((axes or {}).get(name, DEFAULT_AXES[name]), dtype=float) for name in AXES}
+    offer_pct = axes['offer_pct'][:, None, None, None]
+    rehab_multiplier = axes['rehab_multiplier'][None, :, None, None]
+    arv_haircut = axes['arv_haircut'][None, None, :, None]
+    fee = axes['assignment_fee'][None, None, None, :]
+
+    contract_price = np.maximum(0.0, arv * offer_pct - rehab_cost)
+    realized_arv = arv * (1 - arv_haircut)
+    actual_rehab = rehab_cost * rehab_multiplier
+
+    # End buyer's flip after paying contract price + assignment fee
+    holding_period = params.get('holding_period', 6)
+    buyer_basis = contract_price + fee + actual_rehab
+    flip_costs = (buyer_basis * (1 + 0.01 * holding_period + 0.02) + realized_arv * 0.08 + actual_rehab * 0.1)
+    flip_profit = realized_arv - flip_costs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        flip_roi = np.where(buyer_basis > 0, flip_profit / buyer_basis * 100, 0.0)
+
+    # Wholesaler's side depends on the fee only, but is broadcast for easy slicing
+    wholesale_profit = np.broadcast_to(fee - WHOLESALE_COSTS, flip_profit.shape)
+    wholesale_roi = wholesale_profit / WHOLESALE_COSTS * 100
+
+    # Vectorized calculate_deal_grade_score on the wholesaler's total spread
+    spread = realized_arv - contract_price - actual_rehab
+    profit_ratio = spread / arv if arv > 0 else np.zeros_like(spread)
+    score = np.select([profit_ratio >= 0.20, profit_ratio >= 0.15, profit_ratio >= 0.10, profit_ratio >= 0.05],
+                      [40, 32, 24, 16], default=np.maximum(0, profit_ratio * 320))
+    score = score + (20 if list_price < arv * 0.85 else 15 if list_price < arv * 0.95
+                     else 10 if list_price < arv * 1.05 else 5)
+    target = params.get('target_roi', 15) / 100
+    estimated_roi = spread / list_price if list_price > 0 else np.zeros_like(spread)
+    score = score + np.where(estimated_roi >= target, 20, np.maximum(0, estimated_roi / target * 20))
+    score = np.minimum(100, np.round(score + market_score))
+
+    shape = flip_profit.shape
+    return {
+        'axes': {name: axes[name].tolist() for name in AXES},
+        'shape': list(shape),
+        'contract_price': np.broadcast_to(contract_price, shape).astype(np.float32),
+        'buyer_profit': flip_profit.astype(np.float32),
+        'buyer_roi': flip_roi.astype(np.float32),
+        'wholesale_profit': wholesale_profit.astype(np.float32),
+        'wholesale_roi': wholesale_roi.astype(np.float32),
+        'spread': np.broadcast_to(spread, shape).astype(np.float32),
+        'grade_score': np.broadcast_to(score, shape).astype(np.float32),
+        'grade_code': _grade_codes(np.broadcast_to(score, shape))
+    }
+
+
+def nearest_index(grid: Dict, axis: str, value: float) -> int:
+    values = np.asarray(grid['axes'][axis])
+    return int(np.abs(values - value).argmin())
+
+
+def heatmap(grid: Dict, metric: str, x: str = 'offer_pct', y: str = 'assignment_fee',
+            fixed: Optional[Dict] = None) -> Dict:
+    """2-D slice of a metric for plotting; axes not on x/y are pinned to the nearest fixed value"""
+    fixed = fixed or {}
+    index = []
+    for axis in AXES:
+        if axis in (x, y):
+            index.append(slice(None))
+        else:
+            default = grid['axes'][axis][len(grid['axes'][axis]) // 2]
+            index.append(nearest_index(grid, axis, fixed.get(axis, default)))
+
+    values = grid[metric][tuple(index)]
+    if AXES.index(x) < AXES.index(y):
+        values = values.T  # rows follow y, columns follow x
+    return {'x': grid['axes'][x], 'y': grid['axes'][y], 'z': values.tolist(), 'metric': metric}
+
+
+def what_if(grid: Dict, **point) -> Dict:
+    """Read every metric at the grid point nearest to the given axis values"""
+    index = tuple(nearest_index(grid, axis, point.get(axis, grid['axes'][axis][0])) for axis in AXES)
+    result = {axis: grid['axes'][axis][i] for axis, i in zip(AXES, index)}
+    for metric in ('contract_price', 'buyer_profit', 'buyer_roi', 'wholesale_profit', 'wholesale_roi',
+                   'spread', 'grade_score'):
+        result[metric] = float(grid[metric][index])
+    result['grade'] = str(GRADES[grid['grade_code'][index]])
+    return result
+
+
+def grid_key(arv: float, rehab_cost: float, list_price: float, params: Dict, axes: Optional[Dict] = None) -> str:
+    """Stable hash of everything that affects a grid's values"""
+    payload = {
+        'arv': round(float(arv), 2),
+        'rehab_cost': round(float(rehab_cost), 2),
+        'list_price': round(float(list_price), 2),
+        'holding_period': params.get('holding_period', 6),
+        'target_roi': params.get('target_roi', 15),
+        'axes': {name: np.asarray((axes or {}).get(name, DEFAULT_AXES[name]), dtype=float).round(6).tolist()
+                 for name in AXES}
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class SensitivityEngine:
+    """LRU cache of evaluated grids keyed by input hash"""
+
+    def __init__(self, cache_size: int = 64):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def grid(self, arv: float, rehab_cost: float, list_price: float, params: Dict,
+             axes: Optional[Dict] = None) -> Dict:
+        key = grid_key(arv, rehab_cost, list_price, params, axes)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._cache[key]
+            self.stats['misses'] += 1
+
+        grid = evaluate_grid(arv, rehab_cost, list_price, params, axes)
+        grid['key'] = key
+
+        with self._lock:
+            self._cache[key] = grid
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return grid
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
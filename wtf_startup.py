@@ -0,0 +1,125 @@
+"""
+WTF Startup - Deferred heavy imports and import-time profiling for the app entry points
+
+Pages bind numpy/pandas/plotly (and openai) through lazy_import, so the modules
+load on the first attribute access instead of at app start; page-specific
+subsystems are imported inside the pages that use them. The profiler reads the top-level
+imports of an entry point and reports where `python -X importtime` spends the
+cold-start time:
+
+    python -m wtf_startup profile wtf_ultimate_complete.py --top 20
+"""
+
+import argparse
+import ast
+import importlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from typing import Dict, List
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Stand-in for `import name` that defers the import until the module is used"""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def entry_point_imports(path: str) -> List[str]:
+    """Module names imported at the top level of a script (what a cold start pays for)"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def profile_imports(modules: List[str], top: int = 25) -> Dict:
+    """Import modules in a fresh interpreter under -X importtime and rank the cost"""
+    code = (f"import json\nmissing = []\nfor name in {modules!r}:\n"
+            f"    try:\n        exec(f\"import {{name}}\")\n"
+            f"    except ImportError:\n        missing.append(name)\nprint(json.dumps(missing))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            rows.append({'module': match.group(4), 'self_ms': int(match.group(1)) / 1000,
+                         'cumulative_ms': int(match.group(2)) / 1000, 'depth': len(match.group(3)) // 2})
+
+    # Depth 0 rows are the modules requested (or pulled in first) and sum to the total
+    roots = [row for row in rows if row['depth'] == 0]
+    missing = json.loads(result.stdout.strip().splitlines()[-1]) if result.stdout.strip() else []
+    return {
+        'total_ms': round(sum(row['cumulative_ms'] for row in roots), 1),
+        'top_level': sorted((r for r in roots if r['cumulative_ms'] >= 1), key=lambda r: -r['cumulative_ms'])[:top],
+        'slowest_self': sorted(rows, key=lambda r: -r['self_ms'])[:top],
+        'not_installed': missing
+    }
+
+
+def print_report(report: Dict, title: str):
+    print(f"{title}: {report['total_ms']:.1f} ms total import time")
+    print(f"\n{'cumulative ms':>14}  top-level import")
+    for row in report['top_level']:
+        print(f"{row['cumulative_ms']:14.1f}  {row['module']}")
+    print(f"\n{'self ms':>14}  slowest modules (own time)")
+    for row in report['slowest_self']:
+        print(f"{row['self_ms']:14.1f}  {row['module']}")
+    if report['not_installed']:
+        print(f"\nNot installed here: {', '.join(report['not_installed'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup import profiling')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    profile = subparsers.add_parser('profile', help='Import-time report for an entry point')
+    profile.add_argument('entry_point', help='App script, e.g. wtf_ultimate_complete.py')
+    profile.add_argument('--top', type=int, default=25)
+    profile.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    modules = entry_point_imports(args.entry_point)
+    report = profile_imports(modules, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.entry_point)
+
+
+if __name__ == '__main__':
+    main()